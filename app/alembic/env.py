@@ -1,4 +1,5 @@
 import os
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -28,6 +29,38 @@ target_metadata = Base.metadata
 # ... etc.
 
 
+# PostgreSQL reprints index expressions (adding casts), so autogenerate would
+# always report these as changed.
+EXPRESSION_INDEXES = {"ix_jobs_workflow_id_status_rank"}
+
+# pg_trgm indexes, only created where the extension is available (a9b0c1d2e3f4)
+TRIGRAM_INDEX = re.compile(r"^ix_\w+_trgm$")
+
+
+# Partitions of jobs/files once partitioned by job id (app.services.job_partitions)
+JOB_PARTITION = re.compile(r"^(jobs|files)_(p\d+|legacy|default)$")
+
+
+def include_name(name, type_, parent_names):
+    """Leave partitions out of autogenerate.
+
+    They are created and dropped at runtime (``app.services.reports.partitions``,
+    ``app.services.job_partitions``).
+    """
+    if type_ == "table":
+        return not (name.startswith("workflow_events_") or JOB_PARTITION.match(name))
+    return True
+
+
+def include_object(object_, name, type_, reflected, compare_to):
+    if type_ == "index" and (name in EXPRESSION_INDEXES or TRIGRAM_INDEX.match(name)):
+        return False
+    # A partitioned files table has the FK to jobs on each partition instead
+    if type_ == "foreign_key_constraint" and object_.parent.name == "files":
+        return reflected or compare_to is not None
+    return True
+
+
 def get_database_url():
     """Get database URL from environment variables."""
     from app.core.config import settings
@@ -77,7 +110,12 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,64 @@
+"""add indexes matching the keyset pagination of workflow and job lists
+
+Revision ID: a3b4c5d6e7f8
+Revises: f2a3b4c5d6e7
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "a3b4c5d6e7f8"
+down_revision: str | None = "f2a3b4c5d6e7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Must match ``app.models.job.status_rank`` for the planner to use the index
+STATUS_RANK = (
+    "CASE WHEN (status = 'ERROR') THEN 5 WHEN (status = 'RUNNING') THEN 4 "
+    "WHEN (status = 'SUCCESS') THEN 3 WHEN (status = 'UNKNOWN') THEN 2 ELSE 1 END"
+)
+
+# name, table, columns; the workflow indexes supersede REPLACED (same leading
+# columns, plus the id tie-breaker)
+INDEXES = [
+    (
+        "ix_jobs_workflow_id_status_rank",
+        "jobs",
+        f"workflow_id, ({STATUS_RANK}), started_at, id",
+    ),
+    ("ix_workflows_started_at_id", "workflows", "started_at, id"),
+    ("ix_workflows_user_id_started_at_id", "workflows", "user_id, started_at, id"),
+    (
+        "ix_workflows_catalog_id_started_at_id",
+        "workflows",
+        "catalog_id, started_at, id",
+    ),
+]
+REPLACED = [
+    ("ix_workflows_started_at", "workflows", "started_at"),
+    ("ix_workflows_user_id_started_at", "workflows", "user_id, started_at"),
+    ("ix_workflows_catalog_id", "workflows", "catalog_id"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"
+            )
+        for name, _, _ in REPLACED:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"
+            )
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
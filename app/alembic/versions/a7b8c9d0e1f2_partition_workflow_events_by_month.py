@@ -0,0 +1,190 @@
+"""partition workflow_events by month on created_at
+
+Converts the table online: the indexes and the range CHECK the new parent needs are
+built on the existing table without blocking writes, then a short transaction
+renames it to ``workflow_events_legacy``, creates the partitioned parent and
+attaches the old table as its first partition (everything before next month).
+The ATTACH reuses those indexes and skips the validation scan thanks to the CHECK.
+
+Revision ID: a7b8c9d0e1f2
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a7b8c9d0e1f2"
+down_revision: str | None = "f1a2b3c4d5e6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _add_months(month: datetime, offset: int) -> datetime:
+    """First of the month ``offset`` months after ``month``, in UTC.
+
+    ``month`` may come back from the database in the session's time zone; the
+    bounds are UTC months like ``month_start`` in app/services/reports/partitions.py.
+    """
+    month = month.astimezone(UTC)
+    index = month.year * 12 + month.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def _literal(moment: datetime) -> str:
+    return f"'{moment.astimezone(UTC):%Y-%m-%d %H:%M:%S}+00'"
+
+
+_INDEXES = {
+    "ix_workflow_events_workflow_created": "(workflow_id, created_at)",
+    "ix_workflow_events_status_created": "(status, created_at)",
+    "ix_workflow_events_user_id": "(user_id)",
+    "ix_workflow_events_sequence_no": "(sequence_no)",
+}
+
+
+def upgrade() -> None:
+    # First month after both now and the newest existing row (clock skew, imports).
+    boundary = _add_months(
+        op.get_bind().scalar(
+            sa.text("SELECT greatest(now(), max(created_at)) FROM workflow_events")
+        ),
+        1,
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "
+            "workflow_events_legacy_pkey ON workflow_events (id, created_at)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS "
+            "ix_workflow_events_legacy_sequence_no ON workflow_events (sequence_no)"
+        )
+        # NOT VALID + VALIDATE: only a brief lock, the scan does not block writes.
+        op.execute(
+            "ALTER TABLE workflow_events "
+            "DROP CONSTRAINT IF EXISTS workflow_events_legacy_bound"
+        )
+        op.execute(
+            "ALTER TABLE workflow_events ADD CONSTRAINT workflow_events_legacy_bound "
+            f"CHECK (created_at < TIMESTAMPTZ {_literal(boundary)}) NOT VALID"
+        )
+        op.execute(
+            "ALTER TABLE workflow_events VALIDATE CONSTRAINT workflow_events_legacy_bound"
+        )
+
+    op.execute("LOCK TABLE workflow_events IN ACCESS EXCLUSIVE MODE")
+    # The identity sequence can't be shared with the parent; a plain sequence of the
+    # same name (dropped along with the identity) takes over the numbering.
+    op.execute("ALTER TABLE workflow_events ALTER COLUMN sequence_no DROP IDENTITY")
+    op.execute("CREATE SEQUENCE workflow_events_sequence_no_seq")
+    op.execute(
+        "SELECT setval('workflow_events_sequence_no_seq', "
+        "COALESCE((SELECT max(sequence_no) FROM workflow_events), 0) + 1, false)"
+    )
+    op.execute(
+        "ALTER TABLE workflow_events DROP CONSTRAINT uq_workflow_events_sequence_no"
+    )
+    op.execute("ALTER TABLE workflow_events DROP CONSTRAINT workflow_events_pkey")
+    op.execute("ALTER TABLE workflow_events RENAME TO workflow_events_legacy")
+    op.execute(
+        "ALTER TABLE workflow_events_legacy ADD CONSTRAINT workflow_events_legacy_pkey "
+        "PRIMARY KEY USING INDEX workflow_events_legacy_pkey"
+    )
+    op.execute(
+        "ALTER TABLE workflow_events_legacy RENAME CONSTRAINT "
+        "workflow_events_user_id_fkey TO workflow_events_legacy_user_id_fkey"
+    )
+    for name in _INDEXES:
+        if name != "ix_workflow_events_sequence_no":
+            legacy = name.replace("workflow_events", "workflow_events_legacy", 1)
+            op.execute(f"ALTER INDEX {name} RENAME TO {legacy}")
+
+    op.execute(
+        """
+        CREATE TABLE workflow_events (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            sequence_no BIGINT NOT NULL
+                DEFAULT nextval('workflow_events_sequence_no_seq'),
+            workflow_id UUID,
+            user_id UUID NOT NULL,
+            event_type VARCHAR(64) NOT NULL,
+            payload_json JSONB NOT NULL,
+            context_json JSONB NOT NULL,
+            source VARCHAR(32) NOT NULL DEFAULT 'plugin',
+            status VARCHAR(16) NOT NULL DEFAULT 'pending',
+            error_message TEXT,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            processed_at TIMESTAMP WITH TIME ZONE,
+            CONSTRAINT workflow_events_pkey PRIMARY KEY (id, created_at),
+            CONSTRAINT workflow_events_user_id_fkey FOREIGN KEY (user_id)
+                REFERENCES "user" (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute(
+        "ALTER SEQUENCE workflow_events_sequence_no_seq "
+        "OWNED BY workflow_events.sequence_no"
+    )
+    for name, columns in _INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON workflow_events {columns}")
+
+    op.execute(
+        "ALTER TABLE workflow_events ATTACH PARTITION workflow_events_legacy "
+        f"FOR VALUES FROM (MINVALUE) TO ({_literal(boundary)})"
+    )
+    op.execute(
+        "ALTER TABLE workflow_events_legacy "
+        "DROP CONSTRAINT workflow_events_legacy_bound"
+    )
+    for offset in (0, 1):
+        start, end = _add_months(boundary, offset), _add_months(boundary, offset + 1)
+        op.execute(
+            f"CREATE TABLE workflow_events_p{start:%Y%m} PARTITION OF workflow_events "
+            f"FOR VALUES FROM ({_literal(start)}) TO ({_literal(end)})"
+        )
+    op.execute(
+        "CREATE TABLE workflow_events_default PARTITION OF workflow_events DEFAULT"
+    )
+
+
+def downgrade() -> None:
+    # Offline: copies every event back into a plain table.
+    op.execute(
+        "CREATE TABLE workflow_events_plain (LIKE workflow_events INCLUDING DEFAULTS)"
+    )
+    op.execute("INSERT INTO workflow_events_plain SELECT * FROM workflow_events")
+    op.execute(
+        "ALTER TABLE workflow_events_plain ALTER COLUMN sequence_no DROP DEFAULT"
+    )
+    op.execute("DROP TABLE workflow_events")
+    op.execute("DROP SEQUENCE IF EXISTS workflow_events_sequence_no_seq")
+    op.execute("ALTER TABLE workflow_events_plain RENAME TO workflow_events")
+    op.execute(
+        "ALTER TABLE workflow_events ALTER COLUMN sequence_no "
+        "ADD GENERATED BY DEFAULT AS IDENTITY"
+    )
+    op.execute(
+        "SELECT setval(pg_get_serial_sequence('workflow_events', 'sequence_no'), "
+        "COALESCE((SELECT max(sequence_no) FROM workflow_events), 0) + 1, false)"
+    )
+    op.execute(
+        "ALTER TABLE workflow_events ADD CONSTRAINT workflow_events_pkey "
+        "PRIMARY KEY (id)"
+    )
+    op.execute(
+        "ALTER TABLE workflow_events ADD CONSTRAINT uq_workflow_events_sequence_no "
+        "UNIQUE (sequence_no)"
+    )
+    op.execute(
+        "ALTER TABLE workflow_events ADD CONSTRAINT workflow_events_user_id_fkey "
+        'FOREIGN KEY (user_id) REFERENCES "user" (id) ON DELETE CASCADE'
+    )
+    for name, columns in _INDEXES.items():
+        if name != "ix_workflow_events_sequence_no":
+            op.execute(f"CREATE INDEX {name} ON workflow_events {columns}")
@@ -0,0 +1,55 @@
+"""add pg_trgm GIN indexes for run and catalog name searches
+
+Installs pg_trgm where the server offers it; without it the indexes are skipped
+and searches keep scanning (app.services.search falls back to plain matching).
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-19
+
+"""
+
+import logging
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "a9b0c1d2e3f4"
+down_revision: str | None = "f8a9b0c1d2e3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# name, table, column
+INDEXES = [
+    ("ix_workflows_name_trgm", "workflows", "name"),
+    ("ix_catalogs_name_trgm", "catalogs", "name"),
+    ("ix_catalogs_description_trgm", "catalogs", "description"),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    available = bind.exec_driver_sql(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+    ).scalar()
+    if not available:
+        logger.warning("pg_trgm is not available; skipping trigram search indexes")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Built without blocking writes, like e1f2a3b4c5d6
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    # The extension stays; other objects may use it.
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
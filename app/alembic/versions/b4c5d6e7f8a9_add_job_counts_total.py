@@ -0,0 +1,110 @@
+"""count all jobs (any status) in workflow_job_counts and rule_job_counts
+
+Revision ID: b4c5d6e7f8a9
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b4c5d6e7f8a9"
+down_revision: str | None = "a3b4c5d6e7f8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    for table in ("workflow_job_counts", "rule_job_counts"):
+        op.add_column(
+            table,
+            sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        )
+
+    op.execute("""
+    CREATE OR REPLACE FUNCTION add_job_count(
+        p_workflow_id UUID, p_rule_id INTEGER, p_status TEXT, delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        d_success INTEGER := CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END;
+        d_running INTEGER := CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END;
+        d_error INTEGER := CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END;
+    BEGIN
+        INSERT INTO workflow_job_counts AS c
+            (workflow_id, total, success, running, error)
+        VALUES (p_workflow_id, delta, d_success, d_running, d_error)
+        ON CONFLICT (workflow_id) DO UPDATE SET
+            total = c.total + EXCLUDED.total,
+            success = c.success + EXCLUDED.success,
+            running = c.running + EXCLUDED.running,
+            error = c.error + EXCLUDED.error;
+
+        IF p_rule_id IS NOT NULL THEN
+            INSERT INTO rule_job_counts AS c
+                (rule_id, workflow_id, total, success, running, error)
+            VALUES (p_rule_id, p_workflow_id, delta, d_success, d_running, d_error)
+            ON CONFLICT (rule_id) DO UPDATE SET
+                total = c.total + EXCLUDED.total,
+                success = c.success + EXCLUDED.success,
+                running = c.running + EXCLUDED.running,
+                error = c.error + EXCLUDED.error;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+    # Backfill with job writes locked out, as the new function is already counting
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+    INSERT INTO workflow_job_counts AS c (workflow_id, total)
+    SELECT workflow_id, count(*) FROM jobs GROUP BY workflow_id
+    ON CONFLICT (workflow_id) DO UPDATE SET total = EXCLUDED.total;
+
+    INSERT INTO rule_job_counts AS c (rule_id, workflow_id, total)
+    SELECT rule_id, min(workflow_id::text)::uuid, count(*)
+    FROM jobs
+    WHERE rule_id IS NOT NULL
+    GROUP BY rule_id
+    ON CONFLICT (rule_id) DO UPDATE SET total = EXCLUDED.total;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION add_job_count(
+        p_workflow_id UUID, p_rule_id INTEGER, p_status TEXT, delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        d_success INTEGER := CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END;
+        d_running INTEGER := CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END;
+        d_error INTEGER := CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END;
+    BEGIN
+        IF d_success = 0 AND d_running = 0 AND d_error = 0 THEN
+            RETURN;
+        END IF;
+
+        INSERT INTO workflow_job_counts AS c (workflow_id, success, running, error)
+        VALUES (p_workflow_id, d_success, d_running, d_error)
+        ON CONFLICT (workflow_id) DO UPDATE SET
+            success = c.success + EXCLUDED.success,
+            running = c.running + EXCLUDED.running,
+            error = c.error + EXCLUDED.error;
+
+        IF p_rule_id IS NOT NULL THEN
+            INSERT INTO rule_job_counts AS c (rule_id, workflow_id, success, running, error)
+            VALUES (p_rule_id, p_workflow_id, d_success, d_running, d_error)
+            ON CONFLICT (rule_id) DO UPDATE SET
+                success = c.success + EXCLUDED.success,
+                running = c.running + EXCLUDED.running,
+                error = c.error + EXCLUDED.error;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    for table in ("workflow_job_counts", "rule_job_counts"):
+        op.drop_column(table, "total")
@@ -0,0 +1,273 @@
+"""log job rollup changes as deltas keyed on the job's stored rollup row
+
+Revision ID: c1d2e3f4a5b6
+Revises: b0c1d2e3f4a5
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c1d2e3f4a5b6"
+down_revision: str | None = "b0c1d2e3f4a5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# Sketch bucket of a duration in seconds, as in e7f8a9b0c1d2
+_BUCKET = "CEIL(LN(GREATEST({duration}, 0.001)) / LN(1.02020202020202))::INTEGER"
+
+_SET_JOB_ROLLUP_ID = """
+    CREATE OR REPLACE FUNCTION set_job_rollup_id()
+    RETURNS trigger AS $$
+    DECLARE
+        w RECORD;
+        r_name TEXT;
+        r_day DATE;
+    BEGIN
+        IF TG_OP = 'INSERT' AND NEW.rollup_id IS NOT NULL THEN
+            -- A restored job keeps the row it was counted in
+            RETURN NEW;
+        END IF;
+        IF TG_OP = 'UPDATE'
+            AND OLD.started_at IS NOT DISTINCT FROM NEW.started_at
+            AND OLD.rule_id IS NOT DISTINCT FROM NEW.rule_id
+            AND OLD.workflow_id IS NOT DISTINCT FROM NEW.workflow_id
+        THEN
+            RETURN NEW;
+        END IF;
+        SELECT name INTO r_name FROM rules WHERE id = NEW.rule_id;
+        SELECT user_id, catalog_id INTO w FROM workflows WHERE id = NEW.workflow_id;
+        r_day := (NEW.started_at AT TIME ZONE 'UTC')::DATE;
+
+        -- A day has few keys: the day prefix of the unique index finds the row.
+        SELECT id INTO NEW.rollup_id FROM job_daily_rollups
+        WHERE day = r_day
+            AND user_id IS NOT DISTINCT FROM w.user_id
+            AND catalog_id IS NOT DISTINCT FROM w.catalog_id
+            AND rule_name IS NOT DISTINCT FROM r_name;
+        IF NEW.rollup_id IS NULL THEN
+            -- DO NOTHING locks no existing row; the key may be created meanwhile
+            INSERT INTO job_daily_rollups (day, user_id, catalog_id, rule_name)
+            VALUES (r_day, w.user_id, w.catalog_id, r_name)
+            ON CONFLICT (day, user_id, catalog_id, rule_name) DO NOTHING
+            RETURNING id INTO NEW.rollup_id;
+        END IF;
+        IF NEW.rollup_id IS NULL THEN
+            SELECT id INTO NEW.rollup_id FROM job_daily_rollups
+            WHERE day = r_day
+                AND user_id IS NOT DISTINCT FROM w.user_id
+                AND catalog_id IS NOT DISTINCT FROM w.catalog_id
+                AND rule_name IS NOT DISTINCT FROM r_name;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+
+_ADD_JOB_ROLLUP_DELTA = f"""
+    CREATE OR REPLACE FUNCTION add_job_rollup_delta(
+        p_rollup_id BIGINT,
+        p_status TEXT,
+        p_started_at TIMESTAMPTZ,
+        p_end_time TIMESTAMPTZ,
+        delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        duration DOUBLE PRECISION;
+    BEGIN
+        IF p_rollup_id IS NULL THEN
+            RETURN;
+        END IF;
+        IF p_status = 'SUCCESS' AND p_end_time IS NOT NULL THEN
+            duration := EXTRACT(EPOCH FROM p_end_time - p_started_at);
+        END IF;
+        INSERT INTO job_rollup_deltas (
+            rollup_id, total, success, running, error,
+            duration_count, duration_sum, bucket
+        )
+        VALUES (
+            p_rollup_id,
+            delta,
+            CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END,
+            CASE WHEN duration IS NOT NULL THEN delta ELSE 0 END,
+            COALESCE(duration * delta, 0),
+            CASE WHEN duration IS NOT NULL THEN {_BUCKET.format(duration="duration")} END
+        );
+    END;
+    $$ LANGUAGE plpgsql
+    """
+
+_ROLLUP_JOB = """
+    CREATE OR REPLACE FUNCTION rollup_job()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM add_job_rollup_delta(
+                OLD.rollup_id, OLD.status::TEXT, OLD.started_at, OLD.end_time, -1
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM add_job_rollup_delta(
+                NEW.rollup_id, NEW.status::TEXT, NEW.started_at, NEW.end_time, 1
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+
+_COUNTS = ("total", "success", "running", "error", "duration_count", "duration_sum")
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("rollup_id", sa.BigInteger(), nullable=True))
+    op.create_table(
+        "job_rollup_deltas",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("rollup_id", sa.BigInteger(), nullable=False),
+        sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("success", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("running", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("error", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("duration_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("duration_sum", sa.Float(), server_default="0", nullable=False),
+        sa.Column("bucket", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Lock out job writes while the triggers are swapped and the rollup rows of
+    # the existing jobs filled in, so no change is counted twice or missed.
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+    UPDATE jobs j SET rollup_id = r.id
+    FROM jobs k
+    LEFT JOIN workflows w ON w.id = k.workflow_id
+    LEFT JOIN rules ru ON ru.id = k.rule_id
+    JOIN job_daily_rollups r
+        ON r.day = (k.started_at AT TIME ZONE 'UTC')::DATE
+        AND r.user_id IS NOT DISTINCT FROM w.user_id
+        AND r.catalog_id IS NOT DISTINCT FROM w.catalog_id
+        AND r.rule_name IS NOT DISTINCT FROM ru.name
+    WHERE k.id = j.id
+    """)
+    op.execute(_SET_JOB_ROLLUP_ID)
+    op.execute(_ADD_JOB_ROLLUP_DELTA)
+    op.execute(_ROLLUP_JOB)
+    op.execute(
+        "DROP FUNCTION "
+        "add_job_rollup(UUID, INTEGER, TEXT, TIMESTAMPTZ, TIMESTAMPTZ, INTEGER)"
+    )
+    op.execute("""
+    CREATE TRIGGER jobs_rollup_id_trigger
+        BEFORE INSERT OR UPDATE OF started_at, rule_id, workflow_id ON jobs
+        FOR EACH ROW EXECUTE FUNCTION set_job_rollup_id()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("DROP TRIGGER jobs_rollup_id_trigger ON jobs")
+    # Fold the pending deltas in before the log goes
+    op.execute(f"""
+    UPDATE job_daily_rollups r SET
+        {", ".join(f"{c} = r.{c} + s.{c}" for c in _COUNTS)}
+    FROM (
+        SELECT rollup_id, {", ".join(f"sum({c}) AS {c}" for c in _COUNTS)}
+        FROM job_rollup_deltas
+        GROUP BY rollup_id
+    ) s
+    WHERE r.id = s.rollup_id
+    """)
+    op.execute("""
+    INSERT INTO job_duration_buckets AS b (rollup_id, bucket, count)
+    SELECT rollup_id, bucket, sum(duration_count)
+    FROM job_rollup_deltas
+    WHERE bucket IS NOT NULL
+    GROUP BY rollup_id, bucket
+    ON CONFLICT (rollup_id, bucket) DO UPDATE SET count = b.count + EXCLUDED.count
+    """)
+    op.drop_table("job_rollup_deltas")
+    op.execute(
+        """
+    CREATE OR REPLACE FUNCTION add_job_rollup(
+        p_workflow_id UUID,
+        p_rule_id INTEGER,
+        p_status TEXT,
+        p_started_at TIMESTAMPTZ,
+        p_end_time TIMESTAMPTZ,
+        delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        w RECORD;
+        r_name TEXT;
+        duration DOUBLE PRECISION;
+        r_id BIGINT;
+    BEGIN
+        SELECT name INTO r_name FROM rules WHERE id = p_rule_id;
+        SELECT user_id, catalog_id INTO w FROM workflows WHERE id = p_workflow_id;
+        IF p_status = 'SUCCESS' AND p_end_time IS NOT NULL THEN
+            duration := EXTRACT(EPOCH FROM p_end_time - p_started_at);
+        END IF;
+
+        INSERT INTO job_daily_rollups AS r (
+            day, user_id, catalog_id, rule_name,
+            total, success, running, error, duration_count, duration_sum
+        )
+        VALUES (
+            (p_started_at AT TIME ZONE 'UTC')::DATE, w.user_id, w.catalog_id, r_name,
+            delta,
+            CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END,
+            CASE WHEN duration IS NOT NULL THEN delta ELSE 0 END,
+            COALESCE(duration * delta, 0)
+        )
+        ON CONFLICT (day, user_id, catalog_id, rule_name) DO UPDATE SET
+            total = r.total + EXCLUDED.total,
+            success = r.success + EXCLUDED.success,
+            running = r.running + EXCLUDED.running,
+            error = r.error + EXCLUDED.error,
+            duration_count = r.duration_count + EXCLUDED.duration_count,
+            duration_sum = r.duration_sum + EXCLUDED.duration_sum
+        RETURNING r.id INTO r_id;
+
+        IF duration IS NOT NULL THEN
+            INSERT INTO job_duration_buckets AS b (rollup_id, bucket, count)
+            VALUES (r_id, {bucket}, delta)
+            ON CONFLICT (rollup_id, bucket) DO UPDATE SET count = b.count + EXCLUDED.count;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+    """.replace("{bucket}", _BUCKET.format(duration="duration"))
+    )
+    op.execute("""
+    CREATE OR REPLACE FUNCTION rollup_job()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM add_job_rollup(
+                OLD.workflow_id, OLD.rule_id, OLD.status::TEXT,
+                OLD.started_at, OLD.end_time, -1
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM add_job_rollup(
+                NEW.workflow_id, NEW.rule_id, NEW.status::TEXT,
+                NEW.started_at, NEW.end_time, 1
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """)
+    op.execute("DROP FUNCTION add_job_rollup_delta(BIGINT, TEXT, TIMESTAMPTZ, TIMESTAMPTZ, INTEGER)")
+    op.execute("DROP FUNCTION set_job_rollup_id()")
+    op.drop_column("jobs", "rollup_id")
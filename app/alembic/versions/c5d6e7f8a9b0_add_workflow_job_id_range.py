@@ -0,0 +1,143 @@
+"""track the job id range of each run in workflow_job_counts
+
+Lets queries on one run's jobs and files skip the partitions of a jobs/files table
+partitioned by job id (``python -m app.manage jobs-partitions --convert``).
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c5d6e7f8a9b0"
+down_revision: str | None = "b4c5d6e7f8a9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+_ADD_JOB_COUNT = """
+    CREATE OR REPLACE FUNCTION add_job_count(
+        p_workflow_id UUID,
+        p_rule_id INTEGER,
+        p_status TEXT,
+        delta INTEGER,
+        p_job_id INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        d_success INTEGER := CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END;
+        d_running INTEGER := CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END;
+        d_error INTEGER := CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END;
+    BEGIN
+        INSERT INTO workflow_job_counts AS c
+            (workflow_id, total, success, running, error, first_job_id, last_job_id)
+        VALUES (p_workflow_id, delta, d_success, d_running, d_error, p_job_id, p_job_id)
+        ON CONFLICT (workflow_id) DO UPDATE SET
+            total = c.total + EXCLUDED.total,
+            success = c.success + EXCLUDED.success,
+            running = c.running + EXCLUDED.running,
+            error = c.error + EXCLUDED.error,
+            first_job_id = LEAST(c.first_job_id, EXCLUDED.first_job_id),
+            last_job_id = GREATEST(c.last_job_id, EXCLUDED.last_job_id);
+
+        IF p_rule_id IS NOT NULL THEN
+            INSERT INTO rule_job_counts AS c
+                (rule_id, workflow_id, total, success, running, error)
+            VALUES (p_rule_id, p_workflow_id, delta, d_success, d_running, d_error)
+            ON CONFLICT (rule_id) DO UPDATE SET
+                total = c.total + EXCLUDED.total,
+                success = c.success + EXCLUDED.success,
+                running = c.running + EXCLUDED.running,
+                error = c.error + EXCLUDED.error;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+_COUNT_JOB_STATUS = """
+    CREATE OR REPLACE FUNCTION count_job_status()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM add_job_count(
+                OLD.workflow_id, OLD.rule_id, OLD.status::TEXT, -1{old_id}
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM add_job_count(
+                NEW.workflow_id, NEW.rule_id, NEW.status::TEXT, 1{new_id}
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workflow_job_counts", sa.Column("first_job_id", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "workflow_job_counts", sa.Column("last_job_id", sa.Integer(), nullable=True)
+    )
+    op.execute(_ADD_JOB_COUNT)
+    op.execute(_COUNT_JOB_STATUS.format(old_id=", NULL", new_id=", NEW.id"))
+    op.execute("DROP FUNCTION add_job_count(UUID, INTEGER, TEXT, INTEGER)")
+
+    # Backfill with job writes locked out, as the trigger already tracks new jobs
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+    UPDATE workflow_job_counts AS c
+    SET first_job_id = j.first_job_id, last_job_id = j.last_job_id
+    FROM (
+        SELECT workflow_id, min(id) AS first_job_id, max(id) AS last_job_id
+        FROM jobs
+        GROUP BY workflow_id
+    ) AS j
+    WHERE j.workflow_id = c.workflow_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    CREATE OR REPLACE FUNCTION add_job_count(
+        p_workflow_id UUID, p_rule_id INTEGER, p_status TEXT, delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        d_success INTEGER := CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END;
+        d_running INTEGER := CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END;
+        d_error INTEGER := CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END;
+    BEGIN
+        INSERT INTO workflow_job_counts AS c
+            (workflow_id, total, success, running, error)
+        VALUES (p_workflow_id, delta, d_success, d_running, d_error)
+        ON CONFLICT (workflow_id) DO UPDATE SET
+            total = c.total + EXCLUDED.total,
+            success = c.success + EXCLUDED.success,
+            running = c.running + EXCLUDED.running,
+            error = c.error + EXCLUDED.error;
+
+        IF p_rule_id IS NOT NULL THEN
+            INSERT INTO rule_job_counts AS c
+                (rule_id, workflow_id, total, success, running, error)
+            VALUES (p_rule_id, p_workflow_id, delta, d_success, d_running, d_error)
+            ON CONFLICT (rule_id) DO UPDATE SET
+                total = c.total + EXCLUDED.total,
+                success = c.success + EXCLUDED.success,
+                running = c.running + EXCLUDED.running,
+                error = c.error + EXCLUDED.error;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute(_COUNT_JOB_STATUS.format(old_id="", new_id=""))
+    op.execute("DROP FUNCTION add_job_count(UUID, INTEGER, TEXT, INTEGER, INTEGER)")
+    op.drop_column("workflow_job_counts", "last_job_id")
+    op.drop_column("workflow_job_counts", "first_job_id")
@@ -0,0 +1,31 @@
+"""add jobs.error_excerpt and an index of failed jobs
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d0e1f2a3b4c5"
+down_revision: str | None = "c9d0e1f2a3b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("jobs", sa.Column("error_excerpt", sa.JSON(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jobs_failed "
+            "ON jobs (workflow_id, started_at) WHERE status = 'ERROR'"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_failed", table_name="jobs")
+    op.drop_column("jobs", "error_excerpt")
@@ -0,0 +1,31 @@
+"""index workflow_event_keys.event_id for deleting runs' event keys
+
+Revision ID: d4e5f6a7b8c9
+Revises: d3e4f5a6b7c8
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "d4e5f6a7b8c9"
+down_revision: str | None = "d3e4f5a6b7c8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_workflow_event_keys_event_id"),
+        "workflow_event_keys",
+        ["event_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_workflow_event_keys_event_id"), table_name="workflow_event_keys"
+    )
@@ -0,0 +1,161 @@
+"""add daily job rollups per user, catalog and rule kept by a trigger
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d6e7f8a9b0c1"
+down_revision: str | None = "c5d6e7f8a9b0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_daily_rollups",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=True),
+        sa.Column("catalog_id", sa.Uuid(), nullable=True),
+        sa.Column("rule_name", sa.String(), nullable=True),
+        sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("success", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("running", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("error", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("duration_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("duration_sum", sa.Float(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_job_daily_rollups_key",
+        "job_daily_rollups",
+        ["day", "user_id", "catalog_id", "rule_name"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+    op.execute("""
+    CREATE OR REPLACE FUNCTION add_job_rollup(
+        p_workflow_id UUID,
+        p_rule_id INTEGER,
+        p_status TEXT,
+        p_started_at TIMESTAMPTZ,
+        p_end_time TIMESTAMPTZ,
+        delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        w RECORD;
+        r_name TEXT;
+        duration DOUBLE PRECISION;
+    BEGIN
+        SELECT name INTO r_name FROM rules WHERE id = p_rule_id;
+        SELECT user_id, catalog_id INTO w FROM workflows WHERE id = p_workflow_id;
+        IF p_status = 'SUCCESS' AND p_end_time IS NOT NULL THEN
+            duration := EXTRACT(EPOCH FROM p_end_time - p_started_at);
+        END IF;
+
+        INSERT INTO job_daily_rollups AS r (
+            day, user_id, catalog_id, rule_name,
+            total, success, running, error, duration_count, duration_sum
+        )
+        VALUES (
+            (p_started_at AT TIME ZONE 'UTC')::DATE, w.user_id, w.catalog_id, r_name,
+            delta,
+            CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END,
+            CASE WHEN duration IS NOT NULL THEN delta ELSE 0 END,
+            COALESCE(duration * delta, 0)
+        )
+        ON CONFLICT (day, user_id, catalog_id, rule_name) DO UPDATE SET
+            total = r.total + EXCLUDED.total,
+            success = r.success + EXCLUDED.success,
+            running = r.running + EXCLUDED.running,
+            error = r.error + EXCLUDED.error,
+            duration_count = r.duration_count + EXCLUDED.duration_count,
+            duration_sum = r.duration_sum + EXCLUDED.duration_sum;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION rollup_job()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM add_job_rollup(
+                OLD.workflow_id, OLD.rule_id, OLD.status::TEXT,
+                OLD.started_at, OLD.end_time, -1
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM add_job_rollup(
+                NEW.workflow_id, NEW.rule_id, NEW.status::TEXT,
+                NEW.started_at, NEW.end_time, 1
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+    # Lock out job writes while the triggers are created and rollups backfilled,
+    # so no change is counted twice or missed.
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+    CREATE TRIGGER jobs_rollup_insert_delete_trigger
+        AFTER INSERT OR DELETE ON jobs
+        FOR EACH ROW EXECUTE FUNCTION rollup_job();
+
+    CREATE TRIGGER jobs_rollup_update_trigger
+        AFTER UPDATE OF status, started_at, end_time, rule_id, workflow_id ON jobs
+        FOR EACH ROW
+        WHEN (
+            OLD.status IS DISTINCT FROM NEW.status
+            OR OLD.started_at IS DISTINCT FROM NEW.started_at
+            OR OLD.end_time IS DISTINCT FROM NEW.end_time
+            OR OLD.rule_id IS DISTINCT FROM NEW.rule_id
+            OR OLD.workflow_id IS DISTINCT FROM NEW.workflow_id
+        )
+        EXECUTE FUNCTION rollup_job();
+    """)
+    op.execute("""
+    INSERT INTO job_daily_rollups (
+        day, user_id, catalog_id, rule_name,
+        total, success, running, error, duration_count, duration_sum
+    )
+    SELECT
+        (j.started_at AT TIME ZONE 'UTC')::DATE, w.user_id, w.catalog_id, ru.name,
+        count(*),
+        count(*) FILTER (WHERE j.status = 'SUCCESS'),
+        count(*) FILTER (WHERE j.status = 'RUNNING'),
+        count(*) FILTER (WHERE j.status = 'ERROR'),
+        count(*) FILTER (WHERE j.status = 'SUCCESS' AND j.end_time IS NOT NULL),
+        COALESCE(
+            sum(EXTRACT(EPOCH FROM j.end_time - j.started_at))
+                FILTER (WHERE j.status = 'SUCCESS' AND j.end_time IS NOT NULL),
+            0
+        )
+    FROM jobs j
+    LEFT JOIN workflows w ON w.id = j.workflow_id
+    LEFT JOIN rules ru ON ru.id = j.rule_id
+    GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS jobs_rollup_update_trigger ON jobs")
+    op.execute("DROP TRIGGER IF EXISTS jobs_rollup_insert_delete_trigger ON jobs")
+    op.execute("DROP FUNCTION IF EXISTS rollup_job()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS "
+        "add_job_rollup(UUID, INTEGER, TEXT, TIMESTAMPTZ, TIMESTAMPTZ, INTEGER)"
+    )
+    op.drop_index("uq_job_daily_rollups_key", table_name="job_daily_rollups")
+    op.drop_table("job_daily_rollups")
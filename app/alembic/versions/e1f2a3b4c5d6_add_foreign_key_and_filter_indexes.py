@@ -0,0 +1,45 @@
+"""add foreign-key and filter indexes on jobs, files, rules, errors, workflows
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "e1f2a3b4c5d6"
+down_revision: str | None = "d0e1f2a3b4c5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# name, table, columns
+INDEXES = [
+    ("ix_jobs_workflow_id_status", "jobs", "workflow_id, status"),
+    ("ix_jobs_workflow_id_snakemake_id", "jobs", "workflow_id, snakemake_id"),
+    ("ix_jobs_rule_id", "jobs", "rule_id"),
+    ("ix_files_job_id_file_type", "files", "job_id, file_type"),
+    ("ix_rules_workflow_id_name", "rules", "workflow_id, name"),
+    ("ix_errors_workflow_id_timestamp", "errors", "workflow_id, timestamp"),
+    ("ix_workflows_started_at", "workflows", "started_at"),
+    ("ix_workflows_user_id_started_at", "workflows", "user_id, started_at"),
+    ("ix_workflows_catalog_id", "workflows", "catalog_id"),
+]
+
+
+def upgrade() -> None:
+    # Built without blocking writes; IF NOT EXISTS lets a failed run be resumed
+    # (drop any index left INVALID by an interrupted build first).
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
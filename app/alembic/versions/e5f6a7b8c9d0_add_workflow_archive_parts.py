@@ -0,0 +1,48 @@
+"""store archived runs in compressed parts of bounded size
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e5f6a7b8c9d0"
+down_revision: str | None = "d4e5f6a7b8c9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workflow_archive_parts",
+        sa.Column("workflow_id", sa.Uuid(), nullable=False),
+        sa.Column("part", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("table_name", sa.String(length=64), nullable=False),
+        sa.Column("rows", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["workflow_id"],
+            ["workflow_archives.workflow_id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("workflow_id", "part"),
+    )
+    # Existing archives keep their single document in ``data``
+    op.alter_column("workflow_archives", "data", nullable=True)
+
+
+def downgrade() -> None:
+    parted = op.get_bind().scalar(
+        sa.text("SELECT count(*) FROM workflow_archives WHERE data IS NULL")
+    )
+    if parted:
+        raise RuntimeError(
+            f"{parted} runs are archived in parts: restore them before downgrading"
+        )
+    op.alter_column("workflow_archives", "data", nullable=False)
+    op.drop_table("workflow_archive_parts")
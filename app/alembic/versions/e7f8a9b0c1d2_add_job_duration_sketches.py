@@ -0,0 +1,126 @@
+"""add duration sketches (DDSketch buckets) to the daily job rollups
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e7f8a9b0c1d2"
+down_revision: str | None = "d6e7f8a9b0c1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# Sketch bucket of a duration in seconds: app.utils.ddsketch.BUCKET_SQL at this
+# revision, with the exact repr of GAMMA (tests/unit/test_ddsketch.py pins it)
+_BUCKET = "CEIL(LN(GREATEST({duration}, 0.001)) / LN(1.02020202020202))::INTEGER"
+
+_ADD_JOB_ROLLUP = """
+    CREATE OR REPLACE FUNCTION add_job_rollup(
+        p_workflow_id UUID,
+        p_rule_id INTEGER,
+        p_status TEXT,
+        p_started_at TIMESTAMPTZ,
+        p_end_time TIMESTAMPTZ,
+        delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        w RECORD;
+        r_name TEXT;
+        duration DOUBLE PRECISION;
+        r_id BIGINT;
+    BEGIN
+        SELECT name INTO r_name FROM rules WHERE id = p_rule_id;
+        SELECT user_id, catalog_id INTO w FROM workflows WHERE id = p_workflow_id;
+        IF p_status = 'SUCCESS' AND p_end_time IS NOT NULL THEN
+            duration := EXTRACT(EPOCH FROM p_end_time - p_started_at);
+        END IF;
+
+        INSERT INTO job_daily_rollups AS r (
+            day, user_id, catalog_id, rule_name,
+            total, success, running, error, duration_count, duration_sum
+        )
+        VALUES (
+            (p_started_at AT TIME ZONE 'UTC')::DATE, w.user_id, w.catalog_id, r_name,
+            delta,
+            CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END,
+            CASE WHEN duration IS NOT NULL THEN delta ELSE 0 END,
+            COALESCE(duration * delta, 0)
+        )
+        ON CONFLICT (day, user_id, catalog_id, rule_name) DO UPDATE SET
+            total = r.total + EXCLUDED.total,
+            success = r.success + EXCLUDED.success,
+            running = r.running + EXCLUDED.running,
+            error = r.error + EXCLUDED.error,
+            duration_count = r.duration_count + EXCLUDED.duration_count,
+            duration_sum = r.duration_sum + EXCLUDED.duration_sum
+        {returning};
+        {buckets}
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+_ADD_BUCKET = f"""
+        IF duration IS NOT NULL THEN
+            INSERT INTO job_duration_buckets AS b (rollup_id, bucket, count)
+            VALUES (r_id, {_BUCKET.format(duration="duration")}, delta)
+            ON CONFLICT (rollup_id, bucket) DO UPDATE SET count = b.count + EXCLUDED.count;
+        END IF;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_duration_buckets",
+        sa.Column("rollup_id", sa.BigInteger(), nullable=False),
+        sa.Column("bucket", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["rollup_id"], ["job_daily_rollups.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("rollup_id", "bucket"),
+    )
+
+    # Backfill with job writes locked out, as the trigger tracks new durations
+    # from here on.
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute(
+        _ADD_JOB_ROLLUP.replace("{returning}", "RETURNING r.id INTO r_id").replace(
+            "{buckets}", _ADD_BUCKET
+        )
+    )
+    duration = "EXTRACT(EPOCH FROM j.end_time - j.started_at)::FLOAT"
+    op.execute(f"""
+    INSERT INTO job_duration_buckets (rollup_id, bucket, count)
+    SELECT r.id, s.bucket, s.count
+    FROM (
+        SELECT
+            (j.started_at AT TIME ZONE 'UTC')::DATE, w.user_id, w.catalog_id, ru.name,
+            {_BUCKET.format(duration=duration)},
+            count(*)
+        FROM jobs j
+        LEFT JOIN workflows w ON w.id = j.workflow_id
+        LEFT JOIN rules ru ON ru.id = j.rule_id
+        WHERE j.status = 'SUCCESS' AND j.end_time IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+    ) AS s (day, user_id, catalog_id, rule_name, bucket, count)
+    JOIN job_daily_rollups r
+        ON r.day = s.day
+        AND r.user_id IS NOT DISTINCT FROM s.user_id
+        AND r.catalog_id IS NOT DISTINCT FROM s.catalog_id
+        AND r.rule_name IS NOT DISTINCT FROM s.rule_name
+    """)
+
+
+def downgrade() -> None:
+    op.execute(_ADD_JOB_ROLLUP.replace("{returning}", "").replace("{buckets}", ""))
+    op.drop_table("job_duration_buckets")
@@ -0,0 +1,143 @@
+"""add per-workflow and per-rule job status counters kept by a trigger
+
+Revision ID: f2a3b4c5d6e7
+Revises: e1f2a3b4c5d6
+Create Date: 2026-10-19
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f2a3b4c5d6e7"
+down_revision: str | None = "e1f2a3b4c5d6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _count_columns() -> list[sa.Column]:
+    return [
+        sa.Column("success", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("running", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("error", sa.Integer(), server_default="0", nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "workflow_job_counts",
+        sa.Column("workflow_id", sa.Uuid(), nullable=False),
+        *_count_columns(),
+        sa.ForeignKeyConstraint(["workflow_id"], ["workflows.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("workflow_id"),
+    )
+    op.create_table(
+        "rule_job_counts",
+        sa.Column("rule_id", sa.Integer(), nullable=False),
+        sa.Column("workflow_id", sa.Uuid(), nullable=False),
+        *_count_columns(),
+        sa.ForeignKeyConstraint(["rule_id"], ["rules.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["workflow_id"], ["workflows.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("rule_id"),
+    )
+    op.create_index(
+        op.f("ix_rule_job_counts_workflow_id"), "rule_job_counts", ["workflow_id"]
+    )
+
+    op.execute("""
+    CREATE OR REPLACE FUNCTION add_job_count(
+        p_workflow_id UUID, p_rule_id INTEGER, p_status TEXT, delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        d_success INTEGER := CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END;
+        d_running INTEGER := CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END;
+        d_error INTEGER := CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END;
+    BEGIN
+        IF d_success = 0 AND d_running = 0 AND d_error = 0 THEN
+            RETURN;
+        END IF;
+
+        INSERT INTO workflow_job_counts AS c (workflow_id, success, running, error)
+        VALUES (p_workflow_id, d_success, d_running, d_error)
+        ON CONFLICT (workflow_id) DO UPDATE SET
+            success = c.success + EXCLUDED.success,
+            running = c.running + EXCLUDED.running,
+            error = c.error + EXCLUDED.error;
+
+        IF p_rule_id IS NOT NULL THEN
+            INSERT INTO rule_job_counts AS c (rule_id, workflow_id, success, running, error)
+            VALUES (p_rule_id, p_workflow_id, d_success, d_running, d_error)
+            ON CONFLICT (rule_id) DO UPDATE SET
+                success = c.success + EXCLUDED.success,
+                running = c.running + EXCLUDED.running,
+                error = c.error + EXCLUDED.error;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION count_job_status()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM add_job_count(OLD.workflow_id, OLD.rule_id, OLD.status::TEXT, -1);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM add_job_count(NEW.workflow_id, NEW.rule_id, NEW.status::TEXT, 1);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+    # Lock out job writes while the triggers are created and counts backfilled,
+    # so no change is counted twice or missed.
+    op.execute("LOCK TABLE jobs IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+    CREATE TRIGGER jobs_count_insert_delete_trigger
+        AFTER INSERT OR DELETE ON jobs
+        FOR EACH ROW EXECUTE FUNCTION count_job_status();
+
+    CREATE TRIGGER jobs_count_update_trigger
+        AFTER UPDATE OF status, rule_id, workflow_id ON jobs
+        FOR EACH ROW
+        WHEN (
+            OLD.status IS DISTINCT FROM NEW.status
+            OR OLD.rule_id IS DISTINCT FROM NEW.rule_id
+            OR OLD.workflow_id IS DISTINCT FROM NEW.workflow_id
+        )
+        EXECUTE FUNCTION count_job_status();
+    """)
+    op.execute("""
+    INSERT INTO workflow_job_counts (workflow_id, success, running, error)
+    SELECT workflow_id,
+           count(*) FILTER (WHERE status = 'SUCCESS'),
+           count(*) FILTER (WHERE status = 'RUNNING'),
+           count(*) FILTER (WHERE status = 'ERROR')
+    FROM jobs
+    WHERE status IN ('SUCCESS', 'RUNNING', 'ERROR')
+    GROUP BY workflow_id;
+
+    INSERT INTO rule_job_counts (rule_id, workflow_id, success, running, error)
+    SELECT rule_id, min(workflow_id::text)::uuid,
+           count(*) FILTER (WHERE status = 'SUCCESS'),
+           count(*) FILTER (WHERE status = 'RUNNING'),
+           count(*) FILTER (WHERE status = 'ERROR')
+    FROM jobs
+    WHERE rule_id IS NOT NULL AND status IN ('SUCCESS', 'RUNNING', 'ERROR')
+    GROUP BY rule_id;
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+    DROP TRIGGER IF EXISTS jobs_count_update_trigger ON jobs;
+    DROP TRIGGER IF EXISTS jobs_count_insert_delete_trigger ON jobs;
+    DROP FUNCTION IF EXISTS count_job_status();
+    DROP FUNCTION IF EXISTS add_job_count(UUID, INTEGER, TEXT, INTEGER);
+    """)
+    op.drop_index(op.f("ix_rule_job_counts_workflow_id"), table_name="rule_job_counts")
+    op.drop_table("rule_job_counts")
+    op.drop_table("workflow_job_counts")
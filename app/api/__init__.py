@@ -9,6 +9,7 @@ from app.api.endpoints import (
     mcp,
     outputs,
     reports,
+    search,
     settings,
     sse,
     summary,
@@ -30,5 +31,6 @@ api_router.include_router(files.router, prefix="/files", tags=["files"])
 api_router.include_router(reports.router, prefix="/reports", tags=["reports"])
 api_router.include_router(tokens.router, prefix="/tokens", tags=["tokens"])
 api_router.include_router(catalog.router, prefix="/catalog", tags=["catalog"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(settings.router, prefix="/settings", tags=["settings"])
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -1,3 +1,6 @@
+import hashlib
+from collections.abc import AsyncGenerator
+
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -11,6 +14,10 @@ from app.core.users import (
     get_user_manager,
 )
 from app.models.user import User
+from app.services.reports.backpressure import (
+    BACKLOG_RETRY_SECONDS,
+    ingest_backpressure,
+)
 from app.services.user_token import UserTokenService
 
 security = HTTPBearer(auto_error=False)
@@ -57,3 +64,51 @@ async def current_write_user_with_token(
 ) -> User:
     require_not_viewer(user)
     return user
+
+
+def ingest_client_key(
+    request: Request,
+    token: HTTPAuthorizationCredentials | None = Depends(security),
+) -> str:
+    """Rate limit bucket of a report request: a hash of the bearer token.
+
+    Requests without a token are keyed by client address.
+    """
+    if token is not None:
+        return hashlib.sha256(token.credentials.encode()).hexdigest()[:32]
+    return f"addr:{request.client.host if request.client else ''}"
+
+
+async def ingest_backpressure_guard(
+    key: str = Depends(ingest_client_key),
+    session: AsyncSession = Depends(get_async_session),
+) -> AsyncGenerator[None, None]:
+    """Rate limit report ingestion per API token, cap concurrent requests and
+    the projection backlog.
+
+    Runs before authentication so rejected requests cost no database work
+    (beyond the backlog count, taken at most once a second per process).
+    """
+    retry_after = ingest_backpressure.check_rate(key)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Report rate limit exceeded",
+            headers={"Retry-After": str(retry_after)},
+        )
+    if not await ingest_backpressure.check_backlog(session):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Report projection is behind",
+            headers={"Retry-After": str(BACKLOG_RETRY_SECONDS)},
+        )
+    if not ingest_backpressure.enter():
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Server is busy ingesting reports",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        yield
+    finally:
+        ingest_backpressure.exit()
@@ -25,6 +25,10 @@ from app.schemas.system_settings import (
     TestSmtpRequest,
 )
 from app.schemas.user import UserRead
+from app.services.system_settings import (
+    announce_system_settings_change,
+    system_settings_cache,
+)
 
 router = APIRouter()
 
@@ -112,8 +116,10 @@ async def get_system_settings(
         # Create default settings if not exist
         settings = SystemSettings()
         db.add(settings)
+        await announce_system_settings_change(db)
         await db.commit()
         await db.refresh(settings)
+        system_settings_cache.invalidate()
     return settings
 
 
@@ -132,8 +138,10 @@ async def update_system_settings(
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(settings, field, value)
 
+    await announce_system_settings_change(db)
     await db.commit()
     await db.refresh(settings)
+    system_settings_cache.invalidate()
     return settings
 
 
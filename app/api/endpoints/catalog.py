@@ -2,7 +2,9 @@
 REST API endpoints for Snakemake workflow catalog management.
 """
 
+import asyncio
 import os
+import shutil
 import tempfile
 import uuid
 from typing import Any
@@ -12,8 +14,10 @@ from fastapi import (
     BackgroundTasks,
     Depends,
     File,
+    Header,
     HTTPException,
     Query,
+    Request,
     UploadFile,
 )
 from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
@@ -35,9 +39,18 @@ from app.services.catalog.snake_template_storage import (
     read_template_file_async,
     template_overview_async,
 )
+from app.services.catalog.uploads import (
+    assemble_upload,
+    create_upload_session,
+    discard_upload,
+    load_upload_session,
+    upload_status,
+    write_upload_chunk,
+)
 from app.services.catalog.utils import (
     _detect_language,
     assert_catalog_readable,
+    assert_catalog_writable,
     catalog_data_dir,
 )
 from app.services.third_party.snakevision import (
@@ -317,6 +330,9 @@ async def list_catalog_workflows(
     descending: bool = Query(
         True, description="Order in descending order (newest first)"
     ),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (replaces offset)"
+    ),
 ):
     """List workflow runs linked to this catalog (same user scope as GET /workflows)."""
     read_user_id = _catalog_read_user_id(user)
@@ -329,6 +345,7 @@ async def list_catalog_workflows(
         descending=descending,
         readable_user=user,
         catalog_id=cat.id,
+        cursor=cursor,
     )
 
 
@@ -478,6 +495,12 @@ async def export_catalog(
     return await download_catalog(catalog_ref, format="tar.gz", user=user, svc=svc)
 
 
+def _spool_to_tempfile(src: Any, suffix: str) -> str:
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        shutil.copyfileobj(src, tmp, 1024 * 1024)
+        return tmp.name
+
+
 @router.post("/{catalog_ref}/sync")
 async def sync_catalog_zip(
     catalog_ref: str,
@@ -486,11 +509,8 @@ async def sync_catalog_zip(
     svc: CatalogService = Depends(get_catalog_svc),
 ):
     """Sync a catalog from a .zip archive provided by CLI."""
-    # Save uploaded file to a temporary location
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
+    # Stream the spooled upload to a temporary file (constant memory)
+    tmp_path = await asyncio.to_thread(_spool_to_tempfile, file.file, ".zip")
 
     try:
         return await svc.sync_catalog(catalog_ref, tmp_path, user)
@@ -499,6 +519,100 @@ async def sync_catalog_zip(
             os.remove(tmp_path)
 
 
+# --- Chunked (resumable) uploads ---
+
+
+class CatalogUploadCreateRequest(BaseModel):
+    # Existing catalog to sync into; ``None`` creates a new catalog on commit.
+    catalog_ref: str | None = None
+    format: str = "zip"  # "zip" (sync) or "tar.gz" (create)
+
+
+class CatalogUploadCommitRequest(BaseModel):
+    total_chunks: int
+    sha256: str | None = None  # Optional digest of the whole archive
+
+
+@router.post("/uploads", status_code=201)
+async def create_catalog_upload(
+    request: CatalogUploadCreateRequest,
+    user: User = Depends(current_write_user_with_token),
+    svc: CatalogService = Depends(get_catalog_svc),
+):
+    """Open a resumable upload session; chunks are then PUT one by one."""
+    if request.catalog_ref is not None:
+        cat = await svc._resolve_catalog_ref(request.catalog_ref, user.id)
+        assert_catalog_writable(cat, user.id)
+    return await asyncio.to_thread(
+        create_upload_session,
+        owner_id=user.id,
+        catalog_ref=request.catalog_ref,
+        archive_format=request.format,
+    )
+
+
+@router.get("/uploads/{upload_id}")
+async def get_catalog_upload(
+    upload_id: str,
+    user: User = Depends(current_write_user_with_token),
+):
+    """Session status including acknowledged chunks, used by clients to resume."""
+    meta = await asyncio.to_thread(load_upload_session, upload_id, user.id)
+    return await asyncio.to_thread(upload_status, meta)
+
+
+@router.put("/uploads/{upload_id}/chunks/{index}")
+async def put_catalog_upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    x_chunk_sha256: str = Header(...),
+    user: User = Depends(current_write_user_with_token),
+):
+    """Store one chunk; the body is streamed to disk and checked against its SHA-256."""
+    meta = await asyncio.to_thread(load_upload_session, upload_id, user.id)
+    return await write_upload_chunk(meta, index, request.stream(), x_chunk_sha256)
+
+
+@router.post("/uploads/{upload_id}/commit")
+async def commit_catalog_upload(
+    upload_id: str,
+    request: CatalogUploadCommitRequest,
+    user: User = Depends(current_write_user_with_token),
+    svc: CatalogService = Depends(get_catalog_svc),
+):
+    """Assemble the chunks and import them like a one-shot upload."""
+    meta = await asyncio.to_thread(load_upload_session, upload_id, user.id)
+    archive_path = await asyncio.to_thread(
+        assemble_upload, meta, request.total_chunks, request.sha256
+    )
+    try:
+        if meta["catalog_ref"] is None:
+            result = await svc.import_archive_path(
+                archive_path,
+                owner=user.email or str(user.id),
+                owner_id=user.id,
+            )
+        else:
+            result = await svc.sync_catalog(
+                meta["catalog_ref"], str(archive_path), user
+            )
+    finally:
+        await asyncio.to_thread(discard_upload, upload_id)
+    return result
+
+
+@router.delete("/uploads/{upload_id}", status_code=204)
+async def abort_catalog_upload(
+    upload_id: str,
+    user: User = Depends(current_write_user_with_token),
+):
+    """Abandon an upload session and delete its chunks."""
+    await asyncio.to_thread(load_upload_session, upload_id, user.id)
+    await asyncio.to_thread(discard_upload, upload_id)
+    return Response(status_code=204)
+
+
 # --- DAG preview ---
 
 
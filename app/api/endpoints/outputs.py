@@ -21,7 +21,7 @@ async def get_job_outputs(
 ):
     # Verify workflow ownership
     service = WorkflowService(db)
-    wf = await service.get_workflow(workflow_id)
+    wf = await service.get_workflow(workflow_id, restore=True, user=user)
     assert_workflow_readable(wf, user)
 
     return await service.get_rule_outputs(workflow_id=workflow_id, rule_name=rule_name)
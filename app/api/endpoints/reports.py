@@ -1,13 +1,38 @@
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncGenerator
 from typing import Any
 
-from fastapi import APIRouter, Depends
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.requests import ClientDisconnect
 
-from app.api.deps import current_active_user_with_token
-from app.core.session import get_db
+from app.api.deps import (
+    current_active_user_with_token,
+    ingest_backpressure_guard,
+    ingest_client_key,
+)
+from app.core.config import settings
+from app.core.session import get_async_session
+from app.core.users import current_superuser
 from app.models import User
-from app.services.reports import finalize_workflow, ingest_report_event
+from app.services.reports import (
+    backlog,
+    claim_event_key,
+    commit_projected,
+    enqueue_report_event,
+    event_projector,
+    finalize_workflow,
+    ingest_backpressure,
+    ingest_report_event,
+    rebuild_projections,
+    remember_event_response,
+    repeat_report_event,
+)
 
 router = APIRouter()
 
@@ -16,34 +41,262 @@ class ReportPayload(BaseModel):
     event: str
     record: dict[str, Any]
     context: dict[str, Any]
+    # Client id of the event: the plugin run plus a per-run counter. Repeated
+    # deliveries of the same id are answered without recording the event again.
+    stream_id: uuid.UUID | None = None
+    seq: int | None = None
 
 
-@router.post("/")
+async def _handle_report(
+    db: AsyncSession,
+    user: User,
+    *,
+    event: str,
+    record: dict[str, Any],
+    context: dict[str, Any],
+    stream_id: uuid.UUID | None,
+    seq: int | None,
+) -> dict[str, Any]:
+    """Record (and in inline mode project) one event; returns the context to answer.
+
+    The caller commits.
+    """
+    sent = dict(context)
+    # Ensure current user info is in context
+    context["flowo_user"] = user.email
+    context["flowo_user_id"] = user.id
+
+    event_key = None
+    if stream_id is not None and seq is not None:
+        event_key, is_new = await claim_event_key(
+            db, stream_id=stream_id, seq=seq, user_id=user.id
+        )
+        if not is_new:
+            return await repeat_report_event(
+                db, event_key, record=record, context=context
+            )
+
+    if settings.REPORTS_INGEST_MODE == "queued":
+        # Acknowledge once the raw event is durable; projection happens in the
+        # background, in sequence_no order per workflow.
+        await enqueue_report_event(
+            db,
+            event_name=event,
+            record=record,
+            context=context,
+            user_id=user.id,
+            event_key=event_key,
+        )
+    else:
+        await ingest_report_event(
+            db,
+            event_name=event,
+            record=record,
+            context=context,
+            user_id=user.id,
+            event_key=event_key,
+        )
+    if event_key is not None:
+        remember_event_response(event_key, sent, context)
+    return context
+
+
+@router.post("/", dependencies=[Depends(ingest_backpressure_guard)])
 async def report_event(
     payload: ReportPayload,
     user: User = Depends(current_active_user_with_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
 ):
-    # Ensure current user info is in context
-    payload.context["flowo_user"] = user.email
-    payload.context["flowo_user_id"] = user.id
-
-    ingest_report_event(
+    context = await _handle_report(
         db,
-        event_name=payload.event,
+        user,
+        event=payload.event,
         record=payload.record,
         context=payload.context,
-        user_id=user.id,
+        stream_id=payload.stream_id,
+        seq=payload.seq,
     )
-    db.commit()
+    await commit_projected(db)
+    if settings.REPORTS_INGEST_MODE == "queued":
+        event_projector.notify()
+
+    return {"context": context}
+
+
+class StreamedEvent(BaseModel):
+    event: str
+    record: dict[str, Any]
+    seq: int | None = None
+    # Context keys changed since the previous line; the whole context on the first
+    context: dict[str, Any] | None = None
+
+
+class _NDJSONResponse(StreamingResponse):
+    """Streams acknowledgements while the request body is still being read.
+
+    ``StreamingResponse`` reads ``receive`` to watch for a disconnect (ASGI < 2.4),
+    which would swallow body chunks here; the body reader sees the disconnect instead.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
 
-    return {"context": payload.context}
+async def _read_lines(request: Request, lines: asyncio.Queue) -> None:
+    buffer = b""
+    try:
+        async for chunk in request.stream():
+            buffer += chunk
+            *complete, buffer = buffer.split(b"\n")
+            for line in complete:
+                if line.strip():
+                    await lines.put(line)
+        if buffer.strip():
+            await lines.put(buffer)
+    except ClientDisconnect:
+        pass
+    await lines.put(None)
+
+
+async def _acknowledge(
+    db: AsyncSession,
+    user: User,
+    stream_id: uuid.UUID | None,
+    client_key: str,
+    lines: asyncio.Queue,
+    reader: asyncio.Task,
+) -> AsyncGenerator[str, None]:
+    context: dict[str, Any] = {}
+    ended = False
+    try:
+        while not ended:
+            line = await lines.get()
+            if line is None:
+                break
+            # Whatever arrived while the previous batch was committing goes together.
+            batch = [line]
+            while len(batch) < settings.REPORTS_STREAM_BATCH_SIZE:
+                try:
+                    line = lines.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if line is None:
+                    ended = True
+                    break
+                batch.append(line)
+
+            seqs: list[int | None] = []
+            errors: list[dict[str, Any]] = []
+            await ingest_backpressure.acquire(client_key, cost=len(batch), db=db)
+            try:
+                for raw in batch:
+                    try:
+                        item = StreamedEvent.model_validate_json(raw)
+                    except ValidationError as e:
+                        errors.append({"seq": None, "detail": str(e)[:500]})
+                        continue
+                    if item.context:
+                        context.update(item.context)
+                    seqs.append(item.seq)
+                    try:
+                        context.update(
+                            await _handle_report(
+                                db,
+                                user,
+                                event=item.event,
+                                record=item.record,
+                                context=context,
+                                stream_id=stream_id,
+                                seq=item.seq,
+                            )
+                        )
+                    except HTTPException as e:
+                        errors.append({"seq": item.seq, "detail": e.detail})
+                    except Exception as e:
+                        # Projection failed; the raw event is stored as ``failed``.
+                        errors.append(
+                            {"seq": item.seq, "detail": f"{type(e).__name__}: {e}"}
+                        )
+                await commit_projected(db)
+            finally:
+                ingest_backpressure.exit()
+            if settings.REPORTS_INGEST_MODE == "queued":
+                event_projector.notify()
+            ack = {"seqs": seqs, "context": context, "errors": errors}
+            yield json.dumps(jsonable_encoder(ack)) + "\n"
+    finally:
+        reader.cancel()
+
+
+@router.post("/stream")
+async def report_event_stream(
+    request: Request,
+    stream_id: uuid.UUID | None = None,
+    client_key: str = Depends(ingest_client_key),
+    user: User = Depends(current_active_user_with_token),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Ingest newline-delimited events from one long-lived request.
+
+    Authentication and dependencies run once per stream rather than once per event.
+    Each body line is a ``StreamedEvent``; the server keeps the run context between
+    lines, so a line only carries the context keys the plugin changed. Lines are
+    projected in batches of up to ``REPORTS_STREAM_BATCH_SIZE`` (whatever arrived
+    while the previous batch was committing), and each batch is answered with one
+    line: ``{"seqs": [...], "context": {...}, "errors": [...]}``.
+    """
+    lines: asyncio.Queue[bytes | None] = asyncio.Queue(
+        maxsize=settings.REPORTS_STREAM_BATCH_SIZE
+    )
+    reader = asyncio.create_task(_read_lines(request, lines))
+    return _NDJSONResponse(_acknowledge(db, user, stream_id, client_key, lines, reader))
+
+
+@router.get("/metrics")
+async def report_metrics(
+    _admin: User = Depends(current_superuser),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Projection lag, worker counters and requests rejected by backpressure."""
+    return {
+        "mode": settings.REPORTS_INGEST_MODE,
+        **await backlog(db),
+        **event_projector.stats(),
+        "ingest": ingest_backpressure.stats(),
+    }
+
+
+class RebuildRequest(BaseModel):
+    # Rebuilding every workflow outlasts any request: use ``manage events-rebuild``
+    workflow_ids: list[uuid.UUID] = Field(min_length=1)
+    failed_only: bool = False
+    parallelism: int = 4
+
+
+@router.post("/rebuild")
+async def rebuild_reports(
+    payload: RebuildRequest,
+    _admin: User = Depends(current_superuser),
+    db: AsyncSession = Depends(get_async_session),
+):
+    """Re-project workflows from the event log, or retry only their failed events."""
+    # Each workflow gets its own session on the same engine, so they run in parallel.
+    return await rebuild_projections(
+        payload.workflow_ids,
+        failed_only=payload.failed_only,
+        parallelism=payload.parallelism,
+        session_factory=async_sessionmaker(
+            db.bind, autoflush=False, expire_on_commit=False
+        ),
+    )
 
 
 @router.post("/close")
 async def close_workflow(
     workflow_id: str,
     user: User = Depends(current_active_user_with_token),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_session),
 ):
-    return finalize_workflow(db, workflow_id, user)
+    return await finalize_workflow(db, workflow_id, user)
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import current_active_user_with_token
+from app.core.session import get_async_session
+from app.models import User
+from app.schemas import SearchResponse
+from app.services.search import SearchService
+
+router = APIRouter()
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, description="Text to look for"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum hits per kind"),
+    db: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_active_user_with_token),
+):
+    """Runs by name and catalogs by name or description, best matches first."""
+    return await SearchService(db).search(q, user, limit=limit)
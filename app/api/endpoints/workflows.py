@@ -5,7 +5,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import current_active_user_with_token
+from app.api.deps import current_active_user_with_token, current_write_user
 from app.core.permissions import assert_workflow_readable, assert_workflow_writable
 from app.core.session import get_async_session
 from app.core.users import current_active_user
@@ -15,6 +15,7 @@ from app.schemas import (
     Message,
     RuleListResponse,
     RuleStatusResponse,
+    WorkflowBulkDeleteResponse,
     WorkflowDetialResponse,
     WorkflowListResponse,
 )
@@ -53,6 +54,9 @@ async def get_workflows(
         None,
         description="Upper bound on started_at (inclusive) when filtering by start time range; use with start_at.",
     ),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (replaces offset)"
+    ),
 ):
     return await WorkflowService(db).list_all_workflows(
         limit=limit,
@@ -66,6 +70,30 @@ async def get_workflows(
         name=name,
         start_at=start_at,
         end_at=end_at,
+        cursor=cursor,
+    )
+
+
+@router.delete("/", response_model=WorkflowBulkDeleteResponse)
+async def delete_workflows(
+    db: AsyncSession = Depends(get_async_session),
+    user: User = Depends(current_write_user),
+    older_than_days: int | None = Query(
+        None, ge=0, description="Only runs started more than this many days ago"
+    ),
+    status: Status | None = Query(None, description="Only runs with this status"),
+    tags: str | None = Query(
+        None, description="Only runs with all these tags (comma-separated)"
+    ),
+):
+    """Delete the runs you can see that match every filter given, in batches."""
+    if older_than_days is None and status is None and not (tags or "").strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Give at least one filter: older_than_days, status or tags",
+        )
+    return await WorkflowService(db).delete_workflows(
+        user, older_than_days=older_than_days, status=status, tags=tags
     )
 
 
@@ -84,9 +112,12 @@ async def get_jobs(
     user: User = Depends(current_active_user),
     rule_name: str | None = Query(None, description="Filter jobs by rule_name"),
     status: Status | None = Query(None, description="Filter jobs by status"),
+    cursor: str | None = Query(
+        None, description="next_cursor of the previous page (replaces offset)"
+    ),
 ):
     service = WorkflowService(db)
-    wf = await service.get_workflow(workflow_id)
+    wf = await service.get_workflow(workflow_id, restore=True, user=user)
     assert_workflow_readable(wf, user)
 
     return await JobService(db).get_jobs_by_workflow_id(
@@ -97,6 +128,7 @@ async def get_jobs(
         descending=descending,
         rule_name=rule_name,
         status=status,
+        cursor=cursor,
     )
 
 
@@ -131,7 +163,7 @@ async def get_rule_status(
     user: User = Depends(current_active_user),
 ):
     service = WorkflowService(db)
-    wf = await service.get_workflow(workflow_id)
+    wf = await service.get_workflow(workflow_id, restore=True, user=user)
     assert_workflow_readable(wf, user)
     return await service.get_rule_status(workflow_id=workflow_id)
 
@@ -143,7 +175,7 @@ async def get_rules(
     user: User = Depends(current_active_user),
 ):
     service = WorkflowService(db)
-    wf = await service.get_workflow(workflow_id)
+    wf = await service.get_workflow(workflow_id, restore=True, user=user)
     assert_workflow_readable(wf, user)
     rules = await service.get_rules(workflow_id=workflow_id)
     return RuleListResponse(rules=rules)
@@ -218,7 +250,7 @@ async def get_timelines(
     user: User = Depends(current_active_user),
 ):
     service = WorkflowService(db)
-    wf = await service.get_workflow(workflow_id)
+    wf = await service.get_workflow(workflow_id, restore=True, user=user)
     assert_workflow_readable(wf, user)
     return await service.get_timelines_with_id(workflow_id=workflow_id)
 
@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Literal
 
 from pydantic import model_validator
 from pydantic_settings import BaseSettings
@@ -25,6 +26,9 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5432
     SQL_ECHO: bool = False
+    # Async connection pool of this process (the ingest service sets its own)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
 
     PORT: int = 3100
     DOMAIN: str = "localhost"
@@ -57,6 +61,65 @@ class Settings(BaseSettings):
     )
     CATALOG_BLOB_MAX_BYTES: int = 250 * 1024 * 1024
     CATALOG_IMPORT_MAX_BYTES: int = 1024 * 1024 * 1024
+    # Chunked (resumable) catalog uploads
+    CATALOG_UPLOAD_DIR: str | None = (
+        None  # Defaults to CONTAINER_MOUNT_PATH/.flowo_catalog_uploads
+    )
+    CATALOG_UPLOAD_CHUNK_BYTES: int = 8 * 1024 * 1024  # Suggested to clients
+    CATALOG_UPLOAD_CHUNK_MAX_BYTES: int = 64 * 1024 * 1024
+    CATALOG_UPLOAD_TTL_SECONDS: int = 24 * 60 * 60
+    # Report ingestion: "inline" projects before answering the plugin,
+    # "queued" only records the raw event and background workers project it
+    REPORTS_INGEST_MODE: Literal["inline", "queued"] = "inline"
+    REPORTS_PROJECTOR_WORKERS: int = 4
+    REPORTS_PROJECTOR_BATCH_SIZE: int = 200
+    REPORTS_PROJECTOR_POLL_SECONDS: float = 1.0
+    # Per-workflow lookup cache used while projecting (workflows kept, entry TTL)
+    REPORTS_STATE_CACHE_SIZE: int = 1024
+    REPORTS_STATE_CACHE_TTL_SECONDS: int = 60 * 60
+    # Ingest backpressure (0 disables): per-token token bucket, concurrent requests
+    REPORTS_RATE_LIMIT_PER_SECOND: float = 50.0
+    REPORTS_RATE_LIMIT_BURST: int = 200
+    REPORTS_MAX_IN_FLIGHT: int = 32
+    # Queued mode: events waiting for projection before report requests get 429
+    REPORTS_MAX_BACKLOG: int = 100_000
+    # Max events of a /reports/stream request projected and acknowledged together
+    REPORTS_STREAM_BATCH_SIZE: int = 200
+    # /reports is served by the separate ingest process (app/ingest.py), which
+    # also runs the projector; the main app then leaves projecting to it
+    INGEST_SERVICE: bool = False
+    # workflow_events monthly partitions; retention unset keeps events forever
+    WORKFLOW_EVENTS_PARTITION_MONTHS_AHEAD: int = 2
+    WORKFLOW_EVENTS_PARTITION_CHECK_SECONDS: int = 6 * 60 * 60
+    WORKFLOW_EVENTS_RETENTION_MONTHS: int | None = None
+    WORKFLOW_EVENTS_RETENTION_MODE: Literal["drop", "detach"] = "drop"
+    # Job ids per partition of jobs/files, once partitioned (app.manage
+    # jobs-partitions --convert); partitions kept ready past the current one
+    JOBS_PARTITION_SIZE: int = 5_000_000
+    JOBS_PARTITIONS_AHEAD: int = 2
+    # Cold archive of runs that ended this many days ago (unset: never), checked
+    # with the partitions; runs archived per check; rows per compressed part
+    RUNS_ARCHIVE_AFTER_DAYS: int | None = None
+    RUNS_ARCHIVE_BATCH_SIZE: int = 1000
+    RUNS_ARCHIVE_PART_ROWS: int = 5000
+    # Dashboard rollup deltas folded in (app.services.job_rollups): how often, and
+    # deltas per transaction
+    JOB_ROLLUPS_FOLD_SECONDS: float = 5.0
+    JOB_ROLLUPS_FOLD_BATCH_SIZE: int = 50_000
+    # Runs, or jobs with their files, deleted per transaction (app.services.deletion)
+    DELETE_BATCH_SIZE: int = 5000
+    # List totals: planner estimate from this many rows on (0: always exact),
+    # smaller exact counts cached per filter set
+    LIST_COUNT_ESTIMATE_THRESHOLD: int = 10_000
+    LIST_COUNT_CACHE_TTL_SECONDS: float = 10.0
+    # Safety net for the cached system_settings row (changes also invalidate it)
+    SYSTEM_SETTINGS_CACHE_TTL_SECONDS: int = 5 * 60
+    # Workflow email outbox: one worker, shared SMTP connection, digests on bursts
+    NOTIFICATIONS_POLL_SECONDS: float = 5.0
+    NOTIFICATIONS_BATCH_SIZE: int = 100
+    NOTIFICATIONS_RATE_PER_MINUTE: int = 30
+    NOTIFICATIONS_DIGEST_MIN: int = 3
+    NOTIFICATIONS_MAX_ATTEMPTS: int = 5
     # DAG tooling runtime
     DAG_VENV_DIR: str | None = None  # Defaults to CONTAINER_MOUNT_PATH/.flowo_dag_venv
     DAG_AUTO_INSTALL_IMPORTS: bool = False  # Install missing imports into DAG venv
@@ -78,6 +141,10 @@ class Settings(BaseSettings):
             self.CATALOG_BLOB_DIR = str(
                 Path(self.CONTAINER_MOUNT_PATH) / ".flowo_catalog_blobs"
             )
+        if self.CATALOG_UPLOAD_DIR is None:
+            self.CATALOG_UPLOAD_DIR = str(
+                Path(self.CONTAINER_MOUNT_PATH) / ".flowo_catalog_uploads"
+            )
         if self.DAG_VENV_DIR is None:
             self.DAG_VENV_DIR = str(Path(self.CONTAINER_MOUNT_PATH) / ".flowo_dag_venv")
         if self.SNAKEMAKE_WORKFLOW_TEMPLATE_DIR is None:
@@ -1,7 +1,7 @@
 import asyncio
 import json
 from collections import defaultdict
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Callable
 
 import asyncpg
 from fastapi import Request
@@ -20,6 +20,8 @@ class PGListener:
 
         self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
         self._listening_channels: set[str] = set()
+        # In-process consumers (cache invalidation), kept across reconnects
+        self._callbacks: dict[str, list[Callable]] = defaultdict(list)
 
         self._reconnect_count = 0
         self._dropped_notifications_total = 0
@@ -60,6 +62,18 @@ class PGListener:
                 self._connection = None
                 self._listening_channels.clear()
 
+    async def add_callback(self, channel: str, callback: Callable) -> None:
+        """Call ``callback(conn, pid, channel, payload)`` on every NOTIFY on ``channel``.
+
+        Unlike SSE subscriptions this stays registered for the process lifetime. After
+        a reconnect the callback is also called once with ``pid=None``, because
+        notifications sent while the connection was down are lost.
+        """
+        async with self._lock:
+            self._callbacks[channel].append(callback)
+            if self._connection and not self._connection.is_closed():
+                await self._connection.add_listener(channel, callback)
+
     async def _reconnect_unlocked(self) -> None:
         """Replace dead connection and re-LISTEN all channels that still have subscribers."""
         if self._connection and not self._connection.is_closed():
@@ -86,6 +100,11 @@ class PGListener:
                         continue
                     await self._connection.add_listener(channel, self._on_notification)
                     self._listening_channels.add(channel)
+                for channel, callbacks in self._callbacks.items():
+                    for callback in callbacks:
+                        await self._connection.add_listener(channel, callback)
+                        # Notifications may have been missed while disconnected.
+                        callback(self._connection, None, channel, None)
                 return
             except Exception as e:
                 last_err = e
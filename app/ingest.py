@@ -0,0 +1,53 @@
+"""Report ingestion as its own process: ``fastapi run app/ingest.py --port 8001``.
+
+Serves only ``/api/v1/reports`` and, in ``queued`` mode, runs the event projector.
+It shares the code and the database with ``app.main`` but has its own connection
+pool (``DB_POOL_SIZE``) and can run at a lower priority or on another host. Heavy
+ingest then does not slow down the dashboard, SSE or MCP requests. Caddy routes
+``/api/v1/reports`` here when ``INGEST_SERVICE`` is enabled (see ``supervisord.conf``).
+"""
+
+import logging
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI
+
+from .api.endpoints import reports
+from .core.config import settings
+from .core.pg_listener import pg_listener
+from .services.reports import event_projector
+from .services.system_settings import SYSTEM_SETTINGS_CHANNEL, system_settings_cache
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Workflow notifications are queued while ingesting and read the settings cache.
+    await pg_listener.connect()
+    await pg_listener.add_callback(
+        SYSTEM_SETTINGS_CHANNEL, system_settings_cache.on_notification
+    )
+    if settings.REPORTS_INGEST_MODE == "queued":
+        await event_projector.start(settings.REPORTS_PROJECTOR_WORKERS)
+    yield
+    await event_projector.stop()
+    await pg_listener.disconnect()
+
+
+app = FastAPI(
+    title=f"{settings.PROJECT_NAME} ingest",
+    openapi_url=f"{settings.API_V1_STR}/reports/openapi.json",
+    docs_url=None,
+    redoc_url=None,
+    lifespan=lifespan,
+)
+
+app.include_router(
+    reports.router, prefix=f"{settings.API_V1_STR}/reports", tags=["reports"]
+)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="0.0.0.0", port=8001, log_level="info")
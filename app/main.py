@@ -17,6 +17,11 @@ from .services.catalog.snake_template import (
 from .services.catalog.snake_template_storage import (
     seed_snake_template_from_disk_if_empty,
 )
+from .services.job_rollups import job_rollup_fold_loop
+from .services.notification_outbox import notification_outbox_worker
+from .services.reports import event_projector
+from .services.reports.partitions import partition_maintenance_loop
+from .services.system_settings import SYSTEM_SETTINGS_CHANNEL, system_settings_cache
 
 # 配置日志 - 放在所有导入之前
 # 在所有导入之后，配置日志
@@ -30,7 +35,19 @@ async def lifespan(app: FastAPI):
         await seed_snake_template_from_disk_if_empty(session)
         await session.commit()
     await pg_listener.connect()
+    await pg_listener.add_callback(
+        SYSTEM_SETTINGS_CHANNEL, system_settings_cache.on_notification
+    )
+    partitions_task = asyncio.create_task(partition_maintenance_loop())
+    rollups_task = asyncio.create_task(job_rollup_fold_loop())
+    await notification_outbox_worker.start()
+    if settings.REPORTS_INGEST_MODE == "queued" and not settings.INGEST_SERVICE:
+        await event_projector.start(settings.REPORTS_PROJECTOR_WORKERS)
     yield
+    await event_projector.stop()
+    await notification_outbox_worker.stop()
+    partitions_task.cancel()
+    rollups_task.cancel()
     await pg_listener.disconnect()
 
 
@@ -1,20 +1,31 @@
 import argparse
 import asyncio
 import os
+import uuid
+from datetime import UTC, datetime
 from pathlib import Path
 
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 
-from app.core.session import AsyncSessionLocal, get_async_session
+from app.core.config import settings
+from app.core.session import AsyncSessionLocal, async_engine, get_async_session
 from app.core.users import UserManager, get_user_db
 from app.models.catalog import Catalog
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
+from app.services.archive import archive_finished_runs, restore_workflow
 from app.services.catalog.backfill import (
     backfill_catalogs_from_disk_root,
     backfill_snake_template_from_path,
 )
+from app.services.job_partitions import (
+    convert_to_partitioned,
+    drop_history_before,
+    ensure_job_partitions,
+)
+from app.services.reports import rebuild_projections
+from app.services.reports.partitions import maintain_partitions
 
 
 async def reset_password(email: str, new_password: str):
@@ -50,6 +61,55 @@ async def template_backfill(root: str, *, force: bool) -> None:
         print(summary)
 
 
+async def events_rebuild(
+    workflow_ids: list[str] | None, *, failed_only: bool, parallelism: int
+) -> None:
+    ids = [uuid.UUID(w) for w in workflow_ids] if workflow_ids else None
+    summary = await rebuild_projections(
+        ids, failed_only=failed_only, parallelism=parallelism
+    )
+    print(summary)
+
+
+async def events_partitions() -> None:
+    print(await maintain_partitions())
+
+
+async def jobs_partitions(*, convert: bool, drop_before: str | None) -> None:
+    if convert:
+        first_id = await convert_to_partitioned(async_engine)
+        print(f"jobs and files are partitioned; new partitions start at id {first_id}")
+    async with AsyncSessionLocal() as session:
+        print({"created": await ensure_job_partitions(session)})
+        if drop_before:
+            cutoff = datetime.fromisoformat(drop_before)
+            if cutoff.tzinfo is None:
+                cutoff = cutoff.replace(tzinfo=UTC)
+            print(await drop_history_before(session, cutoff))
+        await session.commit()
+
+
+async def runs_archive(older_than_days: int | None, restore: list[str]) -> None:
+    async with AsyncSessionLocal() as session:
+        if restore:
+            for workflow_id in restore:
+                restored = await restore_workflow(session, uuid.UUID(workflow_id))
+                await session.commit()
+                print(f"{workflow_id}: {'restored' if restored else 'not archived'}")
+            return
+        if older_than_days is None and settings.RUNS_ARCHIVE_AFTER_DAYS is None:
+            print("Set --older-than-days or RUNS_ARCHIVE_AFTER_DAYS")
+            return
+        total = {"workflows": 0, "bytes": 0}
+        # Batch after batch until no run is left to archive
+        while True:
+            summary = await archive_finished_runs(session, older_than_days)
+            total = {key: total[key] + summary[key] for key in total}
+            if summary["workflows"] < settings.RUNS_ARCHIVE_BATCH_SIZE:
+                break
+        print(total)
+
+
 async def create_admin(email: str, password: str, *, quiet: bool = False):
     async for session in get_async_session():
         async for user_db in get_user_db(session):
@@ -227,6 +287,70 @@ def main():
         help="Replace existing template rows in the database",
     )
 
+    rb = subparsers.add_parser(
+        "events-rebuild",
+        help="Re-project workflows, jobs, files, rules and errors from workflow_events",
+    )
+    rb.add_argument(
+        "--workflow-id",
+        action="append",
+        dest="workflow_ids",
+        help="Workflow to rebuild (repeatable); default: every workflow in the log",
+    )
+    rb.add_argument(
+        "--failed-only",
+        action="store_true",
+        help="Only retry events whose projection failed; keep everything else",
+    )
+    rb.add_argument(
+        "--parallelism",
+        type=int,
+        default=4,
+        help="Workflows rebuilt concurrently",
+    )
+
+    subparsers.add_parser(
+        "events-partitions",
+        help=(
+            "Create upcoming monthly workflow_events partitions and apply "
+            "WORKFLOW_EVENTS_RETENTION_MONTHS"
+        ),
+    )
+
+    jp = subparsers.add_parser(
+        "jobs-partitions",
+        help="Partition jobs and files by job id, create upcoming partitions",
+    )
+    jp.add_argument(
+        "--convert",
+        action="store_true",
+        help="Convert the existing jobs and files tables (online, once)",
+    )
+    jp.add_argument(
+        "--drop-before",
+        metavar="DATE",
+        help="Delete runs started before DATE (ISO), dropping whole partitions",
+    )
+
+    ra = subparsers.add_parser(
+        "runs-archive",
+        help="Move finished runs to the cold archive, or restore archived runs",
+    )
+    ra.add_argument(
+        "--older-than-days",
+        type=int,
+        default=None,
+        help="Archive runs that ended this many days ago (default: "
+        "RUNS_ARCHIVE_AFTER_DAYS)",
+    )
+    ra.add_argument(
+        "--restore",
+        nargs="*",
+        default=[],
+        metavar="WORKFLOW_ID",
+        help="Restore these archived runs instead",
+    )
+
     args = parser.parse_args()
 
     if args.command == "reset-password":
@@ -243,6 +367,20 @@ def main():
         asyncio.run(catalog_backfill(args.root))
     elif args.command == "template-backfill":
         asyncio.run(template_backfill(args.root, force=args.force))
+    elif args.command == "events-rebuild":
+        asyncio.run(
+            events_rebuild(
+                args.workflow_ids,
+                failed_only=args.failed_only,
+                parallelism=args.parallelism,
+            )
+        )
+    elif args.command == "events-partitions":
+        asyncio.run(events_partitions())
+    elif args.command == "jobs-partitions":
+        asyncio.run(jobs_partitions(convert=args.convert, drop_before=args.drop_before))
+    elif args.command == "runs-archive":
+        asyncio.run(runs_archive(args.older_than_days, args.restore))
     else:
         parser.print_help()
 
@@ -6,6 +6,9 @@ from .error import Error
 from .file import File
 from .invitation import Invitation
 from .job import Job
+from .job_counts import RuleJobCounts, WorkflowJobCounts
+from .job_rollups import JobDailyRollup, JobDurationBucket, JobRollupDelta
+from .notification_outbox import NotificationOutbox
 from .rule import Rule
 from .snake_template import SnakeTemplateFile, SnakeTemplateState
 from .system_settings import SystemSettings
@@ -13,15 +16,24 @@ from .user import User
 from .user_settings import UserSettings
 from .user_token import UserToken
 from .workflow import Workflow
-from .workflow_event import WorkflowEvent
+from .workflow_archive import WorkflowArchive, WorkflowArchivePart
+from .workflow_event import WorkflowEvent, WorkflowEventKey
 
 __all__ = [
     "Status",
     "FileType",
     "Workflow",
+    "WorkflowArchive",
+    "WorkflowArchivePart",
     "WorkflowEvent",
+    "WorkflowEventKey",
     "Rule",
     "Job",
+    "WorkflowJobCounts",
+    "RuleJobCounts",
+    "JobDailyRollup",
+    "JobDurationBucket",
+    "JobRollupDelta",
     "File",
     "Error",
     "User",
@@ -34,4 +46,5 @@ __all__ = [
     "SnakeTemplateState",
     "SystemSettings",
     "Invitation",
+    "NotificationOutbox",
 ]
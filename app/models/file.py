@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -12,6 +12,7 @@ if TYPE_CHECKING:
 
 class File(Base):
     __tablename__ = "files"
+    __table_args__ = (Index("ix_files_job_id_file_type", "job_id", "file_type"),)
     id: Mapped[int] = mapped_column(primary_key=True)
     path: Mapped[str]  # TODO: use pathlib.Path/os.pathlike type here eventually
     file_type: Mapped[FileType] = mapped_column(Enum(FileType))
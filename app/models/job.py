@@ -2,8 +2,18 @@ import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, Enum, ForeignKey
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    case,
+    literal_column,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql.elements import Grouping
 
 from .base import Base
 from .enums import Status
@@ -35,10 +45,28 @@ class Job(Base):
         status (Status): Current job status (default: "UNKNOWN").
         started_at (datetime): Timestamp when the job started, defaults to UTC now.
         end_time (datetime, optional): Timestamp when the job completed.
+        error_excerpt (dict[str, Any], optional): Error-looking lines of the job's logs
+            and Snakemake's error block, captured when the job failed.
+        rollup_id (int, optional): The ``job_daily_rollups`` row counting the job, set
+            by a trigger when the job is written.
         files (list[File]): List of files associated with this job.
     """
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Progress counts and job lists of one run, optionally by status
+        Index("ix_jobs_workflow_id_status", "workflow_id", "status"),
+        # The projector resolves Snakemake job ids within a run
+        Index("ix_jobs_workflow_id_snakemake_id", "workflow_id", "snakemake_id"),
+        Index("ix_jobs_rule_id", "rule_id"),
+        # Failure pages and MCP diagnosis list the failed jobs of one run
+        Index(
+            "ix_jobs_failed",
+            "workflow_id",
+            "started_at",
+            postgresql_where=text("status = 'ERROR'"),
+        ),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     snakemake_id: Mapped[int]
     workflow_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("workflows.id"))
@@ -56,6 +84,8 @@ class Job(Base):
     )
     end_time: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     group_id: Mapped[int | None]
+    error_excerpt: Mapped[dict[str, Any] | None]
+    rollup_id: Mapped[int | None] = mapped_column(BigInteger)
 
     workflow: Mapped["Workflow"] = relationship("Workflow")
     rule: Mapped["Rule"] = relationship("Rule", back_populates="jobs")
@@ -63,3 +93,29 @@ class Job(Base):
     files: Mapped[list["File"]] = relationship(
         "File", cascade="all, delete-orphan", back_populates="job"
     )
+
+
+def status_rank(status):
+    """Sort key of job lists, highest first: failed, running, done, unknown, waiting.
+
+    Rendered with literals only, so queries match the expression index below.
+    """
+    ranks = [("ERROR", 5), ("RUNNING", 4), ("SUCCESS", 3), ("UNKNOWN", 2)]
+    return case(
+        *[
+            (status == literal_column(f"'{name}'"), literal_column(str(rank)))
+            for name, rank in ranks
+        ],
+        else_=literal_column("1"),
+    )
+
+
+# Keyset pagination of a run's jobs: ORDER BY rank, started_at, id (all DESC)
+Index(
+    "ix_jobs_workflow_id_status_rank",
+    Job.workflow_id,
+    # Index expressions must be parenthesized
+    Grouping(status_rank(Job.status)),
+    Job.started_at,
+    Job.id,
+)
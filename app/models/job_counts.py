@@ -0,0 +1,146 @@
+import uuid
+
+from sqlalchemy import DDL, ForeignKey, event, select
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+from .job import Job
+
+
+class WorkflowJobCounts(Base):
+    """Number of jobs of a run per status, kept up to date by a trigger on ``jobs``.
+
+    The trigger runs in the transaction that writes the job, so counts always match
+    the committed jobs; run lists and progress read them instead of counting jobs.
+    """
+
+    __tablename__ = "workflow_job_counts"
+
+    workflow_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("workflows.id", ondelete="CASCADE"), primary_key=True
+    )
+    # All jobs, whatever their status
+    total: Mapped[int] = mapped_column(default=0, server_default="0")
+    success: Mapped[int] = mapped_column(default=0, server_default="0")
+    running: Mapped[int] = mapped_column(default=0, server_default="0")
+    error: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Lowest and highest id the run's jobs ever had (only widened, never narrowed)
+    first_job_id: Mapped[int | None]
+    last_job_id: Mapped[int | None]
+
+
+class RuleJobCounts(Base):
+    """Number of jobs of a rule per status, kept up to date like ``WorkflowJobCounts``."""
+
+    __tablename__ = "rule_job_counts"
+
+    rule_id: Mapped[int] = mapped_column(
+        ForeignKey("rules.id", ondelete="CASCADE"), primary_key=True
+    )
+    workflow_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("workflows.id", ondelete="CASCADE"), index=True
+    )
+    total: Mapped[int] = mapped_column(default=0, server_default="0")
+    success: Mapped[int] = mapped_column(default=0, server_default="0")
+    running: Mapped[int] = mapped_column(default=0, server_default="0")
+    error: Mapped[int] = mapped_column(default=0, server_default="0")
+
+
+def run_job_ids(workflow_id: uuid.UUID, column=Job.id):
+    """``column`` (a job id) within the job id range of the run ``workflow_id``.
+
+    Redundant next to ``Job.workflow_id == workflow_id``, but lets PostgreSQL skip
+    the partitions of ``jobs`` and ``files`` that cannot hold the run's jobs when
+    they are partitioned by job id (``app.services.job_partitions``).
+    """
+    counts = select(WorkflowJobCounts).where(
+        WorkflowJobCounts.workflow_id == workflow_id
+    )
+    return column.between(
+        counts.with_only_columns(WorkflowJobCounts.first_job_id).scalar_subquery(),
+        counts.with_only_columns(WorkflowJobCounts.last_job_id).scalar_subquery(),
+    )
+
+
+# Same definitions as migrations f2a3b4c5d6e7, b4c5d6e7f8a9 and c5d6e7f8a9b0; keep
+# them in sync.
+COUNT_JOB_STATUS_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION add_job_count(
+        p_workflow_id UUID,
+        p_rule_id INTEGER,
+        p_status TEXT,
+        delta INTEGER,
+        p_job_id INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        d_success INTEGER := CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END;
+        d_running INTEGER := CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END;
+        d_error INTEGER := CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END;
+    BEGIN
+        INSERT INTO workflow_job_counts AS c
+            (workflow_id, total, success, running, error, first_job_id, last_job_id)
+        VALUES (p_workflow_id, delta, d_success, d_running, d_error, p_job_id, p_job_id)
+        ON CONFLICT (workflow_id) DO UPDATE SET
+            total = c.total + EXCLUDED.total,
+            success = c.success + EXCLUDED.success,
+            running = c.running + EXCLUDED.running,
+            error = c.error + EXCLUDED.error,
+            first_job_id = LEAST(c.first_job_id, EXCLUDED.first_job_id),
+            last_job_id = GREATEST(c.last_job_id, EXCLUDED.last_job_id);
+
+        IF p_rule_id IS NOT NULL THEN
+            INSERT INTO rule_job_counts AS c
+                (rule_id, workflow_id, total, success, running, error)
+            VALUES (p_rule_id, p_workflow_id, delta, d_success, d_running, d_error)
+            ON CONFLICT (rule_id) DO UPDATE SET
+                total = c.total + EXCLUDED.total,
+                success = c.success + EXCLUDED.success,
+                running = c.running + EXCLUDED.running,
+                error = c.error + EXCLUDED.error;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION count_job_status()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM add_job_count(
+                OLD.workflow_id, OLD.rule_id, OLD.status::TEXT, -1, NULL
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM add_job_count(
+                NEW.workflow_id, NEW.rule_id, NEW.status::TEXT, 1, NEW.id
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+COUNT_JOB_STATUS_TRIGGERS = [
+    """
+    CREATE TRIGGER jobs_count_insert_delete_trigger
+        AFTER INSERT OR DELETE ON jobs
+        FOR EACH ROW EXECUTE FUNCTION count_job_status()
+    """,
+    """
+    CREATE TRIGGER jobs_count_update_trigger
+        AFTER UPDATE OF status, rule_id, workflow_id ON jobs
+        FOR EACH ROW
+        WHEN (
+            OLD.status IS DISTINCT FROM NEW.status
+            OR OLD.rule_id IS DISTINCT FROM NEW.rule_id
+            OR OLD.workflow_id IS DISTINCT FROM NEW.workflow_id
+        )
+        EXECUTE FUNCTION count_job_status()
+    """,
+]
+
+for _ddl in COUNT_JOB_STATUS_FUNCTIONS + COUNT_JOB_STATUS_TRIGGERS:
+    event.listen(Job.__table__, "after_create", DDL(_ddl))
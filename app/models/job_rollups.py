@@ -0,0 +1,347 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    ForeignKey,
+    Index,
+    Subquery,
+    TextClause,
+    event,
+    func,
+    select,
+    text,
+    union_all,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from ..utils.ddsketch import BUCKET_SQL
+from .base import Base
+from .job import Job
+
+
+class JobDailyRollup(Base):
+    """Jobs per UTC day (of ``started_at``), user, catalog and rule name.
+
+    Dashboard analytics sum them over a day range instead of joining rules, jobs
+    and workflows. Triggers on ``jobs`` do not update these rows, which every run
+    of a rule shares: each job stores the id of its row (``jobs.rollup_id``, set
+    when the job is written and kept when its run is relinked to another catalog)
+    and its changes are appended to ``JobRollupDelta``, which
+    ``app.services.job_rollups`` folds in. Read them through
+    :func:`current_rollups`, which adds the deltas not folded yet, so reads always
+    match the committed jobs (today included).
+    """
+
+    __tablename__ = "job_daily_rollups"
+    __table_args__ = (
+        Index(
+            "uq_job_daily_rollups_key",
+            "day",
+            "user_id",
+            "catalog_id",
+            "rule_name",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    day: Mapped[date]
+    # The run's owner and catalog, without foreign keys: rollups are only summed
+    user_id: Mapped[uuid.UUID | None]
+    catalog_id: Mapped[uuid.UUID | None]
+    # None for jobs without a rule
+    rule_name: Mapped[str | None]
+    # All jobs, whatever their status
+    total: Mapped[int] = mapped_column(default=0, server_default="0")
+    success: Mapped[int] = mapped_column(default=0, server_default="0")
+    running: Mapped[int] = mapped_column(default=0, server_default="0")
+    error: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Successful jobs with an end time, and the sum of their durations in seconds
+    duration_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    duration_sum: Mapped[float] = mapped_column(default=0, server_default="0")
+
+
+class JobDurationBucket(Base):
+    """Duration sketch of a rollup row: its durations counted per sketch bucket.
+
+    See ``app.utils.ddsketch``; folded in from ``JobRollupDelta`` like the rollups.
+    Read it through :func:`current_buckets`.
+    """
+
+    __tablename__ = "job_duration_buckets"
+
+    rollup_id: Mapped[int] = mapped_column(
+        ForeignKey("job_daily_rollups.id", ondelete="CASCADE"), primary_key=True
+    )
+    bucket: Mapped[int] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(default=0, server_default="0")
+
+
+class JobRollupDelta(Base):
+    """A change to a rollup row not folded in yet (append-only, then folded).
+
+    Appending takes no lock on the shared rollup rows, so runs writing jobs of the
+    same rule and day never wait on each other; the counts are signed.
+    """
+
+    __tablename__ = "job_rollup_deltas"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    # ``job_daily_rollups.id``, without a foreign key like the rollups' own keys
+    rollup_id: Mapped[int] = mapped_column(BigInteger)
+    total: Mapped[int] = mapped_column(default=0, server_default="0")
+    success: Mapped[int] = mapped_column(default=0, server_default="0")
+    running: Mapped[int] = mapped_column(default=0, server_default="0")
+    error: Mapped[int] = mapped_column(default=0, server_default="0")
+    duration_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    duration_sum: Mapped[float] = mapped_column(default=0, server_default="0")
+    # Sketch bucket of the ``duration_count`` durations (None when there are none)
+    bucket: Mapped[int | None]
+
+
+_ROLLUP_COUNTS = (
+    "total",
+    "success",
+    "running",
+    "error",
+    "duration_count",
+    "duration_sum",
+)
+
+
+def current_rollups() -> Subquery:
+    """``job_daily_rollups`` with the deltas not folded yet added.
+
+    One statement reads both in one snapshot, so a concurrent fold is seen either
+    entirely or not at all.
+    """
+    pending = (
+        select(
+            JobRollupDelta.rollup_id,
+            *(
+                func.sum(getattr(JobRollupDelta, name)).label(name)
+                for name in _ROLLUP_COUNTS
+            ),
+        )
+        .group_by(JobRollupDelta.rollup_id)
+        .subquery()
+    )
+    return (
+        select(
+            JobDailyRollup.id,
+            JobDailyRollup.day,
+            JobDailyRollup.user_id,
+            JobDailyRollup.catalog_id,
+            JobDailyRollup.rule_name,
+            *(
+                (
+                    getattr(JobDailyRollup, name)
+                    + func.coalesce(getattr(pending.c, name), 0)
+                ).label(name)
+                for name in _ROLLUP_COUNTS
+            ),
+        )
+        .outerjoin(pending, pending.c.rollup_id == JobDailyRollup.id)
+        .subquery("job_rollups")
+    )
+
+
+def current_buckets() -> Subquery:
+    """``job_duration_buckets`` rows and the pending deltas' buckets (sum them)."""
+    return union_all(
+        select(
+            JobDurationBucket.rollup_id,
+            JobDurationBucket.bucket,
+            JobDurationBucket.count,
+        ),
+        select(
+            JobRollupDelta.rollup_id,
+            JobRollupDelta.bucket,
+            JobRollupDelta.duration_count.label("count"),
+        ).where(JobRollupDelta.bucket.is_not(None)),
+    ).subquery("job_buckets")
+
+
+DELTA_COLUMNS = ("rollup_id", *_ROLLUP_COUNTS, "bucket")
+
+
+def add_rollups_of(
+    table: str,
+    sign: int = 1,
+    workflow_id: uuid.UUID | None = None,
+    returning: bool = False,
+) -> TextClause:
+    """Add (``sign`` 1) or remove (-1) the jobs of ``table`` to/from the rollups.
+
+    For jobs that bypass the trigger: partitions of ``jobs`` dropped whole, and the
+    jobs of archived runs (``app.services.archive``), which stay counted while out
+    of ``jobs``; ``workflow_id`` limits the statement to one run's jobs. Like the
+    trigger, it appends deltas keyed on the jobs' own ``rollup_id``; with
+    ``returning``, the statement returns them (``DELTA_COLUMNS``).
+    """
+    run = "TRUE" if workflow_id is None else "j.workflow_id = :workflow_id"
+    done = "j.status = 'SUCCESS' AND j.end_time IS NOT NULL"
+    duration = "EXTRACT(EPOCH FROM j.end_time - j.started_at)::FLOAT"
+    bucket = f"CASE WHEN {done} THEN {BUCKET_SQL.replace('duration', duration)} END"
+    statement = text(
+        f"""
+        INSERT INTO job_rollup_deltas (
+            rollup_id, total, success, running, error,
+            duration_count, duration_sum, bucket
+        )
+        SELECT
+            j.rollup_id,
+            {sign} * count(*),
+            {sign} * count(*) FILTER (WHERE j.status = 'SUCCESS'),
+            {sign} * count(*) FILTER (WHERE j.status = 'RUNNING'),
+            {sign} * count(*) FILTER (WHERE j.status = 'ERROR'),
+            {sign} * count(*) FILTER (WHERE {done}),
+            {sign} * COALESCE(sum({duration}) FILTER (WHERE {done}), 0),
+            {bucket}
+        FROM "{table}" j
+        WHERE {run} AND j.rollup_id IS NOT NULL
+        GROUP BY j.rollup_id, {bucket}
+        {"RETURNING " + ", ".join(DELTA_COLUMNS) if returning else ""}
+        """
+    )
+    if workflow_id is not None:
+        statement = statement.bindparams(workflow_id=workflow_id)
+    return statement
+
+
+# Same definitions as migration c1d2e3f4a5b6 (the AFTER triggers as in
+# d6e7f8a9b0c1); keep them in sync.
+ROLLUP_JOB_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION set_job_rollup_id()
+    RETURNS trigger AS $$
+    DECLARE
+        w RECORD;
+        r_name TEXT;
+        r_day DATE;
+    BEGIN
+        IF TG_OP = 'INSERT' AND NEW.rollup_id IS NOT NULL THEN
+            -- A restored job keeps the row it was counted in
+            RETURN NEW;
+        END IF;
+        IF TG_OP = 'UPDATE'
+            AND OLD.started_at IS NOT DISTINCT FROM NEW.started_at
+            AND OLD.rule_id IS NOT DISTINCT FROM NEW.rule_id
+            AND OLD.workflow_id IS NOT DISTINCT FROM NEW.workflow_id
+        THEN
+            RETURN NEW;
+        END IF;
+        SELECT name INTO r_name FROM rules WHERE id = NEW.rule_id;
+        SELECT user_id, catalog_id INTO w FROM workflows WHERE id = NEW.workflow_id;
+        r_day := (NEW.started_at AT TIME ZONE 'UTC')::DATE;
+
+        -- A day has few keys: the day prefix of the unique index finds the row.
+        SELECT id INTO NEW.rollup_id FROM job_daily_rollups
+        WHERE day = r_day
+            AND user_id IS NOT DISTINCT FROM w.user_id
+            AND catalog_id IS NOT DISTINCT FROM w.catalog_id
+            AND rule_name IS NOT DISTINCT FROM r_name;
+        IF NEW.rollup_id IS NULL THEN
+            -- DO NOTHING locks no existing row; the key may be created meanwhile
+            INSERT INTO job_daily_rollups (day, user_id, catalog_id, rule_name)
+            VALUES (r_day, w.user_id, w.catalog_id, r_name)
+            ON CONFLICT (day, user_id, catalog_id, rule_name) DO NOTHING
+            RETURNING id INTO NEW.rollup_id;
+        END IF;
+        IF NEW.rollup_id IS NULL THEN
+            SELECT id INTO NEW.rollup_id FROM job_daily_rollups
+            WHERE day = r_day
+                AND user_id IS NOT DISTINCT FROM w.user_id
+                AND catalog_id IS NOT DISTINCT FROM w.catalog_id
+                AND rule_name IS NOT DISTINCT FROM r_name;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION add_job_rollup_delta(
+        p_rollup_id BIGINT,
+        p_status TEXT,
+        p_started_at TIMESTAMPTZ,
+        p_end_time TIMESTAMPTZ,
+        delta INTEGER
+    )
+    RETURNS void AS $$
+    DECLARE
+        duration DOUBLE PRECISION;
+    BEGIN
+        IF p_rollup_id IS NULL THEN
+            RETURN;
+        END IF;
+        IF p_status = 'SUCCESS' AND p_end_time IS NOT NULL THEN
+            duration := EXTRACT(EPOCH FROM p_end_time - p_started_at);
+        END IF;
+        INSERT INTO job_rollup_deltas (
+            rollup_id, total, success, running, error,
+            duration_count, duration_sum, bucket
+        )
+        VALUES (
+            p_rollup_id,
+            delta,
+            CASE WHEN p_status = 'SUCCESS' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'RUNNING' THEN delta ELSE 0 END,
+            CASE WHEN p_status = 'ERROR' THEN delta ELSE 0 END,
+            CASE WHEN duration IS NOT NULL THEN delta ELSE 0 END,
+            COALESCE(duration * delta, 0),
+            CASE WHEN duration IS NOT NULL THEN {bucket} END
+        );
+    END;
+    $$ LANGUAGE plpgsql
+    """.replace("{bucket}", BUCKET_SQL),
+    """
+    CREATE OR REPLACE FUNCTION rollup_job()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM add_job_rollup_delta(
+                OLD.rollup_id, OLD.status::TEXT, OLD.started_at, OLD.end_time, -1
+            );
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') THEN
+            PERFORM add_job_rollup_delta(
+                NEW.rollup_id, NEW.status::TEXT, NEW.started_at, NEW.end_time, 1
+            );
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+ROLLUP_JOB_TRIGGERS = [
+    """
+    CREATE TRIGGER jobs_rollup_id_trigger
+        BEFORE INSERT OR UPDATE OF started_at, rule_id, workflow_id ON jobs
+        FOR EACH ROW EXECUTE FUNCTION set_job_rollup_id()
+    """,
+    """
+    CREATE TRIGGER jobs_rollup_insert_delete_trigger
+        AFTER INSERT OR DELETE ON jobs
+        FOR EACH ROW EXECUTE FUNCTION rollup_job()
+    """,
+    """
+    CREATE TRIGGER jobs_rollup_update_trigger
+        AFTER UPDATE OF status, started_at, end_time, rule_id, workflow_id ON jobs
+        FOR EACH ROW
+        WHEN (
+            OLD.status IS DISTINCT FROM NEW.status
+            OR OLD.started_at IS DISTINCT FROM NEW.started_at
+            OR OLD.end_time IS DISTINCT FROM NEW.end_time
+            OR OLD.rule_id IS DISTINCT FROM NEW.rule_id
+            OR OLD.workflow_id IS DISTINCT FROM NEW.workflow_id
+        )
+        EXECUTE FUNCTION rollup_job()
+    """,
+]
+
+for _ddl in ROLLUP_JOB_FUNCTIONS + ROLLUP_JOB_TRIGGERS:
+    event.listen(Job.__table__, "after_create", DDL(_ddl))
@@ -0,0 +1,43 @@
+from datetime import UTC, datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class NotificationOutbox(Base):
+    """A workflow email queued in the transaction that triggered it.
+
+    Rows are written by ``app.services.notification`` while an event is ingested
+    (so a rolled-back event sends nothing) and delivered later by the outbox worker
+    in ``app.services.notification_outbox``.
+    """
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index(
+            "ix_notification_outbox_status_next_attempt", "status", "next_attempt_at"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    # "submitted", "success" or "failure"
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    to_email: Mapped[str] = mapped_column(String, nullable=False)
+    workflow_name: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Submission time, run duration or error message, depending on ``kind``
+    detail: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # pending -> sent | failed | skipped (SMTP not configured)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC)
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC)
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -1,7 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Text
+from sqlalchemy import ForeignKey, Index, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -14,6 +14,7 @@ if TYPE_CHECKING:
 
 class Rule(Base):
     __tablename__ = "rules"
+    __table_args__ = (Index("ix_rules_workflow_id_name", "workflow_id", "name"),)
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str]
     code: Mapped[str | None] = mapped_column(type_=Text, nullable=True)
@@ -2,7 +2,7 @@ import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import JSON, DateTime, Enum, ForeignKey, String
+from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,6 +18,16 @@ if TYPE_CHECKING:
 
 class Workflow(Base):
     __tablename__ = "workflows"
+    __table_args__ = (
+        # Keyset pages of run lists (newest first): all, one owner's, one catalog's
+        Index("ix_workflows_started_at_id", "started_at", "id"),
+        Index("ix_workflows_user_id_started_at_id", "user_id", "started_at", "id"),
+        Index(
+            "ix_workflows_catalog_id_started_at_id", "catalog_id", "started_at", "id"
+        ),
+        # Tag filters (``tags @> ARRAY[...]``)
+        Index("ix_workflows_tags", "tags", postgresql_using="gin"),
+    )
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
     snakefile: Mapped[str | None]
     started_at: Mapped[datetime] = mapped_column(
@@ -45,6 +55,14 @@ class Workflow(Base):
     catalog_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("catalogs.id", ondelete="SET NULL"), nullable=True
     )
+    # Set while the run's rows are in ``workflow_archives`` (app.services.archive)
+    archived_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # When the run was last restored from the archive, i.e. opened while cold
+    restored_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     catalog: Mapped["Catalog | None"] = relationship(
         "Catalog", back_populates="workflows"
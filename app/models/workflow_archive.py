@@ -0,0 +1,64 @@
+"""Cold archive of a finished run's rows (see ``app.services.archive``)."""
+
+import uuid
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class WorkflowArchive(Base):
+    """Rules, jobs, files, errors and events of an archived run.
+
+    The rows are in the archive's ``parts``, each compressed with ``codec``
+    (``zstd`` or ``zlib``); archives written before parts hold one JSON document
+    of all the rows in ``data`` instead. The run's ``workflows`` row stays as a
+    stub with ``archived_at`` set until the run is restored. ``rollups`` records
+    what its jobs add to the dashboard rollups, so deleting the run can take them
+    out without restoring it.
+    """
+
+    __tablename__ = "workflow_archives"
+
+    workflow_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("workflows.id", ondelete="CASCADE"), primary_key=True
+    )
+    codec: Mapped[str] = mapped_column(String(16))
+    # The whole document of archives written before parts, else None
+    data: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
+    # Bytes of the JSON rows before and after compression
+    raw_size: Mapped[int] = mapped_column(BigInteger)
+    size: Mapped[int] = mapped_column(BigInteger)
+    jobs: Mapped[int]
+    # The run's rollup deltas (``app.models.job_rollups.DELTA_COLUMNS`` each);
+    # None for archives written before they were recorded
+    rollups: Mapped[list[dict[str, Any]] | None] = mapped_column(
+        JSON(none_as_null=True)
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+
+
+class WorkflowArchivePart(Base):
+    """Up to ``RUNS_ARCHIVE_PART_ROWS`` rows of one table, as one compressed frame.
+
+    ``data`` is a JSON array of the rows; parts are written and restored in
+    ``part`` order, which follows the archive's table order.
+    """
+
+    __tablename__ = "workflow_archive_parts"
+
+    workflow_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("workflow_archives.workflow_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    part: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    table_name: Mapped[str] = mapped_column(String(64))
+    rows: Mapped[int]
+    data: Mapped[bytes] = mapped_column(LargeBinary)
@@ -2,7 +2,18 @@ import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Identity, String, Text
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    PrimaryKeyConstraint,
+    Sequence,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,17 +22,36 @@ from .base import Base
 if TYPE_CHECKING:
     from .user import User
 
+# A plain sequence rather than an identity column: before PostgreSQL 17 identity
+# columns are not shared by partitions attached to a partitioned table.
+WORKFLOW_EVENTS_SEQUENCE = Sequence("workflow_events_sequence_no_seq")
+
 
 class WorkflowEvent(Base):
-    """Append-only raw report event before projection into workflows/jobs/etc."""
+    """Append-only raw report event before projection into workflows/jobs/etc.
+
+    The table is range-partitioned by month on ``created_at`` (partitions are
+    managed by ``app.services.reports.partitions``), so the primary key includes
+    ``created_at`` and ``sequence_no`` uniqueness comes from its sequence.
+    """
 
     __tablename__ = "workflow_events"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "created_at", name="workflow_events_pkey"),
+        Index("ix_workflow_events_workflow_created", "workflow_id", "created_at"),
+        Index("ix_workflow_events_status_created", "status", "created_at"),
+        Index("ix_workflow_events_sequence_no", "sequence_no"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(default=uuid.uuid4)
     sequence_no: Mapped[int] = mapped_column(
-        BigInteger, Identity(always=False), unique=True, nullable=False
+        BigInteger,
+        WORKFLOW_EVENTS_SEQUENCE,
+        server_default=WORKFLOW_EVENTS_SEQUENCE.next_value(),
+        nullable=False,
     )
-    workflow_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True, index=True)
+    workflow_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True)
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("user.id", ondelete="CASCADE"),
         nullable=False,
@@ -31,9 +61,7 @@ class WorkflowEvent(Base):
     payload_json: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
     context_json: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
     source: Mapped[str] = mapped_column(String(32), nullable=False, default="plugin")
-    status: Mapped[str] = mapped_column(
-        String(16), nullable=False, default="pending", index=True
-    )
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="pending")
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, default=lambda: datetime.now(UTC)
@@ -43,3 +71,46 @@ class WorkflowEvent(Base):
     )
 
     user: Mapped["User"] = relationship("User", back_populates="workflow_events")
+
+
+class WorkflowEventKey(Base):
+    """Client-assigned identity of a report event, used to drop retried deliveries.
+
+    The plugin numbers the events of a run (``stream_id`` + monotonic ``seq``).
+    Uniqueness lives here rather than on ``workflow_events`` because a unique
+    index on a partitioned table has to include the partition key.
+    """
+
+    __tablename__ = "workflow_event_keys"
+
+    stream_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    # Indexed for deleting the keys of a deleted run's events
+    event_id: Mapped[uuid.UUID | None] = mapped_column(nullable=True, index=True)
+    # Locates the event's partition
+    event_created_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Context keys the original response changed, returned again for repeats
+    response_json: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        index=True,
+    )
+
+
+# Catch-all partition so inserts never fail when a month has no partition yet
+# (``create_all`` databases start without any monthly partition).
+event.listen(
+    WorkflowEvent.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS workflow_events_default "
+        "PARTITION OF workflow_events DEFAULT"
+    ),
+)
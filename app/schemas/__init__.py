@@ -1,5 +1,6 @@
 from .file import FileResponse, TreeDataNode
 from .job import JobDetailResponse, JobListResponse, JobResponse
+from .search import CatalogSearchHit, SearchResponse, WorkflowSearchHit
 from .util import (
     Message,
     ResourcesSummary,
@@ -11,6 +12,7 @@ from .workflow import (
     RuleListResponse,
     RuleResponse,
     RuleStatusResponse,
+    WorkflowBulkDeleteResponse,
     WorkflowDetialResponse,
     WorkflowListResponse,
     WorkflowResponse,
@@ -35,6 +35,10 @@ class JobListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    # ``total`` is the planner's estimate rather than an exact count
+    approximate: bool = False
+    # Pass as ``cursor`` to get the next page; None on the last page
+    next_cursor: str | None = None
 
 
 class JobDetailResponse(BaseModel):
@@ -48,6 +52,7 @@ class JobDetailResponse(BaseModel):
     wildcards: dict[str, Any] | None = None
     reason: str | None = None
     resources: dict[str, Any] | None = None
+    error_excerpt: dict[str, Any] | None = None
     directory: str | None = None
     input: list[str] | None = None
     output: list[str] | None = None
@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class WorkflowSearchHit(BaseModel):
+    id: uuid.UUID
+    name: str | None
+    status: str | None
+    started_at: datetime | None
+    score: float
+
+
+class CatalogSearchHit(BaseModel):
+    id: uuid.UUID
+    slug: str
+    name: str
+    description: str | None
+    score: float
+
+
+class SearchResponse(BaseModel):
+    workflows: list[WorkflowSearchHit]
+    catalogs: list[CatalogSearchHit]
+    # Ranked by trigram similarity (pg_trgm), else by where the text matches
+    fuzzy: bool
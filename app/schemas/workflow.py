@@ -33,6 +33,17 @@ class WorkflowListResponse(BaseModel):
     total: int | None
     limit: int | None
     offset: int | None
+    # ``total`` is the planner's estimate rather than an exact count
+    approximate: bool = False
+    # Pass as ``cursor`` to get the next page; None on the last page
+    next_cursor: str | None = None
+
+
+class WorkflowBulkDeleteResponse(BaseModel):
+    """Schema for the result of a bulk delete"""
+
+    workflows: int
+    jobs: int
 
 
 class WorkflowDetialResponse(BaseModel):
@@ -0,0 +1,487 @@
+"""Cold archive of finished runs.
+
+Runs that ended more than ``RUNS_ARCHIVE_AFTER_DAYS`` ago are moved out of the hot
+tables: their rules, jobs, files, errors and raw events are written as JSON,
+compressed (zstd when the optional ``zstandard`` package is installed, zlib
+otherwise) into ``workflow_archive_parts`` rows, and deleted. The ``workflows``
+row stays as a stub with ``archived_at`` set, so run lists, filters and search
+still show the run; its job counters are put back after the delete and the
+dashboard rollups keep counting its jobs.
+
+Runs are archived and restored ``RUNS_ARCHIVE_PART_ROWS`` rows at a time, each
+batch one compressed part, so neither holds a whole run in memory. Opening an
+archived run where its jobs, rules or files are needed restores it:
+``WorkflowService.get_workflow`` checks the user can read the run, starts
+:func:`restore_in_background` and answers 202 until the rows are back; endpoints
+that only need the ``workflows`` row (detail, progress, logs) serve the stub.
+:func:`restore_workflow` puts the rows back with their original ids and drops the
+archive. A restored run is not archived again until ``RUNS_ARCHIVE_AFTER_DAYS``
+after it was restored. Archives record their codec, so zlib archives stay
+readable after ``zstandard`` is installed; zstd archives need it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+import zlib
+from collections.abc import AsyncIterator, Callable
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import (
+    DateTime,
+    Table,
+    Uuid,
+    delete,
+    insert,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import (
+    Error,
+    File,
+    Job,
+    Rule,
+    Status,
+    User,
+    Workflow,
+    WorkflowArchive,
+    WorkflowArchivePart,
+    WorkflowEvent,
+    WorkflowJobCounts,
+)
+from app.models.job_rollups import DELTA_COLUMNS, add_rollups_of
+from app.services.reports.state_cache import workflow_state_cache
+from app.utils.ddsketch import BUCKET_SQL
+
+try:
+    import zstandard
+except ImportError:  # optional: archives are written with zlib instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+
+# Restores running in this process, by run
+_restoring: dict[uuid.UUID, asyncio.Task] = {}
+
+# Archived tables, in insert order (rules before the jobs and errors using them)
+TABLES: list[Table] = [
+    Rule.__table__,
+    Job.__table__,
+    File.__table__,
+    Error.__table__,
+    WorkflowEvent.__table__,
+]
+COUNT_COLUMNS = ("total", "success", "running", "error")
+# Codec of the archives written here
+CODEC = "zstd" if zstandard is not None else "zlib"
+ZSTD_LEVEL = 10
+ZLIB_LEVEL = 9
+
+# Take the rollup deltas recorded on the archives of ``:ids`` back out
+_REMOVE_RECORDED_ROLLUPS = text(f"""
+    INSERT INTO job_rollup_deltas ({", ".join(DELTA_COLUMNS)})
+    SELECT d.rollup_id, {", ".join(f"-d.{c}" for c in DELTA_COLUMNS[1:-1])}, d.bucket
+    FROM workflow_archives a
+    CROSS JOIN json_to_recordset(a.rollups) AS d(
+        rollup_id BIGINT, total INTEGER, success INTEGER, running INTEGER,
+        error INTEGER, duration_count INTEGER, duration_sum DOUBLE PRECISION,
+        bucket INTEGER
+    )
+    WHERE a.workflow_id = ANY(:ids) AND a.rollups IS NOT NULL
+""")
+
+_DONE = "j.status = 'SUCCESS' AND j.end_time IS NOT NULL"
+_DURATION = "EXTRACT(EPOCH FROM j.end_time - j.started_at)::FLOAT"
+_BUCKET = f"CASE WHEN {_DONE} THEN {BUCKET_SQL.replace('duration', _DURATION)} END"
+# Take the archived jobs ``:jobs`` (with their ``:rules``) of the run
+# ``:workflow_id`` out of the rollups, for archives that predate
+# ``WorkflowArchive.rollups``: jobs without ``rollup_id`` find their row by key.
+_REMOVE_ARCHIVED_JOBS = text(f"""
+    INSERT INTO job_rollup_deltas ({", ".join(DELTA_COLUMNS)})
+    SELECT
+        COALESCE(j.rollup_id, r.id),
+        -count(*),
+        -count(*) FILTER (WHERE j.status = 'SUCCESS'),
+        -count(*) FILTER (WHERE j.status = 'RUNNING'),
+        -count(*) FILTER (WHERE j.status = 'ERROR'),
+        -count(*) FILTER (WHERE {_DONE}),
+        -COALESCE(sum({_DURATION}) FILTER (WHERE {_DONE}), 0),
+        {_BUCKET}
+    FROM json_to_recordset(CAST(:jobs AS JSON)) AS j(
+        rule_id INTEGER, rollup_id BIGINT, status TEXT,
+        started_at TIMESTAMPTZ, end_time TIMESTAMPTZ
+    )
+    LEFT JOIN json_to_recordset(CAST(:rules AS JSON)) AS ru(id INTEGER, name TEXT)
+        ON ru.id = j.rule_id
+    JOIN workflows w ON w.id = :workflow_id
+    LEFT JOIN job_daily_rollups r
+        ON r.day = (j.started_at AT TIME ZONE 'UTC')::DATE
+        AND r.user_id IS NOT DISTINCT FROM w.user_id
+        AND r.catalog_id IS NOT DISTINCT FROM w.catalog_id
+        AND r.rule_name IS NOT DISTINCT FROM ru.name
+    WHERE COALESCE(j.rollup_id, r.id) IS NOT NULL
+    GROUP BY COALESCE(j.rollup_id, r.id), {_BUCKET}
+""")
+
+
+def compress(data: bytes) -> tuple[str, bytes]:
+    if CODEC == "zstd":
+        return CODEC, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return CODEC, zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd archive: install the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot archive {type(value).__name__}")
+
+
+def _decode(table: Table, row: dict[str, Any]) -> dict[str, Any]:
+    """Turn a row of the JSON document back into column values of ``table``."""
+    values = {}
+    for name, value in row.items():
+        column_type = table.c[name].type
+        if value is not None and isinstance(column_type, DateTime):
+            value = datetime.fromisoformat(value)
+        elif value is not None and isinstance(column_type, Uuid):
+            value = uuid.UUID(value)
+        values[name] = value
+    return values
+
+
+def _run_rows(table: Table, workflow_id: uuid.UUID):
+    if table is File.__table__:
+        job_ids = select(Job.id).where(Job.workflow_id == workflow_id)
+        return table.c.job_id.in_(job_ids)
+    return table.c.workflow_id == workflow_id
+
+
+async def _lock(db: AsyncSession, workflow_id: uuid.UUID) -> datetime | None:
+    """Lock the run's row against the projector and concurrent archive/restore.
+
+    Returns its ``archived_at``; raises ``LookupError`` for unknown runs.
+    """
+    row = (
+        await db.execute(
+            select(Workflow.archived_at)
+            .where(Workflow.id == workflow_id)
+            .with_for_update()
+        )
+    ).one_or_none()
+    if row is None:
+        raise LookupError(f"Workflow {workflow_id} not found")
+    return row.archived_at
+
+
+async def _write_parts(
+    db: AsyncSession, workflow_id: uuid.UUID
+) -> tuple[int, int, int]:
+    """Write the run's rows as archive parts; returns raw and compressed bytes, jobs.
+
+    Rows are read ``RUNS_ARCHIVE_PART_ROWS`` at a time, each batch compressed
+    into one part, so a run of any size takes one batch of memory.
+    """
+    batch_size = settings.RUNS_ARCHIVE_PART_ROWS
+    raw_size = size = jobs = part = 0
+    for table in TABLES:
+        result = await db.stream(
+            select(table)
+            .where(_run_rows(table, workflow_id))
+            .order_by(*table.primary_key)
+            .execution_options(yield_per=batch_size)
+        )
+        async for rows in result.partitions():
+            raw = json.dumps(
+                [dict(row._mapping) for row in rows],
+                default=_encode,
+                separators=(",", ":"),
+            ).encode()
+            _, data = compress(raw)
+            await db.execute(
+                insert(WorkflowArchivePart).values(
+                    workflow_id=workflow_id,
+                    part=part,
+                    table_name=table.name,
+                    rows=len(rows),
+                    data=data,
+                )
+            )
+            part += 1
+            raw_size += len(raw)
+            size += len(data)
+            if table is Job.__table__:
+                jobs += len(rows)
+    return raw_size, size, jobs
+
+
+async def _archived_rows(
+    db: AsyncSession, workflow_id: uuid.UUID
+) -> AsyncIterator[tuple[Table, list[dict[str, Any]]]]:
+    """The archived rows of the run, a part (or a batch of a legacy document) at
+    a time, in table order."""
+    archive = (
+        await db.execute(
+            select(WorkflowArchive.codec, WorkflowArchive.data).where(
+                WorkflowArchive.workflow_id == workflow_id
+            )
+        )
+    ).one()
+    tables = {table.name: table for table in TABLES}
+    if archive.data is not None:
+        # Written before parts: the whole document is one blob
+        document = json.loads(decompress(archive.codec, archive.data))
+        batch_size = settings.RUNS_ARCHIVE_PART_ROWS
+        for table in TABLES:
+            rows = document[table.name]
+            for start in range(0, len(rows), batch_size):
+                yield table, rows[start : start + batch_size]
+        return
+    parts = await db.scalars(
+        select(WorkflowArchivePart.part)
+        .where(WorkflowArchivePart.workflow_id == workflow_id)
+        .order_by(WorkflowArchivePart.part)
+    )
+    for part in parts.all():
+        row = (
+            await db.execute(
+                select(WorkflowArchivePart.table_name, WorkflowArchivePart.data).where(
+                    WorkflowArchivePart.workflow_id == workflow_id,
+                    WorkflowArchivePart.part == part,
+                )
+            )
+        ).one()
+        yield tables[row.table_name], json.loads(decompress(archive.codec, row.data))
+
+
+async def archive_workflow(db: AsyncSession, workflow_id: uuid.UUID) -> int | None:
+    """Move a run's rows into its archive; the caller commits.
+
+    Returns the compressed size in bytes, or None if the run is already archived.
+    """
+    if await _lock(db, workflow_id) is not None:
+        return None
+    # The parts reference the archive row; its sizes are set once they are known
+    await db.execute(
+        insert(WorkflowArchive).values(
+            workflow_id=workflow_id,
+            codec=CODEC,
+            raw_size=0,
+            size=0,
+            jobs=0,
+            created_at=datetime.now(UTC),
+        )
+    )
+    raw_size, size, jobs = await _write_parts(db, workflow_id)
+
+    counts = await db.get(WorkflowJobCounts, workflow_id)
+    saved = {name: getattr(counts, name) for name in COUNT_COLUMNS} if counts else {}
+    # Deleting the jobs takes them out of the rollups (trigger): count them twice
+    # first, so the run still counts in dashboards while archived, and keep what
+    # they add so deleting the run can take it out again.
+    rollups = await db.execute(
+        add_rollups_of("jobs", sign=1, workflow_id=workflow_id, returning=True)
+    )
+    rollups = [dict(row._mapping) for row in rollups]
+    for table in reversed(TABLES):
+        await db.execute(delete(table).where(_run_rows(table, workflow_id)))
+    if saved:
+        await db.execute(
+            update(WorkflowJobCounts)
+            .where(WorkflowJobCounts.workflow_id == workflow_id)
+            .values(**saved)
+        )
+
+    await db.execute(
+        update(WorkflowArchive)
+        .where(WorkflowArchive.workflow_id == workflow_id)
+        .values(raw_size=raw_size, size=size, jobs=jobs, rollups=rollups)
+    )
+    await db.execute(
+        update(Workflow)
+        .where(Workflow.id == workflow_id)
+        .values(archived_at=datetime.now(UTC))
+    )
+    await db.flush()
+    workflow_state_cache.evict(workflow_id)
+    return size
+
+
+async def restore_workflow(db: AsyncSession, workflow_id: uuid.UUID) -> bool:
+    """Put an archived run's rows back and drop its archive; the caller commits.
+
+    Rows are inserted a part at a time. Returns False if the run is not archived
+    (e.g. restored concurrently).
+    """
+    if await _lock(db, workflow_id) is None:
+        return False
+
+    # The triggers count the jobs again as they are inserted
+    await db.execute(
+        update(WorkflowJobCounts)
+        .where(WorkflowJobCounts.workflow_id == workflow_id)
+        .values(**dict.fromkeys(COUNT_COLUMNS, 0))
+    )
+    async for table, rows in _archived_rows(db, workflow_id):
+        if table is WorkflowEvent.__table__:
+            # Events of users deleted since cannot come back (theirs cascade too)
+            users = {
+                str(user_id)
+                for user_id in await db.scalars(
+                    select(User.id).where(
+                        User.id.in_({uuid.UUID(e["user_id"]) for e in rows})
+                    )
+                )
+            }
+            rows = [e for e in rows if e["user_id"] in users]
+        if rows:
+            await db.execute(insert(table), [_decode(table, row) for row in rows])
+    # ... and add them to the rollups, which kept counting them while archived
+    await db.execute(add_rollups_of("jobs", sign=-1, workflow_id=workflow_id))
+
+    await db.execute(
+        delete(WorkflowArchive).where(WorkflowArchive.workflow_id == workflow_id)
+    )
+    await db.execute(
+        update(Workflow)
+        .where(Workflow.id == workflow_id)
+        .values(archived_at=None, restored_at=datetime.now(UTC))
+    )
+    await db.flush()
+    workflow_state_cache.evict(workflow_id)
+    return True
+
+
+async def _restore(workflow_id: uuid.UUID, session_factory: SessionFactory) -> None:
+    try:
+        async with session_factory() as db:
+            await restore_workflow(db, workflow_id)
+            await db.commit()
+    except Exception:
+        logger.exception("Restoring workflow %s failed", workflow_id)
+    finally:
+        _restoring.pop(workflow_id, None)
+
+
+def restore_in_background(
+    workflow_id: uuid.UUID, session_factory: SessionFactory
+) -> asyncio.Task:
+    """Restore the run in a task of its own, started once per run at a time.
+
+    Returns the task, so callers that must wait for the rows can await it.
+    """
+    task = _restoring.get(workflow_id)
+    if task is None:
+        task = asyncio.create_task(
+            _restore(workflow_id, session_factory), name=f"restore-{workflow_id}"
+        )
+        _restoring[workflow_id] = task
+    return task
+
+
+async def remove_archived_rollups(
+    db: AsyncSession, workflow_ids: list[uuid.UUID]
+) -> None:
+    """Take the archived jobs of ``workflow_ids`` out of the rollups; the caller commits.
+
+    For deleting archived runs without restoring them: deleting the stub drops the
+    archive (cascade), but the rollups keep counting its jobs until this runs.
+    Runs that are not archived are skipped.
+    """
+    if not workflow_ids:
+        return
+    await db.execute(_REMOVE_RECORDED_ROLLUPS, {"ids": workflow_ids})
+    unrecorded = await db.scalars(
+        select(WorkflowArchive.workflow_id).where(
+            WorkflowArchive.workflow_id.in_(workflow_ids),
+            WorkflowArchive.rollups.is_(None),
+        )
+    )
+    for workflow_id in unrecorded.all():
+        archive = (
+            await db.execute(
+                select(WorkflowArchive.codec, WorkflowArchive.data).where(
+                    WorkflowArchive.workflow_id == workflow_id
+                )
+            )
+        ).one()
+        document = json.loads(decompress(archive.codec, archive.data))
+        await db.execute(
+            _REMOVE_ARCHIVED_JOBS,
+            {
+                "workflow_id": workflow_id,
+                "jobs": json.dumps(document[Job.__tablename__]),
+                "rules": json.dumps(document[Rule.__tablename__]),
+            },
+        )
+
+
+async def archive_finished_runs(
+    db: AsyncSession,
+    older_than_days: int | None = None,
+    limit: int | None = None,
+) -> dict[str, int]:
+    """Archive runs that ended more than ``older_than_days`` ago, one commit each.
+
+    Runs restored within ``older_than_days`` stay hot, as they were just opened.
+    Defaults to ``RUNS_ARCHIVE_AFTER_DAYS`` (unset: nothing is archived) and
+    ``RUNS_ARCHIVE_BATCH_SIZE`` runs per call.
+    """
+    if older_than_days is None:
+        older_than_days = settings.RUNS_ARCHIVE_AFTER_DAYS
+    if older_than_days is None:
+        return {"workflows": 0, "bytes": 0}
+    cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
+    workflow_ids = (
+        await db.scalars(
+            select(Workflow.id)
+            .where(
+                Workflow.archived_at.is_(None),
+                Workflow.end_time < cutoff,
+                or_(Workflow.restored_at.is_(None), Workflow.restored_at < cutoff),
+                Workflow.status.not_in([Status.RUNNING, Status.WAITING]),
+            )
+            .order_by(Workflow.end_time)
+            .limit(limit or settings.RUNS_ARCHIVE_BATCH_SIZE)
+        )
+    ).all()
+    archived = size = 0
+    for workflow_id in workflow_ids:
+        try:
+            written = await archive_workflow(db, workflow_id)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            logger.exception("Archiving workflow %s failed", workflow_id)
+            continue
+        if written is not None:
+            archived += 1
+            size += written
+    if archived:
+        logger.info("Archived %d runs (%d bytes)", archived, size)
+    return {"workflows": archived, "bytes": size}
@@ -1,3 +1,4 @@
+import asyncio
 import shutil
 import tarfile
 import tempfile
@@ -25,6 +26,11 @@ from .utils import (
 )
 
 
+def _copy_to(src: Any, path: Path | str) -> None:
+    with open(path, "wb") as out:
+        shutil.copyfileobj(src, out, 1024 * 1024)
+
+
 def _catalog_root_after_zip_unpack(extract_root: Path) -> Path:
     """If the archive is one top-level folder (no loose files), scan inside it."""
     entries = [
@@ -66,13 +72,24 @@ class CatalogArchiveMixin:
             )
 
         with tempfile.TemporaryDirectory() as tmp_dir:
-            content = await file.read()
+            # Stream the spooled upload to disk instead of reading it into memory.
             archive_path = Path(tmp_dir) / "upload.tar.gz"
-            archive_path.write_bytes(content)
+            await asyncio.to_thread(_copy_to, file.file, archive_path)
+            return await self.import_archive_path(
+                archive_path, owner=owner, owner_id=owner_id
+            )
 
-            # Extract only under ``unpack/`` so ``upload.tar.gz`` is not a sibling of
-            # the catalog folder; otherwise ``_catalog_root_after_zip_unpack`` sees both
-            # a file and one directory and wrongly treats ``tmp_dir`` as the catalog root.
+    async def import_archive_path(
+        self,
+        archive_path: Path,
+        owner: str = "unknown",
+        owner_id: uuid.UUID | None = None,
+    ) -> dict[str, Any]:
+        """Import a catalog from a .tar.gz archive already on disk."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Extract only under ``unpack/`` so nothing else in ``tmp_dir`` is a
+            # sibling of the catalog folder; otherwise ``_catalog_root_after_zip_unpack``
+            # could see both a file and one directory and pick the wrong root.
             unpack_root = Path(tmp_dir) / "unpack"
             unpack_root.mkdir(parents=True, exist_ok=True)
 
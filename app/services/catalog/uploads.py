@@ -0,0 +1,297 @@
+"""Resumable, chunked catalog uploads.
+
+An upload session is a directory under ``CATALOG_UPLOAD_DIR`` holding a small
+``session.json`` plus one file per acknowledged chunk. Chunks are streamed to disk
+as they arrive (never buffered whole in memory), verified against the SHA-256 the
+client sends, and only renamed into place once complete, so a chunk that is
+present is always a fully acknowledged one. ``commit`` concatenates the chunks in
+order into a single archive which is then imported like a one-shot upload.
+"""
+
+import asyncio
+import hashlib
+import json
+import shutil
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+from .utils import CATALOG_IMPORT_MAX_BYTES
+
+UPLOAD_FORMATS = ("zip", "tar.gz")
+_SESSION_FILE = "session.json"
+_CHUNK_SUFFIX = ".chunk"
+# Request body bytes gathered before each (threaded) write of a chunk
+_WRITE_BYTES = 1024 * 1024
+# Smallest chunk size the index bound allows for: a session has at most
+# ``CATALOG_IMPORT_MAX_BYTES / _MIN_CHUNK_BYTES`` chunks
+_MIN_CHUNK_BYTES = 64 * 1024
+
+
+def upload_root() -> Path:
+    return Path(settings.CATALOG_UPLOAD_DIR)
+
+
+def _session_dir(upload_id: str) -> Path:
+    try:
+        normalized = uuid.UUID(upload_id).hex
+    except ValueError:
+        raise HTTPException(
+            status_code=404, detail="Upload session not found"
+        ) from None
+    return upload_root() / normalized
+
+
+def _chunk_path(session_dir: Path, index: int) -> Path:
+    return session_dir / f"{index:08d}{_CHUNK_SUFFIX}"
+
+
+def _chunk_digest_path(session_dir: Path, index: int) -> Path:
+    return session_dir / f"{index:08d}.sha256"
+
+
+def purge_stale_uploads(max_age_seconds: int | None = None) -> int:
+    """Remove sessions untouched for longer than ``CATALOG_UPLOAD_TTL_SECONDS``."""
+    root = upload_root()
+    if not root.is_dir():
+        return 0
+    ttl = max_age_seconds or settings.CATALOG_UPLOAD_TTL_SECONDS
+    cutoff = time.time() - ttl
+    removed = 0
+    for entry in root.iterdir():
+        try:
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def create_upload_session(
+    *,
+    owner_id: uuid.UUID,
+    catalog_ref: str | None,
+    archive_format: str,
+) -> dict[str, Any]:
+    """Start a new session; ``catalog_ref=None`` means "create a new catalog"."""
+    if archive_format not in UPLOAD_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported archive format '{archive_format}'",
+        )
+    if catalog_ref is None and archive_format != "tar.gz":
+        raise HTTPException(
+            status_code=400,
+            detail="New catalogs must be uploaded as a .tar.gz archive",
+        )
+
+    purge_stale_uploads()
+
+    upload_id = uuid.uuid4().hex
+    session_dir = upload_root() / upload_id
+    session_dir.mkdir(parents=True, exist_ok=False)
+    meta = {
+        "upload_id": upload_id,
+        "owner_id": str(owner_id),
+        "catalog_ref": catalog_ref,
+        "format": archive_format,
+        "chunk_size": settings.CATALOG_UPLOAD_CHUNK_BYTES,
+        "created_at": datetime.now(UTC).isoformat(),
+    }
+    (session_dir / _SESSION_FILE).write_text(json.dumps(meta), encoding="utf-8")
+    return meta
+
+
+def load_upload_session(upload_id: str, owner_id: uuid.UUID) -> dict[str, Any]:
+    session_dir = _session_dir(upload_id)
+    meta_path = session_dir / _SESSION_FILE
+    if not meta_path.is_file():
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    if meta.get("owner_id") != str(owner_id):
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return meta
+
+
+def _received_chunks(session_dir: Path) -> list[dict[str, Any]]:
+    chunks = []
+    for path in sorted(session_dir.glob(f"*{_CHUNK_SUFFIX}")):
+        index = int(path.name.removesuffix(_CHUNK_SUFFIX))
+        digest_path = _chunk_digest_path(session_dir, index)
+        chunks.append(
+            {
+                "index": index,
+                "size": path.stat().st_size,
+                "sha256": digest_path.read_text().strip()
+                if digest_path.is_file()
+                else None,
+            }
+        )
+    return chunks
+
+
+def upload_status(meta: dict[str, Any]) -> dict[str, Any]:
+    """Session metadata plus the chunks acknowledged so far (for resume)."""
+    session_dir = _session_dir(meta["upload_id"])
+    chunks = _received_chunks(session_dir)
+    return {
+        **meta,
+        "chunks": chunks,
+        "received_bytes": sum(c["size"] for c in chunks),
+    }
+
+
+def _acknowledged_chunk(session_dir: Path, index: int, expected: str) -> int | None:
+    """Size of chunk ``index`` if it is already stored with digest ``expected``."""
+    final_path = _chunk_path(session_dir, index)
+    digest_path = _chunk_digest_path(session_dir, index)
+    if final_path.is_file() and digest_path.is_file():
+        if digest_path.read_text().strip() == expected:
+            return final_path.stat().st_size
+    return None
+
+
+def _stored_bytes(session_dir: Path, skip_index: int) -> int:
+    """Bytes of the session's acknowledged chunks other than ``skip_index``."""
+    return sum(
+        path.stat().st_size
+        for path in session_dir.glob(f"*{_CHUNK_SUFFIX}")
+        if path != _chunk_path(session_dir, skip_index)
+    )
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail={
+            "message": "Upload exceeds import size limit",
+            "max_bytes": CATALOG_IMPORT_MAX_BYTES,
+        },
+    )
+
+
+def _store_chunk(session_dir: Path, index: int, part_path: Path, digest: str) -> None:
+    _chunk_digest_path(session_dir, index).write_text(digest)
+    part_path.replace(_chunk_path(session_dir, index))
+
+
+async def write_upload_chunk(
+    meta: dict[str, Any],
+    index: int,
+    body: AsyncIterator[bytes],
+    expected_sha256: str,
+) -> dict[str, Any]:
+    """Stream one chunk to disk, verifying size and checksum before acknowledging.
+
+    Re-sending an already acknowledged chunk with the same checksum is a no-op, so
+    clients can blindly retry after a dropped connection. A chunk that would take
+    the session past ``CATALOG_IMPORT_MAX_BYTES`` is refused with 413 before it is
+    stored. File I/O runs in worker threads, a ``_WRITE_BYTES`` block at a time, to
+    keep the event loop free.
+    """
+    max_chunks = -(-CATALOG_IMPORT_MAX_BYTES // _MIN_CHUNK_BYTES)
+    if not 0 <= index < max_chunks:
+        raise HTTPException(
+            status_code=400, detail=f"Chunk index must be >= 0 and < {max_chunks}"
+        )
+    expected = (expected_sha256 or "").strip().lower()
+    if len(expected) != 64:
+        raise HTTPException(
+            status_code=400, detail="X-Chunk-Sha256 header with a hex digest required"
+        )
+
+    session_dir = _session_dir(meta["upload_id"])
+    size = await asyncio.to_thread(_acknowledged_chunk, session_dir, index, expected)
+    if size is not None:
+        return {"index": index, "size": size, "sha256": expected}
+
+    stored = await asyncio.to_thread(_stored_bytes, session_dir, index)
+    budget = CATALOG_IMPORT_MAX_BYTES - stored
+    if budget <= 0:
+        raise _too_large()
+    max_chunk = settings.CATALOG_UPLOAD_CHUNK_MAX_BYTES
+    part_path = session_dir / f"{index:08d}.{uuid.uuid4().hex}.part"
+    hasher = hashlib.sha256()
+    size = 0
+    pending = bytearray()
+    out = await asyncio.to_thread(open, part_path, "wb")
+    try:
+        try:
+            async for piece in body:
+                size += len(piece)
+                if size > max_chunk:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Chunk exceeds {max_chunk} bytes",
+                    )
+                if size > budget:
+                    raise _too_large()
+                hasher.update(piece)
+                pending += piece
+                if len(pending) >= _WRITE_BYTES:
+                    await asyncio.to_thread(out.write, bytes(pending))
+                    pending.clear()
+            if pending:
+                await asyncio.to_thread(out.write, bytes(pending))
+        finally:
+            await asyncio.to_thread(out.close)
+        actual = hasher.hexdigest()
+        if actual != expected:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Checksum mismatch for chunk {index}: got {actual}",
+            )
+        await asyncio.to_thread(_store_chunk, session_dir, index, part_path, actual)
+    finally:
+        await asyncio.to_thread(part_path.unlink, missing_ok=True)
+    return {"index": index, "size": size, "sha256": expected}
+
+
+def assemble_upload(
+    meta: dict[str, Any],
+    total_chunks: int,
+    sha256: str | None = None,
+) -> Path:
+    """Concatenate chunks ``0..total_chunks-1`` into one archive (streaming copy)."""
+    session_dir = _session_dir(meta["upload_id"])
+    missing = [
+        i for i in range(total_chunks) if not _chunk_path(session_dir, i).is_file()
+    ]
+    if total_chunks <= 0 or missing:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "Upload is incomplete", "missing_chunks": missing},
+        )
+
+    suffix = ".zip" if meta["format"] == "zip" else ".tar.gz"
+    archive_path = session_dir / f"upload{suffix}"
+    hasher = hashlib.sha256()
+    total = 0
+    with open(archive_path, "wb") as out:
+        for i in range(total_chunks):
+            with open(_chunk_path(session_dir, i), "rb") as src:
+                while block := src.read(1024 * 1024):
+                    total += len(block)
+                    if total > CATALOG_IMPORT_MAX_BYTES:
+                        raise _too_large()
+                    hasher.update(block)
+                    out.write(block)
+
+    if sha256 and hasher.hexdigest() != sha256.strip().lower():
+        archive_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=422, detail="Checksum mismatch for assembled archive"
+        )
+    return archive_path
+
+
+def discard_upload(upload_id: str) -> None:
+    shutil.rmtree(_session_dir(upload_id), ignore_errors=True)
@@ -0,0 +1,161 @@
+"""Set-based deletion of runs in bounded batches.
+
+Runs are deleted ``DELETE_BATCH_SIZE`` at a time, and their jobs (with the jobs'
+files, in the same statement) ``DELETE_BATCH_SIZE`` at a time, each batch in its
+own transaction: deleting thousands of runs never holds locks for long, and a
+failure keeps the batches already committed. Jobs go first, then the runs' raw
+report events with their client event ids (so a rebuild cannot bring the runs
+back), errors, rules and rows; the triggers on ``jobs`` keep the job counters and
+the dashboard rollups in step. Archived runs are deleted without restoring them:
+their archives go with the rows, and the jobs they hold are taken out of the
+rollups from the archive (see ``app.services.archive``).
+
+``progress`` (default: log) is called after every committed batch with the
+running totals.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import Workflow, WorkflowArchive
+from app.services.archive import remove_archived_rollups
+from app.services.reports.state_cache import workflow_state_cache
+
+logger = logging.getLogger(__name__)
+
+Progress = Callable[[dict[str, int]], None]
+
+# Jobs of the runs ``:ids`` (at most ``:limit``, all if NULL) with their files
+_DELETE_JOBS = text("""
+    WITH doomed AS (
+        SELECT id FROM jobs WHERE workflow_id = ANY(:ids) LIMIT :limit
+    ), deleted_files AS (
+        DELETE FROM files f USING doomed d WHERE f.job_id = d.id
+    )
+    DELETE FROM jobs j USING doomed d WHERE j.id = d.id
+""")
+
+# Report events of the runs ``:ids`` (at most ``:limit``) with their client ids
+_DELETE_EVENTS = text("""
+    WITH doomed AS (
+        SELECT id, created_at FROM workflow_events
+        WHERE workflow_id = ANY(:ids) LIMIT :limit
+    ), deleted_keys AS (
+        DELETE FROM workflow_event_keys k USING doomed d WHERE k.event_id = d.id
+    )
+    DELETE FROM workflow_events e USING doomed d
+    WHERE e.id = d.id AND e.created_at = d.created_at
+""")
+
+
+def _log_progress(totals: dict[str, int]) -> None:
+    logger.info(
+        "Deleting runs: %d runs, %d jobs deleted so far",
+        totals["workflows"],
+        totals["jobs"],
+    )
+
+
+async def delete_jobs_of(
+    db: AsyncSession,
+    workflow_ids: list[uuid.UUID],
+    batch_size: int | None = None,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    """Delete the jobs and files of ``workflow_ids``, committing every batch.
+
+    Returns the number of jobs deleted; ``on_batch`` gets each batch's count.
+    """
+    batch_size = batch_size or settings.DELETE_BATCH_SIZE
+    deleted = 0
+    while True:
+        result = await db.execute(
+            _DELETE_JOBS, {"ids": workflow_ids, "limit": batch_size}
+        )
+        await db.commit()
+        deleted += result.rowcount
+        if on_batch is not None:
+            on_batch(result.rowcount)
+        if result.rowcount < batch_size:
+            return deleted
+
+
+async def _delete_events_of(
+    db: AsyncSession, workflow_ids: list[uuid.UUID], batch_size: int
+) -> None:
+    """Delete the report events of ``workflow_ids``, committing every batch."""
+    while True:
+        result = await db.execute(
+            _DELETE_EVENTS, {"ids": workflow_ids, "limit": batch_size}
+        )
+        await db.commit()
+        if result.rowcount < batch_size:
+            return
+
+
+async def delete_runs(
+    db: AsyncSession,
+    runs: Select,
+    batch_size: int | None = None,
+    progress: Progress | None = _log_progress,
+) -> dict[str, int]:
+    """Delete the runs selected by ``runs`` (a query of ``Workflow.id``).
+
+    ``runs`` is re-run for each batch, so it must stop matching deleted runs.
+    """
+    batch_size = batch_size or settings.DELETE_BATCH_SIZE
+    totals = {"workflows": 0, "jobs": 0}
+
+    def count_jobs(deleted: int) -> None:
+        totals["jobs"] += deleted
+        if progress is not None and deleted:
+            progress(totals)
+
+    while True:
+        rows = await db.scalars(runs.with_only_columns(Workflow.id).limit(batch_size))
+        ids = rows.all()
+        if not ids:
+            return totals
+        await delete_jobs_of(db, ids, batch_size, count_jobs)
+        await _delete_events_of(db, ids, batch_size)
+
+        # Jobs reported meanwhile would block deleting the runs: lock the runs,
+        # then take the stragglers with the rest.
+        params = {"ids": ids}
+        await db.execute(
+            text("SELECT id FROM workflows WHERE id = ANY(:ids) FOR UPDATE"), params
+        )
+        result = await db.execute(_DELETE_JOBS, {**params, "limit": None})
+        await db.execute(_DELETE_EVENTS, {**params, "limit": None})
+        # Archived runs' jobs are only in their archives, which go with the rows
+        archived_jobs = await db.scalar(
+            select(func.coalesce(func.sum(WorkflowArchive.jobs), 0)).where(
+                WorkflowArchive.workflow_id.in_(ids)
+            )
+        )
+        await remove_archived_rollups(db, ids)
+        await db.execute(
+            text("DELETE FROM errors WHERE workflow_id = ANY(:ids)"), params
+        )
+        await db.execute(
+            text("DELETE FROM rules WHERE workflow_id = ANY(:ids)"), params
+        )
+        deleted = await db.execute(
+            text("DELETE FROM workflows WHERE id = ANY(:ids)"), params
+        )
+        await db.commit()
+        for workflow_id in ids:
+            workflow_state_cache.evict(workflow_id)
+        totals["jobs"] += result.rowcount + archived_jobs
+        totals["workflows"] += deleted.rowcount
+        if progress is not None:
+            progress(totals)
+        if len(ids) < batch_size:
+            return totals
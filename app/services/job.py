@@ -1,18 +1,32 @@
 import uuid
+from datetime import datetime
 from pathlib import Path
 
 from fastapi import HTTPException
-from sqlalchemy import and_, case, func, select
+from sqlalchemy import Select, and_, delete, func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from ..models import File, Job, Rule, Status
+from ..models import (
+    Error,
+    File,
+    Job,
+    Rule,
+    RuleJobCounts,
+    Status,
+    WorkflowJobCounts,
+)
+from ..models.job import status_rank
+from ..models.job_counts import run_job_ids
 from ..schemas import (
     JobDetailResponse,
     JobListResponse,
     JobResponse,
 )
+from ..utils.cursor import decode_cursor, encode_cursor
 from ..utils.paths import path_resolver
+from .deletion import delete_jobs_of
+from .list_counts import ListTotal, list_total
 from .workflow import WorkflowService
 
 
@@ -51,6 +65,7 @@ class JobService:
         descending: bool = True,
         rule_name: str | None = None,
         status: Status | None = None,
+        cursor: str | None = None,
     ) -> JobListResponse:
         """
         Get jobs for a specific workflow with optional filtering by rule name
@@ -58,67 +73,99 @@ class JobService:
         Args:
             workflow_id: UUID of the workflow to filter jobs by
             rule_name_filter: Optional rule name to filter jobs by
+            cursor: ``next_cursor`` of the previous page; replaces ``offset``
+                (default, descending order only)
 
         Returns:
             List of JobResponse objects
         """
 
+        rank = status_rank(Job.status)
         query = (
-            select(Job, Rule.name.label("rule_name"))
+            select(Job, Rule.name.label("rule_name"), rank.label("status_rank"))
             .join(Rule)
-            .where(Job.workflow_id == workflow_id)
-        )
-
-        status_order = case(
-            (Job.status == "ERROR", 1),
-            (Job.status == "RUNNING", 2),
-            (Job.status == "SUCCESS", 3),
-            (Job.status == "UNKNOWN", 4),
-            else_=5,
+            .where(Job.workflow_id == workflow_id, run_job_ids(workflow_id))
         )
 
         if descending:
-            query = query.order_by(status_order, Job.started_at.desc())
+            query = query.order_by(rank.desc(), Job.started_at.desc(), Job.id.desc())
         else:
-            query = query.order_by(status_order, Job.id)
+            query = query.order_by(rank.desc(), Job.id)
 
         if rule_name:
             query = query.filter(Rule.name == rule_name)
 
         if status:
             query = query.filter(Job.status == status)
-
-        if offset:
+        matching = query.with_only_columns(Job.id)
+
+        if cursor:
+            if not descending:
+                raise HTTPException(
+                    status_code=400, detail="cursor requires descending order"
+                )
+            query = query.where(
+                tuple_(rank, Job.started_at, Job.id)
+                < tuple_(*decode_cursor(cursor, int, datetime, int))
+            )
+        elif offset:
             query = query.offset(offset)
 
         if limit:
             query = query.limit(limit)
 
-        count_query = (
-            select(func.count())
-            .select_from(Job)
-            .join(Rule)
-            .filter(Job.workflow_id == workflow_id)
-        )
-        if rule_name:
-            count_query = count_query.filter(Rule.name == rule_name)
-        if status:
-            count_query = count_query.filter(Job.status == status)
-
-        total_jobs_result = await self.db_session.execute(count_query)
-        total_jobs = total_jobs_result.scalar() or 0
+        total = await self._count_jobs(workflow_id, rule_name, status, matching)
 
         result = await self.db_session.execute(query)
         rows = result.all()
 
         results = [
-            JobResponse(**job.__dict__, rule_name=rule_name) for job, rule_name in rows
+            JobResponse(**job.__dict__, rule_name=rule_name)
+            for job, rule_name, _ in rows
         ]
 
+        next_cursor = None
+        if descending and limit and len(rows) == limit:
+            last, _, last_rank = rows[-1]
+            next_cursor = encode_cursor(last_rank, last.started_at, last.id)
+
         return JobListResponse(
-            jobs=results, total=total_jobs, limit=limit or 0, offset=offset or 0
+            jobs=results,
+            total=total.value,
+            approximate=total.approximate,
+            limit=limit or 0,
+            offset=offset or 0,
+            next_cursor=next_cursor,
         )
 
+    async def _count_jobs(
+        self,
+        workflow_id: uuid.UUID,
+        rule_name: str | None,
+        status: Status | None,
+        rows: Select,
+    ) -> ListTotal:
+        """Total of a job list, read from the job counters when they cover the filter."""
+        column = {
+            None: "total",
+            Status.SUCCESS: "success",
+            Status.RUNNING: "running",
+            Status.ERROR: "error",
+        }.get(status)
+        if column is None:
+            return await list_total(self.db_session, rows)
+        if rule_name:
+            stmt = (
+                select(func.sum(getattr(RuleJobCounts, column)))
+                .join(Rule, Rule.id == RuleJobCounts.rule_id)
+                .where(RuleJobCounts.workflow_id == workflow_id, Rule.name == rule_name)
+            )
+        else:
+            stmt = select(getattr(WorkflowJobCounts, column)).where(
+                WorkflowJobCounts.workflow_id == workflow_id
+            )
+        return ListTotal(await self.db_session.scalar(stmt) or 0)
+
     def _get_jobs_by_workflow_id(self):
         pass
 
@@ -184,14 +231,14 @@ class JobService:
         return results
 
     async def delete_jobs(self, workflow_id: uuid.UUID):
-        from sqlalchemy import delete
-
-        query_job_ids = select(Job.id).where(Job.workflow_id == workflow_id)
-        result = await self.db_session.execute(query_job_ids)
-        job_ids = result.scalars().all()
+        """Delete the run's jobs with their files (in batches), then its rules.
 
-        await self.db_session.execute(delete(File).where(File.job_id.in_(job_ids)))
-        await self.db_session.execute(delete(Job).where(Job.workflow_id == workflow_id))
+        The run's errors go too, as they reference its rules.
+        """
+        await delete_jobs_of(self.db_session, [workflow_id])
+        await self.db_session.execute(
+            delete(Error).where(Error.workflow_id == workflow_id)
+        )
         await self.db_session.execute(
             delete(Rule).where(Rule.workflow_id == workflow_id)
         )
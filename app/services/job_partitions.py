@@ -0,0 +1,438 @@
+"""Optional partitioning of ``jobs`` and ``files`` by job id, for large installs.
+
+``python -m app.manage jobs-partitions --convert`` turns both tables into range
+partitions of ``JOBS_PARTITION_SIZE`` job ids: ``jobs`` on ``id`` and ``files`` on
+``job_id``, with the same bounds, so a job and its files sit in the partitions
+``jobs_p<first id>`` and ``files_p<first id>``. Job ids grow with time, so each
+pair holds one stretch of history:
+
+* lookups by job id, and file lookups by job, touch a single partition; queries on
+  one run add ``run_job_ids`` (the run's job id range, kept by the job counters)
+  and only visit the partitions holding its jobs;
+* :func:`drop_history_before` removes runs started before a cutoff by dropping the
+  partitions that hold nothing else (reading each once, to take its jobs out of
+  the dashboard rollups, but without deleting rows), and deletes only the rows
+  left in partitions shared with newer runs.
+
+The conversion keeps existing rows in place, like the ``workflow_events`` migration:
+the old tables become the partitions ``jobs_legacy`` and ``files_legacy`` (every id
+below the first new partition), which can be dropped once all their runs are
+expired. Upcoming partitions are created ahead of the id sequence with the
+``workflow_events`` partitions; ids without a partition land in ``*_default``.
+
+``files`` partitions reference ``jobs`` by their own foreign key, as one on a
+partitioned ``files`` could not be added to the existing rows without a long lock.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.models.job_rollups import add_rollups_of
+from app.services.archive import remove_archived_rollups
+from app.services.reports.state_cache import workflow_state_cache
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> partition key
+PARTITION_KEYS = {"jobs": "id", "files": "job_id"}
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+@dataclass
+class IdPartition:
+    name: str
+    lower: int | None  # None: MINVALUE or the default partition
+    upper: int | None  # None: MAXVALUE or the default partition
+    is_default: bool = False
+
+
+def partition_name(parent: str, lower: int) -> str:
+    return f"{parent}_p{lower}"
+
+
+def _parse_bound(raw: str) -> int | None:
+    raw = raw.strip().strip("'")
+    if raw.upper() in ("MINVALUE", "MAXVALUE"):
+        return None
+    return int(raw)
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    return bool(
+        await db.scalar(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = 'jobs' AND pg_table_is_visible(c.oid))"
+            )
+        )
+    )
+
+
+async def list_partitions(db: AsyncSession, parent: str = "jobs") -> list[IdPartition]:
+    rows = await db.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent AND pg_table_is_visible(p.oid) "
+            "ORDER BY c.relname"
+        ),
+        {"parent": parent},
+    )
+    partitions = []
+    for name, bound in rows.all():
+        if bound == "DEFAULT":
+            partitions.append(IdPartition(name, None, None, is_default=True))
+            continue
+        match = _BOUND_RE.search(bound or "")
+        if match is None:
+            continue
+        partitions.append(
+            IdPartition(name, _parse_bound(match[1]), _parse_bound(match[2]))
+        )
+    return sorted(partitions, key=lambda p: (p.is_default, p.lower or 0))
+
+
+def _covers(partition: IdPartition, job_id: int) -> bool:
+    if partition.is_default:
+        return False
+    return (partition.lower is None or partition.lower <= job_id) and (
+        partition.upper is None or job_id < partition.upper
+    )
+
+
+async def _add_files_fk(db: AsyncSession, files_partition: str) -> None:
+    await db.execute(
+        text(
+            f'ALTER TABLE "{files_partition}" ADD CONSTRAINT '
+            f'"{files_partition}_job_id_fkey" FOREIGN KEY (job_id) REFERENCES jobs (id)'
+        )
+    )
+
+
+async def create_partition(db: AsyncSession, lower: int, upper: int) -> str | None:
+    """Create the ``jobs``/``files`` partitions of ids ``[lower, upper)``."""
+    try:
+        async with db.begin_nested():
+            for parent in PARTITION_KEYS:
+                await db.execute(
+                    text(
+                        f'CREATE TABLE "{partition_name(parent, lower)}" '
+                        f"PARTITION OF {parent} "
+                        f"FOR VALUES FROM ({lower}) TO ({upper})"
+                    )
+                )
+            await _add_files_fk(db, partition_name("files", lower))
+    except DBAPIError as e:
+        # Typically rows for those ids already sit in the default partition.
+        logger.warning("Could not create job partition %s: %s", lower, e.orig)
+        return None
+    logger.info("Created job partitions for ids %s to %s", lower, upper - 1)
+    return partition_name("jobs", lower)
+
+
+async def _last_id(db: AsyncSession, table: str = "jobs") -> int:
+    """Highest id taken from ``table``'s sequence so far (or stored in it)."""
+    sequence = await db.scalar(text(f"SELECT pg_get_serial_sequence('{table}', 'id')"))
+    return int(
+        await db.scalar(
+            text(
+                f"SELECT greatest((SELECT last_value FROM {sequence}), "
+                f"(SELECT max(id) FROM {table}), 0)"
+            )
+        )
+    )
+
+
+async def ensure_job_partitions(
+    db: AsyncSession, ahead: int | None = None, size: int | None = None
+) -> list[str]:
+    """Create the partition of the next job id and ``ahead`` partitions after it.
+
+    New partitions end on multiples of ``size`` and fill the gaps left by
+    existing ones (the legacy partition, or partitions of another size).
+    """
+    if not await is_partitioned(db):
+        return []
+    ahead = settings.JOBS_PARTITIONS_AHEAD if ahead is None else ahead
+    size = size or settings.JOBS_PARTITION_SIZE
+    partitions = [p for p in await list_partitions(db) if not p.is_default]
+    job_id = await _last_id(db) + 1
+    created = []
+    for _ in range(ahead + 1):
+        existing = next((p for p in partitions if _covers(p, job_id)), None)
+        if existing is not None:
+            if existing.upper is None:
+                break
+            job_id = existing.upper
+            continue
+        lower = max(
+            [job_id // size * size]
+            + [p.upper for p in partitions if p.upper is not None and p.upper <= job_id]
+        )
+        upper = min(
+            [(lower // size + 1) * size]
+            + [p.lower for p in partitions if p.lower is not None and p.lower > lower]
+        )
+        name = await create_partition(db, lower, upper)
+        if name is None:
+            break
+        created.append(name)
+        partitions.append(IdPartition(name, lower, upper))
+        job_id = upper
+    return created
+
+
+async def convert_to_partitioned(engine: AsyncEngine, size: int | None = None) -> int:
+    """Turn ``jobs`` and ``files`` into tables partitioned by job id, online.
+
+    Indexes and range CHECKs for the legacy partitions are built without blocking
+    writes; a short exclusive lock then swaps in the partitioned parents. Returns
+    the first job id of the new partitions.
+    """
+    size = size or settings.JOBS_PARTITION_SIZE
+    async with AsyncSession(engine) as db:
+        if await is_partitioned(db):
+            raise RuntimeError("jobs is already partitioned")
+        # Leave a partition's worth of ids for jobs written during the conversion.
+        boundary = (await _last_id(db) + size) // size * size + size
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            text(
+                "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS files_legacy_pkey "
+                "ON files (id, job_id)"
+            )
+        )
+        # NOT VALID + VALIDATE: only a brief lock, the scan does not block writes.
+        for table, key in PARTITION_KEYS.items():
+            bound = f"{table}_legacy_bound"
+            await conn.execute(
+                text(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {bound}")
+            )
+            await conn.execute(
+                text(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {bound} "
+                    f"CHECK ({key} < {boundary}) NOT VALID"
+                )
+            )
+            await conn.execute(text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {bound}"))
+
+    async with AsyncSession(engine) as db:
+        await db.execute(text("LOCK TABLE jobs, files IN ACCESS EXCLUSIVE MODE"))
+        triggers = (
+            await db.execute(
+                text(
+                    "SELECT tgname, tgrelid::regclass::text, pg_get_triggerdef(oid) "
+                    "FROM pg_trigger WHERE NOT tgisinternal "
+                    "AND tgrelid IN ('jobs'::regclass, 'files'::regclass)"
+                )
+            )
+        ).all()
+        indexes = (
+            await db.execute(
+                text(
+                    "SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) "
+                    "FROM pg_index i WHERE NOT i.indisprimary "
+                    "AND i.indexrelid <> 'files_legacy_pkey'::regclass "
+                    "AND i.indrelid IN ('jobs'::regclass, 'files'::regclass)"
+                )
+            )
+        ).all()
+        foreign_keys = (
+            await db.execute(
+                text(
+                    "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                    "WHERE contype = 'f' AND conrelid = 'jobs'::regclass"
+                )
+            )
+        ).all()
+
+        for name, table, _ in triggers:
+            await db.execute(text(f'DROP TRIGGER "{name}" ON {table}'))
+        await db.execute(text("ALTER TABLE files DROP CONSTRAINT files_job_id_fkey"))
+        await db.execute(text("ALTER TABLE files DROP CONSTRAINT files_pkey"))
+        await db.execute(
+            text(
+                "ALTER TABLE files ADD CONSTRAINT files_legacy_pkey "
+                "PRIMARY KEY USING INDEX files_legacy_pkey"
+            )
+        )
+        await db.execute(
+            text("ALTER TABLE jobs RENAME CONSTRAINT jobs_pkey TO jobs_legacy_pkey")
+        )
+        for name, _ in foreign_keys:
+            await db.execute(
+                text(
+                    f'ALTER TABLE jobs RENAME CONSTRAINT "{name}" '
+                    f'TO "{_legacy_name(name)}"'
+                )
+            )
+        for name, _ in indexes:
+            await db.execute(
+                text(f'ALTER INDEX "{name}" RENAME TO "{_legacy_name(name)}"')
+            )
+
+        for table, key in PARTITION_KEYS.items():
+            await db.execute(text(f"ALTER TABLE {table} RENAME TO {table}_legacy"))
+            await db.execute(
+                text(
+                    f"CREATE TABLE {table} (LIKE {table}_legacy INCLUDING DEFAULTS) "
+                    f"PARTITION BY RANGE ({key})"
+                )
+            )
+            sequence = await db.scalar(
+                text(f"SELECT pg_get_serial_sequence('{table}_legacy', 'id')")
+            )
+            await db.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+        await db.execute(
+            text("ALTER TABLE jobs ADD CONSTRAINT jobs_pkey PRIMARY KEY (id)")
+        )
+        await db.execute(
+            text("ALTER TABLE files ADD CONSTRAINT files_pkey PRIMARY KEY (id, job_id)")
+        )
+        for name, definition in foreign_keys:
+            await db.execute(
+                text(f'ALTER TABLE jobs ADD CONSTRAINT "{name}" {definition}')
+            )
+        for _, definition in indexes:
+            await db.execute(text(definition))
+
+        # The legacy tables' indexes and foreign keys are reused; the CHECKs spare
+        # the validation scans.
+        for table in PARTITION_KEYS:
+            await db.execute(
+                text(
+                    f"ALTER TABLE {table} ATTACH PARTITION {table}_legacy "
+                    f"FOR VALUES FROM (MINVALUE) TO ({boundary})"
+                )
+            )
+            await db.execute(
+                text(f"ALTER TABLE {table}_legacy DROP CONSTRAINT {table}_legacy_bound")
+            )
+            await db.execute(
+                text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+            )
+        await _add_files_fk(db, "files_default")
+        for _, _, definition in triggers:
+            await db.execute(text(definition))
+        await ensure_job_partitions(db, size=size)
+        await db.commit()
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(
+            text(
+                "ALTER TABLE files_legacy ADD CONSTRAINT files_legacy_job_id_fkey "
+                "FOREIGN KEY (job_id) REFERENCES jobs (id) NOT VALID"
+            )
+        )
+        await conn.execute(
+            text(
+                "ALTER TABLE files_legacy VALIDATE CONSTRAINT files_legacy_job_id_fkey"
+            )
+        )
+    logger.info("Partitioned jobs and files; new partitions start at id %s", boundary)
+    return boundary
+
+
+def _legacy_name(name: str) -> str:
+    for table in PARTITION_KEYS:
+        if f"{table}_" in name:
+            return name.replace(f"{table}_", f"{table}_legacy_", 1)
+    return f"{name}_legacy"
+
+
+async def drop_history_before(db: AsyncSession, cutoff: datetime) -> dict:
+    """Delete the runs started before ``cutoff`` with their jobs, files and rules.
+
+    Partitions holding only jobs of those runs are dropped whole; the rest is
+    deleted row by row. Works on unpartitioned tables too (all rows then).
+    """
+    # Archived runs are not restored: the jobs their archives recorded leave the
+    # rollups here, and deleting their stubs drops the archives.
+    archived = await db.scalars(
+        text(
+            "SELECT id FROM workflows "
+            "WHERE started_at < :cutoff AND archived_at IS NOT NULL FOR UPDATE"
+        ),
+        {"cutoff": cutoff},
+    )
+    await remove_archived_rollups(db, archived.all())
+
+    # Jobs of runs to keep all have ids from here on (newer runs get higher ids).
+    keep_from = await db.scalar(
+        text(
+            "SELECT min(c.first_job_id) FROM workflows w "
+            "JOIN workflow_job_counts c ON c.workflow_id = w.id "
+            "WHERE w.started_at >= :cutoff OR w.started_at IS NULL"
+        ),
+        {"cutoff": cutoff},
+    )
+    if keep_from is None:
+        keep_from = await _last_id(db) + 1
+
+    dropped = []
+    if await is_partitioned(db):
+        for partition in await list_partitions(db):
+            if partition.is_default or partition.upper is None:
+                continue
+            if partition.upper > keep_from:
+                continue
+            suffix = partition.name.removeprefix("jobs")
+            # Dropping skips the trigger keeping the dashboard rollups
+            await db.execute(add_rollups_of(partition.name, sign=-1))
+            await db.execute(text(f'DROP TABLE "files{suffix}"'))
+            # Detaching drops the references from other files partitions' FKs
+            # (after checking none of their rows point into it).
+            await db.execute(
+                text(f'ALTER TABLE jobs DETACH PARTITION "{partition.name}"')
+            )
+            await db.execute(text(f'DROP TABLE "{partition.name}"'))
+            dropped.append(partition.name)
+            logger.info("History: dropped partition %s", partition.name)
+
+    expired = "SELECT id FROM workflows WHERE started_at < :cutoff"
+    params = {"cutoff": cutoff}
+    await db.execute(
+        text(
+            "DELETE FROM files f USING jobs j "
+            f"WHERE f.job_id = j.id AND j.workflow_id IN ({expired})"
+        ),
+        params,
+    )
+    jobs = await db.execute(
+        text(f"DELETE FROM jobs WHERE workflow_id IN ({expired})"), params
+    )
+    await db.execute(
+        text(f"DELETE FROM errors WHERE workflow_id IN ({expired})"), params
+    )
+    await db.execute(
+        text(f"DELETE FROM rules WHERE workflow_id IN ({expired})"), params
+    )
+    workflow_ids = (
+        await db.scalars(
+            text("DELETE FROM workflows WHERE started_at < :cutoff RETURNING id"),
+            params,
+        )
+    ).all()
+    for workflow_id in workflow_ids:
+        workflow_state_cache.evict(workflow_id)
+    return {
+        "partitions": dropped,
+        "workflows": len(workflow_ids),
+        "jobs_deleted": jobs.rowcount,
+    }
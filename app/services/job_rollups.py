@@ -0,0 +1,95 @@
+"""Folding of ``job_rollup_deltas`` into the dashboard rollups.
+
+The triggers on ``jobs`` only append deltas (see ``app.models.job_rollups``), so
+job writes never wait on the rollup rows that all runs of a rule share. A single
+folder, under a transaction-scoped advisory lock, moves the deltas into
+``job_daily_rollups`` and ``job_duration_buckets`` every
+``JOB_ROLLUPS_FOLD_SECONDS``, ``JOB_ROLLUPS_FOLD_BATCH_SIZE`` deltas per short
+transaction. It is the only writer of those rows, so folds never contend with job
+writes or with each other, and apply each batch in rollup id order. Readers add
+the deltas not folded yet (``current_rollups``), so folding late only grows the
+delta log.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+
+# pg advisory lock key of the rollup folder ("rollup" in ASCII)
+FOLD_LOCK_KEY = 0x726F6C6C7570
+
+_COUNTS = ("total", "success", "running", "error", "duration_count", "duration_sum")
+
+# Move the oldest ``:limit`` deltas into the rollups; returns how many were moved
+_FOLD = text(f"""
+    WITH moved AS (
+        DELETE FROM job_rollup_deltas
+        WHERE id IN (
+            SELECT id FROM job_rollup_deltas ORDER BY id LIMIT :limit
+        )
+        RETURNING rollup_id, {", ".join(_COUNTS)}, bucket
+    ), summed AS (
+        SELECT rollup_id, {", ".join(f"sum({c}) AS {c}" for c in _COUNTS)}
+        FROM moved
+        GROUP BY rollup_id
+        ORDER BY rollup_id
+    ), rollups AS (
+        UPDATE job_daily_rollups r SET
+            {", ".join(f"{c} = r.{c} + s.{c}" for c in _COUNTS)}
+        FROM summed s
+        WHERE r.id = s.rollup_id
+    ), buckets AS (
+        INSERT INTO job_duration_buckets AS b (rollup_id, bucket, count)
+        SELECT rollup_id, bucket, sum(duration_count)
+        FROM moved
+        WHERE bucket IS NOT NULL
+        GROUP BY rollup_id, bucket
+        ORDER BY rollup_id, bucket
+        ON CONFLICT (rollup_id, bucket) DO UPDATE SET count = b.count + EXCLUDED.count
+    )
+    SELECT count(*) FROM moved
+""")
+
+
+async def fold_job_rollups(db: AsyncSession, batch_size: int | None = None) -> int:
+    """Fold the pending deltas in, committing every batch; returns how many.
+
+    Returns 0 without waiting when another process is folding.
+    """
+    batch_size = batch_size or settings.JOB_ROLLUPS_FOLD_BATCH_SIZE
+    folded = 0
+    while True:
+        locked = await db.scalar(select(func.pg_try_advisory_xact_lock(FOLD_LOCK_KEY)))
+        if not locked:
+            await db.rollback()
+            return folded
+        moved = await db.scalar(_FOLD, {"limit": batch_size})
+        await db.commit()
+        folded += moved
+        if moved < batch_size:
+            return folded
+
+
+async def job_rollup_fold_loop(
+    session_factory: SessionFactory = AsyncSessionLocal,
+) -> None:
+    """Run :func:`fold_job_rollups` every ``JOB_ROLLUPS_FOLD_SECONDS``."""
+    while True:
+        try:
+            async with session_factory() as db:
+                await fold_job_rollups(db)
+        except Exception as e:
+            logger.error("Folding job rollups failed: %s", e)
+        await asyncio.sleep(settings.JOB_ROLLUPS_FOLD_SECONDS)
@@ -0,0 +1,119 @@
+"""Totals of list pages without an exact ``count(*)`` per request.
+
+Counting every matching row costs about as much as reading them, so list totals
+come from, cheapest first:
+
+* the job counter tables, for job lists filtered by nothing but status or rule
+  (exact, see ``app.models.job_counts``; done by ``JobService``);
+* the planner's row estimate, once it reaches ``LIST_COUNT_ESTIMATE_THRESHOLD``,
+  returned as ``approximate`` (the UI shows "~12,000");
+* an exact count, reused for ``LIST_COUNT_CACHE_TTL_SECONDS`` per filter set.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.config import settings
+
+_MAX_CACHED = 1024
+
+
+class ListTotal(NamedTuple):
+    value: int
+    approximate: bool = False
+
+
+class CountCache:
+    """Exact counts by the SQL (filters and user scope included) that produced them."""
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    def get(self, key: str) -> int | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[0]
+
+    def put(self, key: str, value: int) -> None:
+        self._entries[key] = (
+            value,
+            time.monotonic() + settings.LIST_COUNT_CACHE_TTL_SECONDS,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > _MAX_CACHED:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+count_cache = CountCache()
+
+
+def _literal_sql(stmt: Select) -> str | None:
+    try:
+        return str(
+            stmt.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+    except CompileError:
+        return None
+
+
+class _Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, run with its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def estimate_rows(db: AsyncSession, stmt: Select) -> int:
+    """Rows the planner expects ``stmt`` to return."""
+    plan = (await db.execute(_Explain(stmt))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def list_total(db: AsyncSession, rows: Select) -> ListTotal:
+    """Total of a list whose filtered, unpaged rows are selected by ``rows``."""
+    rows = rows.order_by(None).limit(None).offset(None)
+    count_stmt = select(func.count()).select_from(rows.subquery())
+    sql = _literal_sql(rows)
+
+    threshold = settings.LIST_COUNT_ESTIMATE_THRESHOLD
+    if threshold > 0:
+        estimate = await estimate_rows(db, rows)
+        if estimate >= threshold:
+            return ListTotal(estimate, approximate=True)
+
+    if sql is None:
+        return ListTotal(await db.scalar(count_stmt) or 0)
+    total = count_cache.get(sql)
+    if total is None:
+        total = await db.scalar(count_stmt) or 0
+        count_cache.put(sql, total)
+    return ListTotal(total)
@@ -3,7 +3,7 @@ from pathlib import Path
 from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import and_, desc, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.permissions import (
@@ -21,6 +21,7 @@ from app.services.catalog.catalog_storage import (
 )
 from app.services.catalog.service import CatalogService
 from app.services.catalog.utils import catalog_data_dir
+from app.services.list_counts import list_total
 from app.services.mcp.workflows import duration_seconds, status_value
 from app.services.workflow import WorkflowService
 
@@ -352,17 +353,17 @@ class McpCatalogService:
             filters.append(Workflow.started_at >= cutoff)
 
         stmt = select(Workflow).where(and_(*filters))
-        count_stmt = select(func.count(Workflow.id)).where(and_(*filters))
+        matching = self._scope_workflows(select(Workflow.id).where(and_(*filters)))
         stmt = (
             self._scope_workflows(stmt).order_by(desc(Workflow.started_at)).limit(limit)
         )
-        count_stmt = self._scope_workflows(count_stmt)
 
         workflows = (await self.db.execute(stmt)).scalars().all()
-        total = (await self.db.execute(count_stmt)).scalar() or 0
+        total = await list_total(self.db, matching)
+        progress_by_id = await self.workflow_service.get_progress_many(workflows)
         rows = []
         for workflow in workflows:
-            progress = await self.workflow_service.get_progress(workflow.id)
+            progress = progress_by_id[workflow.id]
             total_jobs = progress.get("total", 0)
             completed_jobs = progress.get("completed", 0)
             rows.append(
@@ -386,7 +387,8 @@ class McpCatalogService:
 
         return {
             "catalog": {"id": str(cat.id), "slug": cat.slug, "name": cat.name},
-            "total_matches": total,
+            "total_matches": total.value,
+            "total_is_estimate": total.approximate,
             "returned": len(rows),
             "workflows": rows,
         }
@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import and_, cast, desc, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -22,6 +22,8 @@ from app.models import (
     Workflow,
 )
 from app.models.enums import FileType
+from app.models.job_counts import run_job_ids
+from app.services.list_counts import list_total
 from app.services.workflow import WorkflowService
 
 TEXT_SUFFIXES = {
@@ -238,12 +240,9 @@ class McpWorkflowService:
         return stmt.where(workflow_read_filter(self.user))
 
     async def get_readable_workflow(self, workflow_id: uuid.UUID) -> Workflow:
-        stmt = (
-            select(Workflow)
-            .options(selectinload(Workflow.catalog))
-            .where(Workflow.id == workflow_id)
+        workflow = await self.workflow_service.get_workflow(
+            workflow_id, restore=True, user=self.user
         )
-        workflow = (await self.db.execute(stmt)).scalar_one_or_none()
         return assert_workflow_readable(workflow, self.user)
 
     def _workflow_row(self, workflow: Workflow, progress: dict[str, int] | None = None):
@@ -403,7 +402,7 @@ class McpWorkflowService:
             filters.append(Catalog.slug == catalog_slug)
 
         if tag:
-            filters.append(func.array_position(Workflow.tags, tag) > 0)
+            filters.append(Workflow.tags.contains(cast([tag], Workflow.tags.type)))
 
         if since_hours:
             cutoff = datetime.now(UTC) - timedelta(hours=since_hours)
@@ -422,12 +421,10 @@ class McpWorkflowService:
         limit: int = 10,
     ) -> dict[str, Any]:
         stmt = select(Workflow).options(selectinload(Workflow.catalog))
-        count_stmt = select(func.count(Workflow.id))
+        matching = select(Workflow.id)
         if catalog_slug:
             stmt = stmt.outerjoin(Catalog, Workflow.catalog_id == Catalog.id)
-            count_stmt = count_stmt.outerjoin(
-                Catalog, Workflow.catalog_id == Catalog.id
-            )
+            matching = matching.outerjoin(Catalog, Workflow.catalog_id == Catalog.id)
 
         filters = self._workflow_filters(
             status=status,
@@ -438,21 +435,20 @@ class McpWorkflowService:
         )
         if filters:
             stmt = stmt.where(and_(*filters))
-            count_stmt = count_stmt.where(and_(*filters))
+            matching = matching.where(and_(*filters))
 
         stmt = self._scope_workflows(stmt)
-        count_stmt = self._scope_workflows(count_stmt)
+        matching = self._scope_workflows(matching)
         stmt = stmt.order_by(desc(Workflow.started_at)).limit(limit)
 
         workflows = (await self.db.execute(stmt)).scalars().all()
-        total = (await self.db.execute(count_stmt)).scalar() or 0
-        rows = []
-        for workflow in workflows:
-            progress = await self.workflow_service.get_progress(workflow.id)
-            rows.append(self._workflow_row(workflow, progress))
+        total = await list_total(self.db, matching)
+        progress = await self.workflow_service.get_progress_many(workflows)
+        rows = [self._workflow_row(w, progress[w.id]) for w in workflows]
 
         return {
-            "total_matches": total,
+            "total_matches": total.value,
+            "total_is_estimate": total.approximate,
             "returned": len(rows),
             "workflows": rows,
         }
@@ -482,7 +478,9 @@ class McpWorkflowService:
         detail = await self.workflow_service.get_detail(workflow_id)
         rules = await self.workflow_service.get_rules(workflow_id)
 
-        jobs_stmt = select(Job).where(Job.workflow_id == workflow_id)
+        jobs_stmt = select(Job).where(
+            Job.workflow_id == workflow_id, run_job_ids(workflow_id)
+        )
         jobs = (await self.db.execute(jobs_stmt)).scalars().all()
         progress = await self.workflow_service.get_progress(workflow_id)
 
@@ -575,7 +573,11 @@ class McpWorkflowService:
         jobs_stmt = (
             select(Job)
             .options(selectinload(Job.rule), selectinload(Job.files))
-            .where(Job.workflow_id == workflow_id, Job.status == Status.ERROR)
+            .where(
+                Job.workflow_id == workflow_id,
+                run_job_ids(workflow_id),
+                Job.status == Status.ERROR,
+            )
             .order_by(Job.started_at)
         )
         failed_jobs = (await self.db.execute(jobs_stmt)).scalars().all()
@@ -621,6 +623,7 @@ class McpWorkflowService:
                     "shellcmd": job.shellcmd,
                     "started_at": dt(job.started_at),
                     "end_time": dt(job.end_time),
+                    "error_excerpt": job.error_excerpt,
                     "files": [
                         {"path": f.path, "file_type": status_value(f.file_type)}
                         for f in job.files
@@ -674,7 +677,7 @@ class McpWorkflowService:
         stmt = (
             select(Job)
             .options(selectinload(Job.rule))
-            .where(Job.workflow_id == workflow_id)
+            .where(Job.workflow_id == workflow_id, run_job_ids(workflow_id))
             .order_by(Job.started_at)
             .limit(limit)
         )
@@ -725,7 +728,11 @@ class McpWorkflowService:
             select(File)
             .options(selectinload(File.job).selectinload(Job.rule))
             .join(Job, File.job_id == Job.id)
-            .where(Job.workflow_id == workflow_id, File.file_type == FileType.OUTPUT)
+            .where(
+                Job.workflow_id == workflow_id,
+                run_job_ids(workflow_id, File.job_id),
+                File.file_type == FileType.OUTPUT,
+            )
         )
         if suffix:
             normalized = suffix if suffix.startswith(".") else f".{suffix}"
@@ -761,7 +768,9 @@ class McpWorkflowService:
                 selectinload(File.job).selectinload(Job.files),
             )
             .join(Job, File.job_id == Job.id)
-            .where(Job.workflow_id == workflow_id)
+            .where(
+                Job.workflow_id == workflow_id, run_job_ids(workflow_id, File.job_id)
+            )
         )
         files = (await self.db.execute(stmt)).scalars().all()
         matches = [f for f in files if f.path == path or f.path.endswith(path)]
@@ -815,7 +824,11 @@ class McpWorkflowService:
             select(File)
             .options(selectinload(File.job).selectinload(Job.rule))
             .join(Job, File.job_id == Job.id)
-            .where(Job.workflow_id == workflow_id, File.file_type.in_(file_types))
+            .where(
+                Job.workflow_id == workflow_id,
+                run_job_ids(workflow_id, File.job_id),
+                File.file_type.in_(file_types),
+            )
         )
         rows = (await self.db.execute(stmt)).scalars().all()
         if path is None:
@@ -1063,7 +1076,11 @@ class McpWorkflowService:
             select(File)
             .options(selectinload(File.job).selectinload(Job.rule))
             .join(Job, File.job_id == Job.id)
-            .where(Job.workflow_id == workflow_id, File.file_type == FileType.LOG)
+            .where(
+                Job.workflow_id == workflow_id,
+                run_job_ids(workflow_id, File.job_id),
+                File.file_type == FileType.LOG,
+            )
         )
         if job_id is not None:
             stmt = stmt.where(Job.id == job_id)
@@ -1,7 +1,8 @@
 """Email notification service for FlowO.
 
 Provides HTML email templates and SMTP sending for:
-- Workflow lifecycle: submitted, succeeded, failed
+- Workflow lifecycle: submitted, succeeded, failed (queued in ``notification_outbox``,
+  delivered by ``app.services.notification_outbox``; bursts become digests)
 - User lifecycle: registration, password reset, email verification
 """
 
@@ -12,10 +13,11 @@ from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.notification_outbox import NotificationOutbox
 from app.models.system_settings import SystemSettings
+from app.services.system_settings import system_settings_cache
 
 logger = logging.getLogger("flowo.notification")
 
@@ -142,6 +144,46 @@ def workflow_failure_html(
     return _wrap_html(content, "#f43f5e")
 
 
+_DIGEST_LABELS = {
+    "submitted": ("Submitted", "#0284c7"),
+    "success": ("Succeeded", "#059669"),
+    "failure": ("Failed", "#e11d48"),
+}
+
+
+def workflow_digest_html(
+    user_email: str, items: list[tuple[str, str, str]], site_url: str = ""
+) -> str:
+    """One email for a burst of workflow notifications: ``(kind, name, detail)`` rows."""
+    link = _get_absolute_url(site_url, "/workflow")
+    failed = sum(1 for kind, _, _ in items if kind == "failure")
+    rows = "".join(
+        f"""<div class="info-row"><span class="info-value">{name or "Unnamed"}</span><span class="info-value" style="color: {_DIGEST_LABELS.get(kind, ("", "#475569"))[1]};">{_DIGEST_LABELS.get(kind, (kind, ""))[0]}</span></div>
+            <div style="color: #94a3b8; font-size: 12px; padding-bottom: 6px;">{(detail or "")[:200]}</div>"""
+        for kind, name, detail in items
+    )
+    accent = "#f43f5e" if failed else "#0ea5e9"
+    content = f"""
+    <div class="header" style="border-bottom: 3px solid {accent};">
+        <div class="sub" style="color: {accent};">workflow notification digest</div>
+        <h1 style="color: #0f172a;">{len(items)} Workflow Updates</h1>
+    </div>
+    <div class="body">
+        <p style="color: #475569; font-size: 14px; line-height: 1.7;">
+            Several of your workflows changed state at about the same time ({failed} failed).
+        </p>
+        <div style="background: #f8fafc; border-radius: 12px; padding: 16px 20px; margin: 20px 0;">
+            <div class="info-row"><span class="info-label">User</span><span class="info-value">{user_email}</span></div>
+            {rows}
+        </div>
+        <div style="text-align: center;">
+            <a href="{link}" class="btn" style="background: {accent};">View in Dashboard</a>
+        </div>
+    </div>
+    <div class="footer">FlowO Workflow Management System</div>"""
+    return _wrap_html(content, accent)
+
+
 # ─── User Lifecycle Email Templates ───────────────────────────────────────────
 
 
@@ -222,39 +264,82 @@ def verify_email_html(user_email: str, token: str, site_url: str = "") -> str:
 # ─── SMTP Send Logic ──────────────────────────────────────────────────────────
 
 
+def smtp_configured(settings: SystemSettings) -> bool:
+    return all([settings.smtp_host, settings.smtp_port, settings.smtp_from])
+
+
+def _build_message(
+    settings: SystemSettings, to_email: str, subject: str, html: str
+) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = settings.smtp_from
+    msg["To"] = to_email
+    msg.attach(MIMEText(html, "html"))
+    return msg
+
+
+def _connect_smtp(settings: SystemSettings) -> smtplib.SMTP:
+    if settings.smtp_use_tls:
+        server = smtplib.SMTP_SSL(settings.smtp_host, settings.smtp_port, timeout=15)
+    else:
+        server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=15)
+        server.starttls()
+
+    if settings.smtp_user and settings.smtp_password:
+        server.login(settings.smtp_user, settings.smtp_password)
+    return server
+
+
+class SmtpSession:
+    """One SMTP connection reused for many messages (synchronous, run in a thread).
+
+    Connects on the first message and reconnects once if the server dropped an idle
+    connection. ``send`` raises on failure so the caller can retry the message.
+    """
+
+    def __init__(self, settings: SystemSettings):
+        self.settings = settings
+        self._server: smtplib.SMTP | None = None
+
+    def send(self, to_email: str, subject: str, html: str) -> None:
+        msg = _build_message(self.settings, to_email, subject, html)
+        if self._server is None:
+            self._server = _connect_smtp(self.settings)
+        try:
+            self._server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._server = _connect_smtp(self.settings)
+            self._server.send_message(msg)
+        logger.info("Email sent to %s: %s", to_email, subject)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            pass
+        self._server = None
+
+
 def _send_smtp(
     settings: SystemSettings, to_email: str, subject: str, html: str
 ) -> bool:
     """Synchronous SMTP send. Should be called via asyncio.to_thread."""
-    if not all([settings.smtp_host, settings.smtp_port, settings.smtp_from]):
+    if not smtp_configured(settings):
         logger.warning("SMTP not configured — skipping email to %s", to_email)
         return False
 
+    session = SmtpSession(settings)
     try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = settings.smtp_from
-        msg["To"] = to_email
-        msg.attach(MIMEText(html, "html"))
-
-        if settings.smtp_use_tls:
-            server = smtplib.SMTP_SSL(
-                settings.smtp_host, settings.smtp_port, timeout=15
-            )
-        else:
-            server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=15)
-            server.starttls()
-
-        if settings.smtp_user and settings.smtp_password:
-            server.login(settings.smtp_user, settings.smtp_password)
-
-        server.send_message(msg)
-        server.quit()
-        logger.info("Email sent to %s: %s", to_email, subject)
+        session.send(to_email, subject, html)
         return True
     except Exception:
         logger.exception("Failed to send email to %s", to_email)
         return False
+    finally:
+        session.close()
 
 
 async def send_email(
@@ -267,76 +352,78 @@ async def send_email(
 # ─── High-level notification functions ─────────────────────────────────────────
 
 
-def _get_settings(db: Session) -> SystemSettings | None:
-    result = db.execute(select(SystemSettings))
-    return result.scalar_one_or_none()
+async def _get_settings(db: AsyncSession) -> SystemSettings | None:
+    return await system_settings_cache.get(db)
 
 
-def notify_workflow_submitted(db: Session, workflow_name: str, user_email: str) -> None:
-    """Fire-and-forget notification for workflow submission."""
-    settings = _get_settings(db)
-    if not settings or not settings.notify_on_submit:
+def _queue_workflow_email(
+    db: AsyncSession, kind: str, workflow_name: str, user_email: str, detail: str
+) -> None:
+    # Delivered by the outbox worker once (and only if) the caller commits.
+    db.add(
+        NotificationOutbox(
+            kind=kind,
+            to_email=user_email,
+            workflow_name=workflow_name,
+            detail=detail,
+        )
+    )
+
+
+async def notify_workflow_submitted(
+    db: AsyncSession, workflow_name: str, user_email: str
+) -> None:
+    """Queue the workflow submission email in the caller's transaction."""
+    settings = await _get_settings(db)
+    if not settings or not settings.notify_on_submit or not user_email:
         return
-    html = workflow_submitted_html(
+    _queue_workflow_email(
+        db,
+        "submitted",
         workflow_name,
         user_email,
         datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        settings.site_url or "",
-    )
-    asyncio.get_event_loop().create_task(
-        send_email(
-            settings,
-            user_email,
-            f"[FlowO] Workflow Submitted: {workflow_name or 'Unnamed'}",
-            html,
-        )
     )
 
 
-def notify_workflow_success(
-    db: Session, workflow_name: str, user_email: str, duration: str
+async def notify_workflow_success(
+    db: AsyncSession, workflow_name: str, user_email: str, duration: str
 ) -> None:
-    """Fire-and-forget notification for workflow success."""
-    settings = _get_settings(db)
-    if not settings or not settings.notify_on_success:
+    """Queue the workflow success email in the caller's transaction."""
+    settings = await _get_settings(db)
+    if not settings or not settings.notify_on_success or not user_email:
         return
-    html = workflow_success_html(
-        workflow_name, user_email, duration, settings.site_url or ""
-    )
-    asyncio.get_event_loop().create_task(
-        send_email(
-            settings,
-            user_email,
-            f"[FlowO] Workflow Completed: {workflow_name or 'Unnamed'}",
-            html,
-        )
-    )
+    _queue_workflow_email(db, "success", workflow_name, user_email, duration)
 
 
-def notify_workflow_failure(
-    db: Session, workflow_name: str, user_email: str, error_msg: str
+async def notify_workflow_failure(
+    db: AsyncSession, workflow_name: str, user_email: str, error_msg: str
 ) -> None:
-    """Fire-and-forget notification for workflow failure."""
-    settings = _get_settings(db)
-    if not settings or not settings.notify_on_failure:
+    """Queue the workflow failure email in the caller's transaction."""
+    settings = await _get_settings(db)
+    if not settings or not settings.notify_on_failure or not user_email:
         return
-    html = workflow_failure_html(
-        workflow_name, user_email, error_msg, settings.site_url or ""
-    )
-    asyncio.get_event_loop().create_task(
-        send_email(
-            settings,
-            user_email,
-            f"[FlowO] Workflow Failed: {workflow_name or 'Unnamed'}",
-            html,
-        )
-    )
+    _queue_workflow_email(db, "failure", workflow_name, user_email, error_msg)
+
+
+def render_workflow_email(
+    kind: str, workflow_name: str, user_email: str, detail: str, site_url: str = ""
+) -> tuple[str, str]:
+    """Subject and HTML of one queued workflow email."""
+    name = workflow_name or "Unnamed"
+    if kind == "submitted":
+        html = workflow_submitted_html(workflow_name, user_email, detail, site_url)
+        return f"[FlowO] Workflow Submitted: {name}", html
+    if kind == "success":
+        html = workflow_success_html(workflow_name, user_email, detail, site_url)
+        return f"[FlowO] Workflow Completed: {name}", html
+    html = workflow_failure_html(workflow_name, user_email, detail, site_url)
+    return f"[FlowO] Workflow Failed: {name}", html
 
 
 async def notify_user_registered(db_session, user_email: str) -> None:
     """Send welcome email after user registration."""
-    result = await db_session.execute(select(SystemSettings))
-    settings = result.scalar_one_or_none()
+    settings = await _get_settings(db_session)
     if not settings or not settings.smtp_host:
         return
     html = welcome_html(user_email, settings.site_url or "")
@@ -347,8 +434,7 @@ async def notify_user_registered(db_session, user_email: str) -> None:
 
 async def notify_password_reset(db_session, user_email: str, token: str) -> None:
     """Send password reset email."""
-    result = await db_session.execute(select(SystemSettings))
-    settings = result.scalar_one_or_none()
+    settings = await _get_settings(db_session)
     if not settings or not settings.smtp_host:
         return
     html = reset_password_html(user_email, token, settings.site_url or "")
@@ -357,8 +443,7 @@ async def notify_password_reset(db_session, user_email: str, token: str) -> None
 
 async def notify_verify_email(db_session, user_email: str, token: str) -> None:
     """Send verification email."""
-    result = await db_session.execute(select(SystemSettings))
-    settings = result.scalar_one_or_none()
+    settings = await _get_settings(db_session)
     if not settings or not settings.smtp_host:
         return
     html = verify_email_html(user_email, token, settings.site_url or "")
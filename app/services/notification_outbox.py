@@ -0,0 +1,235 @@
+"""Delivery of queued workflow emails from ``notification_outbox``.
+
+A single worker drains the outbox, even with several processes. Each batch runs
+under a transaction-scoped advisory lock, and processes that don't get the lock
+skip the round. Delivery works like this:
+
+* the pending rows of one recipient become a single digest email once there are
+  ``NOTIFICATIONS_DIGEST_MIN`` or more of them, so a burst of failing runs sends a
+  handful of emails instead of one per run;
+* one SMTP connection is reused across messages and batches, and closed when the
+  outbox is idle or the system settings change;
+* at most ``NOTIFICATIONS_RATE_PER_MINUTE`` messages are sent per minute: messages
+  over the rate are put back with ``next_attempt_at`` at their send slot, and the
+  worker waits for it after committing, so it never sleeps holding the lock;
+* a failed message is retried with exponential backoff and marked ``failed``
+  after ``NOTIFICATIONS_MAX_ATTEMPTS``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.session import AsyncSessionLocal
+from app.models import NotificationOutbox, SystemSettings
+from app.services.notification import (
+    SmtpSession,
+    render_workflow_email,
+    smtp_configured,
+    workflow_digest_html,
+)
+from app.services.system_settings import system_settings_cache
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+
+# pg advisory lock key of the outbox worker ("outbox" in ASCII)
+OUTBOX_LOCK_KEY = 0x6F7574626F78
+SENT_RETENTION = timedelta(days=7)
+
+
+def _compose(
+    rows: list[NotificationOutbox], site_url: str
+) -> list[tuple[list[NotificationOutbox], str, str, str]]:
+    """Group rows into ``(rows, to_email, subject, html)`` messages."""
+    by_recipient: dict[str, list[NotificationOutbox]] = {}
+    for row in rows:
+        by_recipient.setdefault(row.to_email, []).append(row)
+
+    messages = []
+    for to_email, items in by_recipient.items():
+        if len(items) >= settings.NOTIFICATIONS_DIGEST_MIN:
+            html = workflow_digest_html(
+                to_email,
+                [(r.kind, r.workflow_name or "", r.detail or "") for r in items],
+                site_url,
+            )
+            subject = f"[FlowO] {len(items)} workflow updates"
+            messages.append((items, to_email, subject, html))
+            continue
+        for row in items:
+            subject, html = render_workflow_email(
+                row.kind, row.workflow_name or "", to_email, row.detail or "", site_url
+            )
+            messages.append(([row], to_email, subject, html))
+    return messages
+
+
+class NotificationOutboxWorker:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self._smtp: SmtpSession | None = None
+        self._next_send_at = 0.0
+        # Rows the last batch put back for the rate limit
+        self._deferred = 0
+
+    async def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._loop(), name="notification-outbox")
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await asyncio.to_thread(self._close_smtp)
+
+    def _close_smtp(self) -> None:
+        if self._smtp is not None:
+            self._smtp.close()
+            self._smtp = None
+
+    def _deliver(
+        self, smtp_settings: SystemSettings, messages: list[tuple]
+    ) -> list[str | None]:
+        """Send ``messages`` over the shared connection; runs in a worker thread.
+
+        Returns one error (or None) per message sent. Sending stops at the first
+        message over the rate, so the result may be shorter than ``messages``.
+        """
+        if self._smtp is None or self._smtp.settings is not smtp_settings:
+            # The settings snapshot is replaced whenever the admin changes them.
+            self._close_smtp()
+            self._smtp = SmtpSession(smtp_settings)
+        interval = 60.0 / max(settings.NOTIFICATIONS_RATE_PER_MINUTE, 1)
+        errors: list[str | None] = []
+        for _, to_email, subject, html in messages:
+            if self._next_send_at > time.monotonic():
+                break
+            self._next_send_at = time.monotonic() + interval
+            try:
+                self._smtp.send(to_email, subject, html)
+                errors.append(None)
+            except Exception as e:
+                logger.warning("Failed to send email to %s: %s", to_email, e)
+                # Start from a fresh connection for the next message.
+                self._close_smtp()
+                self._smtp = SmtpSession(smtp_settings)
+                errors.append(f"{type(e).__name__}: {e}"[:2000])
+        return errors
+
+    async def _wait_for_send_slot(self) -> None:
+        await asyncio.sleep(max(self._next_send_at - time.monotonic(), 0))
+
+    async def run_once(
+        self, session_factory: SessionFactory = AsyncSessionLocal
+    ) -> int:
+        """Deliver one batch of due rows; returns the number of rows handled.
+
+        Rows put back for the rate limit are not counted (see ``_deferred``).
+        """
+        self._deferred = 0
+        async with session_factory() as db:
+            if not await db.scalar(
+                select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_KEY))
+            ):
+                await db.rollback()
+                return 0
+            now = datetime.now(UTC)
+            rows = (
+                await db.scalars(
+                    select(NotificationOutbox)
+                    .where(
+                        NotificationOutbox.status == "pending",
+                        NotificationOutbox.next_attempt_at <= now,
+                    )
+                    .order_by(NotificationOutbox.id)
+                    .limit(settings.NOTIFICATIONS_BATCH_SIZE)
+                )
+            ).all()
+            if not rows:
+                await db.execute(
+                    delete(NotificationOutbox).where(
+                        NotificationOutbox.status != "pending",
+                        NotificationOutbox.created_at < now - SENT_RETENTION,
+                    )
+                )
+                await db.commit()
+                return 0
+
+            smtp_settings = await system_settings_cache.get(db)
+            if smtp_settings is None or not smtp_configured(smtp_settings):
+                logger.warning(
+                    "SMTP not configured — skipping %s queued email(s)", len(rows)
+                )
+                for row in rows:
+                    row.status = "skipped"
+                await db.commit()
+                return len(rows)
+
+            messages = _compose(rows, smtp_settings.site_url or "")
+            errors = await asyncio.to_thread(self._deliver, smtp_settings, messages)
+            sent_at = datetime.now(UTC)
+            slot = sent_at + timedelta(
+                seconds=max(self._next_send_at - time.monotonic(), 0)
+            )
+            for items, *_ in messages[len(errors) :]:
+                for row in items:
+                    row.next_attempt_at = slot
+                    self._deferred += 1
+            for (items, *_), error in zip(messages, errors, strict=False):
+                for row in items:
+                    row.attempts += 1
+                    if error is None:
+                        row.status = "sent"
+                        row.sent_at = sent_at
+                        continue
+                    row.last_error = error
+                    if row.attempts >= settings.NOTIFICATIONS_MAX_ATTEMPTS:
+                        row.status = "failed"
+                    else:
+                        row.next_attempt_at = sent_at + timedelta(
+                            seconds=30 * 2**row.attempts
+                        )
+            await db.commit()
+            return len(rows) - self._deferred
+
+    async def drain(self, session_factory: SessionFactory = AsyncSessionLocal) -> int:
+        """Deliver until nothing is due (tests and maintenance)."""
+        total = 0
+        while True:
+            handled = await self.run_once(session_factory)
+            total += handled
+            if self._deferred:
+                await self._wait_for_send_slot()
+            elif not handled:
+                return total
+
+    async def _loop(self) -> None:
+        while not self._stopping:
+            try:
+                handled = await self.run_once()
+                if self._deferred:
+                    await self._wait_for_send_slot()
+                    continue
+                if handled:
+                    continue
+            except Exception as e:
+                logger.error("Notification outbox worker failed: %s", e)
+            await asyncio.to_thread(self._close_smtp)
+            await asyncio.sleep(settings.NOTIFICATIONS_POLL_SECONDS)
+
+
+# Process-wide worker, started from the app lifespan
+notification_outbox_worker = NotificationOutboxWorker()
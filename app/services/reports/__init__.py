@@ -1,6 +1,28 @@
-"""Reports ingestion and workflow finalization (sync Session)."""
+"""Reports ingestion and workflow finalization (AsyncSession)."""
 
+from app.services.reports.backpressure import ingest_backpressure
 from app.services.reports.finalizer import finalize_workflow
-from app.services.reports.service import ingest_report_event
+from app.services.reports.projector import backlog, event_projector
+from app.services.reports.rebuild import rebuild_projections
+from app.services.reports.service import (
+    claim_event_key,
+    commit_projected,
+    enqueue_report_event,
+    ingest_report_event,
+    remember_event_response,
+    repeat_report_event,
+)
 
-__all__ = ["finalize_workflow", "ingest_report_event"]
+__all__ = [
+    "backlog",
+    "claim_event_key",
+    "commit_projected",
+    "enqueue_report_event",
+    "event_projector",
+    "finalize_workflow",
+    "ingest_backpressure",
+    "ingest_report_event",
+    "rebuild_projections",
+    "remember_event_response",
+    "repeat_report_event",
+]
@@ -0,0 +1,153 @@
+"""Backpressure for report ingestion.
+
+Three limits protect the API process from ingest storms:
+
+* a token bucket per API token (``REPORTS_RATE_LIMIT_PER_SECOND`` sustained,
+  ``REPORTS_RATE_LIMIT_BURST`` at once), so one huge or misbehaving run cannot
+  monopolise the server;
+* a process-wide cap on report requests being handled at once
+  (``REPORTS_MAX_IN_FLIGHT``), which bounds concurrent projections and leaves
+  room for dashboard, SSE and MCP requests;
+* in queued mode, a cap on events waiting for projection
+  (``REPORTS_MAX_BACKLOG``): requests only record events there, so the in-flight
+  cap alone would let the projector fall behind without bound. The backlog is
+  counted at most every ``_BACKLOG_CHECK_SECONDS``, and never past the cap.
+
+Rejected requests get ``429`` with ``Retry-After``; the plugin waits and resends
+(event ids make the resend safe). Event streams are not rejected: each micro-batch
+waits for its turn instead, which stops reading the request body and so slows the
+client down. A micro-batch costs one token per event, like the events posted one
+by one. A limit set to ``0`` is disabled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import WorkflowEvent
+
+_MAX_BUCKETS = 10_000
+_BACKLOG_CHECK_SECONDS = 1.0
+BACKLOG_RETRY_SECONDS = 5
+
+
+class IngestBackpressure:
+    def __init__(self):
+        # key -> (tokens, last refill); bounded LRU so unknown keys can't grow it
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._in_flight = 0
+        self._rate_limited_total = 0
+        self._overloaded_total = 0
+        self._backlog = 0
+        self._backlog_checked = -math.inf
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "backlog": self._backlog,
+            "rate_limited_total": self._rate_limited_total,
+            "overloaded_total": self._overloaded_total,
+            "rate_limit_buckets": len(self._buckets),
+        }
+
+    def _take(self, key: str, cost: int) -> int:
+        """Take ``cost`` tokens from ``key``'s bucket; seconds to wait if short."""
+        rate = settings.REPORTS_RATE_LIMIT_PER_SECOND
+        if rate <= 0:
+            return 0
+        burst = max(settings.REPORTS_RATE_LIMIT_BURST, 1)
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        # A batch larger than the burst goes once the bucket is full and leaves
+        # it in debt, so the sustained rate still holds.
+        needed = min(cost, burst)
+        if tokens >= needed:
+            self._buckets[key] = (tokens - cost, now)
+            retry_after = 0
+        else:
+            self._buckets[key] = (tokens, now)
+            retry_after = max(1, math.ceil((needed - tokens) / rate))
+        while len(self._buckets) > _MAX_BUCKETS:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+    def check_rate(self, key: str, cost: int = 1) -> int:
+        """Take ``cost`` tokens from ``key``'s bucket; seconds to wait if it is short.
+
+        Counts the request as rate limited when it is refused.
+        """
+        retry_after = self._take(key, cost)
+        if retry_after:
+            self._rate_limited_total += 1
+        return retry_after
+
+    def _at_capacity(self) -> bool:
+        limit = settings.REPORTS_MAX_IN_FLIGHT
+        return limit > 0 and self._in_flight >= limit
+
+    def enter(self) -> bool:
+        """Count a request in; ``False`` (and nothing counted) when at capacity."""
+        if self._at_capacity():
+            self._overloaded_total += 1
+            return False
+        self._in_flight += 1
+        return True
+
+    async def _backlog_full(self, db: AsyncSession) -> bool:
+        limit = settings.REPORTS_MAX_BACKLOG
+        if limit <= 0 or settings.REPORTS_INGEST_MODE != "queued":
+            return False
+        now = time.monotonic()
+        if now - self._backlog_checked >= _BACKLOG_CHECK_SECONDS:
+            self._backlog_checked = now
+            pending = (
+                select(WorkflowEvent.id)
+                .where(WorkflowEvent.status == "pending")
+                .limit(limit)
+                .subquery()
+            )
+            self._backlog = await db.scalar(select(func.count()).select_from(pending))
+        return self._backlog >= limit
+
+    async def check_backlog(self, db: AsyncSession) -> bool:
+        """``False`` (counted as overloaded) when the projection backlog is full."""
+        if await self._backlog_full(db):
+            self._overloaded_total += 1
+            return False
+        return True
+
+    async def acquire(
+        self, key: str, cost: int = 1, db: AsyncSession | None = None
+    ) -> None:
+        """Wait until ``key`` has ``cost`` tokens and a slot is free, then count in.
+
+        With ``db``, also waits while the projection backlog is full. Waiting is
+        not refusing: nothing is added to the rejection counters.
+        """
+        while retry_after := self._take(key, cost):
+            await asyncio.sleep(retry_after)
+        while db is not None and await self._backlog_full(db):
+            await asyncio.sleep(_BACKLOG_CHECK_SECONDS)
+        while self._at_capacity():
+            await asyncio.sleep(0.05)
+        self._in_flight += 1
+
+    def exit(self) -> None:
+        self._in_flight -= 1
+
+    def reset(self) -> None:
+        self._buckets.clear()
+        self._backlog = 0
+        self._backlog_checked = -math.inf
+
+
+# Per process: each API process enforces its own share of the limits
+ingest_backpressure = IngestBackpressure()
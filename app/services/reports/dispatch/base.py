@@ -1,7 +1,7 @@
 from typing import Any, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -9,6 +9,8 @@ T = TypeVar("T", bound=BaseModel)
 class BaseEventHandler[T: BaseModel]:
     """Base class for all server-side event handlers."""
 
-    def handle(self, data: T, session: Session, context: dict[str, Any]) -> None:
+    async def handle(
+        self, data: T, session: AsyncSession, context: dict[str, Any]
+    ) -> None:
         """Process the validated event data."""
         raise NotImplementedError
@@ -3,13 +3,17 @@ import uuid
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Integer, any_, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models import Catalog, Error, File, Job, Rule, Workflow
 from app.models.enums import FileType, Status
 from app.services.notification import notify_workflow_failure, notify_workflow_submitted
 from app.services.reports.dispatch.base import BaseEventHandler
+from app.services.reports.error_excerpt import request_error_excerpt
+from app.services.reports.state_cache import workflow_state_cache
 from flowo_common.schemas import (
     ErrorSchema,
     GroupErrorSchema,
@@ -48,9 +52,145 @@ def _normalize_flowo_tags(raw: Any) -> list[str]:
     return []
 
 
+def _current_workflow_id(context: dict[str, Any]) -> uuid.UUID | None:
+    """``current_workflow_id`` from the context; it is a string once round-tripped."""
+    raw = context.get("current_workflow_id")
+    if raw is None or isinstance(raw, uuid.UUID):
+        return raw
+    try:
+        return uuid.UUID(str(raw))
+    except ValueError:
+        return None
+
+
+def _event_time(context: dict[str, Any]) -> datetime:
+    """When the event happened: its recorded time when projected later or replayed."""
+    return context.get("flowo_event_time") or datetime.now()
+
+
+def _is_replay(context: dict[str, Any]) -> bool:
+    """Rebuilds and retries re-apply old events; they must not notify anyone again."""
+    return bool(context.get("flowo_replay"))
+
+
+async def _workflow_exists(session: AsyncSession, workflow_id: uuid.UUID) -> bool:
+    if workflow_state_cache.workflow_exists(workflow_id):
+        return True
+    found = await session.scalar(select(Workflow.id).where(Workflow.id == workflow_id))
+    if found is None:
+        return False
+    workflow_state_cache.remember_workflow(workflow_id)
+    return True
+
+
+async def _rule_id(session: AsyncSession, workflow_id: uuid.UUID, name: str) -> int:
+    """``rules.id`` for ``name`` in the workflow, creating the rule when unknown."""
+    rule_id = workflow_state_cache.rule_id(workflow_id, name)
+    if rule_id is not None:
+        return rule_id
+    rule_id = await session.scalar(
+        select(Rule.id).filter_by(name=name, workflow_id=workflow_id).limit(1)
+    )
+    if rule_id is None:
+        rule_id = await session.scalar(
+            insert(Rule).values(name=name, workflow_id=workflow_id).returning(Rule.id)
+        )
+    workflow_state_cache.remember_rule(workflow_id, name, rule_id)
+    return rule_id
+
+
+async def _resolve_job_ids(
+    session: AsyncSession, context: dict[str, Any], snakemake_ids: list[Any]
+) -> list[int]:
+    """Map Snakemake job ids to the ``jobs.id`` of their latest attempts.
+
+    The ``jobs`` map round-tripped through the plugin context is used when present.
+    Events projected from the queue (or replayed) never saw that map, so the rest
+    come from the workflow state cache, then from one ``(workflow_id, snakemake_id)``
+    query.
+    """
+    jobs_map = context.get("jobs") or {}
+    resolved: list[int] = []
+    missing: list[int] = []
+    for snakemake_id in snakemake_ids:
+        db_job_id = jobs_map.get(snakemake_id) or jobs_map.get(str(snakemake_id))
+        if db_job_id:
+            resolved.append(db_job_id)
+            continue
+        try:
+            missing.append(int(snakemake_id))
+        except (TypeError, ValueError):
+            continue
+    workflow_id = _current_workflow_id(context)
+    if not missing or workflow_id is None:
+        return resolved
+    cached = workflow_state_cache.job_ids(workflow_id, missing)
+    resolved.extend(cached.values())
+    missing = [s for s in missing if s not in cached]
+    if missing:
+        rows = await session.execute(
+            select(Job.snakemake_id, func.max(Job.id))
+            .where(Job.workflow_id == workflow_id, Job.snakemake_id.in_(missing))
+            .group_by(Job.snakemake_id)
+        )
+        found = dict(rows.tuples().all())
+        workflow_state_cache.remember_jobs(workflow_id, found)
+        resolved.extend(found.values())
+    return resolved
+
+
+async def _resolve_job_id(
+    session: AsyncSession, context: dict[str, Any], snakemake_id: Any
+) -> int | None:
+    ids = await _resolve_job_ids(session, context, [snakemake_id])
+    return ids[0] if ids else None
+
+
+async def _update_jobs(
+    session: AsyncSession, job_ids: list[int], **values: Any
+) -> None:
+    """Set ``values`` on all ``job_ids`` with one ``UPDATE ... WHERE id = ANY(...)``."""
+    if not job_ids:
+        return
+    await session.execute(
+        update(Job)
+        .where(Job.id == any_(literal(job_ids, ARRAY(Integer))))
+        .values(**values)
+        .execution_options(synchronize_session="fetch")
+    )
+
+
+# Below this many rows a multi-row INSERT beats the COPY round trips.
+_FILE_COPY_MIN_ROWS = 500
+
+
+async def _insert_files(
+    session: AsyncSession, rows: list[tuple[str, FileType, int]]
+) -> None:
+    """Bulk insert ``(path, file_type, job_id)`` rows; large batches go through COPY."""
+    if not rows:
+        return
+    if len(rows) < _FILE_COPY_MIN_ROWS:
+        await session.execute(
+            insert(File),
+            [{"path": p, "file_type": t, "job_id": j} for p, t, j in rows],
+        )
+        return
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        File.__tablename__,
+        records=[(p, t.name, j) for p, t, j in rows],
+        columns=["path", "file_type", "job_id"],
+    )
+
+
 class WorkflowStartedHandler(BaseEventHandler[WorkflowStartedSchema]):
-    def handle(
-        self, data: WorkflowStartedSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self,
+        data: WorkflowStartedSchema,
+        session: AsyncSession,
+        context: dict[str, Any],
     ) -> None:
         catalog: Catalog | None = None
         catalog_id = None
@@ -58,7 +198,11 @@ class WorkflowStartedHandler(BaseEventHandler[WorkflowStartedSchema]):
         user_id = context.get("flowo_user_id")
         uid = user_id if isinstance(user_id, uuid.UUID) else None
         if slug and uid is not None:
-            found = session.query(Catalog).filter_by(slug=slug, owner_id=uid).first()
+            found = (
+                await session.execute(
+                    select(Catalog).filter_by(slug=slug, owner_id=uid).limit(1)
+                )
+            ).scalar_one_or_none()
             if found:
                 catalog = found
                 catalog_id = found.id
@@ -97,7 +241,7 @@ class WorkflowStartedHandler(BaseEventHandler[WorkflowStartedSchema]):
             config=context.get("config"),
             dryrun=context.get("dryrun", False),
             status=Status.RUNNING,
-            started_at=datetime.now(),
+            started_at=_event_time(context),
             configfiles=context.get("configfiles"),
             catalog_id=catalog_id,
         )
@@ -116,166 +260,149 @@ class WorkflowStartedHandler(BaseEventHandler[WorkflowStartedSchema]):
         session.add_all(rules)
 
         context["current_workflow_id"] = data.workflow_id
+        workflow_state_cache.remember_workflow(data.workflow_id)
 
         # Send workflow submitted notification
-        user_email = context.get("flowo_user", "")
-        notify_workflow_submitted(session, name or "", user_email)
+        if not _is_replay(context):
+            user_email = context.get("flowo_user", "")
+            await notify_workflow_submitted(session, name or "", user_email)
 
 
 class RunInfoHandler(BaseEventHandler[RunInfoSchema]):
-    def handle(
-        self, data: RunInfoSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: RunInfoSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        workflow_id = context.get("current_workflow_id")
+        workflow_id = _current_workflow_id(context)
         if not workflow_id:
             return
-        workflow = session.get(Workflow, workflow_id)
+        workflow = await session.get(Workflow, workflow_id)
         if workflow:
             workflow.run_info = data.stats
 
 
 class JobStartedHandler(BaseEventHandler[JobStartedSchema]):
-    def handle(
-        self, data: JobStartedSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: JobStartedSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        workflow_id = context.get("current_workflow_id")
+        workflow_id = _current_workflow_id(context)
         if not workflow_id:
             return
-        jobs = []
-        for snakemake_job_id in data.job_ids:
-            job = Job(
-                snakemake_id=snakemake_job_id,
-                workflow_id=workflow_id,
-                status=Status.RUNNING,
-                started_at=datetime.now(),
-            )
-            jobs.append(job)
-        session.add_all(jobs)
-        session.flush()
+        if not data.job_ids or not await _workflow_exists(session, workflow_id):
+            return
+        # The Workflow may still be pending in this session; Core inserts skip autoflush.
+        await session.flush()
+        now = _event_time(context)
+        rows = await session.execute(
+            insert(Job).returning(Job.snakemake_id, Job.id),
+            [
+                {
+                    "snakemake_id": snakemake_job_id,
+                    "workflow_id": workflow_id,
+                    "status": Status.RUNNING,
+                    "started_at": now,
+                }
+                for snakemake_job_id in data.job_ids
+            ],
+        )
+        new_mappings = dict(rows.tuples().all())
+        workflow_state_cache.remember_jobs(workflow_id, new_mappings)
         # Update mapping
-        new_mappings = {job.snakemake_id: job.id for job in jobs}
         context.setdefault("jobs", {}).update(new_mappings)
 
 
 class JobInfoHandler(BaseEventHandler[JobInfoSchema]):
-    def handle(
-        self, data: JobInfoSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: JobInfoSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        workflow_id = context.get("current_workflow_id")
-        if not workflow_id or "jobs" not in context:
+        workflow_id = _current_workflow_id(context)
+        if not workflow_id:
             return
 
-        rule = (
-            session.query(Rule)
-            .filter_by(name=data.rule_name, workflow_id=workflow_id)
-            .first()
-        )
-        if not rule:
-            rule = Rule(name=data.rule_name, workflow_id=workflow_id)
-            session.add(rule)
-            session.flush()
-
-        jobs_map = context.get("jobs", {})
-        db_job_id = jobs_map.get(data.job_id) or jobs_map.get(str(data.job_id))
-
+        rule_id = await _rule_id(session, workflow_id, data.rule_name)
+        db_job_id = await _resolve_job_id(session, context, data.job_id)
         if not db_job_id:
             return
 
-        job = session.get(Job, db_job_id)
-        if not job:
-            return
-
-        job.rule_id = rule.id
-        job.message = data.rule_msg
-        job.wildcards = data.wildcards
-        job.reason = data.reason
-        job.resources = data.resources
-        job.shellcmd = data.shellcmd
-        job.threads = data.threads
-        job.priority = data.priority
-
-        self._add_files(job, data.input, FileType.INPUT, session)
-        self._add_files(job, data.output, FileType.OUTPUT, session)
-        self._add_files(job, data.log, FileType.LOG, session)
-        self._add_files(job, data.benchmark, FileType.BENCHMARK, session)
-
-    def _add_files(
-        self, job: Job, paths: list[str] | None, ftype: FileType, session: Session
-    ):
-        if not paths:
-            return
-        for p in paths:
-            f = File(path=p, file_type=ftype, job_id=job.id)
-            session.add(f)
+        await _update_jobs(
+            session,
+            [db_job_id],
+            rule_id=rule_id,
+            message=data.rule_msg,
+            wildcards=data.wildcards,
+            reason=data.reason,
+            resources=data.resources,
+            shellcmd=data.shellcmd,
+            threads=data.threads,
+            priority=data.priority,
+        )
+        await _insert_files(
+            session,
+            [
+                (path, ftype, db_job_id)
+                for paths, ftype in (
+                    (data.input, FileType.INPUT),
+                    (data.output, FileType.OUTPUT),
+                    (data.log, FileType.LOG),
+                    (data.benchmark, FileType.BENCHMARK),
+                )
+                for path in paths or ()
+            ],
+        )
 
 
 class JobFinishedHandler(BaseEventHandler[JobFinishedSchema]):
-    def handle(
-        self, data: JobFinishedSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: JobFinishedSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        jobs_map = context.get("jobs", {})
-        db_job_id = jobs_map.get(data.job_id) or jobs_map.get(str(data.job_id))
-
+        db_job_id = await _resolve_job_id(session, context, data.job_id)
         if not db_job_id:
             return
-        job = session.get(Job, db_job_id)
-        if job:
-            job.status = Status.SUCCESS
-            job.end_time = datetime.now()
+        await _update_jobs(
+            session, [db_job_id], status=Status.SUCCESS, end_time=_event_time(context)
+        )
 
 
 class JobErrorHandler(BaseEventHandler[JobErrorSchema]):
-    def handle(
-        self, data: JobErrorSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: JobErrorSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        jobs_map = context.get("jobs", {})
-        db_job_id = jobs_map.get(data.job_id) or jobs_map.get(str(data.job_id))
-
+        db_job_id = await _resolve_job_id(session, context, data.job_id)
         if not db_job_id:
             return
-        job = session.get(Job, db_job_id)
-        if job:
-            job.status = Status.ERROR
-            job.end_time = datetime.now()
+        await _update_jobs(
+            session, [db_job_id], status=Status.ERROR, end_time=_event_time(context)
+        )
+        request_error_excerpt(session, db_job_id)
 
 
 class RuleGraphHandler(BaseEventHandler[RuleGraphSchema]):
-    def handle(
-        self, data: RuleGraphSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: RuleGraphSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        workflow_id = context.get("current_workflow_id")
+        workflow_id = _current_workflow_id(context)
         if not workflow_id:
             return
-        workflow = session.get(Workflow, workflow_id)
+        workflow = await session.get(Workflow, workflow_id)
         if workflow:
             workflow.rulegraph_data = data.rulegraph
             if workflow.catalog_id:
                 # Cache the successful DAG in the catalog
-                catalog = session.get(Catalog, workflow.catalog_id)
+                catalog = await session.get(Catalog, workflow.catalog_id)
                 if catalog:
                     catalog.rulegraph_data = data.rulegraph
 
 
 class ErrorHandler(BaseEventHandler[ErrorSchema]):
-    def handle(
-        self, data: ErrorSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: ErrorSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        workflow_id = context.get("current_workflow_id")
+        workflow_id = _current_workflow_id(context)
         if not workflow_id:
             return
 
         rule_id = None
         if data.rule:
-            rule = (
-                session.query(Rule)
-                .filter_by(name=data.rule, workflow_id=workflow_id)
-                .first()
-            )
-            if not rule:
-                rule = Rule(name=data.rule, workflow_id=workflow_id)
-                session.add(rule)
-                session.flush()
-            rule_id = rule.id
+            rule_id = await _rule_id(session, workflow_id, data.rule)
 
         error = Error(
             exception=data.exception,
@@ -288,43 +415,39 @@ class ErrorHandler(BaseEventHandler[ErrorSchema]):
         )
         session.add(error)
 
-        workflow = session.get(Workflow, workflow_id)
+        workflow = await session.get(Workflow, workflow_id)
         if workflow and workflow.status == Status.RUNNING:
             workflow.status = Status.ERROR
-            workflow.end_time = datetime.now()
+            workflow.end_time = _event_time(context)
 
             # Send workflow failure notification
-            user_email = context.get("flowo_user", "")
-            error_msg = data.exception or "Unknown error"
-            notify_workflow_failure(session, workflow.name or "", user_email, error_msg)
+            if not _is_replay(context):
+                user_email = context.get("flowo_user", "")
+                error_msg = data.exception or "Unknown error"
+                await notify_workflow_failure(
+                    session, workflow.name or "", user_email, error_msg
+                )
 
 
 class GroupInfoHandler(BaseEventHandler[GroupInfoSchema]):
-    def handle(
-        self, data: GroupInfoSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: GroupInfoSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        jobs_map = context.get("jobs", {})
-        for job_ref in data.jobs:
-            jid = getattr(job_ref, "job_id", job_ref)
-            db_jid = jobs_map.get(jid) or jobs_map.get(str(jid))
-            if db_jid:
-                job = session.get(Job, db_jid)
-                if job:
-                    job.group_id = data.group_id
+        snakemake_ids = [getattr(job_ref, "job_id", job_ref) for job_ref in data.jobs]
+        db_job_ids = await _resolve_job_ids(session, context, snakemake_ids)
+        await _update_jobs(session, db_job_ids, group_id=data.group_id)
 
 
 class GroupErrorHandler(BaseEventHandler[GroupErrorSchema]):
-    def handle(
-        self, data: GroupErrorSchema, session: Session, context: dict[str, Any]
+    async def handle(
+        self, data: GroupErrorSchema, session: AsyncSession, context: dict[str, Any]
     ) -> None:
-        jobs_map = context.get("jobs", {})
         snakemake_job_id = data.job_error_info.get("job_id")
         if not snakemake_job_id:
             return
 
-        db_jid = jobs_map.get(snakemake_job_id) or jobs_map.get(str(snakemake_job_id))
+        db_jid = await _resolve_job_id(session, context, snakemake_job_id)
         if db_jid:
-            job = session.get(Job, db_jid)
-            if job:
-                job.status = Status.ERROR
-                job.end_time = datetime.now()
+            await _update_jobs(
+                session, [db_jid], status=Status.ERROR, end_time=_event_time(context)
+            )
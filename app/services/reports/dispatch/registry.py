@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.services.reports.dispatch.constants import EventName
 from app.services.reports.dispatch.handlers import (
@@ -47,7 +47,9 @@ class EventRegistry:
             EventName.ERROR: (ErrorSchema, ErrorHandler()),
         }
 
-    def dispatch(self, event_name: str, payload: dict, db: Session, context: dict):
+    async def dispatch(
+        self, event_name: str, payload: dict, db: AsyncSession, context: dict
+    ):
         if event_name not in self._registry:
             # Fallback for unknown events, just return context
             return context
@@ -58,7 +60,7 @@ class EventRegistry:
         validated_data = schema_class.model_validate(payload)
 
         # 2. Handle event
-        handler.handle(validated_data, db, context)
+        await handler.handle(validated_data, db, context)
 
         return context
 
@@ -0,0 +1,248 @@
+"""Compact error excerpt of a failed job, stored on ``jobs.error_excerpt``.
+
+When ``job_error`` is projected, the tails of the job's LOG files and Snakemake's
+``Error in rule …`` block from the run log are scanned for error-looking lines.
+The matches and their line numbers are kept on the job, so failure pages and MCP
+diagnosis need no file reads.
+
+The handler only asks for the excerpt; it is read after the projection commits
+(``attach_error_excerpts``), so no file is read while the transaction and the
+workflow's advisory lock are held. Reading is bounded: at most ``_MAX_LOG_FILES``
+files, each read backwards in ``_BLOCK_BYTES`` blocks until its last ``_TAIL_LINES``
+lines are found (never more than ``_MAX_TAIL_BYTES``), ``_MAX_LINES`` lines kept per
+file, all within ``_TIMEOUT_SECONDS`` in a worker thread. The lines before the tail
+are only counted (in ``_COUNT_BYTES`` blocks), for the line numbers. Files the
+server cannot see (no shared filesystem) are skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import File, Job, Workflow
+from app.models.enums import FileType, Status
+from app.utils.paths import path_resolver
+
+logger = logging.getLogger(__name__)
+
+_MAX_LOG_FILES = 5
+_TAIL_LINES = 500
+_BLOCK_BYTES = 64 * 1024
+_MAX_TAIL_BYTES = 1024 * 1024
+_COUNT_BYTES = 1024 * 1024
+_MAX_LINES = 20
+_MAX_LINE_CHARS = 300
+_TIMEOUT_SECONDS = 5.0
+
+ERROR_LINE = re.compile(
+    r"error|exception|traceback|fatal|fail|killed|abort|panic|segmentation fault"
+    r"|out of memory|oom|no such file|permission denied|command not found"
+    r"|non-zero exit|exit status|exit code",
+    re.IGNORECASE,
+)
+_RULE_ERROR = re.compile(r"^\s*Error in rule \S+:")
+# session.info key: failed jobs whose excerpt is read once the projection commits
+_REQUESTED = "reports_error_excerpts"
+
+
+def _count_lines(fh, end: int, deadline: float | None) -> int | None:
+    """Newlines in the first ``end`` bytes of ``fh``; None past ``deadline``."""
+    fh.seek(0)
+    newlines = read = 0
+    while read < end:
+        if deadline is not None and time.monotonic() > deadline:
+            return None
+        block = fh.read(min(_COUNT_BYTES, end - read))
+        if not block:
+            break
+        newlines += block.count(b"\n")
+        read += len(block)
+    return newlines
+
+
+def _read_tail(
+    path: Path, deadline: float | None = None
+) -> tuple[list[str], int | None, bool]:
+    """Last lines of ``path``, the line number of the first one and whether cut.
+
+    The line number is None only if counting the lines before the tail ran past
+    ``deadline``.
+    """
+    blocks: list[bytes] = []
+    newlines = read = 0
+    with path.open("rb") as fh:
+        pos = fh.seek(0, 2)
+        while pos and newlines <= _TAIL_LINES and read < _MAX_TAIL_BYTES:
+            step = min(_BLOCK_BYTES, pos, _MAX_TAIL_BYTES - read)
+            pos -= step
+            fh.seek(pos)
+            block = fh.read(step)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+            read += step
+        # Lines before the one the tail starts in
+        before = _count_lines(fh, pos, deadline) if pos else 0
+    lines = b"".join(reversed(blocks)).decode("utf-8", errors="replace").splitlines()
+    if pos and lines:
+        # The first line is most likely partial.
+        lines = lines[1:]
+        if before is not None:
+            before += 1
+    kept = lines[-_TAIL_LINES:]
+    first_line = None if before is None else before + len(lines) - len(kept) + 1
+    return kept, first_line, bool(pos) or len(kept) < len(lines)
+
+
+def _numbered(lines: list[str], first_line: int | None, indexes) -> list[dict]:
+    return [
+        {
+            "line": first_line + i if first_line is not None else None,
+            "text": lines[i][:_MAX_LINE_CHARS],
+        }
+        for i in indexes
+    ]
+
+
+def error_lines(path: Path, deadline: float | None = None) -> dict[str, Any] | None:
+    """Error-looking lines of a log tail (the last lines if none match)."""
+    lines, first_line, truncated = _read_tail(path, deadline)
+    if not lines:
+        return None
+    matches = [i for i, text in enumerate(lines) if ERROR_LINE.search(text)]
+    indexes = (
+        matches[-_MAX_LINES:] if matches else range(max(0, len(lines) - 5), len(lines))
+    )
+    return {
+        "lines": _numbered(lines, first_line, indexes),
+        "matched": bool(matches),
+        "truncated": truncated,
+    }
+
+
+def snakemake_error_block(
+    path: Path, snakemake_id: int, deadline: float | None = None
+) -> list[dict]:
+    """The last ``Error in rule …`` block of the run log naming ``jobid``."""
+    lines, first_line, _ = _read_tail(path, deadline)
+    jobid = re.compile(rf"^\s*jobid:\s*{snakemake_id}\s*$")
+    block: list[int] = []
+    for i, text in enumerate(lines):
+        if not _RULE_ERROR.match(text):
+            continue
+        end = i + 1
+        while end < len(lines) and lines[end].strip():
+            end += 1
+        if any(jobid.match(lines[j]) for j in range(i + 1, end)):
+            block = list(range(i, min(end, i + _MAX_LINES)))
+    return _numbered(lines, first_line, block)
+
+
+def _collect(
+    log_paths: list[tuple[str, Path]],
+    run_log: Path | None,
+    snakemake_id: int,
+    deadline: float,
+) -> dict[str, Any] | None:
+    # Past the deadline the caller has given up: stop between files.
+    logs = []
+    for recorded, path in log_paths:
+        if time.monotonic() > deadline:
+            return None
+        try:
+            if not path.is_file():
+                continue
+            excerpt = error_lines(path, deadline)
+        except OSError as e:
+            logger.debug("Cannot read job log %s: %s", path, e)
+            continue
+        if excerpt:
+            logs.append({"path": recorded, **excerpt})
+
+    snakemake: list[dict] = []
+    if run_log is not None and time.monotonic() <= deadline:
+        try:
+            if run_log.is_file():
+                snakemake = snakemake_error_block(run_log, snakemake_id, deadline)
+        except OSError as e:
+            logger.debug("Cannot read run log %s: %s", run_log, e)
+
+    if not logs and not snakemake:
+        return None
+    return {"snakemake": snakemake, "logs": logs}
+
+
+def _server_path(directory: str | None, recorded: str) -> Path:
+    path = Path(recorded)
+    if not path.is_absolute() and directory:
+        path = Path(directory) / path
+    return path_resolver.resolve(str(path))
+
+
+def request_error_excerpt(session: AsyncSession, job_id: int) -> None:
+    """Have ``attach_error_excerpts`` read the job's excerpt after the commit."""
+    session.info.setdefault(_REQUESTED, set()).add(job_id)
+
+
+def discard_error_excerpts(session: AsyncSession) -> None:
+    session.info.pop(_REQUESTED, None)
+
+
+async def _excerpt_of(session: AsyncSession, job_id: int) -> dict[str, Any] | None:
+    # Columns, not objects: the session's objects may predate the commit.
+    row = (
+        await session.execute(
+            select(Job.snakemake_id, Workflow.directory, Workflow.logfile)
+            .join(Workflow, Workflow.id == Job.workflow_id)
+            .where(Job.id == job_id, Job.status == Status.ERROR)
+        )
+    ).one_or_none()
+    if row is None:
+        await session.commit()
+        return None
+    recorded_logs = (
+        await session.scalars(
+            select(File.path)
+            .where(File.job_id == job_id, File.file_type == FileType.LOG)
+            .order_by(File.id)
+            .limit(_MAX_LOG_FILES)
+        )
+    ).all()
+    log_paths = [(p, _server_path(row.directory, p)) for p in recorded_logs]
+    run_log = _server_path(row.directory, row.logfile) if row.logfile else None
+    # The files are read with no transaction open.
+    await session.commit()
+    deadline = time.monotonic() + _TIMEOUT_SECONDS
+    return await asyncio.wait_for(
+        asyncio.to_thread(_collect, log_paths, run_log, row.snakemake_id, deadline),
+        _TIMEOUT_SECONDS,
+    )
+
+
+async def attach_error_excerpts(session: AsyncSession) -> None:
+    """Store the error excerpts requested in ``session``, each in a short transaction.
+
+    Runs after the projection committed; reading problems only skip an excerpt.
+    """
+    for job_id in sorted(session.info.pop(_REQUESTED, ())):
+        try:
+            excerpt = await _excerpt_of(session, job_id)
+            if excerpt is not None:
+                await session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == Status.ERROR)
+                    .values(error_excerpt=excerpt)
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+        except Exception as e:
+            if session.in_transaction():
+                await session.rollback()
+            logger.warning("Error excerpt of job %s skipped: %s", job_id, e)
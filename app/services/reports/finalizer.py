@@ -1,4 +1,4 @@
-"""Synchronous workflow close / finalize for the reports API (sync SQLAlchemy Session)."""
+"""Workflow close / finalize for the reports API (AsyncSession)."""
 
 from __future__ import annotations
 
@@ -7,16 +7,17 @@ from typing import Any
 from uuid import UUID
 
 from sqlalchemy import exists, select, update
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Job, Status, User, Workflow
+from app.services.reports.state_cache import workflow_state_cache
 
 
-def finalize_workflow(
-    db: Session, workflow_id: str | UUID, user: User
+async def finalize_workflow(
+    db: AsyncSession, workflow_id: str | UUID, user: User
 ) -> dict[str, Any]:
     """
-    Set workflow terminal status from job errors, fix RUNNING jobs, commit, send notifications.
+    Set workflow terminal status from job errors, fix RUNNING jobs, queue notifications, commit.
 
     Returns the same shapes as the legacy ``/reports/close`` route for compatibility.
     """
@@ -31,7 +32,7 @@ def finalize_workflow(
         )
     except (TypeError, ValueError):
         return {"message": "Workflow not found"}
-    workflow = db.get(Workflow, wf_key)
+    workflow = await db.get(Workflow, wf_key)
     if not workflow:
         return {"message": "Workflow not found"}
 
@@ -41,7 +42,7 @@ def finalize_workflow(
     stmt = select(
         exists().where(Job.workflow_id == workflow.id, Job.status == Status.ERROR)
     )
-    has_error = db.scalar(stmt)
+    has_error = await db.scalar(stmt)
     if has_error:
         workflow.status = Status.ERROR
     else:
@@ -49,13 +50,16 @@ def finalize_workflow(
 
     workflow.end_time = datetime.now()
 
-    db.execute(
+    await db.execute(
         update(Job)
         .where(Job.workflow_id == workflow.id, Job.status == Status.RUNNING)
         .values(status=workflow.status, end_time=workflow.end_time)
     )
 
-    db.commit()
+    await db.flush()
+    # Reload both timestamps so they are consistently tz-aware before computing
+    # the duration.
+    await db.refresh(workflow, ["started_at", "end_time"])
 
     duration = ""
     if workflow.started_at and workflow.end_time:
@@ -64,11 +68,15 @@ def finalize_workflow(
         seconds = int(delta.total_seconds() % 60)
         duration = f"{minutes}m {seconds}s"
 
+    # Queued in the outbox, so the email commits (or not) with the new status.
     if workflow.status == Status.SUCCESS:
-        notify_workflow_success(db, workflow.name or "", user.email, duration)
+        await notify_workflow_success(db, workflow.name or "", user.email, duration)
     elif workflow.status == Status.ERROR:
-        notify_workflow_failure(
+        await notify_workflow_failure(
             db, workflow.name or "", user.email, "Workflow completed with errors"
         )
 
+    await db.commit()
+    workflow_state_cache.evict(workflow.id)
+
     return {"status": workflow.status}
@@ -0,0 +1,215 @@
+"""Monthly partitions of ``workflow_events`` and their retention.
+
+``workflow_events`` is range-partitioned on ``created_at``. One partition per UTC
+month is created ahead of time (``WORKFLOW_EVENTS_PARTITION_MONTHS_AHEAD``); rows
+for a month without a partition land in ``workflow_events_default``. With
+``WORKFLOW_EVENTS_RETENTION_MONTHS`` set, partitions entirely older than the
+retention window are dropped (or detached, keeping the table for archiving), which
+removes a month of events in O(1) instead of a large ``DELETE``.
+
+Indexes declared on the parent are created on every partition by PostgreSQL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import delete, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.session import AsyncSessionLocal
+from app.models import WorkflowEventKey
+from app.services.archive import archive_finished_runs
+from app.services.job_partitions import ensure_job_partitions
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "workflow_events"
+SessionFactory = Callable[[], AsyncSession]
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+
+@dataclass
+class Partition:
+    name: str
+    lower: datetime | None  # None: MINVALUE or the default partition
+    upper: datetime | None  # None: MAXVALUE or the default partition
+    is_default: bool = False
+
+
+def month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=UTC)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_p{month:%Y%m}"
+
+
+def _parse_bound(raw: str) -> datetime | None:
+    raw = raw.strip()
+    if raw.upper() in ("MINVALUE", "MAXVALUE"):
+        return None
+    return datetime.fromisoformat(raw.strip("'")).astimezone(UTC)
+
+
+async def is_partitioned(db: AsyncSession) -> bool:
+    return bool(
+        await db.scalar(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+                "JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :parent AND pg_table_is_visible(c.oid))"
+            ),
+            {"parent": PARENT_TABLE},
+        )
+    )
+
+
+async def list_partitions(db: AsyncSession) -> list[Partition]:
+    rows = await db.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent AND pg_table_is_visible(p.oid) "
+            "ORDER BY c.relname"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    partitions = []
+    for name, bound in rows.all():
+        if bound == "DEFAULT":
+            partitions.append(Partition(name, None, None, is_default=True))
+            continue
+        match = _BOUND_RE.search(bound or "")
+        if match is None:
+            continue
+        partitions.append(
+            Partition(name, _parse_bound(match[1]), _parse_bound(match[2]))
+        )
+    return partitions
+
+
+def _covers(partition: Partition, moment: datetime) -> bool:
+    if partition.is_default:
+        return False
+    return (partition.lower is None or partition.lower <= moment) and (
+        partition.upper is None or moment < partition.upper
+    )
+
+
+async def create_month_partition(db: AsyncSession, month: datetime) -> str | None:
+    """Create the partition for ``month`` unless one already covers it."""
+    month = month_start(month)
+    if any(_covers(p, month) for p in await list_partitions(db)):
+        return None
+    name = partition_name(month)
+    try:
+        async with db.begin_nested():
+            await db.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+                    f"FOR VALUES FROM ('{month.isoformat()}') "
+                    f"TO ('{add_months(month, 1).isoformat()}')"
+                )
+            )
+    except DBAPIError as e:
+        # Typically rows for that month already sit in the default partition.
+        logger.warning("Could not create partition %s: %s", name, e.orig)
+        return None
+    logger.info("Created partition %s", name)
+    return name
+
+
+async def ensure_partitions(
+    db: AsyncSession, months_ahead: int | None = None, now: datetime | None = None
+) -> list[str]:
+    """Create partitions for the current month and ``months_ahead`` after it."""
+    if not await is_partitioned(db):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.WORKFLOW_EVENTS_PARTITION_MONTHS_AHEAD
+    current = month_start(now or datetime.now(UTC))
+    created = []
+    for offset in range(months_ahead + 1):
+        name = await create_month_partition(db, add_months(current, offset))
+        if name:
+            created.append(name)
+    return created
+
+
+async def apply_retention(
+    db: AsyncSession,
+    retention_months: int | None = None,
+    mode: str | None = None,
+    now: datetime | None = None,
+) -> list[str]:
+    """Drop or detach partitions whose whole range is older than the window."""
+    if retention_months is None:
+        retention_months = settings.WORKFLOW_EVENTS_RETENTION_MONTHS
+    if retention_months is None or not await is_partitioned(db):
+        return []
+    mode = mode or settings.WORKFLOW_EVENTS_RETENTION_MODE
+    cutoff = add_months(month_start(now or datetime.now(UTC)), -retention_months)
+    expired = [
+        p
+        for p in await list_partitions(db)
+        if not p.is_default and p.upper is not None and p.upper <= cutoff
+    ]
+    for partition in expired:
+        if mode == "detach":
+            await db.execute(
+                text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{partition.name}"')
+            )
+        else:
+            await db.execute(text(f'DROP TABLE "{partition.name}"'))
+        logger.info("Retention: %s partition %s", mode, partition.name)
+    # Client event ids only matter while their events may still be re-sent.
+    await db.execute(
+        delete(WorkflowEventKey).where(WorkflowEventKey.created_at < cutoff)
+    )
+    return [p.name for p in expired]
+
+
+async def maintain_partitions(
+    session_factory: SessionFactory = AsyncSessionLocal,
+) -> dict[str, list[str]]:
+    async with session_factory() as db:
+        created = await ensure_partitions(db)
+        removed = await apply_retention(db)
+        # Upcoming partitions of jobs/files too, when those are partitioned
+        jobs_created = await ensure_job_partitions(db)
+        await db.commit()
+        # Finished runs past RUNS_ARCHIVE_AFTER_DAYS go to the cold archive
+        archived = await archive_finished_runs(db)
+    return {
+        "created": created,
+        "removed": removed,
+        "jobs_created": jobs_created,
+        "archived": archived["workflows"],
+    }
+
+
+async def partition_maintenance_loop() -> None:
+    """Run :func:`maintain_partitions` now and then every few hours."""
+    while True:
+        try:
+            await maintain_partitions()
+        except Exception as e:
+            logger.error("Partition maintenance failed: %s", e)
+        await asyncio.sleep(settings.WORKFLOW_EVENTS_PARTITION_CHECK_SECONDS)
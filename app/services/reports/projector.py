@@ -1,6 +1,203 @@
-"""Projection entrypoint; currently delegates to ``event_registry`` (see ``service.py``)."""
+"""Background projection of queued report events (``REPORTS_INGEST_MODE=queued``).
+
+The API only records raw ``WorkflowEvent`` rows (``status='pending'``); workers here
+project them through ``event_registry``. Each batch claims one workflow with a
+transaction-scoped advisory lock, so events of a workflow are applied strictly in
+``sequence_no`` order even with several workers or API processes, while different
+workflows are projected in parallel.
+"""
 
 from __future__ import annotations
 
-# Intentionally thin: handlers live under app.services.reports.dispatch.handlers and may be
-# renamed to *Projector incrementally without changing the ingest transaction shape.
+import asyncio
+import logging
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.session import AsyncSessionLocal
+from app.models import WorkflowEvent
+from app.services.reports.service import (
+    commit_projected,
+    project_event,
+    stored_event_context,
+    workflow_lock_key,
+)
+from app.services.reports.state_cache import workflow_state_cache
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+async def project_pending_for_workflow(
+    db: AsyncSession, workflow_id: uuid.UUID | None, limit: int
+) -> tuple[int, int]:
+    """Project up to ``limit`` pending events of one workflow, oldest first.
+
+    The caller must hold the workflow's advisory lock and commits afterwards. The
+    workflow state cache is dropped first if another process projected events of
+    this workflow since this one last did. A failing event is marked ``failed``
+    and projection continues with the next one, like the inline path where the
+    plugin keeps reporting after a 500. Returns ``(handled, failed)``.
+    """
+    wf_filter = (
+        WorkflowEvent.workflow_id.is_(None)
+        if workflow_id is None
+        else WorkflowEvent.workflow_id == workflow_id
+    )
+    if workflow_id is not None:
+        last_projected = await db.scalar(
+            select(func.max(WorkflowEvent.sequence_no)).where(
+                wf_filter, WorkflowEvent.status != "pending"
+            )
+        )
+        workflow_state_cache.sync_watermark(workflow_id, last_projected)
+    result = await db.execute(
+        select(WorkflowEvent)
+        .where(wf_filter, WorkflowEvent.status == "pending")
+        .order_by(WorkflowEvent.sequence_no)
+        .limit(limit)
+    )
+    rows = result.scalars().all()
+    failed = 0
+    for row in rows:
+        try:
+            await project_event(
+                db, row, dict(row.payload_json), stored_event_context(row)
+            )
+        except Exception:
+            failed += 1
+            logger.exception(
+                "Projection failed for event %s (%s)", row.id, row.event_type
+            )
+        if workflow_id is not None:
+            workflow_state_cache.advance_watermark(workflow_id, row.sequence_no)
+    return len(rows), failed
+
+
+async def backlog(db: AsyncSession) -> dict[str, Any]:
+    """Queue depth and lag: pending event count and age of the oldest one."""
+    count, oldest = (
+        await db.execute(
+            select(func.count(), func.min(WorkflowEvent.created_at)).where(
+                WorkflowEvent.status == "pending"
+            )
+        )
+    ).one()
+    age = (datetime.now(UTC) - oldest).total_seconds() if oldest else 0.0
+    return {
+        "backlog_size": count,
+        "oldest_pending_at": oldest,
+        "oldest_pending_age_seconds": round(age, 3),
+    }
+
+
+class EventProjector:
+    def __init__(self):
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+        self._projected_total = 0
+        self._failed_total = 0
+        self._batches_total = 0
+        self._last_batch_at: datetime | None = None
+
+    def stats(self) -> dict:
+        """Worker counters for metrics; queue depth comes from :func:`backlog`."""
+        return {
+            "workers": sum(1 for t in self._tasks if not t.done()),
+            "projected_total": self._projected_total,
+            "failed_total": self._failed_total,
+            "batches_total": self._batches_total,
+            "last_batch_at": self._last_batch_at,
+        }
+
+    def notify(self) -> None:
+        """Wake idle workers after new events were committed."""
+        self._wakeup.set()
+
+    async def start(self, workers: int) -> None:
+        self._stopping = False
+        for n in range(workers):
+            self._tasks.append(
+                asyncio.create_task(self._worker(n), name=f"report-projector-{n}")
+            )
+        logger.info("Report projector started with %s worker(s)", workers)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def run_once(
+        self, session_factory: SessionFactory = AsyncSessionLocal
+    ) -> int:
+        """Claim one workflow with pending events and project a batch of them.
+
+        Returns the number of events handled (``0`` when nothing was claimable).
+        """
+        async with session_factory() as db:
+            result = await db.execute(
+                select(WorkflowEvent.workflow_id)
+                .where(WorkflowEvent.status == "pending")
+                .group_by(WorkflowEvent.workflow_id)
+                .order_by(func.min(WorkflowEvent.sequence_no))
+                .limit(max(len(self._tasks), 1) * 2)
+            )
+            for workflow_id in result.scalars().all():
+                locked = await db.scalar(
+                    select(
+                        func.pg_try_advisory_xact_lock(workflow_lock_key(workflow_id))
+                    )
+                )
+                if not locked:
+                    continue
+                handled, failed = await project_pending_for_workflow(
+                    db, workflow_id, settings.REPORTS_PROJECTOR_BATCH_SIZE
+                )
+                # Committing also releases the advisory lock.
+                await commit_projected(db)
+                self._projected_total += handled - failed
+                self._failed_total += failed
+                self._batches_total += 1
+                self._last_batch_at = datetime.now(UTC)
+                return handled
+            await db.rollback()
+        return 0
+
+    async def drain(self, session_factory: SessionFactory = AsyncSessionLocal) -> int:
+        """Project until nothing claimable is left (tests and maintenance)."""
+        total = 0
+        while handled := await self.run_once(session_factory):
+            total += handled
+        return total
+
+    async def _worker(self, n: int) -> None:
+        while not self._stopping:
+            try:
+                if await self.run_once():
+                    continue
+            except Exception as e:
+                logger.error("Report projector worker %s failed: %s", n, e)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=settings.REPORTS_PROJECTOR_POLL_SECONDS,
+                )
+            except TimeoutError:
+                pass
+
+
+# Process-wide projector, started from the app lifespan in queued mode
+event_projector = EventProjector()
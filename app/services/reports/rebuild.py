@@ -0,0 +1,188 @@
+"""Rebuild workflow projections from the ``workflow_events`` log.
+
+``rebuild_workflow`` deletes a workflow's projected rows (files, jobs, errors, rules
+and the workflow itself) and re-applies every recorded event in ``sequence_no``
+order through the same handlers used at ingest time. ``retry_failed_events`` only
+re-applies events that failed to project, leaving everything else untouched.
+
+Both take the workflow's projection advisory lock, so they never interleave with
+the queued projector, and mark events as replays so no notifications are sent.
+Workflows without a recorded ``workflow_started`` event (reported before the log
+existed) are skipped rather than wiped, and so are deleted runs whose events are
+still in the log: rebuilding must not bring them back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.session import AsyncSessionLocal
+from app.models import Error, File, Job, Rule, Status, Workflow, WorkflowEvent
+from app.services.reports.dispatch.constants import EventName
+from app.services.reports.service import (
+    commit_projected,
+    project_event,
+    stored_event_context,
+    workflow_lock_key,
+)
+from app.services.reports.state_cache import workflow_state_cache
+
+logger = logging.getLogger(__name__)
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+async def _lock_workflow(db: AsyncSession, workflow_id: uuid.UUID) -> None:
+    await db.execute(select(func.pg_advisory_xact_lock(workflow_lock_key(workflow_id))))
+
+
+async def _replay(db: AsyncSession, workflow_id: uuid.UUID, *statuses: str) -> dict:
+    """Project the workflow's events (optionally only some statuses) in order."""
+    filters = [WorkflowEvent.workflow_id == workflow_id]
+    if statuses:
+        filters.append(WorkflowEvent.status.in_(statuses))
+    batch_size = settings.REPORTS_PROJECTOR_BATCH_SIZE
+    replayed = failed = 0
+    last_seq = -1
+    while True:
+        result = await db.execute(
+            select(WorkflowEvent)
+            .where(*filters, WorkflowEvent.sequence_no > last_seq)
+            .order_by(WorkflowEvent.sequence_no)
+            .limit(batch_size)
+        )
+        rows = result.scalars().all()
+        if not rows:
+            break
+        for row in rows:
+            try:
+                await project_event(
+                    db,
+                    row,
+                    dict(row.payload_json),
+                    stored_event_context(row, replay=True),
+                )
+            except Exception:
+                failed += 1
+                logger.warning("Replay of event %s (%s) failed", row.id, row.event_type)
+            replayed += 1
+            last_seq = row.sequence_no
+        # Write the batch and keep the identity map small on long runs.
+        await db.flush()
+        db.expunge_all()
+    return {"events": replayed, "failed": failed}
+
+
+async def rebuild_workflow(db: AsyncSession, workflow_id: uuid.UUID) -> dict[str, Any]:
+    """Wipe and re-project one workflow from its events; the caller commits."""
+    await _lock_workflow(db, workflow_id)
+    has_start = await db.scalar(
+        select(
+            exists().where(
+                WorkflowEvent.workflow_id == workflow_id,
+                WorkflowEvent.event_type == EventName.WORKFLOW_STARTED,
+            )
+        )
+    )
+    if not has_start:
+        return {"workflow_id": workflow_id, "skipped": "no workflow_started event"}
+
+    # ``/reports/close`` is not an event: keep the terminal state it set.
+    closed = (
+        await db.execute(
+            select(Workflow.status, Workflow.end_time).where(Workflow.id == workflow_id)
+        )
+    ).one_or_none()
+    if closed is None:
+        return {"workflow_id": workflow_id, "skipped": "workflow deleted"}
+
+    job_ids = select(Job.id).where(Job.workflow_id == workflow_id)
+    await db.execute(delete(File).where(File.job_id.in_(job_ids)))
+    await db.execute(delete(Job).where(Job.workflow_id == workflow_id))
+    await db.execute(delete(Error).where(Error.workflow_id == workflow_id))
+    await db.execute(delete(Rule).where(Rule.workflow_id == workflow_id))
+    await db.execute(delete(Workflow).where(Workflow.id == workflow_id))
+    db.expunge_all()
+    workflow_state_cache.evict(workflow_id)
+
+    summary = await _replay(db, workflow_id)
+
+    workflow = await db.get(Workflow, workflow_id)
+    if (
+        workflow is not None
+        and closed.status != Status.RUNNING
+        and workflow.status == Status.RUNNING
+    ):
+        workflow.status = closed.status
+        workflow.end_time = closed.end_time
+        await db.execute(
+            update(Job)
+            .where(Job.workflow_id == workflow_id, Job.status == Status.RUNNING)
+            .values(status=closed.status, end_time=closed.end_time)
+        )
+    return {"workflow_id": workflow_id, **summary}
+
+
+async def retry_failed_events(
+    db: AsyncSession, workflow_id: uuid.UUID
+) -> dict[str, Any]:
+    """Re-project only the workflow's ``failed`` events; the caller commits."""
+    await _lock_workflow(db, workflow_id)
+    workflow_state_cache.evict(workflow_id)
+    summary = await _replay(db, workflow_id, "failed")
+    return {"workflow_id": workflow_id, **summary}
+
+
+async def rebuild_projections(
+    workflow_ids: list[uuid.UUID] | None = None,
+    *,
+    failed_only: bool = False,
+    parallelism: int = 4,
+    session_factory: SessionFactory = AsyncSessionLocal,
+) -> dict[str, Any]:
+    """Rebuild (or retry failed events of) many workflows, several at a time.
+
+    ``workflow_ids=None`` selects every workflow in the event log (with
+    ``failed_only``, every workflow that has failed events). Each workflow is
+    processed in its own session and transaction.
+    """
+    if workflow_ids is None:
+        query = select(WorkflowEvent.workflow_id).where(
+            WorkflowEvent.workflow_id.is_not(None)
+        )
+        if failed_only:
+            query = query.where(WorkflowEvent.status == "failed")
+        async with session_factory() as db:
+            workflow_ids = list((await db.scalars(query.distinct())).all())
+
+    semaphore = asyncio.Semaphore(max(parallelism, 1))
+    action = retry_failed_events if failed_only else rebuild_workflow
+
+    async def run(workflow_id: uuid.UUID) -> dict[str, Any]:
+        async with semaphore, session_factory() as db:
+            try:
+                result = await action(db, workflow_id)
+                await commit_projected(db)
+                return result
+            except Exception as e:
+                await db.rollback()
+                workflow_state_cache.evict(workflow_id)
+                logger.exception("Rebuild of workflow %s failed", workflow_id)
+                return {"workflow_id": workflow_id, "error": str(e)}
+
+    results = await asyncio.gather(*(run(wf) for wf in workflow_ids))
+    return {
+        "workflows": len(results),
+        "events": sum(r.get("events", 0) for r in results),
+        "failed_events": sum(r.get("failed", 0) for r in results),
+        "skipped": [r["workflow_id"] for r in results if "skipped" in r],
+        "errors": {str(r["workflow_id"]): r["error"] for r in results if "error" in r},
+    }
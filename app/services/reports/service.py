@@ -7,11 +7,23 @@ from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
+from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Workflow, WorkflowEvent
+from app.core.config import settings
+from app.models import WorkflowEvent, WorkflowEventKey
+from app.services.reports.dispatch.constants import EventName
 from app.services.reports.dispatch.registry import event_registry
+from app.services.reports.error_excerpt import (
+    attach_error_excerpts,
+    discard_error_excerpts,
+)
+from app.services.reports.state_cache import workflow_state_cache
+
+# ``db.info`` key: workflows whose events were projected in the open transaction
+_PROJECTED = "reports_projected_workflows"
 
 
 def _resolve_workflow_id(
@@ -32,38 +44,53 @@ def _resolve_workflow_id(
     return None
 
 
-def _resolve_persistable_workflow_id(
-    db: Session, event_name: str, record: dict[str, Any], context: dict[str, Any]
-) -> UUID | None:
-    """
-    Only persist ``workflow_id`` when the referenced workflow row already exists.
+def workflow_lock_key(workflow_id: UUID | None) -> int:
+    """Advisory lock key serializing projection of one workflow's events.
 
-    ``workflow_started`` is intentionally recorded before projection creates the Workflow
-    row, so raw event storage must tolerate an unresolved workflow reference.
+    Signed 64-bit (``0`` for events without a workflow), shared by the queued
+    projector and rebuilds so they never apply a workflow's events concurrently.
     """
-    workflow_id = _resolve_workflow_id(event_name, record, context)
     if workflow_id is None:
-        return None
-    return workflow_id if db.get(Workflow, workflow_id) is not None else None
+        return 0
+    return int.from_bytes(workflow_id.bytes[:8], "big", signed=True)
+
+
+def stored_event_context(row: WorkflowEvent, *, replay: bool = False) -> dict[str, Any]:
+    """Rebuild the handler context of a recorded event.
+
+    The ``jobs`` map is dropped: it only reflects what the plugin knew when it sent
+    the event, and handlers resolve job ids from the database instead. Timestamps
+    come from when the event was recorded, not from when it is projected.
+    """
+    context = dict(row.context_json or {})
+    context.pop("jobs", None)
+    context["flowo_user_id"] = row.user_id
+    context["flowo_event_time"] = row.created_at
+    if replay:
+        context["flowo_replay"] = True
+    if row.workflow_id is not None:
+        context.setdefault("current_workflow_id", str(row.workflow_id))
+    return context
 
 
-def ingest_report_event(
-    db: Session,
+async def record_report_event(
+    db: AsyncSession,
     *,
     event_name: str,
     record: dict[str, Any],
     context: dict[str, Any],
     user_id: UUID,
-) -> None:
+    event_key: WorkflowEventKey | None = None,
+) -> WorkflowEvent:
     """
-    Insert ``WorkflowEvent`` (pending), run projector inside a savepoint, then set status.
+    Insert the raw ``WorkflowEvent`` (pending) and flush it; nothing is projected yet.
 
-    On projector failure, handler DB changes roll back but the raw event row remains with
-    ``status=failed`` and ``error_message`` set, then the exception is re-raised for the API.
+    ``workflow_id`` is stored even before the Workflow row exists (``workflow_started``
+    is recorded before projection creates it, and queued events are recorded before
+    any of them is projected), so the log can be ordered and replayed per workflow.
     """
-    wf_id = _resolve_persistable_workflow_id(db, event_name, record, context)
     row = WorkflowEvent(
-        workflow_id=wf_id,
+        workflow_id=_resolve_workflow_id(event_name, record, context),
         user_id=user_id,
         event_type=event_name,
         payload_json=jsonable_encoder(record),
@@ -72,20 +99,183 @@ def ingest_report_event(
         status="pending",
     )
     db.add(row)
-    db.flush()
+    await db.flush()
+    if event_key is not None:
+        event_key.event_id = row.id
+        event_key.event_created_at = row.created_at
+    return row
+
 
+async def project_event(
+    db: AsyncSession,
+    row: WorkflowEvent,
+    record: dict[str, Any],
+    context: dict[str, Any],
+) -> None:
+    """
+    Run the registry handlers for ``row`` inside a savepoint, then set its status.
+
+    On failure the handler changes roll back, the row is marked ``failed`` with the
+    traceback in ``error_message``, and the exception is re-raised.
+    """
+    db.info.setdefault(_PROJECTED, set()).add(row.workflow_id)
     try:
-        with db.begin_nested():
-            event_registry.dispatch(event_name, record, db, context)
+        async with db.begin_nested():
+            await event_registry.dispatch(row.event_type, record, db, context)
     except Exception as e:
+        # The savepoint rollback may have undone rules/jobs the handlers cached.
+        workflow_state_cache.evict(row.workflow_id)
         row.status = "failed"
         row.error_message = (f"{type(e).__name__}: {e}\n{traceback.format_exc()}")[
             :8000
         ]
         row.processed_at = datetime.now(UTC)
-        # Persist the raw row even though the API will error (outer rollback would drop it).
-        db.commit()
         raise
 
     row.status = "processed"
     row.processed_at = datetime.now(UTC)
+
+
+async def commit_projected(db: AsyncSession) -> None:
+    """Commit events projected in ``db``'s transaction.
+
+    If the commit fails, the state cached while projecting them was never stored:
+    the entries of their workflows are evicted before the error propagates. Once
+    committed, the error excerpts the events asked for are read and stored.
+    """
+    try:
+        await db.commit()
+    except Exception:
+        for workflow_id in db.info.pop(_PROJECTED, ()):
+            workflow_state_cache.evict(workflow_id)
+        discard_error_excerpts(db)
+        raise
+    db.info.pop(_PROJECTED, None)
+    await attach_error_excerpts(db)
+
+
+async def ingest_report_event(
+    db: AsyncSession,
+    *,
+    event_name: str,
+    record: dict[str, Any],
+    context: dict[str, Any],
+    user_id: UUID,
+    event_key: WorkflowEventKey | None = None,
+) -> None:
+    """
+    Insert ``WorkflowEvent`` (pending), run projector inside a savepoint, then set status.
+
+    On projector failure, handler DB changes roll back but the raw event row remains with
+    ``status=failed`` and ``error_message`` set, then the exception is re-raised for the API.
+    """
+    row = await record_report_event(
+        db,
+        event_name=event_name,
+        record=record,
+        context=context,
+        user_id=user_id,
+        event_key=event_key,
+    )
+    try:
+        await project_event(db, row, record, context)
+    except Exception:
+        # Persist the raw row even though the API will error (outer rollback would drop it).
+        await commit_projected(db)
+        raise
+
+
+async def enqueue_report_event(
+    db: AsyncSession,
+    *,
+    event_name: str,
+    record: dict[str, Any],
+    context: dict[str, Any],
+    user_id: UUID,
+    event_key: WorkflowEventKey | None = None,
+) -> WorkflowEvent:
+    """
+    Durably record an event for the background projector and return immediately.
+
+    Only what the plugin needs to keep reporting is put back into ``context``: the
+    workflow id on ``workflow_started``. Job ids are resolved server-side at
+    projection time, so the ``jobs`` map is not needed.
+    """
+    row = await record_report_event(
+        db,
+        event_name=event_name,
+        record=record,
+        context=context,
+        user_id=user_id,
+        event_key=event_key,
+    )
+    if event_name == EventName.WORKFLOW_STARTED and row.workflow_id is not None:
+        context["current_workflow_id"] = str(row.workflow_id)
+    return row
+
+
+async def claim_event_key(
+    db: AsyncSession, *, stream_id: UUID, seq: int, user_id: UUID
+) -> tuple[WorkflowEventKey, bool]:
+    """
+    Claim the client id ``(stream_id, seq)`` of an event; ``True`` if it is new.
+
+    A new key is filled in by ``record_report_event`` and committed with the event.
+    If the same key is being delivered concurrently, the insert waits on the primary
+    key until the other request commits and then returns its key as a repeat.
+    """
+    key = await db.scalar(
+        insert(WorkflowEventKey)
+        .values(
+            stream_id=stream_id,
+            seq=seq,
+            user_id=user_id,
+            created_at=datetime.now(UTC),
+        )
+        .on_conflict_do_nothing(index_elements=["stream_id", "seq"])
+        .returning(WorkflowEventKey)
+    )
+    if key is not None:
+        return key, True
+    key = await db.get(WorkflowEventKey, (stream_id, seq))
+    if key.user_id != user_id:
+        raise HTTPException(
+            status_code=409, detail="Event id already used by another user"
+        )
+    return key, False
+
+
+def remember_event_response(
+    key: WorkflowEventKey, sent: dict[str, Any], answered: dict[str, Any]
+) -> None:
+    """Store the context keys the response changed, to answer repeats with them."""
+    key.response_json = jsonable_encoder(
+        {k: v for k, v in answered.items() if k not in sent or sent[k] != v}
+    )
+
+
+async def repeat_report_event(
+    db: AsyncSession,
+    key: WorkflowEventKey,
+    *,
+    record: dict[str, Any],
+    context: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Answer a repeated delivery of an event without recording it again.
+
+    The response context is the one stored for the first delivery. In inline mode
+    an event whose projection failed (the plugin got a 500 and retried) is projected
+    again; queued events are left to the projector and to rebuilds.
+    """
+    sent = dict(context)
+    if settings.REPORTS_INGEST_MODE == "inline" and key.event_id is not None:
+        row = await db.get(WorkflowEvent, (key.event_id, key.event_created_at))
+        if row is not None and row.status == "failed":
+            try:
+                await project_event(db, row, record, context)
+            except Exception:
+                await commit_projected(db)
+                raise
+            remember_event_response(key, sent, context)
+    return {**context, **(key.response_json or {})}
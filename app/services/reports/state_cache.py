@@ -0,0 +1,139 @@
+"""In-process cache of per-workflow projection state.
+
+Projection repeatedly looks up the same facts while a run is reporting: whether the
+workflow row exists, the ``rules.id`` for a rule name and the ``jobs.id`` of a
+Snakemake job id. This LRU (bounded by ``REPORTS_STATE_CACHE_SIZE`` workflows, each
+entry expiring after ``REPORTS_STATE_CACHE_TTL_SECONDS``) remembers them.
+
+The cache is advisory: a miss always falls back to the database, and anything that
+could make an entry wrong evicts it:
+
+* a failed projection (its savepoint may have rolled back a rule or job we cached);
+* closing or deleting the workflow;
+* another process having projected events of the workflow since this one last did
+  (see :meth:`WorkflowStateCache.sync_watermark`), as it may have started a new
+  attempt of a job.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from app.core.config import settings
+
+
+@dataclass
+class WorkflowState:
+    expires_at: float
+    exists: bool = False
+    rules: dict[str, int] = field(default_factory=dict)
+    jobs: dict[int, int] = field(default_factory=dict)
+    # Highest ``workflow_events.sequence_no`` this process projected for the workflow
+    watermark: int | None = None
+
+
+class WorkflowStateCache:
+    def __init__(self, max_workflows: int | None = None, ttl: float | None = None):
+        self._max_workflows = max_workflows
+        self._ttl = ttl
+        self._entries: OrderedDict[uuid.UUID, WorkflowState] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_workflows(self) -> int:
+        return self._max_workflows or settings.REPORTS_STATE_CACHE_SIZE
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl or settings.REPORTS_STATE_CACHE_TTL_SECONDS
+
+    def stats(self) -> dict:
+        return {
+            "workflows": len(self._entries),
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def peek(self, workflow_id: uuid.UUID) -> WorkflowState | None:
+        """Live entry for ``workflow_id`` (refreshing its LRU position), if any."""
+        state = self._entries.get(workflow_id)
+        if state is None:
+            return None
+        if state.expires_at <= time.monotonic():
+            del self._entries[workflow_id]
+            return None
+        self._entries.move_to_end(workflow_id)
+        return state
+
+    def state(self, workflow_id: uuid.UUID) -> WorkflowState:
+        """Entry for ``workflow_id``, created empty when missing."""
+        state = self.peek(workflow_id)
+        if state is None:
+            state = WorkflowState(expires_at=time.monotonic() + self.ttl)
+            self._entries[workflow_id] = state
+            while len(self._entries) > self.max_workflows:
+                self._entries.popitem(last=False)
+        return state
+
+    def workflow_exists(self, workflow_id: uuid.UUID) -> bool:
+        state = self.peek(workflow_id)
+        return self._count(state is not None and state.exists)
+
+    def rule_id(self, workflow_id: uuid.UUID, name: str) -> int | None:
+        state = self.peek(workflow_id)
+        return self._count(state.rules.get(name) if state else None)
+
+    def job_ids(
+        self, workflow_id: uuid.UUID, snakemake_ids: list[int]
+    ) -> dict[int, int]:
+        state = self.peek(workflow_id)
+        found = {}
+        if state is not None:
+            found = {s: state.jobs[s] for s in snakemake_ids if s in state.jobs}
+        self._hits += len(found)
+        self._misses += len(snakemake_ids) - len(found)
+        return found
+
+    def remember_workflow(self, workflow_id: uuid.UUID) -> None:
+        self.state(workflow_id).exists = True
+
+    def remember_rule(self, workflow_id: uuid.UUID, name: str, rule_id: int) -> None:
+        self.state(workflow_id).rules[name] = rule_id
+
+    def remember_jobs(self, workflow_id: uuid.UUID, jobs: dict[int, int]) -> None:
+        self.state(workflow_id).jobs.update(jobs)
+
+    def sync_watermark(
+        self, workflow_id: uuid.UUID, last_projected: int | None
+    ) -> None:
+        """Drop the entry unless this process projected the workflow's latest event."""
+        state = self.peek(workflow_id)
+        if state is not None and state.watermark != last_projected:
+            self.evict(workflow_id)
+
+    def advance_watermark(self, workflow_id: uuid.UUID, sequence_no: int) -> None:
+        state = self.peek(workflow_id)
+        if state is not None:
+            state.watermark = sequence_no
+
+    def evict(self, workflow_id: uuid.UUID | None) -> None:
+        if workflow_id is not None:
+            self._entries.pop(workflow_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _count(self, value):
+        if value:
+            self._hits += 1
+        else:
+            self._misses += 1
+        return value
+
+
+# Shared by all handlers and projector workers of this process
+workflow_state_cache = WorkflowStateCache()
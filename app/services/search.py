@@ -0,0 +1,115 @@
+"""Typeahead search over run names and catalog names/descriptions.
+
+With the ``pg_trgm`` extension (migration a9b0c1d2e3f4 installs it where the server
+offers it), substring filters use its GIN indexes and matches are ranked by trigram
+word similarity, which also finds near misses ("algn" for "align"). Without it,
+search falls back to substring matches ranked by where the text matches.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Float, case, cast, func, literal, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.permissions import catalog_read_filter, workflow_read_filter
+from ..models import Catalog, User, Workflow
+from ..schemas import CatalogSearchHit, SearchResponse, WorkflowSearchHit
+
+# Whether pg_trgm is installed; checked once per process (restart after installing)
+_trigram: bool | None = None
+
+
+async def trigram_available(db: AsyncSession) -> bool:
+    global _trigram
+    if _trigram is None:
+        _trigram = bool(
+            await db.scalar(
+                text(
+                    "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')"
+                )
+            )
+        )
+    return _trigram
+
+
+def _matches(column, query: str, fuzzy: bool):
+    match = column.icontains(query, autoescape=True)
+    if fuzzy:
+        # ``query <% column``: a word of column is similar to query
+        match = or_(match, literal(query).op("<%")(column))
+    return match
+
+
+def _score(column, query: str, fuzzy: bool):
+    if fuzzy:
+        return func.coalesce(func.word_similarity(query, column), 0)
+    lowered = func.lower(column)
+    needle = query.lower()
+    return case(
+        (lowered == needle, 1.0),
+        (lowered.startswith(needle, autoescape=True), 0.75),
+        (lowered.contains(needle, autoescape=True), 0.5),
+        else_=0.0,
+    )
+
+
+class SearchService:
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def search(self, query: str, user: User, limit: int = 10) -> SearchResponse:
+        query = query.strip()
+        fuzzy = await trigram_available(self.db_session)
+
+        workflow_score = cast(_score(Workflow.name, query, fuzzy), Float)
+        workflows = await self.db_session.execute(
+            select(
+                Workflow.id,
+                Workflow.name,
+                Workflow.status,
+                Workflow.started_at,
+                workflow_score.label("score"),
+            )
+            .where(_matches(Workflow.name, query, fuzzy), workflow_read_filter(user))
+            .order_by(workflow_score.desc(), Workflow.started_at.desc())
+            .limit(limit)
+        )
+
+        # Name matches rank above description matches
+        catalog_score = cast(
+            func.greatest(
+                _score(Catalog.name, query, fuzzy),
+                _score(Catalog.description, query, fuzzy) / 2,
+            ),
+            Float,
+        )
+        catalogs = await self.db_session.execute(
+            select(
+                Catalog.id,
+                Catalog.slug,
+                Catalog.name,
+                Catalog.description,
+                catalog_score.label("score"),
+            )
+            .where(
+                or_(
+                    _matches(Catalog.name, query, fuzzy),
+                    _matches(Catalog.description, query, fuzzy),
+                ),
+                catalog_read_filter(user),
+            )
+            .order_by(catalog_score.desc(), Catalog.name)
+            .limit(limit)
+        )
+
+        return SearchResponse(
+            workflows=[
+                WorkflowSearchHit.model_validate(row, from_attributes=True)
+                for row in workflows
+            ],
+            catalogs=[
+                CatalogSearchHit.model_validate(row, from_attributes=True)
+                for row in catalogs
+            ],
+            fuzzy=fuzzy,
+        )
@@ -1,20 +1,40 @@
 import math
-from collections import Counter, defaultdict
-from datetime import datetime
+from collections import defaultdict
+from datetime import UTC, date, datetime
 from typing import Literal
 
 import asyncpg
-from sqlalchemy import Float, and_, cast, desc, func, select, text
+from sqlalchemy import Float, and_, cast, desc, func, select, text, true
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.pg_listener import pg_listener
-from ..models import Job, Rule, Workflow
+from ..models import JobDailyRollup, Workflow
+from ..models.job_rollups import current_buckets, current_rollups
 from ..schemas import (
     ServiceStatus,
     StatusSummary,
     SystemHealthResponse,
 )
+from ..utils import ddsketch
+
+
+def _rollup_filters(
+    rollups, start_at: datetime | None, end_at: datetime | None, user_id
+):
+    """Rollup rows of the UTC days from ``start_at`` to ``end_at`` (whole days)."""
+    conditions = []
+    if user_id:
+        conditions.append(rollups.c.user_id == user_id)
+    if start_at:
+        conditions.append(rollups.c.day >= _utc_day(start_at))
+    if end_at:
+        conditions.append(rollups.c.day <= _utc_day(end_at))
+    return conditions
+
+
+def _utc_day(at: datetime) -> date:
+    return (at.astimezone(UTC) if at.tzinfo else at).date()
 
 
 class SummaryService:
@@ -42,14 +62,15 @@ class SummaryService:
                 running=result.running or 0,
             )
         if item == "job":
+            rollups = current_rollups()
             stmt = select(
-                func.count().filter(Job.status == "SUCCESS").label("success"),
-                func.count().filter(Job.status == "ERROR").label("error"),
-                func.count().filter(Job.status == "RUNNING").label("running"),
-            ).join(Workflow, Job.workflow_id == Workflow.id)
+                func.sum(rollups.c.success).label("success"),
+                func.sum(rollups.c.error).label("error"),
+                func.sum(rollups.c.running).label("running"),
+            )
 
             if user_id:
-                stmt = stmt.where(Workflow.user_id == user_id)
+                stmt = stmt.where(rollups.c.user_id == user_id)
 
             result = (await self.db_session.execute(stmt)).one()
 
@@ -73,26 +94,19 @@ class SummaryService:
         user_id=None,
     ):
         if item == "rule":
+            rollups = current_rollups()
+            job_count = func.sum(rollups.c.success)
             stmt = (
-                select(Rule.name, func.count(Job.id).label("job_count"))
-                .join(Job, Rule.id == Job.rule_id)
-                .join(Workflow, Job.workflow_id == Workflow.id)
-                .where(Job.status == "SUCCESS", Rule.name != "all")
-                .group_by(Rule.name)
+                select(rollups.c.rule_name, job_count.label("job_count"))
+                .where(
+                    rollups.c.rule_name != "all",
+                    *_rollup_filters(rollups, start_at, end_at, user_id),
+                )
+                .group_by(rollups.c.rule_name)
+                .having(job_count > 0)
                 .order_by(desc("job_count"))
             )
 
-            if user_id:
-                stmt = stmt.where(Workflow.user_id == user_id)
-
-            conditions = []
-            if start_at:
-                conditions.append(Job.started_at >= start_at)
-            if end_at:
-                conditions.append(Job.started_at <= end_at)
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
-
             results = (await self.db_session.execute(stmt.limit(limit))).all()
 
             return dict(results)
@@ -121,7 +135,15 @@ class SummaryService:
             return dict(results)
 
         if item == "tag":
-            stmt = select(Workflow).where(Workflow.run_info.is_not(None))
+            tags = func.unnest(Workflow.tags).table_valued("tag").render_derived()
+            stmt = (
+                select(tags.c.tag, func.count().label("workflow_count"))
+                .select_from(Workflow)
+                .join(tags, true())
+                .where(Workflow.run_info.is_not(None))
+                .group_by(tags.c.tag)
+                .order_by(desc("workflow_count"), tags.c.tag)
+            )
 
             if user_id:
                 stmt = stmt.where(Workflow.user_id == user_id)
@@ -131,16 +153,9 @@ class SummaryService:
             if end_at:
                 stmt = stmt.where(Workflow.started_at <= end_at)
 
-            workflows = (await self.db_session.execute(stmt)).scalars().all()
-
-            tag_counter = Counter()
-            for wf in workflows:
-                if wf.tags:
-                    tag_counter.update(wf.tags)
-
-            top_tags = tag_counter.most_common(limit)
+            results = (await self.db_session.execute(stmt.limit(limit))).all()
 
-            return dict(top_tags)
+            return dict(results)
 
     async def get_rule_error(
         self,
@@ -150,35 +165,26 @@ class SummaryService:
         user_id=None,
     ):
         # rule_name, total, error, pct
-        conditions = []
-        if start_at:
-            conditions.append(Job.started_at >= start_at)
-        if end_at:
-            conditions.append(Job.started_at <= end_at)
-
+        rollups = current_rollups()
+        total = func.sum(rollups.c.total)
+        error = func.sum(rollups.c.error)
         stmt = (
             select(
-                Rule.name,
-                func.count(Job.id).label("total_jobs"),
-                func.count().filter(Job.status == "ERROR").label("error_jobs"),
-                (
-                    cast(func.count().filter(Job.status == "ERROR"), Float)
-                    / func.count(Job.id)
-                ).label("error_ratio"),
+                rollups.c.rule_name,
+                total.label("total_jobs"),
+                error.label("error_jobs"),
+                (cast(error, Float) / total).label("error_ratio"),
+            )
+            .where(
+                rollups.c.rule_name.is_not(None),
+                *_rollup_filters(rollups, start_at, end_at, user_id),
             )
-            .join(Job, Rule.id == Job.rule_id)
-            .join(Workflow, Job.workflow_id == Workflow.id)
-            .group_by(Rule.name)
+            .group_by(rollups.c.rule_name)
+            .having(total > 0)
             .order_by(desc("error_ratio"))
             .limit(limit)
         )
 
-        if user_id:
-            stmt = stmt.where(Workflow.user_id == user_id)
-
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
-
         results = (await self.db_session.execute(stmt)).all()
 
         return {
@@ -195,73 +201,56 @@ class SummaryService:
         user_id=None,
     ):
         # max, min, q4, q1, media
-        conditions = [
-            Job.status == "SUCCESS",
-            Job.end_time.is_not(None),
-            Rule.name != "all",
-        ]
-        if start_at:
-            conditions.append(Job.started_at >= start_at)
-        if end_at:
-            conditions.append(Job.started_at <= end_at)
-
-        duration_expr = func.extract("epoch", Job.end_time - Job.started_at)
+        rollups = current_rollups()
+        avg_duration = func.sum(rollups.c.duration_sum) / func.sum(
+            rollups.c.duration_count
+        )
         stmt_avg = (
-            select(
-                Rule.name, func.avg(cast(duration_expr, Float)).label("avg_duration")
+            select(rollups.c.rule_name, avg_duration.label("avg_duration"))
+            .where(
+                rollups.c.rule_name != "all",
+                *_rollup_filters(rollups, start_at, end_at, user_id),
             )
-            .join(Job, Rule.id == Job.rule_id)
-            .join(Workflow, Job.workflow_id == Workflow.id)
-            .where(and_(*conditions))
-            .group_by(Rule.name)
-            .order_by(func.avg(cast(duration_expr, Float)).desc())
+            .group_by(rollups.c.rule_name)
+            .having(func.sum(rollups.c.duration_count) > 0)
+            .order_by(avg_duration.desc())
             .limit(limit)
         )
 
-        if user_id:
-            stmt_avg = stmt_avg.where(Workflow.user_id == user_id)
-
         result_avg = await self.db_session.execute(stmt_avg)
         top_rules = [r[0] for r in result_avg.all()]
         if not top_rules:
             return {}
-        stmt_details = (
-            select(
-                Rule.name,
-                func.min(cast(duration_expr, Float)).label("min_duration"),
-                func.percentile_cont(0.25)
-                .within_group(cast(duration_expr, Float))
-                .label("q1_duration"),
-                func.percentile_cont(0.5)
-                .within_group(cast(duration_expr, Float))
-                .label("median_duration"),
-                func.percentile_cont(0.75)
-                .within_group(cast(duration_expr, Float))
-                .label("q3_duration"),
-                func.max(cast(duration_expr, Float)).label("max_duration"),
+        # Duration sketches of the top rules, merged over the day range
+        rollups = JobDailyRollup.__table__
+        buckets = current_buckets()
+        stmt_buckets = (
+            select(rollups.c.rule_name, buckets.c.bucket, func.sum(buckets.c.count))
+            .join(buckets, buckets.c.rollup_id == rollups.c.id)
+            .where(
+                rollups.c.rule_name.in_(top_rules),
+                *_rollup_filters(rollups, start_at, end_at, user_id),
             )
-            .join(Job, Rule.id == Job.rule_id)
-            .join(Workflow, Job.workflow_id == Workflow.id)
-            .where(and_(*conditions, Rule.name.in_(top_rules)))
-            .group_by(Rule.name)
+            .group_by(rollups.c.rule_name, buckets.c.bucket)
         )
-
-        if user_id:
-            stmt_details = stmt_details.where(Workflow.user_id == user_id)
-
-        result_details = await self.db_session.execute(stmt_details)
-        results = result_details.all()
+        sketches = defaultdict(dict)
+        for rule_name, bucket, count in (
+            await self.db_session.execute(stmt_buckets)
+        ).all():
+            sketches[rule_name][bucket] = count
 
         durations_map = defaultdict(dict)
-        for result in results:
+        for rule_name, sketch in sketches.items():
+            summary = ddsketch.quantiles(sketch, (0, 0.25, 0.5, 0.75, 1))
+            if summary is None:
+                continue
             (
-                rule_name,
                 min_duration,
                 q1_duration,
                 median_duration,
                 q3_duration,
                 max_duration,
-            ) = result
+            ) = summary
 
             iqr_duration = q3_duration - q1_duration
             max_ = q3_duration + 1.5 * iqr_duration
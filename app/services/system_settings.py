@@ -0,0 +1,80 @@
+"""Process-wide snapshot of the ``system_settings`` row.
+
+Notification checks run on every workflow start, error and close, inside the ingest
+transaction. They read the snapshot instead of querying the row each time.
+
+The snapshot is a transient ``SystemSettings`` copy, never attached to a session.
+It is dropped when:
+
+* ``PATCH /admin/settings`` changes the row in this process;
+* another process sends ``NOTIFY`` on :data:`SYSTEM_SETTINGS_CHANNEL`, which the
+  admin endpoints emit in the updating transaction;
+* it is older than ``SYSTEM_SETTINGS_CACHE_TTL_SECONDS``, which covers
+  notifications missed while the listener connection was down.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+from sqlalchemy import func, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.system_settings import SystemSettings
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_SETTINGS_CHANNEL = "flowo_system_settings"
+
+
+def _snapshot(row: SystemSettings) -> SystemSettings:
+    return SystemSettings(
+        **{
+            attr.key: getattr(row, attr.key)
+            for attr in inspect(row).mapper.column_attrs
+        }
+    )
+
+
+class SystemSettingsCache:
+    def __init__(self):
+        self._value: SystemSettings | None = None
+        self._loaded = False
+        self._expires_at = 0.0
+        # Bumped on invalidation so a load racing with an update is not kept
+        self._version = 0
+
+    async def get(self, db: AsyncSession) -> SystemSettings | None:
+        """The cached settings (``None`` when no row exists), loaded on a miss."""
+        if self._loaded and self._expires_at > time.monotonic():
+            return self._value
+        version = self._version
+        row = (await db.execute(select(SystemSettings))).scalar_one_or_none()
+        value = _snapshot(row) if row is not None else None
+        if version == self._version:
+            self._value = value
+            self._loaded = True
+            self._expires_at = (
+                time.monotonic() + settings.SYSTEM_SETTINGS_CACHE_TTL_SECONDS
+            )
+        return value
+
+    def invalidate(self) -> None:
+        self._version += 1
+        self._loaded = False
+        self._value = None
+
+    def on_notification(self, conn, pid, channel, payload) -> None:
+        """``asyncpg`` listener callback for :data:`SYSTEM_SETTINGS_CHANNEL`."""
+        logger.debug("System settings changed in process %s", pid)
+        self.invalidate()
+
+
+async def announce_system_settings_change(db: AsyncSession) -> None:
+    """Tell every process to drop its snapshot once the caller's transaction commits."""
+    await db.execute(select(func.pg_notify(SYSTEM_SETTINGS_CHANNEL, "")))
+
+
+system_settings_cache = SystemSettingsCache()
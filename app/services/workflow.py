@@ -1,28 +1,52 @@
 import uuid
-from collections import Counter, defaultdict
+from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
-from itertools import chain, groupby
+from itertools import groupby
 from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import and_, case, func, inspect, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    and_,
+    cast,
+    exists,
+    func,
+    inspect,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
-from app.core.permissions import workflow_read_filter
+from app.core.config import settings
+from app.core.permissions import can_read_workflow, workflow_read_filter
 from app.models import User
 
-from ..models import Error, File, Job, Rule, Status, Workflow
+from ..models import (
+    File,
+    Job,
+    Rule,
+    RuleJobCounts,
+    Status,
+    Workflow,
+    WorkflowJobCounts,
+)
 from ..models.enums import FileType
+from ..models.job_counts import run_job_ids
 from ..schemas import (
     RuleStatusResponse,
     WorkflowDetialResponse,
     WorkflowListResponse,
     WorkflowResponse,
 )
+from ..utils.cursor import decode_cursor, encode_cursor
 from ..utils.paths import PathContent, get_file_content, path_resolver
+from .archive import restore_in_background
+from .deletion import delete_runs
+from .list_counts import list_total
 
 
 def _workflow_status_api(st: Status | None) -> str:
@@ -32,20 +56,65 @@ def _workflow_status_api(st: Status | None) -> str:
     return st.value
 
 
+def _progress(
+    run_info: dict[str, Any] | None, counts: WorkflowJobCounts | None
+) -> dict[str, int]:
+    # Until Snakemake sends ``run_info``, ``workflow.run_info`` is empty — use 0, not 1,
+    # so progress stays 0% instead of looking like one phantom job.
+    raw_total = (run_info or {}).get("total")
+    return {
+        "total": int(raw_total) if raw_total is not None else 0,
+        "completed": counts.success if counts else 0,
+        "running": counts.running if counts else 0,
+    }
+
+
+def _progress_percent(progress: dict[str, int]) -> int:
+    if not progress["total"]:
+        return 0
+    return round(progress["completed"] / progress["total"] * 100)
+
+
 class WorkflowService:
     """Service class for workflow-related business logic"""
 
     def __init__(self, db_session: AsyncSession):
         self.db_session = db_session
 
-    async def get_workflow(self, workflow_id: uuid.UUID):
-        query = (
+    async def get_workflow(
+        self, workflow_id: uuid.UUID, restore: bool = False, user: User | None = None
+    ):
+        """The run; archived runs come back as the stub with ``archived_at`` set.
+
+        With ``restore``, for callers that need the run's jobs, rules or files, an
+        archived run ``user`` can read is restored in the background and the
+        request answered 202 meanwhile. Runs they cannot read come back as the
+        stub for the caller's permission check to reject.
+        """
+        result = await self.db_session.execute(
             select(Workflow)
             .options(selectinload(Workflow.catalog))
             .where(Workflow.id == workflow_id)
         )
-        result = await self.db_session.execute(query)
-        return result.scalar_one_or_none()
+        workflow = result.scalar_one_or_none()
+        if (
+            workflow is not None
+            and workflow.archived_at is not None
+            and restore
+            and (user is None or can_read_workflow(user, workflow))
+        ):
+            restore_in_background(
+                workflow_id,
+                async_sessionmaker(
+                    self.db_session.bind, autoflush=False, expire_on_commit=False
+                ),
+            )
+            raise HTTPException(
+                status_code=202,
+                detail="Run is being restored from the archive",
+                headers={"Retry-After": "5"},
+            )
+        return workflow
 
     async def get_flowo_directory(self, workflow_id: uuid.UUID):
         workflow = await self.get_workflow(workflow_id=workflow_id)
@@ -57,7 +126,7 @@ class WorkflowService:
         workflow = await self.get_workflow(workflow_id=workflow_id)
         if not workflow:
             raise HTTPException(status_code=404, detail="Workflow not found")
-        progress = await self._get_progress(workflow.id)
+        progress = (await self.get_progress_many([workflow]))[workflow.id]
         cols = {
             c.key: getattr(workflow, c.key)
             for c in inspect(workflow).mapper.column_attrs
@@ -71,7 +140,7 @@ class WorkflowService:
             started_at=cols.get("started_at"),
             end_time=cols.get("end_time"),
             status=_workflow_status_api(cols.get("status")),
-            progress=progress,
+            progress=_progress_percent(progress),
             config=cols.get("config"),
             snakefile=cols.get("snakefile"),
             directory=cols.get("directory"),
@@ -81,22 +150,6 @@ class WorkflowService:
             catalog_slug=catalog_slug,
         )
 
-    async def _get_progress_data(self, workflow_id: uuid.UUID):
-        result = await self.db_session.execute(
-            select(func.count(Job.id)).where(
-                Job.workflow_id == workflow_id, Job.status == Status.SUCCESS
-            )
-        )
-        success = result.scalar() or 0
-
-        run_info = await self.get_workflow_run_info(workflow_id=workflow_id)
-        if not run_info:
-            return 0, 0, 0
-        total = run_info.get("total", 0)
-        if not total:
-            return 0, success, 0
-        return round((success / total) * 100), success, total
-
     async def list_all_workflows(
         self,
         limit: int | None = None,
@@ -112,6 +165,7 @@ class WorkflowService:
         user_id: uuid.UUID | None = None,
         readable_user: User | None = None,
         catalog_id: uuid.UUID | None = None,
+        cursor: str | None = None,
     ) -> WorkflowListResponse:
         base_query = select(Workflow).options(selectinload(Workflow.catalog))
         filters = []
@@ -132,8 +186,10 @@ class WorkflowService:
 
         if tags:
             tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
-            for tag in tag_list:
-                filters.append(func.array_position(Workflow.tags, tag) > 0)
+            if tag_list:
+                filters.append(
+                    Workflow.tags.contains(cast(tag_list, Workflow.tags.type))
+                )
         if name:
             filters.append(Workflow.name.ilike(f"%{name}%"))
 
@@ -148,33 +204,44 @@ class WorkflowService:
         if filters:
             base_query = base_query.where(and_(*filters))
 
-        count_query = select(func.count(Workflow.id))
-        if filters:
-            count_query = count_query.where(and_(*filters))
-
-        total_count_result = await self.db_session.execute(count_query)
-        total_count = total_count_result.scalar()
+        total = await list_total(self.db_session, select(Workflow.id).where(*filters))
 
         data_query = base_query
 
+        # Ties are broken by id so that every row has a distinct position
         if order_by_started:
-            order_column = Workflow.started_at
+            key = (Workflow.started_at, Workflow.id)
+            key_types = (datetime, uuid.UUID)
         else:
-            order_column = Workflow.id
+            key = (Workflow.id,)
+            key_types = (uuid.UUID,)
 
         if descending:
-            data_query = data_query.order_by(order_column.desc())
+            data_query = data_query.order_by(*(c.desc() for c in key))
         else:
-            data_query = data_query.order_by(order_column)
+            data_query = data_query.order_by(*key)
 
-        data_query = data_query.offset(offset).limit(limit)
+        if cursor:
+            after = tuple_(*decode_cursor(cursor, *key_types))
+            data_query = data_query.where(
+                tuple_(*key) < after if descending else tuple_(*key) > after
+            )
+        else:
+            data_query = data_query.offset(offset)
+        data_query = data_query.limit(limit)
 
         result = await self.db_session.execute(data_query)
         workflows = result.scalars().all()
 
+        next_cursor = None
+        if limit and len(workflows) == limit:
+            last = workflows[-1]
+            next_cursor = encode_cursor(*(getattr(last, c.key) for c in key))
+
+        progress_by_id = await self.get_progress_many(workflows)
         workflow_responses = []
         for workflow in workflows:
-            progress, success, total = await self._get_progress_data(workflow.id)
+            progress = progress_by_id[workflow.id]
             cols = {
                 c.key: getattr(workflow, c.key)
                 for c in inspect(workflow).mapper.column_attrs
@@ -192,9 +259,9 @@ class WorkflowService:
                     name=cols.get("name"),
                     configfiles=bool(cols.get("configfiles")),
                     tags=cols.get("tags"),
-                    progress=progress,
-                    total_jobs=total,
-                    completed_jobs=success,
+                    progress=_progress_percent(progress),
+                    total_jobs=progress["total"],
+                    completed_jobs=progress["completed"],
                     catalog_id=cols.get("catalog_id"),
                     catalog_slug=catalog_slug,
                 )
@@ -204,7 +271,9 @@ class WorkflowService:
             workflows=workflow_responses,
             offset=offset,
             limit=limit,
-            total=total_count,
+            total=total.value,
+            approximate=total.approximate,
+            next_cursor=next_cursor,
         )
 
     async def get_all_users(self) -> list[str]:
@@ -235,13 +304,15 @@ class WorkflowService:
         return get_file_content(workflow.logfile)
 
     async def get_all_tags(self) -> list[str]:
-        query = select(Workflow.tags)
-        result = await self.db_session.execute(query)
-        tags = result.scalars().all()
-        flattened = list(
-            chain.from_iterable(t for t in tags if t is not None),
+        tags = func.unnest(Workflow.tags).table_valued("tag").render_derived()
+        result = await self.db_session.execute(
+            select(tags.c.tag)
+            .select_from(Workflow)
+            .join(tags, true())
+            .distinct()
+            .order_by(tags.c.tag)
         )
-        return list(set(flattened))
+        return list(result.scalars().all())
 
     async def get_configfiles(self, workflow_id: uuid.UUID):
         workflow = await self.get_workflow(workflow_id=workflow_id)
@@ -270,39 +341,32 @@ class WorkflowService:
         return data
 
     async def get_progress(self, workflow_id: uuid.UUID):
-        # get the total number of jobs, completed jobs, running jobs, failed jobs in one query
-        query = select(
-            func.sum(case((Job.status == Status.SUCCESS, 1), else_=0)).label(
-                "completed"
-            ),
-            func.sum(case((Job.status == Status.RUNNING, 1), else_=0)).label("running"),
-        ).where(Job.workflow_id == workflow_id)
-
-        result = await self.db_session.execute(query)
-        row = result.first()
-
-        workflow_run_info = await self.get_workflow_run_info(workflow_id=workflow_id)
-        # Until Snakemake sends ``run_info``, ``workflow.run_info`` is empty — use 0, not 1,
-        # so progress stays 0% instead of looking like one phantom job.
-        raw_total = workflow_run_info.get("total")
-        total_jobs = int(raw_total) if raw_total is not None else 0
-
-        if not row:
-            completed = 0
-            running = 0
-        else:
-            completed = row.completed or 0
-            running = row.running or 0
-
-        return {
-            "total": total_jobs,
-            "completed": completed,
-            "running": running,
-        }
-
-    async def _get_progress(self, workflow_id: uuid.UUID):
-        progress, _, _ = await self._get_progress_data(workflow_id)
-        return progress
+        row = (
+            await self.db_session.execute(
+                select(Workflow.run_info, WorkflowJobCounts)
+                .outerjoin(
+                    WorkflowJobCounts, WorkflowJobCounts.workflow_id == Workflow.id
+                )
+                .where(Workflow.id == workflow_id)
+            )
+        ).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        return _progress(row[0], row[1])
+
+    async def get_progress_many(
+        self, workflows: Sequence[Workflow]
+    ) -> dict[uuid.UUID, dict[str, int]]:
+        """Progress of already loaded workflows, with one query for their counters."""
+        counts = {}
+        if workflows:
+            result = await self.db_session.scalars(
+                select(WorkflowJobCounts).where(
+                    WorkflowJobCounts.workflow_id.in_([w.id for w in workflows])
+                )
+            )
+            counts = {c.workflow_id: c for c in result}
+        return {w.id: _progress(w.run_info, counts.get(w.id)) for w in workflows}
 
     async def get_workflow_rule_graph_data(
         self, workflow_id: uuid.UUID
@@ -368,20 +432,22 @@ class WorkflowService:
 
     async def get_rule_status(self, workflow_id: uuid.UUID):
         # {rule name : [success, running, error, total, status]}
-        from app.services.job import JobService
-
         run_info = await self.get_workflow_run_info(workflow_id=workflow_id)
-        job_list_resp = await JobService(self.db_session).get_jobs_by_workflow_id(
-            workflow_id=workflow_id, descending=False
+        result = await self.db_session.execute(
+            select(
+                Rule.name,
+                func.sum(RuleJobCounts.success),
+                func.sum(RuleJobCounts.running),
+                func.sum(RuleJobCounts.error),
+            )
+            .join(RuleJobCounts, RuleJobCounts.rule_id == Rule.id)
+            .where(RuleJobCounts.workflow_id == workflow_id)
+            .group_by(Rule.name)
         )
-        jobs = job_list_resp.jobs
-
-        stats = defaultdict(Counter)
-
-        for record in jobs:
-            rule = record.rule_name
-            status = record.status
-            stats[rule][status] += 1
+        stats = {
+            name: {"SUCCESS": success, "RUNNING": running, "ERROR": error}
+            for name, success, running, error in result
+        }
 
         def make_response(k):
             success = stats.get(k, {}).get("SUCCESS", 0)
@@ -408,86 +474,47 @@ class WorkflowService:
 
         return {k: make_response(k) for k, _ in run_info.items() if k != "total"}
 
-    async def pruning(self, user_id: uuid.UUID):
-        # Only delete empty workflows started more than 10 minutes ago
-        threshold = datetime.now(UTC) - timedelta(minutes=10)
-
-        # 删除没有任何jobs的workflows
-        query = (
-            select(Workflow.id)
-            .outerjoin(Job, Workflow.id == Job.workflow_id)
-            .where(
-                Job.id.is_(None),
-                Workflow.started_at < threshold,
-                Workflow.user_id == user_id,
-            )
-        )
-        result = await self.db_session.execute(query)
-        workflows_without_jobs = result.all()
-
-        deleted_workflows_count = len(workflows_without_jobs)
-        for (workflow_id,) in workflows_without_jobs:
-            from sqlalchemy import delete
-
-            await self.db_session.execute(
-                delete(Error).where(Error.workflow_id == workflow_id)
-            )
-            await self.db_session.execute(
-                delete(Workflow).where(Workflow.id == workflow_id)
-            )
-
-        # 如果workflow为error且已结束，将其所有running的jobs改为error
-        query = (
-            select(Job.id)
-            .join(Workflow, Job.workflow_id == Workflow.id)
-            .where(
-                Job.status == Status.RUNNING,
-                Workflow.status == Status.ERROR,
-                Workflow.end_time.is_not(None),
-                Workflow.user_id == user_id,
-            )
-            .distinct()
-        )
-        result = await self.db_session.execute(query)
-        jobs_to_error = result.all()
-
-        updated_error_jobs_count = len(jobs_to_error)
-        for (job_id,) in jobs_to_error:
-            from sqlalchemy import update
-
-            await self.db_session.execute(
-                update(Job).where(Job.id == job_id).values(status=Status.ERROR)
-            )
+    async def pruning(self, user_id: uuid.UUID | None):
+        """Delete empty runs and settle the jobs left running in finished runs.
 
-        # 如果workflow为success且已结束，将其所有的running的jobs改为success
-        query = (
-            select(Job.id)
-            .join(Workflow, Job.workflow_id == Workflow.id)
-            .where(
-                Job.status == Status.RUNNING,
-                Workflow.status == Status.SUCCESS,
-                Workflow.end_time.is_not(None),
-                Workflow.user_id == user_id,
-            )
-            .distinct()
+        ``user_id`` None covers every user's runs. Both steps are set-based and
+        committed in batches of ``DELETE_BATCH_SIZE``.
+        """
+        owned = [Workflow.user_id == user_id] if user_id is not None else []
+        # Only delete empty workflows started more than 10 minutes ago; archived
+        # runs have no jobs in ``jobs`` but are not empty
+        threshold = datetime.now(UTC) - timedelta(minutes=10)
+        empty = select(Workflow.id).where(
+            ~exists().where(Job.workflow_id == Workflow.id),
+            Workflow.archived_at.is_(None),
+            Workflow.started_at < threshold,
+            *owned,
         )
-        result = await self.db_session.execute(query)
-        jobs_to_success = result.all()
-
-        updated_success_jobs_count = len(jobs_to_success)
-        for (job_id,) in jobs_to_success:
-            from sqlalchemy import update
-
-            await self.db_session.execute(
-                update(Job).where(Job.id == job_id).values(status=Status.SUCCESS)
+        deleted = await delete_runs(self.db_session, empty)
+
+        # Jobs still RUNNING in a finished (ERROR or SUCCESS) workflow take its status
+        batch_size = settings.DELETE_BATCH_SIZE
+        finished = [
+            Job.workflow_id == Workflow.id,
+            Job.status == Status.RUNNING,
+            Workflow.status.in_([Status.ERROR, Status.SUCCESS]),
+            Workflow.end_time.is_not(None),
+            *owned,
+        ]
+        settled = 0
+        while True:
+            batch = select(Job.id).where(*finished).limit(batch_size).correlate(None)
+            result = await self.db_session.execute(
+                update(Job)
+                .where(*finished, Job.id.in_(batch))
+                .values(status=Workflow.status)
             )
+            await self.db_session.commit()
+            settled += result.rowcount
+            if result.rowcount < batch_size:
+                break
 
-        await self.db_session.commit()
-
-        return {
-            "workflow": deleted_workflows_count,
-            "job": updated_error_jobs_count + updated_success_jobs_count,
-        }
+        return {"workflow": deleted["workflows"], "job": settled}
 
     async def get_rule_outputs(self, workflow_id: uuid.UUID, rule_name: str):
         query = (
@@ -496,6 +523,7 @@ class WorkflowService:
             .join(Rule)
             .where(
                 Job.workflow_id == workflow_id,
+                run_job_ids(workflow_id, File.job_id),
                 Rule.name == rule_name,
                 File.file_type == FileType.OUTPUT,
             )
@@ -504,15 +532,33 @@ class WorkflowService:
         return result.scalars().all()
 
     async def delete_workflow(self, workflow_id: uuid.UUID):
-        from sqlalchemy import delete
-
-        await self.db_session.execute(
-            delete(Error).where(Error.workflow_id == workflow_id)
-        )
-        await self.db_session.execute(
-            delete(Workflow).where(Workflow.id == workflow_id)
+        """Delete the run with its jobs, files, rules and errors."""
+        await delete_runs(
+            self.db_session, select(Workflow.id).where(Workflow.id == workflow_id)
         )
-        await self.db_session.commit()
+
+    async def delete_workflows(
+        self,
+        user: User,
+        older_than_days: int | None = None,
+        status: Status | None = None,
+        tags: str | None = None,
+    ) -> dict[str, int]:
+        """Delete the runs ``user`` can see matching every filter given.
+
+        ``older_than_days`` compares with the start of the run; ``tags`` is
+        comma-separated like in run lists.
+        """
+        filters = [workflow_read_filter(user)]
+        if older_than_days is not None:
+            cutoff = datetime.now(UTC) - timedelta(days=older_than_days)
+            filters.append(Workflow.started_at < cutoff)
+        if status:
+            filters.append(Workflow.status == status)
+        tag_list = [tag.strip() for tag in (tags or "").split(",") if tag.strip()]
+        if tag_list:
+            filters.append(Workflow.tags.contains(cast(tag_list, Workflow.tags.type)))
+        return await delete_runs(self.db_session, select(Workflow.id).where(*filters))
 
     async def get_workflow_id_by_name(self, workflow_name) -> uuid.UUID | None:
         query = select(Workflow.id).where(Workflow.name == workflow_name)
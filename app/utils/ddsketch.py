@@ -0,0 +1,58 @@
+"""Mergeable quantile sketches of job durations (DDSketch, relative-error buckets).
+
+A duration ``x`` (seconds) is counted in the bucket ``ceil(log_gamma(x))`` with
+``gamma = (1 + a) / (1 - a)``; the bucket is reported as ``2 * gamma**i / (gamma + 1)``,
+which is within ``a`` (relative) of every value the bucket holds. Sketches merge by
+adding the counts of equal buckets, and remove values by subtracting them, so
+they can be kept per rule and day by a trigger and summed over any day range.
+
+Error bound: the quantile ``q`` of ``n`` durations is reported within
+``RELATIVE_ACCURACY`` (1%) of the duration of rank ``floor(q * (n - 1))`` in sorted
+order (the lower of the two ranks ``percentile_cont`` interpolates between), and
+min/max within 1% of the true ones. Durations under ``MIN_DURATION`` count as
+``MIN_DURATION``.
+
+The bucket of a duration is also computed in SQL by the rollup trigger
+(``app.models.job_rollups``); keep ``BUCKET_SQL`` and :func:`bucket_of` in step.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable, Mapping
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+MIN_DURATION = 0.001
+
+# Bucket of the DOUBLE PRECISION ``duration`` (seconds)
+BUCKET_SQL = f"CEIL(LN(GREATEST(duration, {MIN_DURATION})) / LN({GAMMA!r}))::INTEGER"
+
+
+def bucket_of(seconds: float) -> int:
+    return math.ceil(math.log(max(seconds, MIN_DURATION)) / math.log(GAMMA))
+
+
+def bucket_value(bucket: int) -> float:
+    return 2 * GAMMA**bucket / (GAMMA + 1)
+
+
+def quantiles(counts: Mapping[int, int], qs: Iterable[float]) -> list[float] | None:
+    """Quantiles ``qs`` (0 to 1) of the sketch ``counts`` (bucket -> count).
+
+    None if the sketch is empty.
+    """
+    buckets = sorted((b, c) for b, c in counts.items() if c > 0)
+    total = sum(c for _, c in buckets)
+    if not total:
+        return None
+    result = []
+    for q in qs:
+        rank = math.floor(q * (total - 1))
+        seen = 0
+        for bucket, count in buckets:
+            seen += count
+            if seen > rank:
+                result.append(bucket_value(bucket))
+                break
+    return result
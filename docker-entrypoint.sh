@@ -19,5 +19,15 @@ python -m app.manage bootstrap-admin-from-env || {
     exit 1
 }
 
+# Optional separate ingest process (see supervisord.conf); Caddy sends
+# /api/v1/reports to INGEST_TARGET
+export INGEST_SERVICE="${INGEST_SERVICE:-false}"
+export INGEST_DB_POOL_SIZE="${INGEST_DB_POOL_SIZE:-10}"
+if [ "$INGEST_SERVICE" = "true" ]; then
+    export INGEST_TARGET="${INGEST_TARGET:-localhost:8001}"
+else
+    export INGEST_TARGET="${INGEST_TARGET:-${BACKEND_TARGET:-localhost:8000}}"
+fi
+
 # Hand over to CMD (supervisord)
 exec "$@"
@@ -3,8 +3,8 @@
 import { type DefaultError, type InfiniteData, infiniteQueryOptions, queryOptions, type UseMutationOptions, useQuery } from '@tanstack/react-query';
 
 import { client } from '../client.gen';
-import { authJwtLogin, authJwtLogout, batchImportCatalogFiles, closeWorkflow, createInvitation, createToken, deleteCatalog, deleteInvitation, deleteToken, deleteUser, deleteWorkflow, downloadCatalog, exportCatalog, getActivity, getAllTags, getCatalog, getCatalogDag, getCatalogDagSvg, getClientConfig, getConfigfiles, getDetail, getJob, getJobOutputs, getJobs, getLogs, getProgress, getRuleDuration, getRuleError, getRuleGraph, getRules, getRuleStatus, getSettings, getSnakefile, getSnakeTemplateDagSvg, getSnakeTemplateOverview, getSseTicket, getStatus, getSystemHealth, getSystemInfo, getSystemResources, getSystemSettings, getTimelines, getWorkflowIdByName, getWorkflowLog, getWorkflows, gitPull, gitPush, importFromGit, listCatalogs, listCatalogWorkflows, listFiles, listInvitations, listTokens, listUsers, type Options, postPruning, pullSnakeTemplate, readFile, readFile2, readSnakeTemplateFile, registerRegister, reportEvent, resetForgotPassword, resetResetPassword, streamEvents, syncCatalogZip, testAdminSmtpConnection, testGitConnection, triggerCatalogDagSvg, triggerSnakeTemplateDagSvg, updateCatalog, updateSettings, updateSystemSettings, uploadCatalog, usersCurrentUser, usersDeleteUser, usersPatchCurrentUser, usersPatchUser, usersUser, verifyRequestToken, verifyVerify } from '../sdk.gen';
-import type { AuthJwtLoginData, AuthJwtLoginError, AuthJwtLoginResponse, AuthJwtLogoutData, BatchImportCatalogFilesData, BatchImportCatalogFilesError, CloseWorkflowData, CloseWorkflowError, CreateInvitationData, CreateInvitationError, CreateInvitationResponse, CreateTokenData, CreateTokenError, CreateTokenResponse, DeleteCatalogData, DeleteCatalogError, DeleteInvitationData, DeleteInvitationError, DeleteTokenData, DeleteTokenError, DeleteUserData, DeleteUserError, DeleteWorkflowData, DeleteWorkflowError, DownloadCatalogData, DownloadCatalogError, ExportCatalogData, ExportCatalogError, GetActivityData, GetActivityError, GetActivityResponse, GetAllTagsData, GetAllTagsResponse, GetCatalogDagData, GetCatalogDagError, GetCatalogDagSvgData, GetCatalogDagSvgError, GetCatalogData, GetCatalogError, GetCatalogResponse, GetClientConfigData, GetClientConfigResponse, GetConfigfilesData, GetConfigfilesError, GetConfigfilesResponse, GetDetailData, GetDetailError, GetDetailResponse, GetJobData, GetJobError, GetJobOutputsData, GetJobOutputsError, GetJobOutputsResponse, GetJobResponse, GetJobsData, GetJobsError, GetJobsResponse, GetLogsData, GetLogsError, GetLogsResponse, GetProgressData, GetProgressError, GetProgressResponse, GetRuleDurationData, GetRuleDurationError, GetRuleDurationResponse, GetRuleErrorData, GetRuleErrorError, GetRuleErrorResponse, GetRuleGraphData, GetRuleGraphError, GetRuleGraphResponse, GetRulesData, GetRulesError, GetRulesResponse, GetRuleStatusData, GetRuleStatusError, GetRuleStatusResponse, GetSettingsData, GetSettingsResponse, GetSnakefileData, GetSnakefileError, GetSnakefileResponse, GetSnakeTemplateDagSvgData, GetSnakeTemplateOverviewData, GetSnakeTemplateOverviewResponse, GetSseTicketData, GetStatusData, GetStatusError, GetStatusResponse, GetSystemHealthData, GetSystemHealthResponse, GetSystemInfoData, GetSystemInfoResponse, GetSystemResourcesData, GetSystemResourcesResponse, GetSystemSettingsData, GetSystemSettingsResponse, GetTimelinesData, GetTimelinesError, GetTimelinesResponse, GetWorkflowIdByNameData, GetWorkflowIdByNameError, GetWorkflowIdByNameResponse, GetWorkflowLogData, GetWorkflowLogError, GetWorkflowLogResponse, GetWorkflowsData, GetWorkflowsError, GetWorkflowsResponse, GitPullData, GitPushData, GitPushError, ImportFromGitData, ImportFromGitError, ListCatalogsData, ListCatalogsError, ListCatalogsResponse, ListCatalogWorkflowsData, ListCatalogWorkflowsError, ListCatalogWorkflowsResponse, ListFilesData, ListFilesError, ListFilesResponse, ListInvitationsData, ListInvitationsResponse, ListTokensData, ListTokensResponse, ListUsersData, ListUsersResponse, PostPruningData, PostPruningResponse, PullSnakeTemplateData, PullSnakeTemplateResponse, ReadFile2Data, ReadFile2Error, ReadFile2Response, ReadFileData, ReadFileError, ReadFileResponse, ReadSnakeTemplateFileData, ReadSnakeTemplateFileError, ReadSnakeTemplateFileResponse, RegisterRegisterData, RegisterRegisterError, RegisterRegisterResponse, ReportEventData, ReportEventError, ResetForgotPasswordData, ResetForgotPasswordError, ResetResetPasswordData, ResetResetPasswordError, StreamEventsData, StreamEventsError, SyncCatalogZipData, SyncCatalogZipError, TestAdminSmtpConnectionData, TestAdminSmtpConnectionError, TestAdminSmtpConnectionResponse, TestGitConnectionData, TestGitConnectionError, TestGitConnectionResponse, TriggerCatalogDagSvgData, TriggerCatalogDagSvgError, TriggerSnakeTemplateDagSvgData, UpdateCatalogData, UpdateCatalogError, UpdateCatalogResponse, UpdateSettingsData, UpdateSettingsError, UpdateSettingsResponse, UpdateSystemSettingsData, UpdateSystemSettingsError, UpdateSystemSettingsResponse, UploadCatalogData, UploadCatalogError, UploadCatalogResponse, UsersCurrentUserData, UsersCurrentUserResponse, UsersDeleteUserData, UsersDeleteUserError, UsersDeleteUserResponse, UsersPatchCurrentUserData, UsersPatchCurrentUserError, UsersPatchCurrentUserResponse, UsersPatchUserData, UsersPatchUserError, UsersPatchUserResponse, UsersUserData, UsersUserError, UsersUserResponse, VerifyRequestTokenData, VerifyRequestTokenError, VerifyVerifyData, VerifyVerifyError, VerifyVerifyResponse } from '../types.gen';
+import { authJwtLogin, authJwtLogout, batchImportCatalogFiles, closeWorkflow, createInvitation, createToken, deleteCatalog, deleteInvitation, deleteToken, deleteUser, deleteWorkflow, deleteWorkflows, downloadCatalog, exportCatalog, getActivity, getAllTags, getCatalog, getCatalogDag, getCatalogDagSvg, getClientConfig, getConfigfiles, getDetail, getJob, getJobOutputs, getJobs, getLogs, getProgress, getRuleDuration, getRuleError, getRuleGraph, getRules, getRuleStatus, getSettings, getSnakefile, getSnakeTemplateDagSvg, getSnakeTemplateOverview, getSseTicket, getStatus, getSystemHealth, getSystemInfo, getSystemResources, getSystemSettings, getTimelines, getWorkflowIdByName, getWorkflowLog, getWorkflows, gitPull, gitPush, importFromGit, listCatalogs, listCatalogWorkflows, listFiles, listInvitations, listTokens, listUsers, type Options, postPruning, pullSnakeTemplate, readFile, readFile2, readSnakeTemplateFile, registerRegister, reportEvent, resetForgotPassword, resetResetPassword, search, streamEvents, syncCatalogZip, testAdminSmtpConnection, testGitConnection, triggerCatalogDagSvg, triggerSnakeTemplateDagSvg, updateCatalog, updateSettings, updateSystemSettings, uploadCatalog, usersCurrentUser, usersDeleteUser, usersPatchCurrentUser, usersPatchUser, usersUser, verifyRequestToken, verifyVerify } from '../sdk.gen';
+import type { AuthJwtLoginData, AuthJwtLoginError, AuthJwtLoginResponse, AuthJwtLogoutData, BatchImportCatalogFilesData, BatchImportCatalogFilesError, CloseWorkflowData, CloseWorkflowError, CreateInvitationData, CreateInvitationError, CreateInvitationResponse, CreateTokenData, CreateTokenError, CreateTokenResponse, DeleteCatalogData, DeleteCatalogError, DeleteInvitationData, DeleteInvitationError, DeleteTokenData, DeleteTokenError, DeleteUserData, DeleteUserError, DeleteWorkflowData, DeleteWorkflowError, DeleteWorkflowsData, DeleteWorkflowsError, DeleteWorkflowsResponse, DownloadCatalogData, DownloadCatalogError, ExportCatalogData, ExportCatalogError, GetActivityData, GetActivityError, GetActivityResponse, GetAllTagsData, GetAllTagsResponse, GetCatalogDagData, GetCatalogDagError, GetCatalogDagSvgData, GetCatalogDagSvgError, GetCatalogData, GetCatalogError, GetCatalogResponse, GetClientConfigData, GetClientConfigResponse, GetConfigfilesData, GetConfigfilesError, GetConfigfilesResponse, GetDetailData, GetDetailError, GetDetailResponse, GetJobData, GetJobError, GetJobOutputsData, GetJobOutputsError, GetJobOutputsResponse, GetJobResponse, GetJobsData, GetJobsError, GetJobsResponse, GetLogsData, GetLogsError, GetLogsResponse, GetProgressData, GetProgressError, GetProgressResponse, GetRuleDurationData, GetRuleDurationError, GetRuleDurationResponse, GetRuleErrorData, GetRuleErrorError, GetRuleErrorResponse, GetRuleGraphData, GetRuleGraphError, GetRuleGraphResponse, GetRulesData, GetRulesError, GetRulesResponse, GetRuleStatusData, GetRuleStatusError, GetRuleStatusResponse, GetSettingsData, GetSettingsResponse, GetSnakefileData, GetSnakefileError, GetSnakefileResponse, GetSnakeTemplateDagSvgData, GetSnakeTemplateOverviewData, GetSnakeTemplateOverviewResponse, GetSseTicketData, GetStatusData, GetStatusError, GetStatusResponse, GetSystemHealthData, GetSystemHealthResponse, GetSystemInfoData, GetSystemInfoResponse, GetSystemResourcesData, GetSystemResourcesResponse, GetSystemSettingsData, GetSystemSettingsResponse, GetTimelinesData, GetTimelinesError, GetTimelinesResponse, GetWorkflowIdByNameData, GetWorkflowIdByNameError, GetWorkflowIdByNameResponse, GetWorkflowLogData, GetWorkflowLogError, GetWorkflowLogResponse, GetWorkflowsData, GetWorkflowsError, GetWorkflowsResponse, GitPullData, GitPushData, GitPushError, ImportFromGitData, ImportFromGitError, ListCatalogsData, ListCatalogsError, ListCatalogsResponse, ListCatalogWorkflowsData, ListCatalogWorkflowsError, ListCatalogWorkflowsResponse, ListFilesData, ListFilesError, ListFilesResponse, ListInvitationsData, ListInvitationsResponse, ListTokensData, ListTokensResponse, ListUsersData, ListUsersResponse, PostPruningData, PostPruningResponse, PullSnakeTemplateData, PullSnakeTemplateResponse, ReadFile2Data, ReadFile2Error, ReadFile2Response, ReadFileData, ReadFileError, ReadFileResponse, ReadSnakeTemplateFileData, ReadSnakeTemplateFileError, ReadSnakeTemplateFileResponse, RegisterRegisterData, RegisterRegisterError, RegisterRegisterResponse, ReportEventData, ReportEventError, ResetForgotPasswordData, ResetForgotPasswordError, ResetResetPasswordData, ResetResetPasswordError, SearchData, SearchError, SearchResponse2, StreamEventsData, StreamEventsError, SyncCatalogZipData, SyncCatalogZipError, TestAdminSmtpConnectionData, TestAdminSmtpConnectionError, TestAdminSmtpConnectionResponse, TestGitConnectionData, TestGitConnectionError, TestGitConnectionResponse, TriggerCatalogDagSvgData, TriggerCatalogDagSvgError, TriggerSnakeTemplateDagSvgData, UpdateCatalogData, UpdateCatalogError, UpdateCatalogResponse, UpdateSettingsData, UpdateSettingsError, UpdateSettingsResponse, UpdateSystemSettingsData, UpdateSystemSettingsError, UpdateSystemSettingsResponse, UploadCatalogData, UploadCatalogError, UploadCatalogResponse, UsersCurrentUserData, UsersCurrentUserResponse, UsersDeleteUserData, UsersDeleteUserError, UsersDeleteUserResponse, UsersPatchCurrentUserData, UsersPatchCurrentUserError, UsersPatchCurrentUserResponse, UsersPatchUserData, UsersPatchUserError, UsersPatchUserResponse, UsersUserData, UsersUserError, UsersUserResponse, VerifyRequestTokenData, VerifyRequestTokenError, VerifyVerifyData, VerifyVerifyError, VerifyVerifyResponse } from '../types.gen';
 
 /**
  * Auth:Jwt.Login
@@ -493,6 +493,25 @@ export const getWorkflowsInfiniteOptions = (options?: Options<GetWorkflowsData>)
  */
 export const useGetWorkflowsQuery = (options?: Options<GetWorkflowsData>) => useQuery(getWorkflowsOptions(options));
 
+/**
+ * Delete Workflows
+ *
+ * Delete the runs you can see that match every filter given, in batches.
+ */
+export const deleteWorkflowsMutation = (options?: Partial<Options<DeleteWorkflowsData>>): UseMutationOptions<DeleteWorkflowsResponse, DeleteWorkflowsError, Options<DeleteWorkflowsData>> => {
+    const mutationOptions: UseMutationOptions<DeleteWorkflowsResponse, DeleteWorkflowsError, Options<DeleteWorkflowsData>> = {
+        mutationFn: async (fnOptions) => {
+            const { data } = await deleteWorkflows({
+                ...options,
+                ...fnOptions,
+                throwOnError: true
+            });
+            return data;
+        }
+    };
+    return mutationOptions;
+};
+
 export const getJobsQueryKey = (options: Options<GetJobsData>) => createQueryKey('getJobs', options, false, ['workflow']);
 
 /**
@@ -1653,6 +1672,33 @@ export const importFromGitMutation = (options?: Partial<Options<ImportFromGitDat
     return mutationOptions;
 };
 
+export const searchQueryKey = (options: Options<SearchData>) => createQueryKey('search', options, false, ['search']);
+
+/**
+ * Search
+ *
+ * Runs by name and catalogs by name or description, best matches first.
+ */
+export const searchOptions = (options: Options<SearchData>) => queryOptions<SearchResponse2, SearchError, SearchResponse2, ReturnType<typeof searchQueryKey>>({
+    queryFn: async ({ queryKey, signal }) => {
+        const { data } = await search({
+            ...options,
+            ...queryKey[0],
+            signal,
+            throwOnError: true
+        });
+        return data;
+    },
+    queryKey: searchQueryKey(options)
+});
+
+/**
+ * Search
+ *
+ * Runs by name and catalogs by name or description, best matches first.
+ */
+export const useSearchQuery = (options: Options<SearchData>) => useQuery(searchOptions(options));
+
 export const getSettingsQueryKey = (options?: Options<GetSettingsData>) => createQueryKey('getSettings', options, false, ['settings']);
 
 /**
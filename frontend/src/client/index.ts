@@ -1,4 +1,4 @@
 // This file is auto-generated by @hey-api/openapi-ts
 
-export { authJwtLogin, authJwtLogout, batchImportCatalogFiles, closeWorkflow, createInvitation, createToken, deleteCatalog, deleteInvitation, deleteToken, deleteUser, deleteWorkflow, downloadCatalog, exportCatalog, getActivity, getAllTags, getCatalog, getCatalogDag, getCatalogDagSvg, getClientConfig, getConfigfiles, getDetail, getJob, getJobOutputs, getJobs, getLogs, getProgress, getRuleDuration, getRuleError, getRuleGraph, getRules, getRuleStatus, getSettings, getSnakefile, getSnakeTemplateDagSvg, getSnakeTemplateOverview, getSseTicket, getStatus, getSystemHealth, getSystemInfo, getSystemResources, getSystemSettings, getTimelines, getWorkflowIdByName, getWorkflowLog, getWorkflows, gitPull, gitPush, importFromGit, listCatalogs, listCatalogWorkflows, listFiles, listInvitations, listTokens, listUsers, type Options, postPruning, pullSnakeTemplate, readFile, readFile2, readSnakeTemplateFile, registerRegister, reportEvent, resetForgotPassword, resetResetPassword, streamEvents, syncCatalogZip, testAdminSmtpConnection, testGitConnection, triggerCatalogDagSvg, triggerSnakeTemplateDagSvg, updateCatalog, updateSettings, updateSystemSettings, uploadCatalog, usersCurrentUser, usersDeleteUser, usersPatchCurrentUser, usersPatchUser, usersUser, verifyRequestToken, verifyVerify } from './sdk.gen';
-export type { AuthJwtLoginData, AuthJwtLoginError, AuthJwtLoginErrors, AuthJwtLoginResponse, AuthJwtLoginResponses, AuthJwtLogoutData, AuthJwtLogoutErrors, AuthJwtLogoutResponses, BatchImportCatalogFilesData, BatchImportCatalogFilesError, BatchImportCatalogFilesErrors, BatchImportCatalogFilesResponses, BatchImportRequest, BearerResponse, BodyAuthJwtLoginApiV1AuthJwtLoginPost, BodyResetForgotPasswordApiV1AuthAuthForgotPasswordPost, BodyResetResetPasswordApiV1AuthAuthResetPasswordPost, BodySyncCatalogZipApiV1CatalogCatalogRefSyncPost, BodyUploadCatalogApiV1CatalogUploadPost, BodyVerifyRequestTokenApiV1AuthAuthRequestVerifyTokenPost, BodyVerifyVerifyApiV1AuthAuthVerifyPost, CatalogDetail, CatalogFileContent, CatalogFileInfo, CatalogSummary, CatalogUpdateRequest, ClientOptions, CloseWorkflowData, CloseWorkflowError, CloseWorkflowErrors, CloseWorkflowResponses, ConnectionTestResult, CreateInvitationData, CreateInvitationError, CreateInvitationErrors, CreateInvitationResponse, CreateInvitationResponses, CreateTokenData, CreateTokenError, CreateTokenErrors, CreateTokenResponse, CreateTokenResponses, DeleteCatalogData, DeleteCatalogError, DeleteCatalogErrors, DeleteCatalogResponses, DeleteInvitationData, DeleteInvitationError, DeleteInvitationErrors, DeleteInvitationResponses, DeleteTokenData, DeleteTokenError, DeleteTokenErrors, DeleteTokenResponses, DeleteUserData, DeleteUserError, DeleteUserErrors, DeleteUserResponses, DeleteWorkflowData, DeleteWorkflowError, DeleteWorkflowErrors, DeleteWorkflowResponses, DownloadCatalogData, DownloadCatalogError, DownloadCatalogErrors, DownloadCatalogResponses, ErrorModel, ExportCatalogData, ExportCatalogError, ExportCatalogErrors, ExportCatalogResponses, FileImportItem, FileNode, GetActivityData, GetActivityError, GetActivityErrors, GetActivityResponse, GetActivityResponses, GetAllTagsData, GetAllTagsResponse, GetAllTagsResponses, GetCatalogDagData, GetCatalogDagError, GetCatalogDagErrors, GetCatalogDagResponses, GetCatalogDagSvgData, GetCatalogDagSvgError, GetCatalogDagSvgErrors, GetCatalogDagSvgResponses, GetCatalogData, GetCatalogError, GetCatalogErrors, GetCatalogResponse, GetCatalogResponses, GetClientConfigData, GetClientConfigResponse, GetClientConfigResponses, GetConfigfilesData, GetConfigfilesError, GetConfigfilesErrors, GetConfigfilesResponse, GetConfigfilesResponses, GetDetailData, GetDetailError, GetDetailErrors, GetDetailResponse, GetDetailResponses, GetJobData, GetJobError, GetJobErrors, GetJobOutputsData, GetJobOutputsError, GetJobOutputsErrors, GetJobOutputsResponse, GetJobOutputsResponses, GetJobResponse, GetJobResponses, GetJobsData, GetJobsError, GetJobsErrors, GetJobsResponse, GetJobsResponses, GetLogsData, GetLogsError, GetLogsErrors, GetLogsResponse, GetLogsResponses, GetProgressData, GetProgressError, GetProgressErrors, GetProgressResponse, GetProgressResponses, GetRuleDurationData, GetRuleDurationError, GetRuleDurationErrors, GetRuleDurationResponse, GetRuleDurationResponses, GetRuleErrorData, GetRuleErrorError, GetRuleErrorErrors, GetRuleErrorResponse, GetRuleErrorResponses, GetRuleGraphData, GetRuleGraphError, GetRuleGraphErrors, GetRuleGraphResponse, GetRuleGraphResponses, GetRulesData, GetRulesError, GetRulesErrors, GetRulesResponse, GetRulesResponses, GetRuleStatusData, GetRuleStatusError, GetRuleStatusErrors, GetRuleStatusResponse, GetRuleStatusResponses, GetSettingsData, GetSettingsResponse, GetSettingsResponses, GetSnakefileData, GetSnakefileError, GetSnakefileErrors, GetSnakefileResponse, GetSnakefileResponses, GetSnakeTemplateDagSvgData, GetSnakeTemplateDagSvgResponses, GetSnakeTemplateOverviewData, GetSnakeTemplateOverviewResponse, GetSnakeTemplateOverviewResponses, GetSseTicketData, GetSseTicketResponses, GetStatusData, GetStatusError, GetStatusErrors, GetStatusResponse, GetStatusResponses, GetSystemHealthData, GetSystemHealthResponse, GetSystemHealthResponses, GetSystemInfoData, GetSystemInfoResponse, GetSystemInfoResponses, GetSystemResourcesData, GetSystemResourcesResponse, GetSystemResourcesResponses, GetSystemSettingsData, GetSystemSettingsResponse, GetSystemSettingsResponses, GetTimelinesData, GetTimelinesError, GetTimelinesErrors, GetTimelinesResponse, GetTimelinesResponses, GetWorkflowIdByNameData, GetWorkflowIdByNameError, GetWorkflowIdByNameErrors, GetWorkflowIdByNameResponse, GetWorkflowIdByNameResponses, GetWorkflowLogData, GetWorkflowLogError, GetWorkflowLogErrors, GetWorkflowLogResponse, GetWorkflowLogResponses, GetWorkflowsData, GetWorkflowsError, GetWorkflowsErrors, GetWorkflowsResponse, GetWorkflowsResponses, GitPullData, GitPullResponses, GitPushData, GitPushError, GitPushErrors, GitPushRequest, GitPushResponses, HttpValidationError, ImportFromGitData, ImportFromGitError, ImportFromGitErrors, ImportFromGitRequest, ImportFromGitResponses, InvitationCreate, InvitationCreateResponse, InvitationRead, JobDetailResponse, JobListResponse, JobResponse, ListCatalogsData, ListCatalogsError, ListCatalogsErrors, ListCatalogsResponse, ListCatalogsResponses, ListCatalogWorkflowsData, ListCatalogWorkflowsError, ListCatalogWorkflowsErrors, ListCatalogWorkflowsResponse, ListCatalogWorkflowsResponses, ListFilesData, ListFilesError, ListFilesErrors, ListFilesResponse, ListFilesResponses, ListInvitationsData, ListInvitationsResponse, ListInvitationsResponses, ListTokensData, ListTokensResponse, ListTokensResponses, ListUsersData, ListUsersResponse, ListUsersResponses, PathContent, PostPruningData, PostPruningResponse, PostPruningResponses, PullSnakeTemplateData, PullSnakeTemplateResponse, PullSnakeTemplateResponses, ReadFile2Data, ReadFile2Error, ReadFile2Errors, ReadFile2Response, ReadFile2Responses, ReadFileData, ReadFileError, ReadFileErrors, ReadFileResponse, ReadFileResponses, ReadSnakeTemplateFileData, ReadSnakeTemplateFileError, ReadSnakeTemplateFileErrors, ReadSnakeTemplateFileResponse, ReadSnakeTemplateFileResponses, RegisterRegisterData, RegisterRegisterError, RegisterRegisterErrors, RegisterRegisterResponse, RegisterRegisterResponses, ReportEventData, ReportEventError, ReportEventErrors, ReportEventResponses, ReportPayload, ResetForgotPasswordData, ResetForgotPasswordError, ResetForgotPasswordErrors, ResetForgotPasswordResponses, ResetResetPasswordData, ResetResetPasswordError, ResetResetPasswordErrors, ResetResetPasswordResponses, ResourcesSummary, RuleListResponse, RuleResponse, RuleStatusResponse, ServiceStatus, SnakeTemplateOverview, SnakeTemplatePullResponse, Status, StatusSummary, StreamEventsData, StreamEventsError, StreamEventsErrors, StreamEventsResponses, SyncCatalogZipData, SyncCatalogZipError, SyncCatalogZipErrors, SyncCatalogZipResponses, SystemHealthResponse, SystemInfoRead, SystemSettingsRead, SystemSettingsUpdate, TestAdminSmtpConnectionData, TestAdminSmtpConnectionError, TestAdminSmtpConnectionErrors, TestAdminSmtpConnectionResponse, TestAdminSmtpConnectionResponses, TestGitConnectionData, TestGitConnectionError, TestGitConnectionErrors, TestGitConnectionResponse, TestGitConnectionResponses, TestGitRequest, TestSmtpRequest, TriggerCatalogDagSvgData, TriggerCatalogDagSvgError, TriggerCatalogDagSvgErrors, TriggerCatalogDagSvgResponses, TriggerSnakeTemplateDagSvgData, TriggerSnakeTemplateDagSvgResponses, UpdateCatalogData, UpdateCatalogError, UpdateCatalogErrors, UpdateCatalogResponse, UpdateCatalogResponses, UpdateSettingsData, UpdateSettingsError, UpdateSettingsErrors, UpdateSettingsResponse, UpdateSettingsResponses, UpdateSystemSettingsData, UpdateSystemSettingsError, UpdateSystemSettingsErrors, UpdateSystemSettingsResponse, UpdateSystemSettingsResponses, UploadCatalogData, UploadCatalogError, UploadCatalogErrors, UploadCatalogResponse, UploadCatalogResponses, UserCreate, UserRead, UsersCurrentUserData, UsersCurrentUserErrors, UsersCurrentUserResponse, UsersCurrentUserResponses, UsersDeleteUserData, UsersDeleteUserError, UsersDeleteUserErrors, UsersDeleteUserResponse, UsersDeleteUserResponses, UserSettingsRead, UserSettingsUpdate, UsersPatchCurrentUserData, UsersPatchCurrentUserError, UsersPatchCurrentUserErrors, UsersPatchCurrentUserResponse, UsersPatchCurrentUserResponses, UsersPatchUserData, UsersPatchUserError, UsersPatchUserErrors, UsersPatchUserResponse, UsersPatchUserResponses, UsersUserData, UsersUserError, UsersUserErrors, UsersUserResponse, UsersUserResponses, UserTokenCreate, UserTokenList, UserTokenResponse, UserTokenSummary, UserUpdate, ValidationError, VerifyRequestTokenData, VerifyRequestTokenError, VerifyRequestTokenErrors, VerifyRequestTokenResponses, VerifyVerifyData, VerifyVerifyError, VerifyVerifyErrors, VerifyVerifyResponse, VerifyVerifyResponses, WorkflowDetialResponse, WorkflowListResponse, WorkflowResponse } from './types.gen';
+export { authJwtLogin, authJwtLogout, batchImportCatalogFiles, closeWorkflow, createInvitation, createToken, deleteCatalog, deleteInvitation, deleteToken, deleteUser, deleteWorkflow, deleteWorkflows, downloadCatalog, exportCatalog, getActivity, getAllTags, getCatalog, getCatalogDag, getCatalogDagSvg, getClientConfig, getConfigfiles, getDetail, getJob, getJobOutputs, getJobs, getLogs, getProgress, getRuleDuration, getRuleError, getRuleGraph, getRules, getRuleStatus, getSettings, getSnakefile, getSnakeTemplateDagSvg, getSnakeTemplateOverview, getSseTicket, getStatus, getSystemHealth, getSystemInfo, getSystemResources, getSystemSettings, getTimelines, getWorkflowIdByName, getWorkflowLog, getWorkflows, gitPull, gitPush, importFromGit, listCatalogs, listCatalogWorkflows, listFiles, listInvitations, listTokens, listUsers, type Options, postPruning, pullSnakeTemplate, readFile, readFile2, readSnakeTemplateFile, registerRegister, reportEvent, resetForgotPassword, resetResetPassword, search, streamEvents, syncCatalogZip, testAdminSmtpConnection, testGitConnection, triggerCatalogDagSvg, triggerSnakeTemplateDagSvg, updateCatalog, updateSettings, updateSystemSettings, uploadCatalog, usersCurrentUser, usersDeleteUser, usersPatchCurrentUser, usersPatchUser, usersUser, verifyRequestToken, verifyVerify } from './sdk.gen';
+export type { AuthJwtLoginData, AuthJwtLoginError, AuthJwtLoginErrors, AuthJwtLoginResponse, AuthJwtLoginResponses, AuthJwtLogoutData, AuthJwtLogoutErrors, AuthJwtLogoutResponses, BatchImportCatalogFilesData, BatchImportCatalogFilesError, BatchImportCatalogFilesErrors, BatchImportCatalogFilesResponses, BatchImportRequest, BearerResponse, BodyAuthJwtLoginApiV1AuthJwtLoginPost, BodyResetForgotPasswordApiV1AuthAuthForgotPasswordPost, BodyResetResetPasswordApiV1AuthAuthResetPasswordPost, BodySyncCatalogZipApiV1CatalogCatalogRefSyncPost, BodyUploadCatalogApiV1CatalogUploadPost, BodyVerifyRequestTokenApiV1AuthAuthRequestVerifyTokenPost, BodyVerifyVerifyApiV1AuthAuthVerifyPost, CatalogDetail, CatalogFileContent, CatalogFileInfo, CatalogSearchHit, CatalogSummary, CatalogUpdateRequest, ClientOptions, CloseWorkflowData, CloseWorkflowError, CloseWorkflowErrors, CloseWorkflowResponses, ConnectionTestResult, CreateInvitationData, CreateInvitationError, CreateInvitationErrors, CreateInvitationResponse, CreateInvitationResponses, CreateTokenData, CreateTokenError, CreateTokenErrors, CreateTokenResponse, CreateTokenResponses, DeleteCatalogData, DeleteCatalogError, DeleteCatalogErrors, DeleteCatalogResponses, DeleteInvitationData, DeleteInvitationError, DeleteInvitationErrors, DeleteInvitationResponses, DeleteTokenData, DeleteTokenError, DeleteTokenErrors, DeleteTokenResponses, DeleteUserData, DeleteUserError, DeleteUserErrors, DeleteUserResponses, DeleteWorkflowData, DeleteWorkflowError, DeleteWorkflowErrors, DeleteWorkflowResponses, DeleteWorkflowsData, DeleteWorkflowsError, DeleteWorkflowsErrors, DeleteWorkflowsResponse, DeleteWorkflowsResponses, DownloadCatalogData, DownloadCatalogError, DownloadCatalogErrors, DownloadCatalogResponses, ErrorModel, ExportCatalogData, ExportCatalogError, ExportCatalogErrors, ExportCatalogResponses, FileImportItem, FileNode, GetActivityData, GetActivityError, GetActivityErrors, GetActivityResponse, GetActivityResponses, GetAllTagsData, GetAllTagsResponse, GetAllTagsResponses, GetCatalogDagData, GetCatalogDagError, GetCatalogDagErrors, GetCatalogDagResponses, GetCatalogDagSvgData, GetCatalogDagSvgError, GetCatalogDagSvgErrors, GetCatalogDagSvgResponses, GetCatalogData, GetCatalogError, GetCatalogErrors, GetCatalogResponse, GetCatalogResponses, GetClientConfigData, GetClientConfigResponse, GetClientConfigResponses, GetConfigfilesData, GetConfigfilesError, GetConfigfilesErrors, GetConfigfilesResponse, GetConfigfilesResponses, GetDetailData, GetDetailError, GetDetailErrors, GetDetailResponse, GetDetailResponses, GetJobData, GetJobError, GetJobErrors, GetJobOutputsData, GetJobOutputsError, GetJobOutputsErrors, GetJobOutputsResponse, GetJobOutputsResponses, GetJobResponse, GetJobResponses, GetJobsData, GetJobsError, GetJobsErrors, GetJobsResponse, GetJobsResponses, GetLogsData, GetLogsError, GetLogsErrors, GetLogsResponse, GetLogsResponses, GetProgressData, GetProgressError, GetProgressErrors, GetProgressResponse, GetProgressResponses, GetRuleDurationData, GetRuleDurationError, GetRuleDurationErrors, GetRuleDurationResponse, GetRuleDurationResponses, GetRuleErrorData, GetRuleErrorError, GetRuleErrorErrors, GetRuleErrorResponse, GetRuleErrorResponses, GetRuleGraphData, GetRuleGraphError, GetRuleGraphErrors, GetRuleGraphResponse, GetRuleGraphResponses, GetRulesData, GetRulesError, GetRulesErrors, GetRulesResponse, GetRulesResponses, GetRuleStatusData, GetRuleStatusError, GetRuleStatusErrors, GetRuleStatusResponse, GetRuleStatusResponses, GetSettingsData, GetSettingsResponse, GetSettingsResponses, GetSnakefileData, GetSnakefileError, GetSnakefileErrors, GetSnakefileResponse, GetSnakefileResponses, GetSnakeTemplateDagSvgData, GetSnakeTemplateDagSvgResponses, GetSnakeTemplateOverviewData, GetSnakeTemplateOverviewResponse, GetSnakeTemplateOverviewResponses, GetSseTicketData, GetSseTicketResponses, GetStatusData, GetStatusError, GetStatusErrors, GetStatusResponse, GetStatusResponses, GetSystemHealthData, GetSystemHealthResponse, GetSystemHealthResponses, GetSystemInfoData, GetSystemInfoResponse, GetSystemInfoResponses, GetSystemResourcesData, GetSystemResourcesResponse, GetSystemResourcesResponses, GetSystemSettingsData, GetSystemSettingsResponse, GetSystemSettingsResponses, GetTimelinesData, GetTimelinesError, GetTimelinesErrors, GetTimelinesResponse, GetTimelinesResponses, GetWorkflowIdByNameData, GetWorkflowIdByNameError, GetWorkflowIdByNameErrors, GetWorkflowIdByNameResponse, GetWorkflowIdByNameResponses, GetWorkflowLogData, GetWorkflowLogError, GetWorkflowLogErrors, GetWorkflowLogResponse, GetWorkflowLogResponses, GetWorkflowsData, GetWorkflowsError, GetWorkflowsErrors, GetWorkflowsResponse, GetWorkflowsResponses, GitPullData, GitPullResponses, GitPushData, GitPushError, GitPushErrors, GitPushRequest, GitPushResponses, HttpValidationError, ImportFromGitData, ImportFromGitError, ImportFromGitErrors, ImportFromGitRequest, ImportFromGitResponses, InvitationCreate, InvitationCreateResponse, InvitationRead, JobDetailResponse, JobListResponse, JobResponse, ListCatalogsData, ListCatalogsError, ListCatalogsErrors, ListCatalogsResponse, ListCatalogsResponses, ListCatalogWorkflowsData, ListCatalogWorkflowsError, ListCatalogWorkflowsErrors, ListCatalogWorkflowsResponse, ListCatalogWorkflowsResponses, ListFilesData, ListFilesError, ListFilesErrors, ListFilesResponse, ListFilesResponses, ListInvitationsData, ListInvitationsResponse, ListInvitationsResponses, ListTokensData, ListTokensResponse, ListTokensResponses, ListUsersData, ListUsersResponse, ListUsersResponses, PathContent, PostPruningData, PostPruningResponse, PostPruningResponses, PullSnakeTemplateData, PullSnakeTemplateResponse, PullSnakeTemplateResponses, ReadFile2Data, ReadFile2Error, ReadFile2Errors, ReadFile2Response, ReadFile2Responses, ReadFileData, ReadFileError, ReadFileErrors, ReadFileResponse, ReadFileResponses, ReadSnakeTemplateFileData, ReadSnakeTemplateFileError, ReadSnakeTemplateFileErrors, ReadSnakeTemplateFileResponse, ReadSnakeTemplateFileResponses, RegisterRegisterData, RegisterRegisterError, RegisterRegisterErrors, RegisterRegisterResponse, RegisterRegisterResponses, ReportEventData, ReportEventError, ReportEventErrors, ReportEventResponses, ReportPayload, ResetForgotPasswordData, ResetForgotPasswordError, ResetForgotPasswordErrors, ResetForgotPasswordResponses, ResetResetPasswordData, ResetResetPasswordError, ResetResetPasswordErrors, ResetResetPasswordResponses, ResourcesSummary, RuleListResponse, RuleResponse, RuleStatusResponse, SearchData, SearchError, SearchErrors, SearchResponse, SearchResponse2, SearchResponses, ServiceStatus, SnakeTemplateOverview, SnakeTemplatePullResponse, Status, StatusSummary, StreamEventsData, StreamEventsError, StreamEventsErrors, StreamEventsResponses, SyncCatalogZipData, SyncCatalogZipError, SyncCatalogZipErrors, SyncCatalogZipResponses, SystemHealthResponse, SystemInfoRead, SystemSettingsRead, SystemSettingsUpdate, TestAdminSmtpConnectionData, TestAdminSmtpConnectionError, TestAdminSmtpConnectionErrors, TestAdminSmtpConnectionResponse, TestAdminSmtpConnectionResponses, TestGitConnectionData, TestGitConnectionError, TestGitConnectionErrors, TestGitConnectionResponse, TestGitConnectionResponses, TestGitRequest, TestSmtpRequest, TriggerCatalogDagSvgData, TriggerCatalogDagSvgError, TriggerCatalogDagSvgErrors, TriggerCatalogDagSvgResponses, TriggerSnakeTemplateDagSvgData, TriggerSnakeTemplateDagSvgResponses, UpdateCatalogData, UpdateCatalogError, UpdateCatalogErrors, UpdateCatalogResponse, UpdateCatalogResponses, UpdateSettingsData, UpdateSettingsError, UpdateSettingsErrors, UpdateSettingsResponse, UpdateSettingsResponses, UpdateSystemSettingsData, UpdateSystemSettingsError, UpdateSystemSettingsErrors, UpdateSystemSettingsResponse, UpdateSystemSettingsResponses, UploadCatalogData, UploadCatalogError, UploadCatalogErrors, UploadCatalogResponse, UploadCatalogResponses, UserCreate, UserRead, UsersCurrentUserData, UsersCurrentUserErrors, UsersCurrentUserResponse, UsersCurrentUserResponses, UsersDeleteUserData, UsersDeleteUserError, UsersDeleteUserErrors, UsersDeleteUserResponse, UsersDeleteUserResponses, UserSettingsRead, UserSettingsUpdate, UsersPatchCurrentUserData, UsersPatchCurrentUserError, UsersPatchCurrentUserErrors, UsersPatchCurrentUserResponse, UsersPatchCurrentUserResponses, UsersPatchUserData, UsersPatchUserError, UsersPatchUserErrors, UsersPatchUserResponse, UsersPatchUserResponses, UsersUserData, UsersUserError, UsersUserErrors, UsersUserResponse, UsersUserResponses, UserTokenCreate, UserTokenList, UserTokenResponse, UserTokenSummary, UserUpdate, ValidationError, VerifyRequestTokenData, VerifyRequestTokenError, VerifyRequestTokenErrors, VerifyRequestTokenResponses, VerifyVerifyData, VerifyVerifyError, VerifyVerifyErrors, VerifyVerifyResponse, VerifyVerifyResponses, WorkflowBulkDeleteResponse, WorkflowDetialResponse, WorkflowListResponse, WorkflowResponse, WorkflowSearchHit } from './types.gen';
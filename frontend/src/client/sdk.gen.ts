@@ -2,7 +2,7 @@
 
 import { type Client, formDataBodySerializer, type Options as Options2, type TDataShape, urlSearchParamsBodySerializer } from './client';
 import { client } from './client.gen';
-import type { AuthJwtLoginData, AuthJwtLoginErrors, AuthJwtLoginResponses, AuthJwtLogoutData, AuthJwtLogoutErrors, AuthJwtLogoutResponses, BatchImportCatalogFilesData, BatchImportCatalogFilesErrors, BatchImportCatalogFilesResponses, CloseWorkflowData, CloseWorkflowErrors, CloseWorkflowResponses, CreateInvitationData, CreateInvitationErrors, CreateInvitationResponses, CreateTokenData, CreateTokenErrors, CreateTokenResponses, DeleteCatalogData, DeleteCatalogErrors, DeleteCatalogResponses, DeleteInvitationData, DeleteInvitationErrors, DeleteInvitationResponses, DeleteTokenData, DeleteTokenErrors, DeleteTokenResponses, DeleteUserData, DeleteUserErrors, DeleteUserResponses, DeleteWorkflowData, DeleteWorkflowErrors, DeleteWorkflowResponses, DownloadCatalogData, DownloadCatalogErrors, DownloadCatalogResponses, ExportCatalogData, ExportCatalogErrors, ExportCatalogResponses, GetActivityData, GetActivityErrors, GetActivityResponses, GetAllTagsData, GetAllTagsResponses, GetCatalogDagData, GetCatalogDagErrors, GetCatalogDagResponses, GetCatalogDagSvgData, GetCatalogDagSvgErrors, GetCatalogDagSvgResponses, GetCatalogData, GetCatalogErrors, GetCatalogResponses, GetClientConfigData, GetClientConfigResponses, GetConfigfilesData, GetConfigfilesErrors, GetConfigfilesResponses, GetDetailData, GetDetailErrors, GetDetailResponses, GetJobData, GetJobErrors, GetJobOutputsData, GetJobOutputsErrors, GetJobOutputsResponses, GetJobResponses, GetJobsData, GetJobsErrors, GetJobsResponses, GetLogsData, GetLogsErrors, GetLogsResponses, GetProgressData, GetProgressErrors, GetProgressResponses, GetRuleDurationData, GetRuleDurationErrors, GetRuleDurationResponses, GetRuleErrorData, GetRuleErrorErrors, GetRuleErrorResponses, GetRuleGraphData, GetRuleGraphErrors, GetRuleGraphResponses, GetRulesData, GetRulesErrors, GetRulesResponses, GetRuleStatusData, GetRuleStatusErrors, GetRuleStatusResponses, GetSettingsData, GetSettingsResponses, GetSnakefileData, GetSnakefileErrors, GetSnakefileResponses, GetSnakeTemplateDagSvgData, GetSnakeTemplateDagSvgResponses, GetSnakeTemplateOverviewData, GetSnakeTemplateOverviewResponses, GetSseTicketData, GetSseTicketResponses, GetStatusData, GetStatusErrors, GetStatusResponses, GetSystemHealthData, GetSystemHealthResponses, GetSystemInfoData, GetSystemInfoResponses, GetSystemResourcesData, GetSystemResourcesResponses, GetSystemSettingsData, GetSystemSettingsResponses, GetTimelinesData, GetTimelinesErrors, GetTimelinesResponses, GetWorkflowIdByNameData, GetWorkflowIdByNameErrors, GetWorkflowIdByNameResponses, GetWorkflowLogData, GetWorkflowLogErrors, GetWorkflowLogResponses, GetWorkflowsData, GetWorkflowsErrors, GetWorkflowsResponses, GitPullData, GitPullResponses, GitPushData, GitPushErrors, GitPushResponses, ImportFromGitData, ImportFromGitErrors, ImportFromGitResponses, ListCatalogsData, ListCatalogsErrors, ListCatalogsResponses, ListCatalogWorkflowsData, ListCatalogWorkflowsErrors, ListCatalogWorkflowsResponses, ListFilesData, ListFilesErrors, ListFilesResponses, ListInvitationsData, ListInvitationsResponses, ListTokensData, ListTokensResponses, ListUsersData, ListUsersResponses, PostPruningData, PostPruningResponses, PullSnakeTemplateData, PullSnakeTemplateResponses, ReadFile2Data, ReadFile2Errors, ReadFile2Responses, ReadFileData, ReadFileErrors, ReadFileResponses, ReadSnakeTemplateFileData, ReadSnakeTemplateFileErrors, ReadSnakeTemplateFileResponses, RegisterRegisterData, RegisterRegisterErrors, RegisterRegisterResponses, ReportEventData, ReportEventErrors, ReportEventResponses, ResetForgotPasswordData, ResetForgotPasswordErrors, ResetForgotPasswordResponses, ResetResetPasswordData, ResetResetPasswordErrors, ResetResetPasswordResponses, StreamEventsData, StreamEventsErrors, StreamEventsResponses, SyncCatalogZipData, SyncCatalogZipErrors, SyncCatalogZipResponses, TestAdminSmtpConnectionData, TestAdminSmtpConnectionErrors, TestAdminSmtpConnectionResponses, TestGitConnectionData, TestGitConnectionErrors, TestGitConnectionResponses, TriggerCatalogDagSvgData, TriggerCatalogDagSvgErrors, TriggerCatalogDagSvgResponses, TriggerSnakeTemplateDagSvgData, TriggerSnakeTemplateDagSvgResponses, UpdateCatalogData, UpdateCatalogErrors, UpdateCatalogResponses, UpdateSettingsData, UpdateSettingsErrors, UpdateSettingsResponses, UpdateSystemSettingsData, UpdateSystemSettingsErrors, UpdateSystemSettingsResponses, UploadCatalogData, UploadCatalogErrors, UploadCatalogResponses, UsersCurrentUserData, UsersCurrentUserErrors, UsersCurrentUserResponses, UsersDeleteUserData, UsersDeleteUserErrors, UsersDeleteUserResponses, UsersPatchCurrentUserData, UsersPatchCurrentUserErrors, UsersPatchCurrentUserResponses, UsersPatchUserData, UsersPatchUserErrors, UsersPatchUserResponses, UsersUserData, UsersUserErrors, UsersUserResponses, VerifyRequestTokenData, VerifyRequestTokenErrors, VerifyRequestTokenResponses, VerifyVerifyData, VerifyVerifyErrors, VerifyVerifyResponses } from './types.gen';
+import type { AuthJwtLoginData, AuthJwtLoginErrors, AuthJwtLoginResponses, AuthJwtLogoutData, AuthJwtLogoutErrors, AuthJwtLogoutResponses, BatchImportCatalogFilesData, BatchImportCatalogFilesErrors, BatchImportCatalogFilesResponses, CloseWorkflowData, CloseWorkflowErrors, CloseWorkflowResponses, CreateInvitationData, CreateInvitationErrors, CreateInvitationResponses, CreateTokenData, CreateTokenErrors, CreateTokenResponses, DeleteCatalogData, DeleteCatalogErrors, DeleteCatalogResponses, DeleteInvitationData, DeleteInvitationErrors, DeleteInvitationResponses, DeleteTokenData, DeleteTokenErrors, DeleteTokenResponses, DeleteUserData, DeleteUserErrors, DeleteUserResponses, DeleteWorkflowData, DeleteWorkflowErrors, DeleteWorkflowResponses, DeleteWorkflowsData, DeleteWorkflowsErrors, DeleteWorkflowsResponses, DownloadCatalogData, DownloadCatalogErrors, DownloadCatalogResponses, ExportCatalogData, ExportCatalogErrors, ExportCatalogResponses, GetActivityData, GetActivityErrors, GetActivityResponses, GetAllTagsData, GetAllTagsResponses, GetCatalogDagData, GetCatalogDagErrors, GetCatalogDagResponses, GetCatalogDagSvgData, GetCatalogDagSvgErrors, GetCatalogDagSvgResponses, GetCatalogData, GetCatalogErrors, GetCatalogResponses, GetClientConfigData, GetClientConfigResponses, GetConfigfilesData, GetConfigfilesErrors, GetConfigfilesResponses, GetDetailData, GetDetailErrors, GetDetailResponses, GetJobData, GetJobErrors, GetJobOutputsData, GetJobOutputsErrors, GetJobOutputsResponses, GetJobResponses, GetJobsData, GetJobsErrors, GetJobsResponses, GetLogsData, GetLogsErrors, GetLogsResponses, GetProgressData, GetProgressErrors, GetProgressResponses, GetRuleDurationData, GetRuleDurationErrors, GetRuleDurationResponses, GetRuleErrorData, GetRuleErrorErrors, GetRuleErrorResponses, GetRuleGraphData, GetRuleGraphErrors, GetRuleGraphResponses, GetRulesData, GetRulesErrors, GetRulesResponses, GetRuleStatusData, GetRuleStatusErrors, GetRuleStatusResponses, GetSettingsData, GetSettingsResponses, GetSnakefileData, GetSnakefileErrors, GetSnakefileResponses, GetSnakeTemplateDagSvgData, GetSnakeTemplateDagSvgResponses, GetSnakeTemplateOverviewData, GetSnakeTemplateOverviewResponses, GetSseTicketData, GetSseTicketResponses, GetStatusData, GetStatusErrors, GetStatusResponses, GetSystemHealthData, GetSystemHealthResponses, GetSystemInfoData, GetSystemInfoResponses, GetSystemResourcesData, GetSystemResourcesResponses, GetSystemSettingsData, GetSystemSettingsResponses, GetTimelinesData, GetTimelinesErrors, GetTimelinesResponses, GetWorkflowIdByNameData, GetWorkflowIdByNameErrors, GetWorkflowIdByNameResponses, GetWorkflowLogData, GetWorkflowLogErrors, GetWorkflowLogResponses, GetWorkflowsData, GetWorkflowsErrors, GetWorkflowsResponses, GitPullData, GitPullResponses, GitPushData, GitPushErrors, GitPushResponses, ImportFromGitData, ImportFromGitErrors, ImportFromGitResponses, ListCatalogsData, ListCatalogsErrors, ListCatalogsResponses, ListCatalogWorkflowsData, ListCatalogWorkflowsErrors, ListCatalogWorkflowsResponses, ListFilesData, ListFilesErrors, ListFilesResponses, ListInvitationsData, ListInvitationsResponses, ListTokensData, ListTokensResponses, ListUsersData, ListUsersResponses, PostPruningData, PostPruningResponses, PullSnakeTemplateData, PullSnakeTemplateResponses, ReadFile2Data, ReadFile2Errors, ReadFile2Responses, ReadFileData, ReadFileErrors, ReadFileResponses, ReadSnakeTemplateFileData, ReadSnakeTemplateFileErrors, ReadSnakeTemplateFileResponses, RegisterRegisterData, RegisterRegisterErrors, RegisterRegisterResponses, ReportEventData, ReportEventErrors, ReportEventResponses, ResetForgotPasswordData, ResetForgotPasswordErrors, ResetForgotPasswordResponses, ResetResetPasswordData, ResetResetPasswordErrors, ResetResetPasswordResponses, SearchData, SearchErrors, SearchResponses, StreamEventsData, StreamEventsErrors, StreamEventsResponses, SyncCatalogZipData, SyncCatalogZipErrors, SyncCatalogZipResponses, TestAdminSmtpConnectionData, TestAdminSmtpConnectionErrors, TestAdminSmtpConnectionResponses, TestGitConnectionData, TestGitConnectionErrors, TestGitConnectionResponses, TriggerCatalogDagSvgData, TriggerCatalogDagSvgErrors, TriggerCatalogDagSvgResponses, TriggerSnakeTemplateDagSvgData, TriggerSnakeTemplateDagSvgResponses, UpdateCatalogData, UpdateCatalogErrors, UpdateCatalogResponses, UpdateSettingsData, UpdateSettingsErrors, UpdateSettingsResponses, UpdateSystemSettingsData, UpdateSystemSettingsErrors, UpdateSystemSettingsResponses, UploadCatalogData, UploadCatalogErrors, UploadCatalogResponses, UsersCurrentUserData, UsersCurrentUserErrors, UsersCurrentUserResponses, UsersDeleteUserData, UsersDeleteUserErrors, UsersDeleteUserResponses, UsersPatchCurrentUserData, UsersPatchCurrentUserErrors, UsersPatchCurrentUserResponses, UsersPatchUserData, UsersPatchUserErrors, UsersPatchUserResponses, UsersUserData, UsersUserErrors, UsersUserResponses, VerifyRequestTokenData, VerifyRequestTokenErrors, VerifyRequestTokenResponses, VerifyVerifyData, VerifyVerifyErrors, VerifyVerifyResponses } from './types.gen';
 
 export type Options<TData extends TDataShape = TDataShape, ThrowOnError extends boolean = boolean> = Options2<TData, ThrowOnError> & {
     /**
@@ -227,6 +227,17 @@ export const getWorkflows = <ThrowOnError extends boolean = false>(options?: Opt
     ...options
 });
 
+/**
+ * Delete Workflows
+ *
+ * Delete the runs you can see that match every filter given, in batches.
+ */
+export const deleteWorkflows = <ThrowOnError extends boolean = false>(options?: Options<DeleteWorkflowsData, ThrowOnError>) => (options?.client ?? client).delete<DeleteWorkflowsResponses, DeleteWorkflowsErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }],
+    url: '/api/v1/workflows/',
+    ...options
+});
+
 /**
  * Get Jobs
  */
@@ -746,6 +757,17 @@ export const importFromGit = <ThrowOnError extends boolean = false>(options: Opt
     }
 });
 
+/**
+ * Search
+ *
+ * Runs by name and catalogs by name or description, best matches first.
+ */
+export const search = <ThrowOnError extends boolean = false>(options: Options<SearchData, ThrowOnError>) => (options.client ?? client).get<SearchResponses, SearchErrors, ThrowOnError>({
+    security: [{ scheme: 'bearer', type: 'http' }, { scheme: 'bearer', type: 'http' }],
+    url: '/api/v1/search',
+    ...options
+});
+
 /**
  * Get Settings
  *
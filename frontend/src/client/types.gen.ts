@@ -280,6 +280,32 @@ export type CatalogFileInfo = {
     modified: string;
 };
 
+/**
+ * CatalogSearchHit
+ */
+export type CatalogSearchHit = {
+    /**
+     * Id
+     */
+    id: string;
+    /**
+     * Slug
+     */
+    slug: string;
+    /**
+     * Name
+     */
+    name: string;
+    /**
+     * Description
+     */
+    description: string | null;
+    /**
+     * Score
+     */
+    score: number;
+};
+
 /**
  * CatalogSummary
  */
@@ -639,6 +665,12 @@ export type JobDetailResponse = {
     resources?: {
         [key: string]: unknown;
     } | null;
+    /**
+     * Error Excerpt
+     */
+    error_excerpt?: {
+        [key: string]: unknown;
+    } | null;
     /**
      * Directory
      */
@@ -679,6 +711,14 @@ export type JobListResponse = {
      * Offset
      */
     offset: number;
+    /**
+     * Approximate
+     */
+    approximate?: boolean;
+    /**
+     * Next Cursor
+     */
+    next_cursor?: string | null;
 };
 
 /**
@@ -865,6 +905,24 @@ export type RuleStatusResponse = {
     status: string;
 };
 
+/**
+ * SearchResponse
+ */
+export type SearchResponse = {
+    /**
+     * Workflows
+     */
+    workflows: Array<WorkflowSearchHit>;
+    /**
+     * Catalogs
+     */
+    catalogs: Array<CatalogSearchHit>;
+    /**
+     * Fuzzy
+     */
+    fuzzy: boolean;
+};
+
 /**
  * ServiceStatus
  */
@@ -1356,6 +1414,22 @@ export type ValidationError = {
     type: string;
 };
 
+/**
+ * WorkflowBulkDeleteResponse
+ *
+ * Schema for the result of a bulk delete
+ */
+export type WorkflowBulkDeleteResponse = {
+    /**
+     * Workflows
+     */
+    workflows: number;
+    /**
+     * Jobs
+     */
+    jobs: number;
+};
+
 /**
  * WorkflowDetialResponse
  */
@@ -1446,6 +1520,14 @@ export type WorkflowListResponse = {
      * Offset
      */
     offset: number | null;
+    /**
+     * Approximate
+     */
+    approximate?: boolean;
+    /**
+     * Next Cursor
+     */
+    next_cursor?: string | null;
 };
 
 /**
@@ -1512,6 +1594,32 @@ export type WorkflowResponse = {
     catalog_slug?: string | null;
 };
 
+/**
+ * WorkflowSearchHit
+ */
+export type WorkflowSearchHit = {
+    /**
+     * Id
+     */
+    id: string;
+    /**
+     * Name
+     */
+    name: string | null;
+    /**
+     * Status
+     */
+    status: string | null;
+    /**
+     * Started At
+     */
+    started_at: string | null;
+    /**
+     * Score
+     */
+    score: number;
+};
+
 export type AuthJwtLoginData = {
     body: BodyAuthJwtLoginApiV1AuthJwtLoginPost;
     path?: never;
@@ -2183,6 +2291,12 @@ export type GetWorkflowsData = {
          * Filter workflows ended before this time
          */
         end_at?: string | null;
+        /**
+         * Cursor
+         *
+         * next_cursor of the previous page (replaces offset)
+         */
+        cursor?: string | null;
     };
     url: '/api/v1/workflows/';
 };
@@ -2205,6 +2319,50 @@ export type GetWorkflowsResponses = {
 
 export type GetWorkflowsResponse = GetWorkflowsResponses[keyof GetWorkflowsResponses];
 
+export type DeleteWorkflowsData = {
+    body?: never;
+    path?: never;
+    query?: {
+        /**
+         * Older Than Days
+         *
+         * Only runs started more than this many days ago
+         */
+        older_than_days?: number | null;
+        /**
+         * Status
+         *
+         * Only runs with this status
+         */
+        status?: Status | null;
+        /**
+         * Tags
+         *
+         * Only runs with all these tags (comma-separated)
+         */
+        tags?: string | null;
+    };
+    url: '/api/v1/workflows/';
+};
+
+export type DeleteWorkflowsErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type DeleteWorkflowsError = DeleteWorkflowsErrors[keyof DeleteWorkflowsErrors];
+
+export type DeleteWorkflowsResponses = {
+    /**
+     * Successful Response
+     */
+    200: WorkflowBulkDeleteResponse;
+};
+
+export type DeleteWorkflowsResponse = DeleteWorkflowsResponses[keyof DeleteWorkflowsResponses];
+
 export type GetJobsData = {
     body?: never;
     path: {
@@ -2250,6 +2408,12 @@ export type GetJobsData = {
          * Filter jobs by status
          */
         status?: Status | null;
+        /**
+         * Cursor
+         *
+         * next_cursor of the previous page (replaces offset)
+         */
+        cursor?: string | null;
     };
     url: '/api/v1/workflows/{workflow_id}/jobs';
 };
@@ -3178,6 +3342,12 @@ export type ListCatalogWorkflowsData = {
          * Order in descending order (newest first)
          */
         descending?: boolean;
+        /**
+         * Cursor
+         *
+         * next_cursor of the previous page (replaces offset)
+         */
+        cursor?: string | null;
     };
     url: '/api/v1/catalog/{catalog_ref}/workflows';
 };
@@ -3613,6 +3783,44 @@ export type ImportFromGitResponses = {
     201: unknown;
 };
 
+export type SearchData = {
+    body?: never;
+    path?: never;
+    query: {
+        /**
+         * Q
+         *
+         * Text to look for
+         */
+        q: string;
+        /**
+         * Limit
+         *
+         * Maximum hits per kind
+         */
+        limit?: number;
+    };
+    url: '/api/v1/search';
+};
+
+export type SearchErrors = {
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type SearchError = SearchErrors[keyof SearchErrors];
+
+export type SearchResponses = {
+    /**
+     * Successful Response
+     */
+    200: SearchResponse;
+};
+
+export type SearchResponse2 = SearchResponses[keyof SearchResponses];
+
 export type GetSettingsData = {
     body?: never;
     path?: never;
@@ -323,7 +323,7 @@ const JobTable: React.FC<JobTableProps> = ({ workflowId, ruleName }) => {
           showSizeChanger: true,
           showQuickJumper: true,
           showTotal: (total, range) =>
-            `${range[0]}-${range[1]} of ${total} jobs`,
+            `${range[0]}-${range[1]} of ${jobs?.approximate ? '~' : ''}${total} jobs`,
           pageSizeOptions: ['10', '20', '50', '100'],
           position: ['bottomCenter'],
           onChange: (page, size) => {
@@ -533,6 +533,7 @@ const WorkflowTable = () => {
               )}
             </div>
             <p className="text-[10px] uppercase font-black text-slate-400 mt-1 m-0 tracking-wide">
+              {workflowsData?.approximate ? '~' : ''}
               {workflowsData?.total ?? 0} total runs
             </p>
           </div>
@@ -587,7 +588,8 @@ const WorkflowTable = () => {
             showQuickJumper: true,
             showTotal: (total: number, range: [number, number]) => (
               <span className="text-[10px] uppercase font-black text-slate-400 tracking-wider">
-                {range[0]}-{range[1]} of {total} items
+                {range[0]}-{range[1]} of {workflowsData?.approximate ? '~' : ''}
+                {total} items
               </span>
             ),
             pageSizeOptions: ['10', '20', '50', '100'],
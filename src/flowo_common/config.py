@@ -33,6 +33,8 @@ class ClientSettings(BaseSettings):
     FLOWO_HOST: str | None = None
     FLOWO_USER_TOKEN: str | None = None
     FLOWO_WORKING_PATH: str = "/tmp/flowo_working_dir"
+    # Report events over one long-lived request per run instead of one POST each
+    FLOWO_REPORT_STREAM: bool = True
 
     model_config = SettingsConfigDict(
         case_sensitive=True,
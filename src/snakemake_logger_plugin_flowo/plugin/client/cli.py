@@ -1,15 +1,22 @@
 import argparse
+import hashlib
+import io
 import json
 import logging
 import os
 import shutil
 import sys
 import tarfile
+import tempfile
+import threading
 import time
 import webbrowser
 import zipfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from fnmatch import fnmatch
 from pathlib import Path
+from typing import BinaryIO
 from urllib.parse import urljoin
 
 import httpx
@@ -296,44 +303,71 @@ def _get_ignore_patterns(source_dir: Path) -> list[str]:
     return list(set(patterns))
 
 
-def create_catalog_zip(
-    source_dir: Path, zip_path: Path, extra_excludes: list[str] = None
-):
-    """Create a ZIP archive of the catalog directory, excluding unwanted files."""
-    default_excludes = [
-        ".snakemake",
-        ".git",
-        "__pycache__",
-        "*.pyc",
-        ".DS_Store",
-        ".ipynb_checkpoints",
-        "node_modules",
-        "results",
-        "logs",
-        "benchmarks",
-        "output",
-        ".pytest_cache",
-    ]
+_DEFAULT_CATALOG_EXCLUDES = [
+    ".snakemake",
+    ".git",
+    "__pycache__",
+    "*.pyc",
+    ".DS_Store",
+    ".ipynb_checkpoints",
+    "node_modules",
+    "results",
+    "logs",
+    "benchmarks",
+    "output",
+    ".pytest_cache",
+]
+
+
+def _iter_catalog_files(
+    source_dir: Path, extra_excludes: list[str] | None = None
+) -> Iterator[tuple[Path, Path]]:
+    """Yield ``(file_path, rel_path)`` for every catalog file not excluded."""
     file_ignores = _get_ignore_patterns(source_dir)
-    all_excludes = default_excludes + file_ignores + (extra_excludes or [])
+    all_excludes = _DEFAULT_CATALOG_EXCLUDES + file_ignores + (extra_excludes or [])
 
     source_dir = source_dir.resolve()
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(source_dir):
-            # Filter directories
-            dirs[:] = [
-                d
-                for d in dirs
-                if not any(fnmatch(d, p.rstrip("/")) for p in all_excludes)
-            ]
-
-            for file in files:
-                if any(fnmatch(file, p) for p in all_excludes):
-                    continue
+    for root, dirs, files in os.walk(source_dir):
+        # Filter directories
+        dirs[:] = [
+            d for d in dirs if not any(fnmatch(d, p.rstrip("/")) for p in all_excludes)
+        ]
+
+        for file in files:
+            if any(fnmatch(file, p) for p in all_excludes):
+                continue
+
+            file_path = Path(root) / file
+            yield file_path, file_path.relative_to(source_dir)
+
+
+def write_catalog_zip(
+    source_dir: Path, fileobj: BinaryIO | Path, extra_excludes: list[str] | None = None
+) -> None:
+    """Write a ZIP of the catalog to a path or a (possibly unseekable) stream."""
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for file_path, rel_path in _iter_catalog_files(source_dir, extra_excludes):
+            zipf.write(file_path, rel_path)
+
+
+def write_catalog_tar_gz(
+    source_dir: Path,
+    slug: str,
+    fileobj: BinaryIO,
+    extra_excludes: list[str] | None = None,
+) -> None:
+    """Stream a tar.gz (one top-level ``{slug}/`` directory) to ``fileobj``."""
+    with tarfile.open(fileobj=fileobj, mode="w|gz") as tf:
+        for file_path, rel_path in _iter_catalog_files(source_dir, extra_excludes):
+            arcname = f"{slug}/{rel_path.as_posix()}"
+            tf.add(file_path, arcname=arcname, recursive=False)
 
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(source_dir)
-                zipf.write(file_path, rel_path)
+
+def create_catalog_zip(
+    source_dir: Path, zip_path: Path, extra_excludes: list[str] = None
+):
+    """Create a ZIP archive of the catalog directory, excluding unwanted files."""
+    write_catalog_zip(source_dir, zip_path, extra_excludes)
 
 
 def create_catalog_tar_gz(
@@ -343,38 +377,265 @@ def create_catalog_tar_gz(
     extra_excludes: list[str] | None = None,
 ) -> None:
     """Tar.gz for ``POST /api/v1/catalog/upload`` — one top-level directory ``{slug}/``."""
-    default_excludes = [
-        ".snakemake",
-        ".git",
-        "__pycache__",
-        "*.pyc",
-        ".DS_Store",
-        ".ipynb_checkpoints",
-        "node_modules",
-        "results",
-        "logs",
-        "benchmarks",
-        "output",
-        ".pytest_cache",
-    ]
-    file_ignores = _get_ignore_patterns(source_dir)
-    all_excludes = default_excludes + file_ignores + (extra_excludes or [])
+    with open(tgz_path, "wb") as f:
+        write_catalog_tar_gz(source_dir, slug, f, extra_excludes)
 
-    source_dir = source_dir.resolve()
-    with tarfile.open(tgz_path, "w:gz") as tf:
-        for root, dirs, files in os.walk(source_dir):
-            dirs[:] = [
-                d
-                for d in dirs
-                if not any(fnmatch(d, p.rstrip("/")) for p in all_excludes)
-            ]
-            for file in files:
-                if any(fnmatch(file, p) for p in all_excludes):
-                    continue
-                file_path = Path(root) / file
-                rel_path = file_path.relative_to(source_dir)
-                arcname = f"{slug}/{rel_path.as_posix()}"
-                tf.add(file_path, arcname=arcname, recursive=False)
+
+# --- Chunked (resumable) upload ---
+
+UPLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+UPLOAD_PARALLELISM = 4
+UPLOAD_MAX_RETRIES = 5
+
+
+class UploadSessionUnavailable(Exception):
+    """The server cannot open an upload session (``reason``: missing/unsupported)."""
+
+    def __init__(self, reason: str, detail: str = ""):
+        super().__init__(detail or reason)
+        self.reason = reason
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only stream that cuts whatever is written into fixed-size chunks.
+
+    It is deliberately unseekable, so ``zipfile`` / ``tarfile`` stream their output
+    (data descriptors, ``w|gz``) and no archive ever exists on disk.
+    """
+
+    def __init__(self, chunk_size: int, emit: Callable[[bytes], None]):
+        super().__init__()
+        self._chunk_size = chunk_size
+        self._emit = emit
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._buffer.extend(b)
+        while len(self._buffer) >= self._chunk_size:
+            self._emit(bytes(self._buffer[: self._chunk_size]))
+            del self._buffer[: self._chunk_size]
+        return len(b)
+
+    def finish(self) -> None:
+        if self._buffer:
+            self._emit(bytes(self._buffer))
+            self._buffer.clear()
+
+
+def _upload_state_path(slug: str) -> Path:
+    return Path.home() / ".cache/flowo/uploads" / f"{slug}.json"
+
+
+def _load_upload_state(slug: str, host: str, archive_format: str) -> str | None:
+    try:
+        state = json.loads(_upload_state_path(slug).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if state.get("host") != host or state.get("format") != archive_format:
+        return None
+    return state.get("upload_id")
+
+
+def _save_upload_state(slug: str, host: str, archive_format: str, upload_id: str):
+    path = _upload_state_path(slug)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(
+                {"host": host, "format": archive_format, "upload_id": upload_id}
+            ),
+            encoding="utf-8",
+        )
+    except OSError:
+        pass
+
+
+def _clear_upload_state(slug: str) -> None:
+    try:
+        _upload_state_path(slug).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _response_detail(response: httpx.Response) -> str:
+    try:
+        return str(response.json().get("detail", ""))
+    except Exception:
+        return response.text or ""
+
+
+def _open_upload_session(
+    client: httpx.Client,
+    host: str,
+    headers: dict[str, str],
+    slug: str,
+    catalog_ref: str | None,
+    archive_format: str,
+) -> tuple[str, dict[int, str]]:
+    """Resume the saved session for ``slug`` if the server still has it, else open one.
+
+    Returns ``(upload_id, acknowledged)`` where ``acknowledged`` maps chunk index to
+    the SHA-256 the server already holds.
+    """
+    base = f"{host}/api/v1/catalog/uploads"
+    upload_id = _load_upload_state(slug, host, archive_format)
+    if upload_id:
+        resp = client.get(f"{base}/{upload_id}", headers=headers)
+        if resp.status_code == 200:
+            acked = {c["index"]: c["sha256"] for c in resp.json().get("chunks", [])}
+            logger.info(
+                f"↩️  Resuming upload {upload_id[:8]} ({len(acked)} chunk(s) on server)"
+            )
+            return upload_id, acked
+
+    resp = client.post(
+        base,
+        headers=headers,
+        json={"catalog_ref": catalog_ref, "format": archive_format},
+    )
+    if resp.status_code == 201:
+        upload_id = resp.json()["upload_id"]
+        _save_upload_state(slug, host, archive_format, upload_id)
+        return upload_id, {}
+    if (
+        resp.status_code == 404
+        and "catalog not found" in _response_detail(resp).lower()
+    ):
+        raise UploadSessionUnavailable("missing", _response_detail(resp))
+    if resp.status_code in (404, 405):
+        # Older servers without the chunked upload API.
+        raise UploadSessionUnavailable("unsupported", _response_detail(resp))
+    raise RuntimeError(f"Could not open upload session: {resp.text}")
+
+
+def _put_chunk(
+    client: httpx.Client,
+    url: str,
+    headers: dict[str, str],
+    data: bytes,
+    digest: str,
+) -> None:
+    """PUT one chunk, retrying network errors and 5xx with exponential back-off."""
+    chunk_headers = {**headers, "X-Chunk-Sha256": digest}
+    for attempt in range(UPLOAD_MAX_RETRIES):
+        try:
+            resp = client.put(url, headers=chunk_headers, content=data)
+        except httpx.TransportError as e:
+            error = str(e)
+        else:
+            if resp.status_code == 200:
+                return
+            if resp.status_code < 500 and resp.status_code != 429:
+                raise RuntimeError(f"Chunk upload rejected: {resp.text}")
+            error = f"HTTP {resp.status_code}"
+        if attempt + 1 < UPLOAD_MAX_RETRIES:
+            time.sleep(min(2**attempt, 30))
+    raise RuntimeError(f"Chunk upload failed after {UPLOAD_MAX_RETRIES} tries: {error}")
+
+
+def upload_catalog_chunked(
+    client: httpx.Client,
+    host: str,
+    headers: dict[str, str],
+    catalog_dir: Path,
+    slug: str,
+    exclude: list[str] | None = None,
+    *,
+    create: bool = False,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+    parallelism: int = UPLOAD_PARALLELISM,
+) -> dict:
+    """Stream the catalog archive to the server in checksummed, parallel chunks.
+
+    The archive is produced on the fly while walking the tree; at most
+    ``2 * parallelism`` chunks are held in memory. Chunks the server already
+    acknowledged (same index and checksum) are skipped, so re-running after a
+    network failure resumes where the previous attempt stopped.
+    """
+    archive_format = "tar.gz" if create else "zip"
+    upload_id, acked = _open_upload_session(
+        client, host, headers, slug, None if create else slug, archive_format
+    )
+    chunk_url = f"{host}/api/v1/catalog/uploads/{upload_id}/chunks"
+
+    whole = hashlib.sha256()
+    slots = threading.BoundedSemaphore(parallelism * 2)
+    futures = []
+    index = 0
+
+    with (
+        ThreadPoolExecutor(max_workers=parallelism) as pool,
+        tqdm(unit="B", unit_scale=True, desc=slug, leave=False) as progress,
+    ):
+
+        def _send(i: int, data: bytes, digest: str) -> None:
+            try:
+                _put_chunk(client, f"{chunk_url}/{i}", headers, data, digest)
+                progress.update(len(data))
+            finally:
+                slots.release()
+
+        def _emit(data: bytes) -> None:
+            nonlocal index
+            i = index
+            index += 1
+            whole.update(data)
+            digest = hashlib.sha256(data).hexdigest()
+            if acked.get(i) == digest:
+                progress.update(len(data))
+                return
+            for f in futures:
+                if f.done() and f.exception():
+                    raise f.exception()
+            slots.acquire()
+            futures.append(pool.submit(_send, i, data, digest))
+
+        sink = _ChunkSink(chunk_size, _emit)
+        if create:
+            write_catalog_tar_gz(catalog_dir, slug, sink, exclude)
+        else:
+            write_catalog_zip(catalog_dir, sink, exclude)
+        sink.finish()
+
+        for f in futures:
+            f.result()
+
+    resp = client.post(
+        f"{host}/api/v1/catalog/uploads/{upload_id}/commit",
+        headers=headers,
+        json={"total_chunks": index, "sha256": whole.hexdigest()},
+    )
+    if resp.status_code not in (200, 201):
+        raise RuntimeError(f"Commit failed: {resp.text}")
+    _clear_upload_state(slug)
+    return resp.json()
+
+
+def _log_sync_result(slug: str, result: dict) -> None:
+    if result.get("status") != "completed":
+        logger.error(
+            f"❌ Server import did not complete: {result.get('error', result)}"
+        )
+        return
+    logger.info(f"✅ Catalog '{slug}' synced successfully.")
+    summary = result.get("summary") or {}
+    added = int(summary.get("added") or 0)
+    modified = int(summary.get("modified") or 0)
+    deleted = int(summary.get("deleted") or 0)
+    skipped = int(summary.get("skipped") or 0)
+    logger.info(
+        f"📝 Import summary: {added} added, {modified} modified, "
+        f"{deleted} deleted, {skipped} unchanged (same content hash)."
+    )
+    if skipped and not (added or modified or deleted):
+        logger.info(
+            "ℹ️  Nothing changed on the server — local tree matches DB "
+            "byte-for-byte. Check you saved files and used the correct "
+            "`--path` to the catalog root."
+        )
 
 
 def upload_catalog(
@@ -422,85 +683,88 @@ def upload_catalog(
 
     headers = {"Authorization": f"Bearer {token}"}
     try:
-        import tempfile
+        logger.info(f"📦 Uploading catalog '{slug}'…")
+        with httpx.Client(timeout=300.0) as client:
+            try:
+                result = upload_catalog_chunked(
+                    client, host, headers, catalog_dir, slug, exclude
+                )
+            except UploadSessionUnavailable as e:
+                if e.reason == "unsupported":
+                    _upload_catalog_single_request(
+                        client, host, headers, catalog_dir, slug, exclude
+                    )
+                    return
+                logger.info(
+                    f"📭 Server has no catalog '{slug}' yet — creating it from a "
+                    "tar.gz upload…"
+                )
+                upload_catalog_chunked(
+                    client, host, headers, catalog_dir, slug, exclude, create=True
+                )
+                logger.info(f"✅ Catalog '{slug}' created and imported on the server.")
+                return
+            _log_sync_result(slug, result)
+
+    except Exception as e:
+        logger.error(f"❌ Error uploading catalog: {str(e)}")
 
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            zip_base = Path(tmp_dir) / f"catalog_{slug}_upload.zip"
-            create_catalog_zip(catalog_dir, zip_base, exclude)
 
-            logger.info(f"📦 Uploading catalog '{slug}'…")
-            with httpx.Client(timeout=300.0) as client:
-                with open(zip_base, "rb") as f:
-                    response = client.post(
-                        f"{host}/api/v1/catalog/{slug}/sync",
+def _upload_catalog_single_request(
+    client: httpx.Client,
+    host: str,
+    headers: dict[str, str],
+    catalog_dir: Path,
+    slug: str,
+    exclude: list[str] | None,
+) -> None:
+    """One-shot upload for servers that predate the chunked upload API."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_base = Path(tmp_dir) / f"catalog_{slug}_upload.zip"
+        create_catalog_zip(catalog_dir, zip_base, exclude)
+
+        with open(zip_base, "rb") as f:
+            response = client.post(
+                f"{host}/api/v1/catalog/{slug}/sync",
+                headers=headers,
+                files={
+                    "file": (zip_base.name, f, "application/zip"),
+                },
+            )
+
+        if response.status_code == 200:
+            _log_sync_result(slug, response.json())
+        elif response.status_code == 404:
+            detail = _response_detail(response)
+            if "not found" in detail.lower():
+                logger.info(
+                    f"📭 Server has no catalog '{slug}' yet — creating via "
+                    "POST /api/v1/catalog/upload (tar.gz)…"
+                )
+                tgz_path = Path(tmp_dir) / f"catalog_{slug}_upload.tar.gz"
+                create_catalog_tar_gz(catalog_dir, slug, tgz_path, exclude)
+                with open(tgz_path, "rb") as gf:
+                    up = client.post(
+                        f"{host}/api/v1/catalog/upload",
                         headers=headers,
                         files={
-                            "file": (zip_base.name, f, "application/zip"),
+                            "file": (
+                                f"{slug}.tar.gz",
+                                gf,
+                                "application/gzip",
+                            ),
                         },
                     )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    if result.get("status") != "completed":
-                        logger.error(
-                            f"❌ Server import did not complete: {result.get('error', result)}"
-                        )
-                    else:
-                        logger.info(f"✅ Catalog '{slug}' synced successfully.")
-                        summary = result.get("summary") or {}
-                        added = int(summary.get("added") or 0)
-                        modified = int(summary.get("modified") or 0)
-                        deleted = int(summary.get("deleted") or 0)
-                        skipped = int(summary.get("skipped") or 0)
-                        logger.info(
-                            f"📝 Import summary: {added} added, {modified} modified, "
-                            f"{deleted} deleted, {skipped} unchanged (same content hash)."
-                        )
-                        if skipped and not (added or modified or deleted):
-                            logger.info(
-                                "ℹ️  Nothing changed on the server — local tree matches DB "
-                                "byte-for-byte. Check you saved files and used the correct "
-                                "`--path` to the catalog root."
-                            )
-                elif response.status_code == 404:
-                    detail = ""
-                    try:
-                        body = response.json()
-                        detail = str(body.get("detail", ""))
-                    except Exception:
-                        detail = response.text or ""
-                    if "not found" in detail.lower():
-                        logger.info(
-                            f"📭 Server has no catalog '{slug}' yet — creating via "
-                            "POST /api/v1/catalog/upload (tar.gz)…"
-                        )
-                        tgz_path = Path(tmp_dir) / f"catalog_{slug}_upload.tar.gz"
-                        create_catalog_tar_gz(catalog_dir, slug, tgz_path, exclude)
-                        with open(tgz_path, "rb") as gf:
-                            up = client.post(
-                                f"{host}/api/v1/catalog/upload",
-                                headers=headers,
-                                files={
-                                    "file": (
-                                        f"{slug}.tar.gz",
-                                        gf,
-                                        "application/gzip",
-                                    ),
-                                },
-                            )
-                        if up.status_code == 201:
-                            logger.info(
-                                f"✅ Catalog '{slug}' created and imported on the server."
-                            )
-                        else:
-                            logger.error(f"❌ Create upload failed: {up.text}")
-                    else:
-                        logger.error(f"❌ Sync failed: {response.text}")
+                if up.status_code == 201:
+                    logger.info(
+                        f"✅ Catalog '{slug}' created and imported on the server."
+                    )
                 else:
-                    logger.error(f"❌ Upload failed: {response.text}")
-
-    except Exception as e:
-        logger.error(f"❌ Error uploading catalog: {str(e)}")
+                    logger.error(f"❌ Create upload failed: {up.text}")
+            else:
+                logger.error(f"❌ Sync failed: {response.text}")
+        else:
+            logger.error(f"❌ Upload failed: {response.text}")
 
 
 def catalog_new_from_template(name: str, output_parent: Path, with_git: bool) -> None:
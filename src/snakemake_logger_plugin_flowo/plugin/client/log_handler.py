@@ -1,6 +1,7 @@
 import inspect
 import logging
 import os
+import time
 import uuid
 from dataclasses import dataclass, field
 from logging import Handler, LogRecord
@@ -40,6 +41,8 @@ from snakemake_interface_logger_plugins.settings import (
 
 from flowo_common.config import DEFAULT_API_V1_STR, get_client_settings
 from snakemake_logger_plugin_flowo.plugin.client.parsers import RecordParser
+from snakemake_logger_plugin_flowo.plugin.client.report_sender import ReportSender
+from snakemake_logger_plugin_flowo.plugin.client.report_stream import ReportStream
 
 
 class FlowoFormatter(logging.Formatter):
@@ -66,6 +69,9 @@ class FlowoFormatter(logging.Formatter):
         return formatter.format(record)
 
 
+# Longest wait between two resends of an event the server did not take
+_MAX_BACKOFF_SECONDS = 60.0
+
 # Configure logger for plugin
 logger = logging.getLogger("snakemake.flowo")
 logger.setLevel(logging.INFO)
@@ -104,6 +110,15 @@ class FlowoLogHandler(Handler):
             "workdir": os.getcwd(),
         }
 
+        # Client id of every reported event: (stream_id, seq). The server drops
+        # repeated deliveries, so a request can be retried after a timeout.
+        self._stream_id = str(uuid.uuid4())
+        self._seq = 0
+        # Opened on the first event when FLOWO_REPORT_STREAM is enabled
+        self._stream: ReportStream | None = None
+        # Otherwise events are posted one by one from this sender's thread
+        self._sender: ReportSender | None = None
+
         self.file_handler = self._init_file_handler()
         self._client = self._init_http_client()
 
@@ -217,11 +232,47 @@ class FlowoLogHandler(Handler):
         if not host:
             return
 
+        self._seq += 1
+        if cs.FLOWO_REPORT_STREAM:
+            if self._stream is None:
+                self._stream = ReportStream(
+                    self._client,
+                    f"{host}{DEFAULT_API_V1_STR}/reports/stream",
+                    self._stream_id,
+                    on_context=self.context.update,
+                    fallback=self._post_line,
+                )
+            self._stream.send(
+                {
+                    "event": event,
+                    "record": data,
+                    "seq": self._seq,
+                    "context": dict(self.context),
+                }
+            )
+            return
+
+        if self._sender is None:
+            self._sender = ReportSender(self._post_line)
+        self._sender.send({"event": event, "record": data, "seq": self._seq})
+
+    def _post_line(self, line: dict) -> None:
+        """Report one event with its own request (also the stream's fallback).
+
+        Runs on the sender's or the stream's thread, never on the logging thread.
+        """
+        host = (get_client_settings().FLOWO_HOST or "").rstrip("/")
         url = f"{host}{DEFAULT_API_V1_STR}/reports/"
-        payload = {"event": event, "record": data, "context": self.context}
+        payload = {
+            "event": line["event"],
+            "record": line["record"],
+            "context": dict(self.context),
+            "stream_id": self._stream_id,
+            "seq": line["seq"],
+        }
 
         try:
-            resp = self._client.post(url, json=payload)
+            resp = self._post_event(url, payload)
             if resp.status_code == 200:
                 updated = resp.json().get("context")
                 if updated:
@@ -231,6 +282,35 @@ class FlowoLogHandler(Handler):
         except Exception as e:
             logger.warning(f"Error reporting to API: {e}")
 
+    def _post_event(self, url: str, payload: dict) -> httpx.Response:
+        """POST one event, backing off until the server takes it.
+
+        ``429`` responses are resent after their ``Retry-After``, network errors
+        after an exponential delay, both capped at ``_MAX_BACKOFF_SECONDS``: the
+        server drops repeated ``(stream_id, seq)``, so resending is always safe.
+        Later events wait behind this one. Raises once the client is closed.
+        """
+        failures = 0
+        while True:
+            try:
+                resp = self._client.post(url, json=payload)
+            except httpx.TransportError as e:
+                if self._client.is_closed:
+                    raise
+                delay = min(2.0**failures, _MAX_BACKOFF_SECONDS)
+                failures += 1
+                logger.debug(f"Reporting failed ({e}), resending event in {delay:.1f}s")
+            else:
+                if resp.status_code != 429:
+                    return resp
+                try:
+                    delay = float(resp.headers.get("Retry-After", 1))
+                except ValueError:
+                    delay = 1.0
+                delay = min(max(delay, 0.1), _MAX_BACKOFF_SECONDS)
+                logger.debug(f"Server busy, resending event in {delay:.1f}s")
+            time.sleep(delay)
+
     def flowo_path_valid(self):
         flowo_working_path = get_client_settings().FLOWO_WORKING_PATH
         workdir = self.context.get("workdir")
@@ -329,6 +409,12 @@ class FlowoLogHandler(Handler):
         if self._client.is_closed:
             return
 
+        if self._stream is not None:
+            # Deliver what is still queued; the last ack carries the workflow id.
+            self._stream.close()
+        if self._sender is not None:
+            self._sender.close()
+
         workflow_id = self.context.get("current_workflow_id")
         cs = get_client_settings()
         if workflow_id and cs.FLOWO_USER_TOKEN:
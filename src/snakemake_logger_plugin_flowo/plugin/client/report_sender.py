@@ -0,0 +1,38 @@
+"""Report events one request each, from a background thread.
+
+Used when event streaming is off. ``emit`` runs on Snakemake's logging thread, so
+it only queues the event; the thread posts events in order, and the waits between
+resends while the server answers ``429`` or cannot be reached happen there rather
+than in Snakemake.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable
+
+_CLOSE = object()
+
+
+class ReportSender:
+    def __init__(self, post: Callable[[dict], None]):
+        self._post = post
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="flowo-report-sender", daemon=True
+        )
+        self._thread.start()
+
+    def send(self, line: dict) -> None:
+        """Queue ``{"event", "record", "seq"}`` for posting."""
+        self._queue.put(line)
+
+    def close(self, timeout: float = 60.0) -> None:
+        """Wait until every queued event is posted (or ``timeout`` passes)."""
+        self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while (line := self._queue.get()) is not _CLOSE:
+            self._post(line)
@@ -0,0 +1,147 @@
+"""Report events over one long-lived NDJSON request (``POST /reports/stream``).
+
+A background thread writes each event as one line of a chunked request body, so
+``emit`` never waits on the network and the server authenticates once per stream.
+The request is finished after ``max_events`` lines or when no event arrived for
+``idle_seconds``; the server's acknowledgements are then read, and the next event
+opens a new request that starts with the whole context again. Snapshots queued
+while an earlier request was in flight predate its acknowledgements, so the
+context the server last answered is laid over them: a run the server has just
+started is not reset by lines that were queued before it knew the run.
+
+Lines that were not acknowledged (connection lost, server busy or too old to have
+the endpoint) are handed to ``fallback``, which posts them one by one. Every line
+keeps its ``(stream_id, seq)``, so events the server already stored are not
+recorded twice.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterator
+
+import httpx
+
+logger = logging.getLogger("snakemake.flowo")
+
+_CLOSE = object()
+
+
+class ReportStream:
+    def __init__(
+        self,
+        client: httpx.Client,
+        url: str,
+        stream_id: str,
+        *,
+        on_context: Callable[[dict], None],
+        fallback: Callable[[dict], None],
+        max_events: int = 1000,
+        idle_seconds: float = 5.0,
+    ):
+        self._client = client
+        self._url = url
+        self._stream_id = stream_id
+        self._on_context = on_context
+        self._fallback = fallback
+        self._max_events = max_events
+        self._idle_seconds = idle_seconds
+        self._queue: queue.Queue = queue.Queue()
+        # Latest context acknowledged by the server
+        self._acked_context: dict = {}
+        # Cleared for good once the server turns out not to support streaming
+        self._streaming = True
+        self._closing = False
+        self._thread = threading.Thread(
+            target=self._run, name="flowo-report-stream", daemon=True
+        )
+        self._thread.start()
+
+    def send(self, line: dict) -> None:
+        """Queue ``{"event", "record", "seq", "context"}``; ``context`` is a snapshot."""
+        self._queue.put(line)
+
+    def close(self, timeout: float = 60.0) -> None:
+        """Finish the current request and wait until every event is delivered."""
+        self._queue.put(_CLOSE)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._closing:
+            line = self._queue.get()
+            if line is _CLOSE:
+                return
+            if not self._streaming:
+                self._fallback(line)
+                continue
+
+            sent: list[dict] = [line]
+            acked: set[int] = set()
+            try:
+                self._post(self._body(sent), acked)
+            except httpx.HTTPError as e:
+                logger.debug(f"Report stream interrupted: {e}")
+            except Exception as e:
+                logger.debug(f"Report stream unavailable, posting events: {e}")
+                self._streaming = False
+
+            for line in sent:
+                if line["seq"] not in acked:
+                    self._fallback(line)
+
+    def _body(self, sent: list[dict]) -> Iterator[bytes]:
+        """Lines of one request, starting with ``sent[0]``; appends what it sends."""
+        previous: dict = {}
+        line = sent[0]
+        while True:
+            context = {**line["context"], **self._acked_context}
+            out = {k: v for k, v in line.items() if k != "context"}
+            changed = {
+                k: v
+                for k, v in context.items()
+                if k not in previous or previous[k] != v
+            }
+            if changed:
+                out["context"] = changed
+            previous = context
+            yield (json.dumps(out, default=str) + "\n").encode()
+            if len(sent) >= self._max_events:
+                return
+            try:
+                line = self._queue.get(timeout=self._idle_seconds)
+            except queue.Empty:
+                return
+            if line is _CLOSE:
+                self._closing = True
+                return
+            sent.append(line)
+
+    def _post(self, body: Iterator[bytes], acked: set[int]) -> None:
+        with self._client.stream(
+            "POST",
+            self._url,
+            params={"stream_id": self._stream_id},
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+            # The body stays open between events; only connecting is time-bound.
+            timeout=httpx.Timeout(10.0, read=None, write=None),
+        ) as resp:
+            if resp.status_code in (404, 405):
+                raise RuntimeError(f"{resp.status_code} from {self._url}")
+            if resp.status_code != 200:
+                resp.read()
+                logger.debug(f"Report stream refused: {resp.status_code} {resp.text}")
+                return
+            for raw in resp.iter_lines():
+                if not raw.strip():
+                    continue
+                ack = json.loads(raw)
+                if ack.get("context"):
+                    self._acked_context.update(ack["context"])
+                    self._on_context(ack["context"])
+                for error in ack.get("errors") or []:
+                    logger.warning(f"API reporting failed for event: {error}")
+                acked.update(ack.get("seqs") or [])
@@ -0,0 +1,273 @@
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import (
+    Error,
+    File,
+    Job,
+    JobDailyRollup,
+    JobDurationBucket,
+    Rule,
+    Status,
+    Workflow,
+    WorkflowArchive,
+    WorkflowArchivePart,
+    WorkflowEvent,
+    WorkflowJobCounts,
+)
+from app.models.enums import FileType
+from app.models.user import User
+from app.services.archive import (
+    TABLES,
+    archive_finished_runs,
+    archive_workflow,
+    compress,
+    decompress,
+    restore_in_background,
+    restore_workflow,
+)
+from app.services.job_rollups import fold_job_rollups
+
+NOW = datetime.now(UTC)
+
+
+async def _run(db: AsyncSession, owner: uuid.UUID, ended_days_ago: int) -> uuid.UUID:
+    workflow_id = uuid.uuid4()
+    end = NOW - timedelta(days=ended_days_ago)
+    db.add(
+        Workflow(
+            id=workflow_id,
+            status=Status.ERROR,
+            dryrun=False,
+            user_id=owner,
+            started_at=end - timedelta(hours=1),
+            end_time=end,
+            tags=["cold"],
+        )
+    )
+    rule = Rule(name="align", workflow_id=workflow_id, code="shell: 'bwa mem'")
+    db.add(rule)
+    await db.flush()
+    for i, status in enumerate([Status.SUCCESS, Status.SUCCESS, Status.ERROR]):
+        job = Job(
+            snakemake_id=i,
+            workflow_id=workflow_id,
+            rule_id=rule.id,
+            status=status,
+            wildcards={"sample": f"s{i}"},
+            started_at=end - timedelta(minutes=30),
+            end_time=end - timedelta(minutes=10 * i),
+        )
+        job.files = [File(path=f"out/s{i}.bam", file_type=FileType.OUTPUT)]
+        db.add(job)
+    db.add(Error(exception="RuleException", rule_id=rule.id, workflow_id=workflow_id))
+    db.add(
+        WorkflowEvent(
+            workflow_id=workflow_id,
+            user_id=owner,
+            event_type="workflow_started",
+            payload_json={"workflow_id": str(workflow_id)},
+            context_json={},
+        )
+    )
+    await db.commit()
+    return workflow_id
+
+
+async def _rows(db: AsyncSession, workflow_id: uuid.UUID) -> dict:
+    jobs = select(Job.id).where(Job.workflow_id == workflow_id)
+    return {
+        "rules": (
+            await db.execute(
+                select(Rule.id, Rule.name, Rule.code).where(
+                    Rule.workflow_id == workflow_id
+                )
+            )
+        ).all(),
+        "jobs": (
+            await db.execute(
+                select(
+                    Job.id, Job.rule_id, Job.status, Job.wildcards, Job.end_time
+                ).where(Job.workflow_id == workflow_id)
+            )
+        ).all(),
+        "files": (
+            await db.execute(select(File.id, File.path).where(File.job_id.in_(jobs)))
+        ).all(),
+        "errors": (
+            await db.execute(
+                select(Error.id, Error.rule_id).where(Error.workflow_id == workflow_id)
+            )
+        ).all(),
+        "events": (
+            await db.execute(
+                select(WorkflowEvent.id, WorkflowEvent.sequence_no).where(
+                    WorkflowEvent.workflow_id == workflow_id
+                )
+            )
+        ).all(),
+    }
+
+
+async def _counters(db: AsyncSession) -> tuple:
+    await fold_job_rollups(db)
+    counts = (
+        await db.execute(
+            select(
+                WorkflowJobCounts.total,
+                WorkflowJobCounts.success,
+                WorkflowJobCounts.error,
+            ).order_by(WorkflowJobCounts.total)
+        )
+    ).all()
+    rollups = (
+        await db.execute(
+            select(
+                func.sum(JobDailyRollup.total),
+                func.sum(JobDailyRollup.error),
+                func.sum(JobDailyRollup.duration_sum),
+            )
+        )
+    ).one()
+    buckets = await db.scalar(select(func.sum(JobDurationBucket.count)))
+    return counts, tuple(rollups), buckets
+
+
+def test_archive_codecs_round_trip():
+    data = b'{"jobs": []}' * 100
+    codec, compressed = compress(data)
+    assert codec in ("zstd", "zlib")
+    assert len(compressed) < len(data)
+    assert decompress(codec, compressed) == data
+
+
+@pytest.mark.asyncio
+async def test_archived_runs_are_restored_when_opened(
+    db: AsyncSession,
+    client: AsyncClient,
+    register_user,
+    login_user,
+    TestingSessionLocal,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "RUNS_ARCHIVE_PART_ROWS", 2)
+    await register_user("archive-owner@example.com")
+    headers = await login_user("archive-owner@example.com")
+    owner = await db.scalar(
+        select(User.id).where(User.email == "archive-owner@example.com")
+    )
+    old = await _run(db, owner, ended_days_ago=40)
+    recent = await _run(db, owner, ended_days_ago=2)
+    before = await _rows(db, old)
+    counters = await _counters(db)
+
+    assert await archive_finished_runs(db, older_than_days=30) == {
+        "workflows": 1,
+        "bytes": await db.scalar(select(WorkflowArchive.size)),
+    }
+    # Written a bounded batch of rows at a time: 3 jobs and 3 files take 2 parts each
+    parts = await db.execute(
+        select(WorkflowArchivePart.table_name, WorkflowArchivePart.rows).order_by(
+            WorkflowArchivePart.part
+        )
+    )
+    assert parts.all() == [
+        ("rules", 1),
+        ("jobs", 2),
+        ("jobs", 1),
+        ("files", 2),
+        ("files", 1),
+        ("errors", 1),
+        ("workflow_events", 1),
+    ]
+
+    # Only the stub row is left hot, with its counters and rollups untouched
+    assert all(not rows for rows in (await _rows(db, old)).values())
+    assert all(rows for rows in (await _rows(db, recent)).values())
+    workflow = await db.get(Workflow, old)
+    await db.refresh(workflow)
+    assert workflow.archived_at is not None
+    assert await _counters(db) == counters
+    response = await client.get(
+        "/api/v1/workflows/", params={"tags": "cold"}, headers=headers
+    )
+    assert response.json()["total"] == 2
+
+    # Others cannot open it, and opening fails without restoring it
+    await register_user("archive-intruder@example.com")
+    intruder = await login_user("archive-intruder@example.com")
+    response = await client.get(f"/api/v1/workflows/{old}/jobs", headers=intruder)
+    assert response.status_code == 404
+    db.expire_all()
+    assert await db.scalar(select(func.count()).select_from(WorkflowArchive)) == 1
+
+    # The stub is enough for progress: nothing is restored
+    response = await client.get(f"/api/v1/workflows/{old}/progress", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["completed"] == 2
+    db.expire_all()
+    assert await db.scalar(select(func.count()).select_from(WorkflowArchive)) == 1
+
+    # Its jobs are restored in the background, answering 202 meanwhile
+    response = await client.get(f"/api/v1/workflows/{old}/jobs", headers=headers)
+    assert response.status_code == 202
+    assert response.headers["Retry-After"] == "5"
+    await restore_in_background(old, TestingSessionLocal)
+    db.expire_all()  # the client shares this session
+    response = await client.get(f"/api/v1/workflows/{old}/jobs", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 3
+
+    db.expire_all()
+    assert await _rows(db, old) == before
+    assert (
+        await db.scalar(select(Workflow.archived_at).where(Workflow.id == old)) is None
+    )
+    assert await db.scalar(select(func.count()).select_from(WorkflowArchive)) == 0
+    assert await _counters(db) == counters
+
+    # Just opened: it stays hot until it is left alone as long again
+    assert (await archive_finished_runs(db, older_than_days=30))["workflows"] == 0
+
+
+@pytest.mark.asyncio
+async def test_archives_written_as_one_document_still_restore(
+    db: AsyncSession, register_user
+):
+    await register_user("archive-legacy@example.com")
+    owner = await db.scalar(
+        select(User.id).where(User.email == "archive-legacy@example.com")
+    )
+    old = await _run(db, owner, ended_days_ago=40)
+    before = await _rows(db, old)
+    counters = await _counters(db)
+    await archive_workflow(db, old)
+    # Archives used to hold all the rows as one document in ``data``
+    codec = await db.scalar(select(WorkflowArchive.codec))
+    document = {table.name: [] for table in TABLES}
+    parts = await db.execute(
+        select(WorkflowArchivePart.table_name, WorkflowArchivePart.data).order_by(
+            WorkflowArchivePart.part
+        )
+    )
+    for part in parts:
+        document[part.table_name] += json.loads(decompress(codec, part.data))
+    codec, data = compress(json.dumps(document).encode())
+    await db.execute(delete(WorkflowArchivePart))
+    await db.execute(update(WorkflowArchive).values(codec=codec, data=data))
+    await db.commit()
+
+    assert await restore_workflow(db, old) is True
+    await db.commit()
+
+    db.expire_all()
+    assert await _rows(db, old) == before
+    assert await db.scalar(select(func.count()).select_from(WorkflowArchive)) == 0
+    assert await _counters(db) == counters
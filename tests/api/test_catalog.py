@@ -2,6 +2,7 @@ import hashlib
 import io
 import json
 import tarfile
+import zipfile
 
 import pytest
 from httpx import AsyncClient
@@ -126,3 +127,152 @@ async def test_upload_list_get_update_and_delete_catalog(
         f"/api/v1/catalog/{slug}", headers=superuser_token_headers
     )
     assert del_resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_creates_then_syncs_catalog(
+    client: AsyncClient, superuser_token_headers: dict, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        "app.core.config.settings.CATALOG_DIR", str(tmp_path / "catalog")
+    )
+    monkeypatch.setattr(
+        "app.core.config.settings.CATALOG_UPLOAD_DIR", str(tmp_path / "uploads")
+    )
+    monkeypatch.setattr("app.core.config.settings.FLOWO_WORKING_PATH", str(tmp_path))
+
+    async def _upload(archive: bytes, body: dict, chunk: int = 256) -> dict:
+        create = await client.post(
+            "/api/v1/catalog/uploads", json=body, headers=superuser_token_headers
+        )
+        assert create.status_code == 201
+        upload_id = create.json()["upload_id"]
+        parts = [archive[i : i + chunk] for i in range(0, len(archive), chunk)]
+        # Send out of order and repeat one chunk, as a resuming client would.
+        for index in [*reversed(range(len(parts))), 0]:
+            resp = await client.put(
+                f"/api/v1/catalog/uploads/{upload_id}/chunks/{index}",
+                content=parts[index],
+                headers={
+                    **superuser_token_headers,
+                    "X-Chunk-Sha256": hashlib.sha256(parts[index]).hexdigest(),
+                },
+            )
+            assert resp.status_code == 200
+        status = await client.get(
+            f"/api/v1/catalog/uploads/{upload_id}", headers=superuser_token_headers
+        )
+        assert [c["index"] for c in status.json()["chunks"]] == list(range(len(parts)))
+        commit = await client.post(
+            f"/api/v1/catalog/uploads/{upload_id}/commit",
+            json={
+                "total_chunks": len(parts),
+                "sha256": hashlib.sha256(archive).hexdigest(),
+            },
+            headers=superuser_token_headers,
+        )
+        assert commit.status_code == 200, commit.text
+        return commit.json()
+
+    missing = await client.post(
+        "/api/v1/catalog/uploads",
+        json={"catalog_ref": "chunked-catalog", "format": "zip"},
+        headers=superuser_token_headers,
+    )
+    assert missing.status_code == 404
+
+    created = await _upload(
+        _build_catalog_archive(
+            slug="chunked-catalog", name="Chunked", description="via chunks"
+        ),
+        {"catalog_ref": None, "format": "tar.gz"},
+    )
+    assert created["slug"] == "chunked-catalog"
+
+    zip_buf = io.BytesIO()
+    with zipfile.ZipFile(zip_buf, "w") as zf:
+        zf.writestr(".flowo.json", json.dumps({"slug": "chunked-catalog"}))
+        zf.writestr("README.md", "# Chunked\n")
+        zf.writestr("workflow/Snakefile", "rule all:\n    input: ['x']\n")
+    synced = await _upload(
+        zip_buf.getvalue(), {"catalog_ref": "chunked-catalog", "format": "zip"}
+    )
+    assert synced["status"] == "completed"
+
+    read_resp = await client.get(
+        "/api/v1/catalog/chunked-catalog/files/workflow/Snakefile",
+        headers=superuser_token_headers,
+    )
+    assert "input: ['x']" in read_resp.json()["content"]
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_rejects_bad_checksum(
+    client: AsyncClient, superuser_token_headers: dict, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(
+        "app.core.config.settings.CATALOG_UPLOAD_DIR", str(tmp_path / "uploads")
+    )
+    create = await client.post(
+        "/api/v1/catalog/uploads",
+        json={"format": "tar.gz"},
+        headers=superuser_token_headers,
+    )
+    upload_id = create.json()["upload_id"]
+
+    resp = await client.put(
+        f"/api/v1/catalog/uploads/{upload_id}/chunks/0",
+        content=b"payload",
+        headers={**superuser_token_headers, "X-Chunk-Sha256": "0" * 64},
+    )
+    assert resp.status_code == 422
+
+    commit = await client.post(
+        f"/api/v1/catalog/uploads/{upload_id}/commit",
+        json={"total_chunks": 1},
+        headers=superuser_token_headers,
+    )
+    assert commit.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_chunked_upload_refuses_sessions_over_the_import_limit(
+    client: AsyncClient, superuser_token_headers: dict, monkeypatch, tmp_path
+):
+    uploads = tmp_path / "uploads"
+    monkeypatch.setattr("app.core.config.settings.CATALOG_UPLOAD_DIR", str(uploads))
+    monkeypatch.setattr("app.services.catalog.uploads.CATALOG_IMPORT_MAX_BYTES", 10)
+    monkeypatch.setattr("app.services.catalog.uploads._MIN_CHUNK_BYTES", 2)
+    create = await client.post(
+        "/api/v1/catalog/uploads",
+        json={"format": "tar.gz"},
+        headers=superuser_token_headers,
+    )
+    upload_id = create.json()["upload_id"]
+
+    async def put(index: int, data: bytes) -> int:
+        resp = await client.put(
+            f"/api/v1/catalog/uploads/{upload_id}/chunks/{index}",
+            content=data,
+            headers={
+                **superuser_token_headers,
+                "X-Chunk-Sha256": hashlib.sha256(data).hexdigest(),
+            },
+        )
+        return resp.status_code
+
+    assert await put(0, b"123456") == 200
+    # Resending a stored chunk does not count it twice
+    assert await put(0, b"abcdef") == 200
+    assert await put(1, b"12345") == 413
+    assert await put(1, b"1234") == 200
+    assert await put(2, b"1") == 413
+    # Far-off indexes are refused outright
+    assert await put(5, b"") == 400
+    assert sorted(p.name for p in (uploads / upload_id).iterdir()) == [
+        "00000000.chunk",
+        "00000000.sha256",
+        "00000001.chunk",
+        "00000001.sha256",
+        "session.json",
+    ]
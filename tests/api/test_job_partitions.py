@@ -0,0 +1,187 @@
+import json
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, func, select, text, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    File,
+    Job,
+    JobDailyRollup,
+    Rule,
+    Status,
+    Workflow,
+    WorkflowArchive,
+    WorkflowArchivePart,
+)
+from app.models.enums import FileType
+from app.models.job_counts import run_job_ids
+from app.services.archive import TABLES, archive_workflow, compress, decompress
+from app.services.job_partitions import (
+    convert_to_partitioned,
+    drop_history_before,
+    ensure_job_partitions,
+    is_partitioned,
+    list_partitions,
+)
+from app.services.job_rollups import fold_job_rollups
+
+NOW = datetime.now(UTC)
+
+
+async def _run(db: AsyncSession, started_at: datetime, jobs: int) -> uuid.UUID:
+    workflow_id = uuid.uuid4()
+    db.add(
+        Workflow(
+            id=workflow_id, status=Status.SUCCESS, dryrun=False, started_at=started_at
+        )
+    )
+    rule = Rule(name="align", workflow_id=workflow_id)
+    db.add(rule)
+    await db.flush()
+    for i in range(jobs):
+        job = Job(snakemake_id=i, workflow_id=workflow_id, rule_id=rule.id)
+        job.files = [File(path=f"out/{i}.bam", file_type=FileType.OUTPUT)]
+        db.add(job)
+    await db.commit()
+    return workflow_id
+
+
+async def _skip_to(db: AsyncSession, job_id: int) -> None:
+    await db.execute(
+        text("SELECT setval(pg_get_serial_sequence('jobs', 'id'), :id, false)"),
+        {"id": job_id},
+    )
+    await db.commit()
+
+
+async def _where(db: AsyncSession, workflow_id: uuid.UUID) -> set[str]:
+    rows = await db.execute(
+        text(
+            "SELECT DISTINCT tableoid::regclass::text FROM jobs WHERE workflow_id = :w"
+        ),
+        {"w": workflow_id},
+    )
+    return set(rows.scalars())
+
+
+@pytest.mark.asyncio
+async def test_convert_keeps_rows_and_creates_partitions_ahead(
+    db: AsyncSession, engine
+):
+    old = await _run(db, NOW - timedelta(days=3), jobs=3)
+    assert not await is_partitioned(db)
+    await db.commit()
+
+    boundary = await convert_to_partitioned(engine, size=10)
+
+    assert boundary == 20
+    assert await is_partitioned(db)
+    partitions = [(p.name, p.lower, p.upper) for p in await list_partitions(db)]
+    assert partitions == [
+        ("jobs_legacy", None, 20),
+        ("jobs_p20", 20, 30),
+        ("jobs_p30", 30, 40),
+        ("jobs_default", None, None),
+    ]
+    assert await _where(db, old) == {"jobs_legacy"}
+    assert await db.scalar(select(func.count()).select_from(File)) == 3
+
+    # New jobs and their files land in the partition of their id
+    await _skip_to(db, 25)
+    new = await _run(db, NOW, jobs=2)
+    assert await _where(db, new) == {"jobs_p20"}
+    files = await db.execute(text("SELECT count(*) FROM files_p20"))
+    assert files.scalar_one() == 2
+    # The partition in use and two more stay ready
+    assert await ensure_job_partitions(db, ahead=2, size=10) == ["jobs_p40"]
+
+
+@pytest.mark.asyncio
+async def test_run_queries_skip_other_partitions(db: AsyncSession, engine):
+    await _run(db, NOW - timedelta(days=3), jobs=3)
+    await convert_to_partitioned(engine, size=10)
+    await _skip_to(db, 32)
+    new = await _run(db, NOW, jobs=2)
+
+    plan = "\n".join(
+        (
+            await db.execute(
+                text(
+                    "EXPLAIN (ANALYZE, COSTS OFF, TIMING OFF, SUMMARY OFF) "
+                    + str(
+                        select(Job.id)
+                        .where(Job.workflow_id == new, run_job_ids(new))
+                        .compile(
+                            dialect=postgresql.dialect(),
+                            compile_kwargs={"literal_binds": True},
+                        )
+                    )
+                )
+            )
+        ).scalars()
+    )
+
+    executed = [
+        line.split(" on ")[1].split()[0]
+        for line in plan.splitlines()
+        if " on jobs_" in line and "never executed" not in line
+    ]
+    assert executed == ["jobs_p30"], plan
+
+
+@pytest.mark.asyncio
+async def test_drop_history_drops_whole_partitions(db: AsyncSession, engine):
+    old = await _run(db, NOW - timedelta(days=400), jobs=3)
+    spanning = await _run(db, NOW - timedelta(days=380), jobs=1)
+    await convert_to_partitioned(engine, size=10)
+    await _skip_to(db, 20)
+    new = await _run(db, NOW - timedelta(days=10), jobs=2)
+    # A job of the old run written after the conversion, next to the new run's
+    db.add(Job(snakemake_id=9, workflow_id=spanning, status=Status.SUCCESS))
+    await db.commit()
+    # Archived runs are deleted without being restored. This archive predates
+    # recorded rollups (and jobs.rollup_id): its jobs find their rows by key.
+    await archive_workflow(db, old)
+    codec = await db.scalar(
+        select(WorkflowArchive.codec).where(WorkflowArchive.workflow_id == old)
+    )
+    document = {table.name: [] for table in TABLES}
+    parts = await db.execute(
+        select(WorkflowArchivePart.table_name, WorkflowArchivePart.data)
+        .where(WorkflowArchivePart.workflow_id == old)
+        .order_by(WorkflowArchivePart.part)
+    )
+    for part in parts:
+        document[part.table_name] += json.loads(decompress(codec, part.data))
+    for job in document["jobs"]:
+        del job["rollup_id"]
+    codec, data = compress(json.dumps(document).encode())
+    await db.execute(
+        delete(WorkflowArchivePart).where(WorkflowArchivePart.workflow_id == old)
+    )
+    await db.execute(
+        update(WorkflowArchive)
+        .where(WorkflowArchive.workflow_id == old)
+        .values(codec=codec, data=data, rollups=None)
+    )
+    await db.commit()
+
+    result = await drop_history_before(db, NOW - timedelta(days=365))
+    await db.commit()
+
+    assert result == {"partitions": ["jobs_legacy"], "workflows": 2, "jobs_deleted": 1}
+    names = {p.name for p in await list_partitions(db)}
+    assert "jobs_legacy" not in names
+    assert "files_legacy" not in {p.name for p in await list_partitions(db, "files")}
+    remaining = await db.scalars(select(Workflow.id))
+    assert set(remaining) == {new}
+    assert await db.scalar(select(func.count()).select_from(Job)) == 2
+    assert await db.scalar(select(func.count()).select_from(File)) == 2
+    # Dropped partitions are taken out of the rollups too
+    await fold_job_rollups(db)
+    assert await db.scalar(select(func.sum(JobDailyRollup.total))) == 2
+    assert await db.scalar(select(func.count()).select_from(WorkflowArchive)) == 0
@@ -5,13 +5,17 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, update
 
 from app.models.invitation import Invitation
 from app.models.system_settings import SystemSettings
 from app.models.user import User
 from app.models.user_settings import UserSettings
 from app.models.user_token import UserToken
+from app.services.system_settings import (
+    SYSTEM_SETTINGS_CHANNEL,
+    system_settings_cache,
+)
 
 
 async def create_user_and_headers(
@@ -248,6 +252,38 @@ async def test_admin_settings_initialize_and_update(
     assert persisted.site_url == "https://flowo.example.com"
 
 
+@pytest.mark.asyncio
+async def test_admin_settings_update_refreshes_cached_settings(
+    client: AsyncClient,
+    db,
+    superuser_token_headers: dict,
+):
+    await client.get("/api/v1/admin/settings", headers=superuser_token_headers)
+    cached = await system_settings_cache.get(db)
+    assert cached.notify_on_failure is False
+
+    # Served from the snapshot: a change made behind the cache's back is not seen.
+    await db.execute(update(SystemSettings).values(site_url="https://stale"))
+    await db.commit()
+    assert (await system_settings_cache.get(db)).site_url is None
+
+    response = await client.patch(
+        "/api/v1/admin/settings",
+        json={"notify_on_failure": True},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    cached = await system_settings_cache.get(db)
+    assert cached.notify_on_failure is True
+    assert cached.site_url == "https://stale"
+
+    # Another process changed the row and sent NOTIFY.
+    await db.execute(update(SystemSettings).values(site_url="https://fresh"))
+    await db.commit()
+    system_settings_cache.on_notification(None, 4242, SYSTEM_SETTINGS_CHANNEL, "")
+    assert (await system_settings_cache.get(db)).site_url == "https://fresh"
+
+
 @pytest.mark.asyncio
 async def test_admin_invitation_lifecycle_without_smtp(
     client: AsyncClient,
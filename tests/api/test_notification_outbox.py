@@ -0,0 +1,113 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models import NotificationOutbox, SystemSettings
+from app.services.notification import (
+    notify_workflow_failure,
+    notify_workflow_success,
+)
+from app.services.notification_outbox import NotificationOutboxWorker
+
+
+@pytest.fixture
+async def smtp_settings(db: AsyncSession, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATIONS_RATE_PER_MINUTE", 60_000)
+    db.add(
+        SystemSettings(
+            smtp_host="smtp.example.com",
+            smtp_port=465,
+            smtp_from="flowo@example.com",
+            notify_on_success=True,
+            notify_on_failure=True,
+        )
+    )
+    await db.commit()
+
+
+async def _outbox(db: AsyncSession) -> list[NotificationOutbox]:
+    db.expunge_all()
+    return (
+        await db.scalars(select(NotificationOutbox).order_by(NotificationOutbox.id))
+    ).all()
+
+
+@pytest.mark.asyncio
+async def test_outbox_digests_bursts_over_one_connection(
+    db: AsyncSession, smtp_settings, TestingSessionLocal
+):
+    for n in range(3):
+        await notify_workflow_failure(db, f"run-{n}", "alice@example.com", "boom")
+    await notify_workflow_success(db, "ok-run", "bob@example.com", "1m 2s")
+    await db.commit()
+
+    # Rolled back with the event that triggered it: nothing is sent.
+    await notify_workflow_failure(db, "rolled-back", "bob@example.com", "boom")
+    await db.rollback()
+
+    server = MagicMock()
+    with patch(
+        "app.services.notification._connect_smtp", return_value=server
+    ) as connect:
+        handled = await NotificationOutboxWorker().drain(TestingSessionLocal)
+
+    assert handled == 4
+    assert connect.call_count == 1
+    sent = [call.args[0] for call in server.send_message.call_args_list]
+    assert [(m["To"], m["Subject"]) for m in sent] == [
+        ("alice@example.com", "[FlowO] 3 workflow updates"),
+        ("bob@example.com", "[FlowO] Workflow Completed: ok-run"),
+    ]
+    rows = await _outbox(db)
+    assert {r.status for r in rows} == {"sent"}
+
+
+@pytest.mark.asyncio
+async def test_outbox_retries_failed_delivery_later(
+    db: AsyncSession, smtp_settings, TestingSessionLocal
+):
+    await notify_workflow_failure(db, "run", "alice@example.com", "boom")
+    await db.commit()
+
+    server = MagicMock()
+    server.send_message.side_effect = OSError("connection refused")
+    with patch("app.services.notification._connect_smtp", return_value=server):
+        assert await NotificationOutboxWorker().drain(TestingSessionLocal) == 1
+
+    (row,) = await _outbox(db)
+    assert row.status == "pending"
+    assert row.attempts == 1
+    assert "connection refused" in row.last_error
+    assert row.next_attempt_at > datetime.now(UTC)
+
+
+@pytest.mark.asyncio
+async def test_outbox_defers_messages_over_the_rate_instead_of_sleeping(
+    db: AsyncSession, smtp_settings, TestingSessionLocal, monkeypatch
+):
+    monkeypatch.setattr(settings, "NOTIFICATIONS_RATE_PER_MINUTE", 60)
+    await notify_workflow_failure(db, "run", "alice@example.com", "boom")
+    await notify_workflow_success(db, "ok-run", "bob@example.com", "1m 2s")
+    await db.commit()
+
+    worker = NotificationOutboxWorker()
+    server = MagicMock()
+    with (
+        patch("app.services.notification._connect_smtp", return_value=server),
+        patch(
+            "app.services.notification_outbox.time.sleep",
+            side_effect=AssertionError("slept while holding the outbox lock"),
+        ),
+    ):
+        assert await worker.run_once(TestingSessionLocal) == 1
+
+    assert server.send_message.call_count == 1
+    sent, deferred = await _outbox(db)
+    assert sent.status == "sent"
+    assert deferred.status == "pending"
+    assert deferred.attempts == 0
+    assert deferred.next_attempt_at > datetime.now(UTC)
@@ -0,0 +1,160 @@
+"""The hot filters of the API and projector are served by indexes.
+
+A few runs' worth of rows are seeded and analyzed, so the planner compares indexes
+on real selectivity; sequential scans are disabled, as the tables are still small.
+"""
+
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Error, File, Job, Rule, Workflow
+from app.models.enums import FileType, Status
+from app.models.job import status_rank
+
+WORKFLOW_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000002")
+
+
+SEED = [
+    """INSERT INTO workflows (id, started_at, dryrun, user_id, catalog_id)
+    SELECT ('00000000-0000-0000-0000-' || lpad(g::text, 12, '0'))::uuid,
+           now() - g * interval '1 hour', false, NULL, NULL
+    FROM generate_series(1, 50) g""",
+    """INSERT INTO rules (name, workflow_id)
+    SELECT 'rule_' || (g % 20), w.id
+    FROM workflows w, generate_series(1, 20) g""",
+    """INSERT INTO jobs (snakemake_id, workflow_id, rule_id, status, started_at)
+    SELECT g, w.id, NULL,
+           (ARRAY['SUCCESS', 'RUNNING', 'ERROR', 'WAITING'])[1 + g % 4]::status,
+           now()
+    FROM workflows w, generate_series(1, 200) g""",
+    """INSERT INTO files (path, file_type, job_id)
+    SELECT 'out/' || j.id || '.' || t, t::filetype, j.id
+    FROM jobs j, unnest(ARRAY['INPUT', 'OUTPUT', 'LOG']) t""",
+    """INSERT INTO errors (timestamp, exception, workflow_id)
+    SELECT now() - g * interval '1 minute', 'boom', w.id
+    FROM workflows w, generate_series(1, 20) g""",
+]
+
+
+async def _plan(db: AsyncSession, stmt, *disabled: str) -> str:
+    sql = stmt.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    for seed in SEED:
+        await db.execute(text(seed))
+    for table in ("workflows", "rules", "jobs", "files", "errors"):
+        await db.execute(text(f"ANALYZE {table}"))
+    for node in ("seqscan", *disabled):
+        await db.execute(text(f"SET LOCAL enable_{node} = off"))
+    rows = await db.execute(text(f"EXPLAIN {sql}"))
+    return "\n".join(row[0] for row in rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("stmt", "index"),
+    [
+        (
+            select(Job.status, func.count())
+            .where(Job.workflow_id == WORKFLOW_ID)
+            .group_by(Job.status),
+            "ix_jobs_workflow_id_status",
+        ),
+        (
+            select(Job.id).where(
+                Job.workflow_id == WORKFLOW_ID, Job.status == Status.RUNNING
+            ),
+            "ix_jobs_workflow_id_status",
+        ),
+        (
+            select(Job).where(Job.workflow_id == WORKFLOW_ID, Job.snakemake_id == 7),
+            "ix_jobs_workflow_id_snakemake_id",
+        ),
+        (select(Job.id).where(Job.rule_id == 3), "ix_jobs_rule_id"),
+        (
+            select(File.path).where(File.job_id == 5, File.file_type == FileType.LOG),
+            "ix_files_job_id_file_type",
+        ),
+        (
+            select(Rule.id).where(
+                Rule.workflow_id == WORKFLOW_ID, Rule.name == "align"
+            ),
+            "ix_rules_workflow_id_name",
+        ),
+        (
+            select(Error)
+            .where(Error.workflow_id == WORKFLOW_ID)
+            .order_by(Error.timestamp.desc())
+            .limit(20),
+            "ix_errors_workflow_id_timestamp",
+        ),
+        (
+            select(Workflow.id)
+            .order_by(Workflow.started_at.desc(), Workflow.id.desc())
+            .limit(20),
+            "ix_workflows_started_at_id",
+        ),
+        (
+            select(Workflow.id)
+            .where(Workflow.user_id == USER_ID)
+            .order_by(Workflow.started_at.desc(), Workflow.id.desc())
+            .limit(20),
+            "ix_workflows_user_id_started_at_id",
+        ),
+        (
+            select(Workflow.id).where(Workflow.catalog_id == WORKFLOW_ID),
+            "ix_workflows_catalog_id_started_at_id",
+        ),
+    ],
+)
+async def test_query_uses_index(db: AsyncSession, stmt, index: str):
+    plan = await _plan(db, stmt)
+    assert index in plan, plan
+
+
+RANK = status_rank(Job.status)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("stmt", "index"),
+    [
+        (
+            select(Job.id)
+            .where(
+                Job.workflow_id == WORKFLOW_ID,
+                tuple_(RANK, Job.started_at, Job.id)
+                < tuple_(3, datetime(2026, 1, 1, tzinfo=UTC), 100),
+            )
+            .order_by(RANK.desc(), Job.started_at.desc(), Job.id.desc())
+            .limit(50),
+            "ix_jobs_workflow_id_status_rank",
+        ),
+        (
+            select(Workflow.id)
+            .where(
+                tuple_(Workflow.started_at, Workflow.id)
+                < tuple_(datetime(2026, 1, 1, tzinfo=UTC), WORKFLOW_ID)
+            )
+            .order_by(Workflow.started_at.desc(), Workflow.id.desc())
+            .limit(50),
+            "ix_workflows_started_at_id",
+        ),
+    ],
+)
+async def test_keyset_page_is_an_index_range_without_sort(
+    db: AsyncSession, stmt, index: str
+):
+    # A sort still appears (just costed higher) when no index yields the order;
+    # disabled here because sorting a few hundred rows is cheaper than any scan.
+    plan = await _plan(db, stmt, "sort", "bitmapscan")
+    assert index in plan, plan
+    # The cursor bounds the index scan itself and the index provides the order
+    assert "Index Cond" in plan and "<" in plan.split("Index Cond")[1], plan
+    assert "Sort" not in plan, plan
@@ -1,10 +1,24 @@
+import asyncio
+import json
 import uuid
 
 import pytest
-from httpx import AsyncClient
-from sqlalchemy import select
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete, func, select
 
-from app.models import Catalog, Job, Status, User, Workflow
+from app.core.config import settings
+from app.core.session import get_async_session
+from app.ingest import app as ingest_app
+from app.models import Catalog, File, Job, Status, User, Workflow, WorkflowEvent
+from app.models.enums import FileType
+from app.services.reports import (
+    backpressure,
+    event_projector,
+    ingest_backpressure,
+    rebuild_projections,
+)
+from app.services.reports.dispatch.registry import event_registry
+from app.utils.paths import path_resolver
 
 
 @pytest.mark.asyncio
@@ -250,3 +264,581 @@ async def test_close_workflow(client: AsyncClient, superuser_token_headers: dict
     result = await db.execute(select(Workflow).where(Workflow.id == workflow_id))
     workflow = result.scalar_one()
     assert workflow.status == Status.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_queued_mode_acknowledges_then_projects_in_order(
+    client: AsyncClient,
+    superuser_token_headers: dict,
+    db,
+    TestingSessionLocal,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "REPORTS_INGEST_MODE", "queued")
+    workflow_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+    job_info = {
+        "job_id": 1,
+        "rule_name": "test_rule",
+        "threads": 1,
+        "rule_msg": "msg",
+        "reason": "r",
+        "shellcmd": "cmd",
+        "priority": 1,
+        "input": [],
+        "log": [],
+        "output": [],
+    }
+
+    for workflow_id in workflow_ids:
+        resp = await client.post(
+            "/api/v1/reports/",
+            json={
+                "event": "workflow_started",
+                "record": {"workflow_id": workflow_id, "snakefile": "S", "rules": []},
+                "context": {},
+            },
+            headers=superuser_token_headers,
+        )
+        context = resp.json()["context"]
+        assert context["current_workflow_id"] == workflow_id
+        # Plugin context never carries a ``jobs`` map in queued mode.
+        for event, record in [
+            ("job_started", {"job_ids": [1]}),
+            ("job_info", job_info),
+            ("job_finished", {"job_id": 1}),
+        ]:
+            resp = await client.post(
+                "/api/v1/reports/",
+                json={"event": event, "record": record, "context": context},
+                headers=superuser_token_headers,
+            )
+            assert resp.status_code == 200
+            assert "jobs" not in resp.json()["context"]
+
+    # Nothing is projected until the workers run.
+    assert (await db.execute(select(Workflow))).scalars().all() == []
+    resp = await client.get("/api/v1/reports/metrics", headers=superuser_token_headers)
+    assert resp.status_code == 200
+    assert resp.json()["backlog_size"] == 8
+    assert resp.json()["oldest_pending_age_seconds"] >= 0
+
+    assert await event_projector.drain(TestingSessionLocal) == 8
+
+    jobs = (
+        (await db.execute(select(Job).execution_options(populate_existing=True)))
+        .scalars()
+        .all()
+    )
+    assert sorted(str(j.workflow_id) for j in jobs) == sorted(workflow_ids)
+    assert {j.status for j in jobs} == {Status.SUCCESS}
+    assert all(j.rule_id is not None for j in jobs)  # set by job_info
+    statuses = (
+        await db.execute(
+            select(WorkflowEvent.status).execution_options(populate_existing=True)
+        )
+    ).scalars()
+    assert set(statuses) == {"processed"}
+
+    resp = await client.get("/api/v1/reports/metrics", headers=superuser_token_headers)
+    assert resp.json()["backlog_size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_report_job_info_bulk_files_and_group(
+    client: AsyncClient, superuser_token_headers: dict, db
+):
+    """Large file lists take the COPY path; group_info updates all jobs at once."""
+    workflow_id = str(uuid.uuid4())
+    resp = await client.post(
+        "/api/v1/reports/",
+        json={
+            "event": "workflow_started",
+            "record": {"workflow_id": workflow_id, "snakefile": "S", "rules": []},
+            "context": {},
+        },
+        headers=superuser_token_headers,
+    )
+    context = resp.json()["context"]
+    resp = await client.post(
+        "/api/v1/reports/",
+        json={
+            "event": "job_started",
+            "record": {"job_ids": [1, 2]},
+            "context": context,
+        },
+        headers=superuser_token_headers,
+    )
+    context = resp.json()["context"]
+
+    inputs = [f"data/sample_{i}.fq" for i in range(600)]
+    resp = await client.post(
+        "/api/v1/reports/",
+        json={
+            "event": "job_info",
+            "record": {
+                "job_id": 1,
+                "rule_name": "align",
+                "threads": 4,
+                "input": inputs,
+                "output": ["out.bam"],
+                "log": [],
+            },
+            "context": context,
+        },
+        headers=superuser_token_headers,
+    )
+    assert resp.status_code == 200
+    resp = await client.post(
+        "/api/v1/reports/",
+        json={
+            "event": "group_info",
+            "record": {"group_id": 7, "jobs": [1, 2]},
+            "context": context,
+        },
+        headers=superuser_token_headers,
+    )
+    assert resp.status_code == 200
+
+    jobs = (
+        (
+            await db.execute(
+                select(Job)
+                .where(Job.workflow_id == workflow_id)
+                .order_by(Job.snakemake_id)
+                .execution_options(populate_existing=True)
+            )
+        )
+        .scalars()
+        .all()
+    )
+    assert [j.group_id for j in jobs] == [7, 7]
+    assert jobs[0].threads == 4
+    files = (
+        await db.execute(
+            select(File.file_type, File.path).where(File.job_id == jobs[0].id)
+        )
+    ).all()
+    assert len(files) == 601
+    assert (FileType.OUTPUT, "out.bam") in files
+
+
+async def _report(client: AsyncClient, headers: dict, event: str, record, context):
+    resp = await client.post(
+        "/api/v1/reports/",
+        json={"event": event, "record": record, "context": context},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    return resp.json()["context"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_reprojects_workflow_from_event_log(
+    client: AsyncClient, superuser_token_headers: dict, db
+):
+    headers = superuser_token_headers
+    workflow_id = str(uuid.uuid4())
+    context = await _report(
+        client,
+        headers,
+        "workflow_started",
+        {"workflow_id": workflow_id, "snakefile": "S", "rules": []},
+        {"flowo_project_name": "Rebuilt"},
+    )
+    context = await _report(client, headers, "job_started", {"job_ids": [1]}, context)
+    context = await _report(
+        client,
+        headers,
+        "job_info",
+        {
+            "job_id": 1,
+            "rule_name": "align",
+            "threads": 1,
+            "input": ["a.fq"],
+            "output": ["a.bam"],
+        },
+        context,
+    )
+    await _report(client, headers, "job_finished", {"job_id": 1}, context)
+    resp = await client.post(
+        "/api/v1/reports/close", params={"workflow_id": workflow_id}, headers=headers
+    )
+    assert resp.json()["status"] == "SUCCESS"
+
+    # Lose the projection, as a handler bug or schema change would.
+    await db.execute(delete(File))
+    await db.execute(delete(Job))
+    await db.commit()
+
+    resp = await client.post(
+        "/api/v1/reports/rebuild", json={"workflow_ids": [workflow_id]}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert resp.json()["events"] == 4
+    assert resp.json()["failed_events"] == 0
+
+    db.expunge_all()
+    workflow = await db.get(Workflow, uuid.UUID(workflow_id))
+    assert workflow.name == "Rebuilt"
+    assert workflow.status == Status.SUCCESS  # terminal state from /close is kept
+    job = (await db.execute(select(Job))).scalar_one()
+    assert job.status == Status.SUCCESS
+    started = await db.scalar(
+        select(WorkflowEvent.created_at).where(
+            WorkflowEvent.event_type == "job_started"
+        )
+    )
+    assert job.started_at == started  # event time, not rebuild time
+    paths = (await db.execute(select(File.path).order_by(File.path))).scalars().all()
+    assert paths == ["a.bam", "a.fq"]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_skips_deleted_workflows(
+    client: AsyncClient, superuser_token_headers: dict, db, TestingSessionLocal
+):
+    workflow_id = str(uuid.uuid4())
+    await _report(
+        client,
+        superuser_token_headers,
+        "workflow_started",
+        {"workflow_id": workflow_id, "snakefile": "S", "rules": []},
+        {},
+    )
+    # Deleted while its events stayed in the log
+    await db.execute(delete(Workflow).where(Workflow.id == uuid.UUID(workflow_id)))
+    await db.commit()
+
+    summary = await rebuild_projections(session_factory=TestingSessionLocal)
+
+    assert summary["skipped"] == [uuid.UUID(workflow_id)]
+    db.expunge_all()
+    assert await db.get(Workflow, uuid.UUID(workflow_id)) is None
+
+
+@pytest.mark.asyncio
+async def test_rebuild_failed_only_retries_failed_events(
+    client: AsyncClient,
+    superuser_token_headers: dict,
+    db,
+    TestingSessionLocal,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, "REPORTS_INGEST_MODE", "queued")
+    headers = superuser_token_headers
+    workflow_id = str(uuid.uuid4())
+    context = await _report(
+        client,
+        headers,
+        "workflow_started",
+        {"workflow_id": workflow_id, "snakefile": "S", "rules": []},
+        {},
+    )
+    await _report(client, headers, "run_info", {"stats": {"total": 3}}, context)
+
+    _, handler = event_registry._registry["run_info"]
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("handler bug")
+
+    with monkeypatch.context() as m:
+        m.setattr(handler, "handle", broken)
+        await event_projector.drain(TestingSessionLocal)
+
+    status = await db.scalar(
+        select(WorkflowEvent.status).where(WorkflowEvent.event_type == "run_info")
+    )
+    assert status == "failed"
+
+    resp = await client.post(
+        "/api/v1/reports/rebuild", json={"failed_only": True}, headers=headers
+    )
+    assert resp.status_code == 422  # every workflow is left to the CLI
+
+    resp = await client.post(
+        "/api/v1/reports/rebuild",
+        json={"workflow_ids": [workflow_id], "failed_only": True},
+        headers=headers,
+    )
+    assert resp.json()["events"] == 1
+    assert resp.json()["failed_events"] == 0
+
+    db.expunge_all()
+    workflow = await db.get(Workflow, uuid.UUID(workflow_id))
+    assert workflow.run_info == {"total": 3}
+    statuses = (await db.execute(select(WorkflowEvent.status))).scalars().all()
+    assert set(statuses) == {"processed"}
+
+
+@pytest.mark.asyncio
+async def test_repeated_event_ids_are_recorded_once(
+    client: AsyncClient, superuser_token_headers: dict, db
+):
+    headers = superuser_token_headers
+    stream_id = str(uuid.uuid4())
+    workflow_id = str(uuid.uuid4())
+
+    async def send(seq: int, event: str, record: dict, context: dict) -> dict:
+        resp = await client.post(
+            "/api/v1/reports/",
+            json={
+                "event": event,
+                "record": record,
+                "context": context,
+                "stream_id": stream_id,
+                "seq": seq,
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        return resp.json()["context"]
+
+    started = {"workflow_id": workflow_id, "snakefile": "S", "rules": []}
+    context = await send(1, "workflow_started", started, {})
+    # A retry carries the context the plugin had before the first answer.
+    assert await send(1, "workflow_started", started, {}) == context
+    assert context["current_workflow_id"] == workflow_id
+
+    await send(2, "job_started", {"job_ids": [1]}, context)
+    job_info = {
+        "job_id": 1,
+        "rule_name": "align",
+        "threads": 1,
+        "input": ["a.fq"],
+        "output": ["a.bam"],
+    }
+    for _ in range(3):
+        await send(3, "job_info", job_info, context)
+
+    events = (await db.execute(select(WorkflowEvent.event_type))).scalars().all()
+    assert sorted(events) == ["job_info", "job_started", "workflow_started"]
+    assert len((await db.execute(select(Job))).scalars().all()) == 1
+    assert len((await db.execute(select(File))).scalars().all()) == 2
+
+    # Events without an id keep being recorded as they come.
+    await _report(client, headers, "run_info", {"stats": {"total": 1}}, context)
+    await _report(client, headers, "run_info", {"stats": {"total": 1}}, context)
+    runs = await db.scalar(
+        select(func.count()).where(WorkflowEvent.event_type == "run_info")
+    )
+    assert runs == 2
+
+
+@pytest.mark.asyncio
+async def test_report_ingest_is_rate_limited_per_token(
+    client: AsyncClient, superuser_token_headers: dict, monkeypatch
+):
+    monkeypatch.setattr(settings, "REPORTS_RATE_LIMIT_PER_SECOND", 0.5)
+    monkeypatch.setattr(settings, "REPORTS_RATE_LIMIT_BURST", 2)
+    body = {"event": "run_info", "record": {"stats": {}}, "context": {}}
+
+    async def post(headers: dict):
+        return await client.post("/api/v1/reports/", json=body, headers=headers)
+
+    assert (await post(superuser_token_headers)).status_code == 200
+    assert (await post(superuser_token_headers)).status_code == 200
+    resp = await post(superuser_token_headers)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+    # Other tokens have their own bucket.
+    assert ingest_backpressure.check_rate("another-token") == 0
+
+    monkeypatch.setattr(settings, "REPORTS_RATE_LIMIT_PER_SECOND", 0)
+    monkeypatch.setattr(settings, "REPORTS_MAX_IN_FLIGHT", 1)
+    assert ingest_backpressure.enter()
+    try:
+        resp = await post(superuser_token_headers)
+    finally:
+        ingest_backpressure.exit()
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == "1"
+    assert (await post(superuser_token_headers)).status_code == 200
+
+    resp = await client.get("/api/v1/reports/metrics", headers=superuser_token_headers)
+    ingest = resp.json()["ingest"]
+    assert ingest["rate_limited_total"] >= 1
+    assert ingest["overloaded_total"] >= 1
+    assert ingest["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_ingest_is_refused_while_the_backlog_is_full(
+    client: AsyncClient, superuser_token_headers: dict, TestingSessionLocal, monkeypatch
+):
+    monkeypatch.setattr(settings, "REPORTS_INGEST_MODE", "queued")
+    monkeypatch.setattr(settings, "REPORTS_MAX_BACKLOG", 2)
+    monkeypatch.setattr(backpressure, "_BACKLOG_CHECK_SECONDS", 0)
+    body = {"event": "run_info", "record": {"stats": {}}, "context": {}}
+
+    async def post():
+        return await client.post(
+            "/api/v1/reports/", json=body, headers=superuser_token_headers
+        )
+
+    assert (await post()).status_code == 200
+    assert (await post()).status_code == 200
+    resp = await post()
+    assert resp.status_code == 429
+    assert resp.headers["Retry-After"] == str(backpressure.BACKLOG_RETRY_SECONDS)
+    assert ingest_backpressure.stats()["backlog"] == 2
+
+    assert await event_projector.drain(TestingSessionLocal) == 2
+    assert (await post()).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_stream_batches_cost_one_token_per_event(monkeypatch):
+    monkeypatch.setattr(settings, "REPORTS_RATE_LIMIT_PER_SECOND", 10.0)
+    monkeypatch.setattr(settings, "REPORTS_RATE_LIMIT_BURST", 4)
+    monkeypatch.setattr(settings, "REPORTS_MAX_IN_FLIGHT", 1)
+    before = ingest_backpressure.stats()
+
+    # A full bucket lets a batch larger than the burst through, in debt
+    await ingest_backpressure.acquire("streaming-token", cost=6)
+    assert ingest_backpressure.check_rate("streaming-token") >= 1
+
+    # The next batch waits for its tokens and the free slot, without counting
+    # as rejected
+    waiter = asyncio.create_task(ingest_backpressure.acquire("streaming-token"))
+    await asyncio.sleep(0.1)
+    assert not waiter.done()
+    ingest_backpressure.exit()
+    await asyncio.wait_for(waiter, 5)
+    ingest_backpressure.exit()
+    after = ingest_backpressure.stats()
+    assert after["in_flight"] == 0
+    assert after["rate_limited_total"] == before["rate_limited_total"] + 1
+    assert after["overloaded_total"] == before["overloaded_total"]
+
+
+@pytest.mark.asyncio
+async def test_report_stream_acknowledges_micro_batches(
+    client: AsyncClient, superuser_token_headers: dict, db, monkeypatch
+):
+    monkeypatch.setattr(settings, "REPORTS_STREAM_BATCH_SIZE", 2)
+    stream_id = str(uuid.uuid4())
+    workflow_id = str(uuid.uuid4())
+    lines = [
+        {
+            "event": "workflow_started",
+            "record": {"workflow_id": workflow_id, "snakefile": "S", "rules": []},
+            "seq": 1,
+            "context": {"dryrun": False, "flowo_project_name": "streamed"},
+        },
+        {"event": "job_started", "record": {"job_ids": [1]}, "seq": 2},
+        {
+            "event": "job_info",
+            "record": {
+                "job_id": 1,
+                "rule_name": "align",
+                "threads": 1,
+                "input": ["a.fq"],
+                "output": ["a.bam"],
+            },
+            "seq": 3,
+        },
+    ]
+    body = "".join(json.dumps(line) + "\n" for line in lines) + "not json\n"
+
+    async def stream() -> list[dict]:
+        resp = await client.post(
+            "/api/v1/reports/stream",
+            params={"stream_id": stream_id},
+            content=body.encode(),
+            headers={**superuser_token_headers, "Content-Type": "application/x-ndjson"},
+        )
+        assert resp.status_code == 200
+        return [json.loads(line) for line in resp.text.splitlines()]
+
+    acks = await stream()
+    assert [seq for ack in acks for seq in ack["seqs"]] == [1, 2, 3]
+    assert all(len(ack["seqs"]) <= 2 for ack in acks)
+    assert acks[-1]["context"]["current_workflow_id"] == workflow_id
+    assert [e["seq"] for ack in acks for e in ack["errors"]] == [None]
+
+    workflow = await db.get(Workflow, uuid.UUID(workflow_id))
+    assert workflow.name == "streamed"
+    assert len((await db.execute(select(Job))).scalars().all()) == 1
+
+    # Replaying the stream (e.g. after a dropped connection) records nothing twice.
+    assert [seq for ack in await stream() for seq in ack["seqs"]] == [1, 2, 3]
+    events = (await db.execute(select(WorkflowEvent.event_type))).scalars().all()
+    assert sorted(events) == ["job_info", "job_started", "workflow_started"]
+
+
+@pytest.mark.asyncio
+async def test_ingest_app_serves_only_reports(
+    client: AsyncClient, superuser_token_headers: dict, db
+):
+    def override_get_async_session():
+        yield db
+
+    ingest_app.dependency_overrides[get_async_session] = override_get_async_session
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=ingest_app), base_url="http://test"
+        ) as ingest:
+            workflow_id = str(uuid.uuid4())
+            context = await _report(
+                ingest,
+                superuser_token_headers,
+                "workflow_started",
+                {"workflow_id": workflow_id, "snakefile": "S", "rules": []},
+                {},
+            )
+            assert context["current_workflow_id"] == workflow_id
+            resp = await ingest.get(
+                "/api/v1/workflows/", headers=superuser_token_headers
+            )
+            assert resp.status_code == 404
+    finally:
+        ingest_app.dependency_overrides.clear()
+
+    assert await db.get(Workflow, uuid.UUID(workflow_id)) is not None
+
+
+@pytest.mark.asyncio
+async def test_job_error_stores_log_excerpt(
+    client: AsyncClient, superuser_token_headers: dict, db, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(path_resolver, "source_root", str(tmp_path))
+    monkeypatch.setattr(path_resolver, "current_root", str(tmp_path))
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "align.log").write_text(
+        "loading index\naligning a.fq\n[E::bwa_idx_load] fail to locate the index\n"
+    )
+    (tmp_path / "run.log").write_text(
+        "Error in rule other:\n    jobid: 2\n\n"
+        "Error in rule align:\n    jobid: 1\n    log: logs/align.log\n\nShutting down\n"
+    )
+    headers = superuser_token_headers
+    context = {"workdir": str(tmp_path), "logfile": str(tmp_path / "run.log")}
+    workflow_id = str(uuid.uuid4())
+    started = {"workflow_id": workflow_id, "snakefile": "S", "rules": []}
+    context = await _report(client, headers, "workflow_started", started, context)
+    context = await _report(client, headers, "job_started", {"job_ids": [1]}, context)
+    job_info = {
+        "job_id": 1,
+        "rule_name": "align",
+        "threads": 1,
+        "input": [],
+        "output": [],
+        "log": ["logs/align.log"],
+    }
+    context = await _report(client, headers, "job_info", job_info, context)
+    await _report(client, headers, "job_error", {"job_id": 1}, context)
+
+    job = await db.scalar(select(Job).where(Job.workflow_id == uuid.UUID(workflow_id)))
+    await db.refresh(job)
+    assert job.status == Status.ERROR
+    (log,) = job.error_excerpt["logs"]
+    assert log["path"] == "logs/align.log"
+    assert log["lines"] == [
+        {"line": 3, "text": "[E::bwa_idx_load] fail to locate the index"}
+    ]
+    assert [row["text"].strip() for row in job.error_excerpt["snakemake"]] == [
+        "Error in rule align:",
+        "jobid: 1",
+        "log: logs/align.log",
+    ]
+    assert job.error_excerpt["snakemake"][0]["line"] == 4
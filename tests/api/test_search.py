@@ -0,0 +1,83 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models import Catalog, Status, User, Workflow
+from app.services import search
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_runs_and_catalogs_the_user_can_read(
+    client: AsyncClient, db, register_user, login_user
+):
+    await register_user("search-user@example.com")
+    headers = await login_user("search-user@example.com")
+    await register_user("search-other@example.com")
+    user_id, other_id = [
+        await db.scalar(select(User.id).where(User.email == email))
+        for email in ("search-user@example.com", "search-other@example.com")
+    ]
+    for name, owner in [
+        ("rnaseq-align", user_id),
+        ("align", user_id),
+        ("bulk_align_v2", user_id),
+        ("align-other-user", other_id),
+        ("variant-calling", user_id),
+    ]:
+        db.add(
+            Workflow(
+                id=uuid.uuid4(),
+                name=name,
+                status=Status.SUCCESS,
+                dryrun=False,
+                user_id=owner,
+            )
+        )
+    db.add_all(
+        [
+            Catalog(slug="aligners", name="Aligners", is_public=True),
+            Catalog(
+                slug="rnaseq",
+                name="RNA-seq",
+                description="Align reads and count",
+                is_public=True,
+            ),
+            Catalog(slug="private", name="Align private", owner_id=other_id),
+        ]
+    )
+    await db.commit()
+
+    response = await client.get("/api/v1/search?q=ALIGN", headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    if not data["fuzzy"]:
+        # Exact name, then prefix, then substring matches (newest run first)
+        assert [(w["name"], w["score"]) for w in data["workflows"]] == [
+            ("align", 1.0),
+            ("bulk_align_v2", 0.5),
+            ("rnaseq-align", 0.5),
+        ]
+        assert [(c["slug"], c["score"]) for c in data["catalogs"]] == [
+            ("aligners", 0.75),
+            ("rnaseq", 0.375),
+        ]
+    else:
+        assert data["workflows"][0]["name"] == "align"
+        assert {c["slug"] for c in data["catalogs"]} == {"aligners", "rnaseq"}
+
+    # LIKE wildcards in the query are matched literally
+    response = await client.get("/api/v1/search?q=_align", headers=headers)
+    assert [w["name"] for w in response.json()["workflows"]] == ["bulk_align_v2"]
+
+
+def test_fuzzy_search_uses_trigram_operators():
+    match = search._matches(Workflow.name, "algn", fuzzy=True)
+    score = search._score(Workflow.name, "algn", fuzzy=True)
+    sql = str(select(score).where(match).compile(dialect=postgresql.dialect()))
+    assert "ILIKE" in sql
+    assert "<%" in sql
+    assert "word_similarity" in sql
@@ -1,12 +1,19 @@
+import asyncio
+import math
+import random
 import uuid
+from datetime import UTC, date, datetime, timedelta
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, update
 
+from app.models import Job, JobDailyRollup, JobDurationBucket, Rule, Status, Workflow
 from app.models.user import User
 from app.schemas.util import ServiceStatus, StatusSummary, SystemHealthResponse
+from app.services.job_rollups import fold_job_rollups
+from app.services.summary import SummaryService
 
 
 async def create_user_and_headers(
@@ -240,3 +247,194 @@ async def test_summary_health_returns_service_aggregate(
 
     assert response.status_code == 200
     assert response.json()["overall_status"] == "unhealthy"
+
+
+@pytest.mark.asyncio
+async def test_summary_reads_rollups_kept_by_jobs_trigger(db, register_user):
+    await register_user("rollup-user@example.com")
+    owner = await db.scalar(
+        select(User.id).where(User.email == "rollup-user@example.com")
+    )
+    workflow_id = uuid.uuid4()
+    day = datetime(2026, 3, 2, 23, 0, tzinfo=UTC)
+    db.add(Workflow(id=workflow_id, status=Status.SUCCESS, dryrun=False, user_id=owner))
+    align = Rule(name="align", workflow_id=workflow_id)
+    sort = Rule(name="sort", workflow_id=workflow_id)
+    db.add_all([align, sort])
+    await db.flush()
+    jobs = [
+        Job(
+            snakemake_id=i,
+            workflow_id=workflow_id,
+            rule_id=align.id,
+            status=Status.SUCCESS,
+            started_at=day,
+            end_time=day + timedelta(minutes=10 * (i + 1)),
+        )
+        for i in range(3)
+    ]
+    # Started on the next UTC day
+    failed = Job(
+        snakemake_id=3,
+        workflow_id=workflow_id,
+        rule_id=sort.id,
+        status=Status.RUNNING,
+        started_at=day + timedelta(hours=2),
+    )
+    db.add_all([*jobs, failed])
+    await db.commit()
+
+    failed.status = Status.ERROR
+    await db.delete(jobs[2])
+    await db.commit()
+
+    # Reads add the deltas not folded yet
+    summary = SummaryService(db)
+    unfolded = await summary.get_status("job", user_id=owner)
+    assert await fold_job_rollups(db, batch_size=2) == 7
+    assert await summary.get_status("job", user_id=owner) == unfolded
+
+    rollups = (
+        await db.execute(
+            select(
+                JobDailyRollup.day,
+                JobDailyRollup.rule_name,
+                JobDailyRollup.total,
+                JobDailyRollup.error,
+                JobDailyRollup.duration_sum,
+            )
+            .where(JobDailyRollup.total != 0)
+            .order_by(JobDailyRollup.day)
+        )
+    ).all()
+    assert rollups == [
+        (date(2026, 3, 2), "align", 2, 0, 1800.0),
+        (date(2026, 3, 3), "sort", 1, 1, 0.0),
+    ]
+    # The deleted job's duration left the sketch
+    assert await db.scalar(select(func.sum(JobDurationBucket.count))) == 2
+
+    status = await summary.get_status("job", user_id=owner)
+    assert (status.total, status.success, status.error) == (3, 2, 1)
+    assert await summary.get_status("job", user_id=uuid.uuid4()) == StatusSummary(
+        total=0, success=0, error=0, running=0
+    )
+    assert await summary.get_activity("rule", None, None) == {"align": 2}
+    # Ranges cover whole UTC days
+    next_day = datetime(2026, 3, 3, 12, 0, tzinfo=UTC)
+    assert await summary.get_rule_error(next_day, next_day) == {
+        "sort": {"total": 1, "error": 1}
+    }
+    assert await summary.get_rule_error(None, day) == {}
+    assert list(await summary.get_rule_duration(None, None)) == ["align"]
+
+
+@pytest.mark.asyncio
+async def test_rollup_deltas_lock_nothing_and_follow_the_stored_row(
+    db, TestingSessionLocal, register_user
+):
+    await register_user("relinked@example.com")
+    other = await db.scalar(select(User.id).where(User.email == "relinked@example.com"))
+    day = datetime(2026, 3, 2, 12, 0, tzinfo=UTC)
+    runs = [uuid.uuid4(), uuid.uuid4()]
+    rule_ids = []
+    for workflow_id in runs:
+        db.add(Workflow(id=workflow_id, status=Status.RUNNING, dryrun=False))
+        rule = Rule(name="align", workflow_id=workflow_id)
+        db.add(rule)
+        await db.flush()
+        rule_ids.append(rule.id)
+    db.add(
+        Job(
+            snakemake_id=0,
+            workflow_id=runs[0],
+            rule_id=rule_ids[0],
+            status=Status.SUCCESS,
+            started_at=day,
+            end_time=day + timedelta(minutes=1),
+        )
+    )
+    await db.commit()
+    await fold_job_rollups(db)
+
+    # Both runs count in the same rollup row, each from an open transaction
+    async with TestingSessionLocal() as first, TestingSessionLocal() as second:
+        for n, session in enumerate((first, second)):
+            session.add(
+                Job(
+                    snakemake_id=n + 1,
+                    workflow_id=runs[n],
+                    rule_id=rule_ids[n],
+                    status=Status.RUNNING,
+                    started_at=day,
+                )
+            )
+            await asyncio.wait_for(session.flush(), 5)
+        await second.commit()
+        await first.commit()
+
+    # A run relinked to another owner: its jobs leave the row they were counted in
+    await db.execute(
+        update(Workflow).where(Workflow.id == runs[0]).values(user_id=other)
+    )
+    await db.execute(delete(Job).where(Job.workflow_id == runs[0]))
+    await db.commit()
+
+    assert await SummaryService(db).get_status("job") == StatusSummary(
+        total=1, success=0, error=0, running=1
+    )
+    await fold_job_rollups(db)
+    rollups = (
+        await db.execute(
+            select(JobDailyRollup.user_id, JobDailyRollup.total, JobDailyRollup.running)
+        )
+    ).all()
+    assert rollups == [(None, 1, 1)]
+    assert await db.scalar(select(func.sum(JobDurationBucket.count))) == 0
+
+
+@pytest.mark.asyncio
+async def test_rule_duration_sketches_match_exact_percentiles(db):
+    rng = random.Random(3)
+    workflow_id = uuid.uuid4()
+    db.add(Workflow(id=workflow_id, status=Status.SUCCESS, dryrun=False))
+    rule = Rule(name="align", workflow_id=workflow_id)
+    db.add(rule)
+    await db.flush()
+    start = datetime(2026, 3, 1, tzinfo=UTC)
+    durations = []
+    for i in range(401):
+        seconds = round(rng.lognormvariate(math.log(600), 1.0), 3)
+        durations.append(seconds)
+        started_at = start + timedelta(hours=7 * i)
+        db.add(
+            Job(
+                snakemake_id=i,
+                workflow_id=workflow_id,
+                rule_id=rule.id,
+                status=Status.SUCCESS,
+                started_at=started_at,
+                end_time=started_at + timedelta(seconds=seconds),
+            )
+        )
+    await db.commit()
+
+    durations.sort()
+    q1, median, q3 = durations[100], durations[200], durations[300]
+    iqr = q3 - q1
+    exact = {
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "max": min(durations[-1], q3 + 1.5 * iqr),
+        "min": max(durations[0], q1 - 1.5 * iqr),
+    }
+
+    result = await SummaryService(db).get_rule_duration(None, None)
+
+    assert list(result) == ["align"]
+    for key, seconds in exact.items():
+        # 1% on a duration moves log(minutes + 1) by under 0.01, plus rounding;
+        # the whiskers add up the errors of q1 and q3.
+        tolerance = 0.02 if key in ("q1", "median", "q3") else 0.05
+        assert abs(result["align"][key] - math.log(seconds / 60 + 1)) <= tolerance
@@ -0,0 +1,102 @@
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User, WorkflowEvent
+from app.services.reports.partitions import (
+    apply_retention,
+    create_month_partition,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+)
+
+NOW = datetime(2026, 5, 14, tzinfo=UTC)
+
+
+async def _event(db: AsyncSession, created_at: datetime) -> WorkflowEvent:
+    user = await db.scalar(select(User).limit(1))
+    if user is None:
+        user = User(
+            id=uuid.uuid4(),
+            email="partitions@example.com",
+            hashed_password="hashed",
+            is_active=True,
+            is_superuser=False,
+            is_verified=True,
+        )
+        db.add(user)
+    event = WorkflowEvent(
+        workflow_id=uuid.uuid4(),
+        user_id=user.id,
+        event_type="run_info",
+        payload_json={},
+        context_json={},
+        created_at=created_at,
+    )
+    db.add(event)
+    await db.flush()
+    return event
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_months_ahead(db: AsyncSession):
+    assert await is_partitioned(db)
+
+    created = await ensure_partitions(db, months_ahead=2, now=NOW)
+    assert created == [
+        "workflow_events_p202605",
+        "workflow_events_p202606",
+        "workflow_events_p202607",
+    ]
+    # Idempotent
+    assert await ensure_partitions(db, months_ahead=2, now=NOW) == []
+
+    partitions = {p.name: p for p in await list_partitions(db)}
+    assert partitions["workflow_events_default"].is_default
+    june = partitions["workflow_events_p202606"]
+    assert (june.lower, june.upper) == (
+        datetime(2026, 6, 1, tzinfo=UTC),
+        datetime(2026, 7, 1, tzinfo=UTC),
+    )
+
+    event = await _event(db, datetime(2026, 6, 3, tzinfo=UTC))
+    where = await db.scalar(
+        text("SELECT tableoid::regclass::text FROM workflow_events WHERE id = :id"),
+        {"id": event.id},
+    )
+    assert where == "workflow_events_p202606"
+
+
+@pytest.mark.asyncio
+async def test_retention_drops_expired_months(db: AsyncSession):
+    await create_month_partition(db, datetime(2026, 1, 1, tzinfo=UTC))
+    await ensure_partitions(db, months_ahead=0, now=NOW)
+    await _event(db, datetime(2026, 1, 20, tzinfo=UTC))
+    await _event(db, datetime(2026, 5, 2, tzinfo=UTC))
+
+    assert await apply_retention(db, retention_months=None, now=NOW) == []
+    removed = await apply_retention(db, retention_months=3, mode="drop", now=NOW)
+
+    assert removed == ["workflow_events_p202601"]
+    assert await db.scalar(select(func.count()).select_from(WorkflowEvent)) == 1
+    names = {p.name for p in await list_partitions(db)}
+    assert "workflow_events_p202601" not in names
+    assert "workflow_events_p202605" in names
+
+
+@pytest.mark.asyncio
+async def test_retention_detach_keeps_table(db: AsyncSession):
+    await create_month_partition(db, datetime(2025, 12, 1, tzinfo=UTC))
+    await _event(db, datetime(2025, 12, 24, tzinfo=UTC))
+
+    removed = await apply_retention(db, retention_months=1, mode="detach", now=NOW)
+
+    assert removed == ["workflow_events_p202512"]
+    assert await db.scalar(select(func.count()).select_from(WorkflowEvent)) == 0
+    archived = await db.scalar(text("SELECT count(*) FROM workflow_events_p202512"))
+    assert archived == 1
+    await db.execute(text("DROP TABLE workflow_events_p202512"))
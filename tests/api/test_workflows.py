@@ -1,9 +1,31 @@
 import uuid
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import delete, func, select, update
 
-from app.models import Status, Workflow
+from app.core.config import settings
+from app.models import (
+    Error,
+    File,
+    Job,
+    JobDailyRollup,
+    Rule,
+    RuleJobCounts,
+    Status,
+    User,
+    Workflow,
+    WorkflowArchive,
+    WorkflowEvent,
+    WorkflowEventKey,
+    WorkflowJobCounts,
+)
+from app.models.enums import FileType
+from app.services.archive import archive_workflow
+from app.services.job_rollups import fold_job_rollups
+from app.services.summary import SummaryService
+from app.services.workflow import WorkflowService
 
 
 @pytest.mark.asyncio
@@ -134,3 +156,367 @@ async def test_workflow_endpoints(
         )
         assert resp_by_name.status_code == 200
         assert resp_by_name.json() == str(wf_id)
+
+
+@pytest.mark.asyncio
+async def test_job_counters_follow_job_writes(
+    client: AsyncClient, superuser_token_headers: dict, db
+):
+    wf_id = uuid.uuid4()
+    db.add(
+        Workflow(
+            id=wf_id,
+            name="Counted",
+            status=Status.RUNNING,
+            dryrun=False,
+            run_info={"total": 4, "align": 3, "sort": 1},
+        )
+    )
+    align = Rule(name="align", workflow_id=wf_id)
+    sort = Rule(name="sort", workflow_id=wf_id)
+    db.add_all([align, sort])
+    await db.flush()
+    jobs = [
+        Job(snakemake_id=i, workflow_id=wf_id, rule_id=align.id, status=Status.RUNNING)
+        for i in range(3)
+    ]
+    jobs.append(
+        Job(snakemake_id=3, workflow_id=wf_id, rule_id=sort.id, status=Status.WAITING)
+    )
+    db.add_all(jobs)
+    await db.commit()
+
+    jobs[0].status = Status.SUCCESS
+    jobs[1].status = Status.ERROR
+    jobs[3].status = Status.RUNNING
+    await db.commit()
+    # Bulk statements are counted too
+    await db.execute(
+        update(Job).where(Job.id == jobs[3].id).values(status=Status.SUCCESS)
+    )
+    await db.execute(delete(Job).where(Job.id == jobs[1].id))
+    await db.commit()
+
+    counts = await db.get(WorkflowJobCounts, wf_id, populate_existing=True)
+    assert (counts.success, counts.running, counts.error) == (2, 1, 0)
+    rule_counts = {
+        c.rule_id: (c.success, c.running, c.error)
+        for c in await db.scalars(
+            select(RuleJobCounts).where(RuleJobCounts.workflow_id == wf_id)
+        )
+    }
+    assert rule_counts == {align.id: (1, 1, 0), sort.id: (1, 0, 0)}
+
+    resp = await client.get(
+        f"/api/v1/workflows/{wf_id}/progress", headers=superuser_token_headers
+    )
+    assert resp.json() == {"completed": 2, "running": 1, "progress": 50.0}
+
+    resp = await client.get(
+        f"/api/v1/workflows/{wf_id}/rule_status", headers=superuser_token_headers
+    )
+    assert resp.json()["align"] == {
+        "success": "1",
+        "running": "1",
+        "error": "0",
+        "total": "3",
+        "status": "RUNNING",
+    }
+    assert resp.json()["sort"]["status"] == "SUCCESS"
+
+    resp = await client.get("/api/v1/workflows/", headers=superuser_token_headers)
+    listed = next(w for w in resp.json()["workflows"] if w["id"] == str(wf_id))
+    assert (listed["completed_jobs"], listed["total_jobs"], listed["progress"]) == (
+        2,
+        4,
+        50,
+    )
+
+
+@pytest.mark.asyncio
+async def test_jobs_and_workflows_page_by_cursor(
+    client: AsyncClient, superuser_token_headers: dict, db
+):
+    wf_id = uuid.uuid4()
+    db.add(Workflow(id=wf_id, name="Paged", status=Status.RUNNING, dryrun=False))
+    rule = Rule(name="align", workflow_id=wf_id)
+    db.add(rule)
+    await db.flush()
+    statuses = [Status.SUCCESS, Status.ERROR, Status.WAITING, Status.RUNNING]
+    db.add_all(
+        Job(snakemake_id=i, workflow_id=wf_id, rule_id=rule.id, status=statuses[i % 4])
+        for i in range(11)
+    )
+    for _ in range(4):
+        db.add(Workflow(id=uuid.uuid4(), status=Status.SUCCESS, dryrun=False))
+    await db.commit()
+
+    async def pages(url: str, items: str) -> list[list[str]]:
+        result, cursor = [], None
+        while True:
+            params = {"limit": 4} | ({"cursor": cursor} if cursor else {})
+            resp = await client.get(url, params=params, headers=superuser_token_headers)
+            assert resp.status_code == 200, resp.text
+            body = resp.json()
+            result.append([str(item["id"]) for item in body[items]])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return result
+
+    jobs_url = f"/api/v1/workflows/{wf_id}/jobs"
+    everything = await client.get(
+        jobs_url, params={"limit": 100}, headers=superuser_token_headers
+    )
+    all_jobs = [str(j["id"]) for j in everything.json()["jobs"]]
+    assert everything.json()["next_cursor"] is None
+    # Failed jobs first, then running, finished and waiting ones
+    assert [j["status"] for j in everything.json()["jobs"]][:3] == ["ERROR"] * 3
+
+    job_pages = await pages(jobs_url, "jobs")
+    assert [len(p) for p in job_pages] == [4, 4, 3]
+    assert sum(job_pages, []) == all_jobs
+
+    everything = await client.get(
+        "/api/v1/workflows/", params={"limit": 100}, headers=superuser_token_headers
+    )
+    all_workflows = [str(w["id"]) for w in everything.json()["workflows"]]
+    assert sum(await pages("/api/v1/workflows/", "workflows"), []) == all_workflows
+
+    resp = await client.get(
+        jobs_url, params={"cursor": "not-a-cursor"}, headers=superuser_token_headers
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_totals_from_counters_estimates_and_cache(
+    client: AsyncClient, superuser_token_headers: dict, db, monkeypatch
+):
+    wf_id = uuid.uuid4()
+    db.add(Workflow(id=wf_id, name="Totals", status=Status.RUNNING, dryrun=False))
+    align, sort = (
+        Rule(name="align", workflow_id=wf_id),
+        Rule(name="sort", workflow_id=wf_id),
+    )
+    db.add_all([align, sort])
+    await db.flush()
+    db.add_all(
+        Job(
+            snakemake_id=i,
+            workflow_id=wf_id,
+            rule_id=(align if i < 5 else sort).id,
+            status=Status.SUCCESS if i % 2 else Status.WAITING,
+        )
+        for i in range(7)
+    )
+    await db.commit()
+
+    jobs_url = f"/api/v1/workflows/{wf_id}/jobs"
+
+    async def total(url: str, **params) -> tuple[int, bool]:
+        resp = await client.get(url, params=params, headers=superuser_token_headers)
+        assert resp.status_code == 200, resp.text
+        return resp.json()["total"], resp.json()["approximate"]
+
+    # Status and rule filters are answered by the counters
+    assert await total(jobs_url) == (7, False)
+    assert await total(jobs_url, status="SUCCESS") == (3, False)
+    assert await total(jobs_url, rule_name="align") == (5, False)
+    assert await total(jobs_url, rule_name="sort", status="SUCCESS") == (1, False)
+    # Other statuses are counted, and the count is reused for a while
+    assert await total(jobs_url, status="WAITING") == (4, False)
+    await db.execute(
+        update(Job).where(Job.workflow_id == wf_id).values(status=Status.WAITING)
+    )
+    await db.commit()
+    assert await total(jobs_url, status="WAITING") == (4, False)
+    assert await total(jobs_url, status="SUCCESS") == (0, False)
+
+    # Large lists report the planner's estimate instead of counting
+    monkeypatch.setattr(settings, "LIST_COUNT_ESTIMATE_THRESHOLD", 1)
+    estimate, approximate = await total("/api/v1/workflows/", name="Totals")
+    assert approximate is True
+    assert estimate >= 1
+    # Filters are bound parameters, not SQL text: a colon is just a character
+    assert (await total("/api/v1/workflows/", name="Totals :bar"))[0] >= 0
+    monkeypatch.setattr(settings, "LIST_COUNT_ESTIMATE_THRESHOLD", 0)
+    assert await total("/api/v1/workflows/", name="Totals :bar") == (0, False)
+
+
+@pytest.mark.asyncio
+async def test_tag_filters_and_statistics_run_in_sql(
+    client: AsyncClient, superuser_token_headers: dict, db
+):
+    tagged = {
+        "rnaseq-1": ["human", "rnaseq"],
+        "rnaseq-2": ["human", "rnaseq", "qc"],
+        "wgs": ["human", "wgs"],
+        "untagged": None,
+    }
+    for name, tags in tagged.items():
+        db.add(
+            Workflow(
+                id=uuid.uuid4(),
+                name=name,
+                status=Status.SUCCESS,
+                dryrun=False,
+                tags=tags,
+                run_info={"total": 1},
+            )
+        )
+    await db.commit()
+
+    response = await client.get(
+        "/api/v1/workflows/?tags=rnaseq, human", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert {w["name"] for w in response.json()["workflows"]} == {
+        "rnaseq-1",
+        "rnaseq-2",
+    }
+
+    response = await client.get("/api/v1/utils/tags", headers=superuser_token_headers)
+    assert response.json() == ["human", "qc", "rnaseq", "wgs"]
+
+    activity = await SummaryService(db).get_activity("tag", None, None, limit=2)
+    assert activity == {"human": 3, "rnaseq": 2}
+
+
+async def _run_with_jobs(
+    db, name: str, *, days_ago: int, status: Status, tags=None, jobs: int = 3
+) -> uuid.UUID:
+    workflow_id = uuid.uuid4()
+    started_at = datetime.now(UTC) - timedelta(days=days_ago)
+    db.add(
+        Workflow(
+            id=workflow_id,
+            name=name,
+            status=status,
+            dryrun=False,
+            tags=tags,
+            started_at=started_at,
+            end_time=started_at + timedelta(hours=1),
+        )
+    )
+    rule = Rule(name="align", workflow_id=workflow_id)
+    db.add(rule)
+    await db.flush()
+    for i in range(jobs):
+        job = Job(
+            snakemake_id=i,
+            workflow_id=workflow_id,
+            rule_id=rule.id,
+            status=Status.RUNNING,
+            started_at=started_at,
+        )
+        job.files = [File(path=f"out/{i}.bam", file_type=FileType.OUTPUT)]
+        db.add(job)
+    db.add(Error(exception="boom", rule_id=rule.id, workflow_id=workflow_id))
+    await db.commit()
+    return workflow_id
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_runs_in_batches(
+    client: AsyncClient, superuser_token_headers: dict, db, monkeypatch
+):
+    monkeypatch.setattr(settings, "DELETE_BATCH_SIZE", 2)
+    doomed = [
+        await _run_with_jobs(
+            db, f"old-{i}", days_ago=40, status=Status.ERROR, tags=["tmp"]
+        )
+        for i in range(3)
+    ]
+    # Archived runs are deleted with their archives; their jobs still count
+    await archive_workflow(db, doomed[0])
+    await db.commit()
+    kept = {
+        await _run_with_jobs(db, "recent", days_ago=1, status=Status.ERROR),
+        await _run_with_jobs(db, "old-success", days_ago=40, status=Status.SUCCESS),
+        await _run_with_jobs(db, "old-untagged", days_ago=40, status=Status.ERROR),
+    }
+    # Raw report events and their client ids go with the runs
+    owner = await db.scalar(select(User.id).where(User.is_superuser))
+    stream_id = uuid.uuid4()
+    for seq, workflow_id in enumerate([*doomed[1:], *kept] * 3):
+        event = WorkflowEvent(
+            id=uuid.uuid4(),
+            workflow_id=workflow_id,
+            user_id=owner,
+            event_type="job_started",
+            payload_json={},
+            context_json={},
+        )
+        db.add(event)
+        db.add(
+            WorkflowEventKey(
+                stream_id=stream_id,
+                seq=seq,
+                user_id=owner,
+                event_id=event.id,
+            )
+        )
+    await db.commit()
+
+    response = await client.delete(
+        "/api/v1/workflows/", headers=superuser_token_headers
+    )
+    assert response.status_code == 400
+
+    response = await client.delete(
+        "/api/v1/workflows/",
+        params={"older_than_days": 30, "status": "ERROR", "tags": "tmp"},
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"workflows": 3, "jobs": 9}
+
+    assert set(await db.scalars(select(Workflow.id))) == kept
+    assert await db.scalar(select(func.count()).select_from(Job)) == 9
+    assert await db.scalar(select(func.count()).select_from(File)) == 9
+    assert await db.scalar(select(func.count()).select_from(Rule)) == 3
+    assert await db.scalar(select(func.count()).select_from(Error)) == 3
+    assert await db.scalar(select(func.count()).select_from(WorkflowArchive)) == 0
+    assert set(await db.scalars(select(WorkflowEvent.workflow_id))) == kept
+    assert await db.scalar(select(func.count()).select_from(WorkflowEventKey)) == 9
+    # The jobs triggers took the deleted jobs out of the counters and rollups
+    assert await db.scalar(select(func.sum(WorkflowJobCounts.total))) == 9
+    await fold_job_rollups(db)
+    assert await db.scalar(select(func.sum(JobDailyRollup.total))) == 9
+
+
+@pytest.mark.asyncio
+async def test_pruning_is_set_based(db, monkeypatch):
+    monkeypatch.setattr(settings, "DELETE_BATCH_SIZE", 2)
+    empty = uuid.uuid4()
+    db.add(
+        Workflow(
+            id=empty,
+            status=Status.ERROR,
+            dryrun=False,
+            started_at=datetime.now(UTC) - timedelta(hours=1),
+        )
+    )
+    db.add(Error(exception="boom", workflow_id=empty))
+    failed = await _run_with_jobs(db, "failed", days_ago=1, status=Status.ERROR)
+    done = await _run_with_jobs(db, "done", days_ago=1, status=Status.SUCCESS)
+    running = await _run_with_jobs(db, "running", days_ago=0, status=Status.RUNNING)
+
+    result = await WorkflowService(db).pruning(user_id=None)
+
+    assert result == {"workflow": 1, "job": 6}
+    assert await db.get(Workflow, empty) is None
+    statuses = dict(
+        (
+            await db.execute(
+                select(Job.workflow_id, func.array_agg(Job.status.distinct())).group_by(
+                    Job.workflow_id
+                )
+            )
+        ).all()
+    )
+    assert statuses == {
+        failed: [Status.ERROR],
+        done: [Status.SUCCESS],
+        running: [Status.RUNNING],
+    }
@@ -0,0 +1,75 @@
+"""Report handler throughput (events/s). Opt-in: ``FLOWO_BENCHMARK=1 pytest tests/benchmarks``.
+
+Each event is dispatched in its own savepoint, like ``project_event`` does, so the
+ORM work a handler defers is flushed and counted with that event. The raw event
+insert and the per-request commit are left out: they cost the same for every
+handler implementation and would hide the difference.
+"""
+
+import os
+import time
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models import File
+from app.services.reports.dispatch.registry import event_registry
+
+pytestmark = pytest.mark.skipif(
+    not os.getenv("FLOWO_BENCHMARK"), reason="set FLOWO_BENCHMARK=1 to run"
+)
+
+JOBS = 300
+JOBS_PER_STARTED = 10
+FILES_PER_KIND = 20
+
+
+def _job_info(job_id: int) -> dict:
+    return {
+        "job_id": job_id,
+        "rule_name": f"rule_{job_id % 7}",
+        "threads": 1,
+        "rule_msg": None,
+        "reason": "missing output",
+        "shellcmd": "true",
+        "priority": 0,
+        "input": [f"in/{job_id}/{i}.txt" for i in range(FILES_PER_KIND)],
+        "output": [f"out/{job_id}/{i}.txt" for i in range(FILES_PER_KIND)],
+        "log": [f"logs/{job_id}.log"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_handler_throughput(db):
+    context: dict = {"flowo_user": "bench@example.com"}
+
+    async def project(name: str, record: dict) -> None:
+        async with db.begin_nested():
+            await event_registry.dispatch(name, record, db, context)
+
+    await project(
+        "workflow_started",
+        {"workflow_id": str(uuid.uuid4()), "snakefile": "Snakefile", "rules": []},
+    )
+
+    events: list[tuple[str, dict]] = []
+    for first in range(1, JOBS + 1, JOBS_PER_STARTED):
+        ids = list(range(first, first + JOBS_PER_STARTED))
+        events.append(("job_started", {"job_ids": ids}))
+        events.extend(("job_info", _job_info(j)) for j in ids)
+        events.append(("group_info", {"group_id": first, "jobs": ids}))
+        events.extend(("job_finished", {"job_id": j}) for j in ids)
+
+    started = time.perf_counter()
+    for name, record in events:
+        await project(name, record)
+    await db.commit()
+    elapsed = time.perf_counter() - started
+
+    files = await db.scalar(select(func.count()).select_from(File))
+    assert files == JOBS * (2 * FILES_PER_KIND + 1)
+    print(
+        f"\n{len(events)} events in {elapsed:.2f}s: "
+        f"{len(events) / elapsed:.0f} events/s ({files} files)"
+    )
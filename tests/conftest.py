@@ -23,6 +23,10 @@ from app.core.config import settings
 from app.core.session import get_db
 from app.main import app as fastapi_app
 from app.models.base import Base
+from app.services.list_counts import count_cache
+from app.services.reports import ingest_backpressure
+from app.services.reports.state_cache import workflow_state_cache
+from app.services.system_settings import system_settings_cache
 
 # Use a separate database for testing
 TEST_POSTGRES_PORT = os.getenv("TEST_POSTGRES_PORT", "5555")
@@ -40,10 +44,11 @@ TEST_SYNC_SQLALCHEMY_DATABASE_URI = (
 
 
 @pytest.fixture
-def engine():
+async def engine():
     """Provides a fresh async engine for each test."""
     engine = create_async_engine(TEST_ASYNC_SQLALCHEMY_DATABASE_URI, echo=False)
     yield engine
+    await engine.dispose()
 
 
 @pytest.fixture
@@ -51,6 +56,7 @@ def sync_engine():
     """Provides a fresh sync engine for each test."""
     engine = create_engine(TEST_SYNC_SQLALCHEMY_DATABASE_URI, echo=False)
     yield engine
+    engine.dispose()
 
 
 @pytest.fixture
@@ -77,6 +83,11 @@ def SyncTestingSessionLocal(sync_engine):
 @pytest.fixture(autouse=True)
 async def setup_db(engine):
     """Initializes the test database for each test (function scope)."""
+    # Cached rule/job ids would point at rows of the previous test's tables.
+    workflow_state_cache.clear()
+    system_settings_cache.invalidate()
+    ingest_backpressure.reset()
+    count_cache.clear()
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
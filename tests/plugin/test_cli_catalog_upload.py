@@ -0,0 +1,102 @@
+"""``flowo catalog upload`` — chunked, resumable upload protocol."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import httpx
+
+from snakemake_logger_plugin_flowo.plugin.client import cli
+
+
+def _make_catalog(root: Path) -> Path:
+    catalog = root / "demo"
+    (catalog / "workflow").mkdir(parents=True)
+    (catalog / "workflow" / "Snakefile").write_text("rule all:\n    input: []\n")
+    (catalog / "data.bin").write_bytes(os.urandom(200 * 1024))
+    (catalog / ".flowo.json").write_text('{"slug": "demo"}')
+    return catalog
+
+
+class _FakeServer:
+    """In-memory stand-in for the ``/catalog/uploads`` endpoints."""
+
+    def __init__(self, acked: dict[int, bytes] | None = None, fail_once=()):
+        self.chunks: dict[int, bytes] = dict(acked or {})
+        self.put_indexes: list[int] = []
+        self.fail_once = set(fail_once)
+        self.committed: bytes | None = None
+
+    def get(self, url: str, headers=None):
+        assert url.endswith("/uploads/saved-id")
+        return httpx.Response(
+            200,
+            json={
+                "chunks": [
+                    {"index": i, "sha256": hashlib.sha256(d).hexdigest()}
+                    for i, d in self.chunks.items()
+                ]
+            },
+        )
+
+    def post(self, url: str, headers=None, json=None):
+        if url.endswith("/uploads"):
+            return httpx.Response(201, json={"upload_id": "new-id"})
+        assert url.endswith("/commit")
+        data = b"".join(self.chunks[i] for i in range(json["total_chunks"]))
+        assert hashlib.sha256(data).hexdigest() == json["sha256"]
+        self.committed = data
+        return httpx.Response(200, json={"status": "completed", "summary": {}})
+
+    def put(self, url: str, headers=None, content=None):
+        index = int(url.rsplit("/", 1)[1])
+        assert hashlib.sha256(content).hexdigest() == headers["X-Chunk-Sha256"]
+        if index in self.fail_once:
+            self.fail_once.discard(index)
+            raise httpx.ConnectError("connection reset")
+        self.put_indexes.append(index)
+        self.chunks[index] = content
+        return httpx.Response(200, json={"index": index})
+
+
+def test_chunked_upload_streams_zip_in_chunks(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    monkeypatch.setattr(cli.time, "sleep", lambda _s: None)
+    catalog = _make_catalog(tmp_path)
+    server = _FakeServer(fail_once={1})
+
+    result = cli.upload_catalog_chunked(
+        server, "https://flowo.test", {}, catalog, "demo", chunk_size=16 * 1024
+    )
+
+    assert result["status"] == "completed"
+    assert len(server.chunks) > 1
+    assert 1 in server.put_indexes  # retried after the transient network error
+    names = zipfile.ZipFile(io.BytesIO(server.committed)).namelist()
+    assert sorted(names) == [".flowo.json", "data.bin", "workflow/Snakefile"]
+    assert not (tmp_path / "home/.cache/flowo/uploads/demo.json").exists()
+
+
+def test_chunked_upload_resumes_and_skips_acknowledged_chunks(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path / "home")
+    catalog = _make_catalog(tmp_path)
+
+    first = _FakeServer()
+    cli.upload_catalog_chunked(
+        first, "https://flowo.test", {}, catalog, "demo", chunk_size=16 * 1024
+    )
+    total = len(first.chunks)
+
+    # Pretend the previous run died after the first two chunks were acknowledged.
+    cli._save_upload_state("demo", "https://flowo.test", "zip", "saved-id")
+    resumed = _FakeServer(acked={0: first.chunks[0], 1: first.chunks[1]})
+    cli.upload_catalog_chunked(
+        resumed, "https://flowo.test", {}, catalog, "demo", chunk_size=16 * 1024
+    )
+
+    assert sorted(resumed.put_indexes) == list(range(2, total))
+    assert resumed.committed == first.committed
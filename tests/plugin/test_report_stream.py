@@ -0,0 +1,180 @@
+"""Logger plugin event stream (``POST /reports/stream``) and its per-event fallback."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+import httpx
+
+from snakemake_logger_plugin_flowo.plugin.client.report_stream import ReportStream
+
+
+def _line(seq: int, **context) -> dict:
+    return {
+        "event": "job_started",
+        "record": {"job_ids": [seq]},
+        "seq": seq,
+        "context": context,
+    }
+
+
+def _stream(handler, contexts: list, fallback: list, **kwargs) -> ReportStream:
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return ReportStream(
+        client,
+        "http://flowo.test/api/v1/reports/stream",
+        "stream-1",
+        on_context=contexts.append,
+        fallback=fallback.append,
+        **kwargs,
+    )
+
+
+def test_stream_sends_context_changes_and_falls_back_for_unacked_lines():
+    received: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.params["stream_id"] == "stream-1"
+        received.extend(json.loads(line) for line in request.read().splitlines())
+        acks = [
+            {"seqs": [1, 2], "context": {"current_workflow_id": "wf"}, "errors": []},
+        ]
+        return httpx.Response(200, text="".join(json.dumps(a) + "\n" for a in acks))
+
+    contexts: list[dict] = []
+    fallback: list[dict] = []
+    stream = _stream(handler, contexts, fallback)
+    stream.send(_line(1, dryrun=False, workdir="/w"))
+    stream.send(_line(2, dryrun=False, workdir="/w"))
+    stream.send(_line(3, dryrun=False, workdir="/w", configfiles=["c.yaml"]))
+    stream.close()
+
+    assert [r["seq"] for r in received] == [1, 2, 3]
+    assert received[0]["context"] == {"dryrun": False, "workdir": "/w"}
+    assert "context" not in received[1]
+    assert received[2]["context"] == {"configfiles": ["c.yaml"]}
+    assert contexts == [{"current_workflow_id": "wf"}]
+    # Not acknowledged: posted on its own, with the same seq.
+    assert [line["seq"] for line in fallback] == [3]
+
+
+def test_lines_queued_before_an_ack_carry_the_acked_context():
+    requests: list[list[dict]] = []
+    started = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        lines = [json.loads(line) for line in request.read().splitlines()]
+        requests.append(lines)
+        if len(requests) == 1:
+            # Later events are queued while the run is still being created
+            started.wait(5)
+        context = {"current_workflow_id": "wf", "jobs": {"1": 10}}
+        acks = [{"seqs": [line["seq"] for line in lines], "context": context}]
+        return httpx.Response(200, text="".join(json.dumps(a) + "\n" for a in acks))
+
+    contexts: list[dict] = []
+    fallback: list[dict] = []
+    stream = _stream(handler, contexts, fallback, max_events=1)
+    unknown = {"current_workflow_id": None, "jobs": {}, "workdir": "/w"}
+    stream.send(_line(1, **unknown))
+    stream.send(_line(2, **unknown))
+    stream.send(_line(3, **unknown))
+    started.set()
+    stream.close()
+
+    assert [[line["seq"] for line in lines] for lines in requests] == [[1], [2], [3]]
+    assert requests[0][0]["context"] == unknown
+    for lines in requests[1:]:
+        assert lines[0]["context"] == {
+            "current_workflow_id": "wf",
+            "jobs": {"1": 10},
+            "workdir": "/w",
+        }
+    assert fallback == []
+
+
+def test_stream_falls_back_to_posting_when_endpoint_is_missing():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        calls.append(request.url.path)
+        return httpx.Response(404, json={"detail": "Not Found"})
+
+    fallback: list[dict] = []
+    stream = _stream(handler, [], fallback, idle_seconds=0.01)
+    stream.send(_line(1))
+    deadline = time.monotonic() + 5
+    while not fallback and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Later events skip the stream and are posted one by one.
+    stream.send(_line(2))
+    stream.close()
+
+    assert [line["seq"] for line in fallback] == [1, 2]
+    assert len(calls) == 1
+
+
+def test_events_posted_one_by_one_back_off_off_the_logging_thread(monkeypatch):
+    from unittest.mock import MagicMock, patch
+
+    from snakemake_logger_plugin_flowo.plugin.client.log_handler import FlowoLogHandler
+
+    monkeypatch.setenv("FLOWO_HOST", "http://flowo.test")
+    monkeypatch.setenv("FLOWO_USER_TOKEN", "secret")
+    monkeypatch.setenv("FLOWO_REPORT_STREAM", "false")
+    posted: list[dict] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/reports/close"):
+            return httpx.Response(200, json={})
+        posted.append(json.loads(request.read()))
+        if len(posted) == 1:
+            return httpx.Response(429, headers={"Retry-After": "1"})
+        return httpx.Response(200, json={"context": {"current_workflow_id": "wf"}})
+
+    with patch.object(FlowoLogHandler, "_init_file_handler", return_value=MagicMock()):
+        handler = FlowoLogHandler(MagicMock(dryrun=False))
+    handler._client = httpx.Client(transport=httpx.MockTransport(respond))
+
+    start = time.monotonic()
+    handler._send_to_api("workflow_started", {"workflow_id": "wf"})
+    handler._send_to_api("job_started", {"job_ids": [1]})
+    assert time.monotonic() - start < 0.5
+    handler.close()
+
+    assert [p["seq"] for p in posted] == [1, 1, 2]
+    assert posted[2]["context"]["current_workflow_id"] == "wf"
+
+
+def test_events_are_resent_until_the_server_takes_them(monkeypatch):
+    from unittest.mock import MagicMock, patch
+
+    from snakemake_logger_plugin_flowo.plugin.client import log_handler
+    from snakemake_logger_plugin_flowo.plugin.client.log_handler import FlowoLogHandler
+
+    monkeypatch.setenv("FLOWO_HOST", "http://flowo.test")
+    delays: list[float] = []
+    monkeypatch.setattr(log_handler.time, "sleep", delays.append)
+    attempts: list[int] = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        attempts.append(json.loads(request.read())["seq"])
+        if len(attempts) <= 2:
+            raise httpx.ConnectError("connection refused", request=request)
+        if len(attempts) <= 100:
+            # Busy for far longer than one backoff
+            return httpx.Response(429, headers={"Retry-After": "120"})
+        return httpx.Response(200, json={"context": {"current_workflow_id": "wf"}})
+
+    with patch.object(FlowoLogHandler, "_init_file_handler", return_value=MagicMock()):
+        handler = FlowoLogHandler(MagicMock(dryrun=False))
+    handler._client = httpx.Client(transport=httpx.MockTransport(respond))
+
+    handler._post_line({"event": "workflow_started", "record": {}, "seq": 1})
+
+    assert attempts == [1] * 101
+    assert delays == [1.0, 2.0] + [60.0] * 98
+    assert handler.context["current_workflow_id"] == "wf"
@@ -0,0 +1,68 @@
+import importlib.util
+import math
+import random
+from collections import Counter
+from pathlib import Path
+
+from app.utils import ddsketch
+
+
+def _exact(values: list[float], q: float) -> tuple[float, float]:
+    """Values around the rank ``percentile_cont`` interpolates at."""
+    rank = q * (len(values) - 1)
+    return values[math.floor(rank)], values[math.ceil(rank)]
+
+
+def _sketch(values: list[float]) -> Counter:
+    return Counter(ddsketch.bucket_of(v) for v in values)
+
+
+def test_quantiles_within_relative_accuracy_of_exact_percentiles():
+    rng = random.Random(42)
+    # Job-like durations: mostly minutes, a long tail of hours, a few instant jobs
+    values = sorted(
+        [rng.lognormvariate(math.log(300), 1.5) for _ in range(20_000)]
+        + [rng.uniform(0.01, 2) for _ in range(500)]
+    )
+    qs = (0, 0.01, 0.25, 0.5, 0.75, 0.99, 1)
+
+    estimates = ddsketch.quantiles(_sketch(values), qs)
+
+    a = ddsketch.RELATIVE_ACCURACY
+    for q, estimate in zip(qs, estimates, strict=True):
+        lower, upper = _exact(values, q)
+        assert lower * (1 - a) <= estimate <= upper * (1 + a), (q, estimate)
+        assert abs(estimate - lower) <= a * lower + 1e-12
+
+
+def test_sketches_merge_and_subtract_like_their_values():
+    rng = random.Random(7)
+    days = [[rng.expovariate(1 / 60) for _ in range(1000)] for _ in range(3)]
+    merged = sum((_sketch(day) for day in days), Counter())
+    assert merged == _sketch([v for day in days for v in day])
+
+    # Removing a day's values leaves the sketch of the others
+    merged.subtract(_sketch(days[0]))
+    rest = sorted(days[1] + days[2])
+    (median,) = ddsketch.quantiles(merged, [0.5])
+    assert abs(median - _exact(rest, 0.5)[0]) <= ddsketch.RELATIVE_ACCURACY * median
+
+
+def test_empty_and_tiny_durations():
+    assert ddsketch.quantiles({}, [0.5]) is None
+    assert ddsketch.quantiles({3: 0}, [0.5]) is None
+    (estimate,) = ddsketch.quantiles(_sketch([0.0, -1.0]), [0.5])
+    assert estimate == ddsketch.bucket_value(ddsketch.bucket_of(ddsketch.MIN_DURATION))
+    assert estimate < 2 * ddsketch.MIN_DURATION
+
+
+def test_migration_backfill_uses_the_trigger_buckets():
+    path = (
+        Path(__file__).resolve().parents[2]
+        / "app/alembic/versions/e7f8a9b0c1d2_add_job_duration_sketches.py"
+    )
+    spec = importlib.util.spec_from_file_location("sketch_migration", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    assert migration._BUCKET.format(duration="duration") == ddsketch.BUCKET_SQL
@@ -0,0 +1,79 @@
+from app.services.reports import error_excerpt
+from app.services.reports.error_excerpt import error_lines, snakemake_error_block
+
+
+def test_error_lines_number_lines_of_a_truncated_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(error_excerpt, "_TAIL_LINES", 8)
+    monkeypatch.setattr(error_excerpt, "_BLOCK_BYTES", 16)
+    log = tmp_path / "job.log"
+    log.write_text("".join(f"step {n}\n" for n in range(1, 101)) + "Killed\n")
+
+    excerpt = error_lines(log)
+
+    assert excerpt["truncated"] is True
+    assert excerpt["matched"] is True
+    assert excerpt["lines"] == [{"line": 101, "text": "Killed"}]
+
+
+def test_error_lines_read_at_most_the_byte_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(error_excerpt, "_BLOCK_BYTES", 16)
+    monkeypatch.setattr(error_excerpt, "_MAX_TAIL_BYTES", 40)
+    log = tmp_path / "job.log"
+    # One huge line: no amount of reading would find the lines wanted
+    log.write_text("x" * 10_000 + "\nsegmentation fault\n")
+
+    excerpt = error_lines(log)
+
+    assert excerpt["truncated"] is True
+    assert excerpt["lines"] == [{"line": 2, "text": "segmentation fault"}]
+
+
+def test_error_lines_number_lines_of_a_file_read_to_its_start(tmp_path, monkeypatch):
+    monkeypatch.setattr(error_excerpt, "_TAIL_LINES", 8)
+    log = tmp_path / "job.log"
+    log.write_text("".join(f"step {n}\n" for n in range(1, 101)) + "Killed\n")
+
+    excerpt = error_lines(log)
+
+    assert excerpt["truncated"] is True
+    assert excerpt["lines"] == [{"line": 101, "text": "Killed"}]
+
+
+def test_error_lines_number_lines_of_long_logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(error_excerpt, "_COUNT_BYTES", 1000)
+    log = tmp_path / "job.log"
+    lines = [f"step {n}" for n in range(1, 2001)]
+    lines[1599] = "Traceback (most recent call last):"
+    lines[1999] = "Error: exit status 1"
+    log.write_text("\n".join(lines) + "\n")
+
+    excerpt = error_lines(log)
+
+    assert excerpt["truncated"] is True
+    assert excerpt["lines"] == [
+        {"line": 1600, "text": "Traceback (most recent call last):"},
+        {"line": 2000, "text": "Error: exit status 1"},
+    ]
+
+
+def test_error_lines_fall_back_to_the_last_lines(tmp_path):
+    log = tmp_path / "job.log"
+    log.write_text("".join(f"step {n}\n" for n in range(1, 11)))
+
+    excerpt = error_lines(log)
+
+    assert excerpt["matched"] is False
+    assert [row["line"] for row in excerpt["lines"]] == [6, 7, 8, 9, 10]
+
+
+def test_snakemake_error_block_picks_the_failed_job(tmp_path):
+    log = tmp_path / "run.log"
+    log.write_text(
+        "Error in rule a:\n    jobid: 12\n\n"
+        "Error in rule b:\n    jobid: 1\n    shell:\n        exit 1\n\ndone\n"
+    )
+
+    block = snakemake_error_block(log, 1)
+
+    assert [row["line"] for row in block] == [4, 5, 6, 7]
+    assert snakemake_error_block(log, 3) == []
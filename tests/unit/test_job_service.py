@@ -40,17 +40,15 @@ async def test_get_all_jobs(job_service, mock_db_session):
 async def test_get_jobs_by_workflow_id(job_service, mock_db_session):
     workflow_id = uuid.uuid4()
 
-    # Needs two db_session.execute calls: one for count, one for roles
-    mock_count_execute = MagicMock()
-    mock_count_execute.scalar.return_value = 5
+    # Unfiltered total comes from the job counters, then one query for the page
+    mock_db_session.scalar.return_value = 5
 
     mock_data_execute = MagicMock()
-    # returns tuple like (job, rule_name)
+    # returns tuple like (job, rule_name, status_rank)
     mock_job = Job(id=1, status="RUNNING", workflow_id=workflow_id)
-    mock_data_execute.all.return_value = [(mock_job, "align")]
+    mock_data_execute.all.return_value = [(mock_job, "align", 4)]
 
-    # Return count execution first, then data execution
-    mock_db_session.execute.side_effect = [mock_count_execute, mock_data_execute]
+    mock_db_session.execute.side_effect = [mock_data_execute]
 
     result = await job_service.get_jobs_by_workflow_id(workflow_id, limit=10, offset=0)
 
@@ -58,7 +56,8 @@ async def test_get_jobs_by_workflow_id(job_service, mock_db_session):
     assert len(result.jobs) == 1
     assert result.jobs[0].id == 1
     assert result.jobs[0].rule_name == "align"
-    assert mock_db_session.execute.call_count == 2
+    assert result.approximate is False
+    assert mock_db_session.execute.call_count == 1
 
 
 @pytest.mark.asyncio
@@ -141,13 +140,10 @@ async def test_get_job_files_with_id(job_service, mock_db_session):
 async def test_delete_jobs(job_service, mock_db_session):
     workflow_id = uuid.uuid4()
 
-    # job ids
-    mock_execute_ids = MagicMock()
-    mock_execute_ids.scalars().all.return_value = [1, 2]
-    mock_db_session.execute.return_value = mock_execute_ids
-
-    await job_service.delete_jobs(workflow_id)
+    with patch("app.services.job.delete_jobs_of", new_callable=AsyncMock) as m_jobs:
+        await job_service.delete_jobs(workflow_id)
 
-    # Should delete File, Job, Rule and commit
-    assert mock_db_session.execute.call_count == 4
+    # Jobs and files in batches, then one DELETE each for errors and rules
+    m_jobs.assert_awaited_once_with(mock_db_session, [workflow_id])
+    assert mock_db_session.execute.call_count == 2
     mock_db_session.commit.assert_called_once()
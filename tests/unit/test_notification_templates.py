@@ -1,6 +1,7 @@
 from app.services.notification import (
     _get_absolute_url,
     welcome_html,
+    workflow_digest_html,
     workflow_submitted_html,
     workflow_success_html,
 )
@@ -46,3 +47,19 @@ def test_welcome_html_contains_link():
     assert "newuser@example.com" in html
     assert "http://flowo.local/login" in html
     assert "Registration Successful" in html
+
+
+def test_workflow_digest_html_lists_every_run():
+    html = workflow_digest_html(
+        "user@example.com",
+        [
+            ("failure", "Align", "MissingOutputException"),
+            ("success", "QC", "3m 0s"),
+        ],
+        "http://flowo.local",
+    )
+    assert "2 Workflow Updates" in html
+    assert "Align" in html and "MissingOutputException" in html
+    assert "QC" in html and "Succeeded" in html
+    assert "(1 failed)" in html
+    assert "http://flowo.local/workflow" in html
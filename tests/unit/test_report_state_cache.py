@@ -0,0 +1,65 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.reports import service, state_cache
+from app.services.reports.state_cache import WorkflowStateCache
+
+
+def test_lru_evicts_least_recently_used_workflow():
+    cache = WorkflowStateCache(max_workflows=2, ttl=60)
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cache.remember_rule(a, "align", 1)
+    cache.remember_rule(b, "sort", 2)
+    assert cache.rule_id(a, "align") == 1  # touch a, so b is the oldest
+    cache.remember_workflow(c)
+
+    assert cache.rule_id(b, "sort") is None
+    assert cache.rule_id(a, "align") == 1
+    assert cache.workflow_exists(c)
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(state_cache.time, "monotonic", lambda: now[0])
+    cache = WorkflowStateCache(max_workflows=10, ttl=30)
+    wf = uuid.uuid4()
+    cache.remember_jobs(wf, {1: 11, 2: 12})
+    assert cache.job_ids(wf, [1, 2, 3]) == {1: 11, 2: 12}
+
+    now[0] += 31
+    assert cache.job_ids(wf, [1, 2]) == {}
+    assert cache.stats()["workflows"] == 0
+
+
+def test_watermark_mismatch_drops_entry():
+    cache = WorkflowStateCache(max_workflows=10, ttl=60)
+    wf = uuid.uuid4()
+    cache.remember_jobs(wf, {1: 11})
+    cache.advance_watermark(wf, 5)
+
+    cache.sync_watermark(wf, 5)
+    assert cache.job_ids(wf, [1]) == {1: 11}
+    # Another process projected event 6 (maybe a retry of job 1) meanwhile.
+    cache.sync_watermark(wf, 6)
+    assert cache.job_ids(wf, [1]) == {}
+
+
+async def test_failed_commit_evicts_the_projected_workflows(monkeypatch):
+    cache = WorkflowStateCache(max_workflows=10, ttl=60)
+    monkeypatch.setattr(service, "workflow_state_cache", cache)
+    projected, other = uuid.uuid4(), uuid.uuid4()
+    cache.remember_jobs(projected, {1: 11})
+    cache.remember_jobs(other, {1: 21})
+
+    async def commit():
+        raise ConnectionError("connection lost")
+
+    db = SimpleNamespace(info={service._PROJECTED: {projected, None}}, commit=commit)
+    with pytest.raises(ConnectionError):
+        await service.commit_projected(db)
+
+    assert cache.job_ids(projected, [1]) == {}
+    assert cache.job_ids(other, [1]) == {1: 21}
+    assert service._PROJECTED not in db.info
@@ -95,21 +95,17 @@ async def test_get_activity_rule(summary_service, mock_db_session):
 
 @pytest.mark.asyncio
 async def test_get_activity_tag(summary_service, mock_db_session):
-    # Mock workflow objects with tags
-    wf1 = MagicMock(tags=["genomics", "human"])
-    wf2 = MagicMock(tags=["human", "rnaseq"])
-    wf3 = MagicMock(tags=["genomics", "microbiome"])
-    wf_no_tags = MagicMock(tags=None)
-
+    # Tags are counted in SQL (unnest ... GROUP BY), most used first
     mock_execute = MagicMock()
-    mock_execute.scalars().all.return_value = [wf1, wf2, wf3, wf_no_tags]
+    mock_execute.all.return_value = [("genomics", 2), ("human", 2)]
     mock_db_session.execute.return_value = mock_execute
 
     activity = await summary_service.get_activity("tag", None, None, limit=2)
 
-    # "human" and "genomics" appear twice, "rnaseq" and "microbiome" appear once.
-    # With limit=2 it should return the top 2
     assert activity == {"genomics": 2, "human": 2}
+    stmt = mock_db_session.execute.await_args.args[0]
+    assert "unnest(workflows.tags)" in str(stmt)
+    assert stmt._limit == 2
 
 
 @pytest.mark.asyncio
@@ -4,8 +4,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from fastapi import HTTPException
 
+from app.models import WorkflowJobCounts
 from app.models.workflow import Workflow
-from app.services.workflow import WorkflowService
+from app.services.workflow import WorkflowService, _progress, _progress_percent
 
 
 @pytest.fixture
@@ -63,37 +64,27 @@ async def test_get_detail_success(workflow_service, mock_db_session):
         assert result.flowo_directory == "/path/to/wf"
 
 
-@pytest.mark.asyncio
-async def test_get_progress_percent_zero_before_run_info(
-    workflow_service, mock_db_session
-):
+def test_progress_percent_zero_before_run_info():
     """``run_info`` is filled after Snakemake's run_info event; until then list progress must be 0."""
-    mock_exec = MagicMock()
-    mock_exec.scalar.return_value = 0
-    mock_db_session.execute.return_value = mock_exec
-    with patch.object(
-        workflow_service, "get_workflow_run_info", new_callable=AsyncMock
-    ) as m_info:
-        m_info.return_value = {}
-        assert await workflow_service._get_progress(uuid.uuid4()) == 0
-
-    mock_exec.scalar.return_value = 3
-    with patch.object(
-        workflow_service, "get_workflow_run_info", new_callable=AsyncMock
-    ) as m_info:
-        m_info.return_value = {"total": 10}
-        assert await workflow_service._get_progress(uuid.uuid4()) == 30
+    counts = WorkflowJobCounts(workflow_id=uuid.uuid4(), success=3, running=1, error=0)
+    assert _progress_percent(_progress({}, counts)) == 0
+    assert _progress_percent(_progress({"total": 10}, counts)) == 30
+    assert _progress({"total": 10}, None) == {"total": 10, "completed": 0, "running": 0}
 
 
 @pytest.mark.asyncio
 async def test_delete_workflow(workflow_service, mock_db_session):
     workflow_id = uuid.uuid4()
 
-    # Two execute calls and one commit
-    await workflow_service.delete_workflow(workflow_id)
+    # One set-based deletion of the run, batched and committed by delete_runs
+    with patch("app.services.workflow.delete_runs", new_callable=AsyncMock) as m_delete:
+        await workflow_service.delete_workflow(workflow_id)
 
-    assert mock_db_session.execute.call_count == 2
-    mock_db_session.commit.assert_awaited_once()
+    m_delete.assert_awaited_once()
+    session, runs = m_delete.await_args.args
+    assert session is mock_db_session
+    assert runs.compile().params == {"id_1": workflow_id}
+    mock_db_session.execute.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -118,25 +109,16 @@ async def test_list_all_workflows(workflow_service, mock_db_session):
     mock_count = MagicMock()
     mock_count.scalar.return_value = 2
 
-    # execute calls:
-    # 1. count
-    # 2. workflows
-    # 3. get_progress -> job query
-    # 4. _get_progress -> job query
-    # It might be very complex to mock all of them by side_effect precisely without knowing the order
-    # Let's mock _get_progress and get_workflow_run_info instead
+    # execute calls: 1. count, 2. workflows; the job counters are mocked
     mock_db_session.execute.side_effect = [mock_count, mock_result]
 
-    with (
-        patch.object(
-            workflow_service, "_get_progress", new_callable=AsyncMock
-        ) as m_prog,
-        patch.object(
-            workflow_service, "get_workflow_run_info", new_callable=AsyncMock
-        ) as m_info,
-    ):
-        m_prog.return_value = 100
-        m_info.return_value = {"total": 5}
+    with patch.object(
+        workflow_service, "get_progress_many", new_callable=AsyncMock
+    ) as m_prog:
+        m_prog.return_value = {
+            wf.id: {"total": 5, "completed": 5, "running": 0}
+            for wf in (mock_wf1, mock_wf2)
+        }
 
         response = await workflow_service.list_all_workflows(
             limit=10, offset=0, user=None
@@ -149,36 +131,24 @@ async def test_list_all_workflows(workflow_service, mock_db_session):
 
 @pytest.mark.asyncio
 async def test_pruning(workflow_service, mock_db_session):
-    # pruning executes multiple queries
     user_id = uuid.uuid4()
 
-    # 1. empty workflows query
-    mock_empty_wfs = MagicMock()
-    mock_empty_wfs.all.return_value = [(uuid.uuid4(),), (uuid.uuid4(),)]
-
-    # 2. jobs to error query
-    mock_jobs_error = MagicMock()
-    mock_jobs_error.all.return_value = [(1,)]
-
-    # 3. jobs to success query
-    mock_jobs_success = MagicMock()
-    mock_jobs_success.all.return_value = [(2,)]
-
-    # side_effect: it executes 1, then two deletes per empty wf, then 2, then updates, then 3, then updates
-    # Just setting return value for any call, but we need to supply lists back
-    mock_db_session.execute.side_effect = [
-        mock_empty_wfs,  # query empty wfs
-        MagicMock(),  # delete Error
-        MagicMock(),  # delete Workflow
-        MagicMock(),  # delete Error
-        MagicMock(),  # delete Workflow
-        mock_jobs_error,  # query jobs error
-        MagicMock(),  # update Job (error)
-        mock_jobs_success,  # query jobs success
-        MagicMock(),  # update Job (success)
-    ]
-
-    res = await workflow_service.pruning(user_id)
-    assert res["workflow"] == 2
-    assert res["job"] == 2
-    mock_db_session.commit.assert_awaited_once()
+    # Empty runs go through delete_runs; running jobs of finished runs are
+    # settled by batched UPDATE ... FROM statements until a batch comes up short
+    full, last = MagicMock(rowcount=2), MagicMock(rowcount=1)
+    mock_db_session.execute.side_effect = [full, last]
+
+    with (
+        patch("app.services.workflow.settings.DELETE_BATCH_SIZE", 2),
+        patch(
+            "app.services.workflow.delete_runs",
+            new=AsyncMock(return_value={"workflows": 2, "jobs": 0}),
+        ) as m_delete,
+    ):
+        res = await workflow_service.pruning(user_id)
+
+    assert res == {"workflow": 2, "job": 3}
+    m_delete.assert_awaited_once()
+    update_sql = str(mock_db_session.execute.await_args_list[0].args[0])
+    assert "UPDATE jobs SET status=workflows.status FROM workflows" in update_sql
+    assert mock_db_session.commit.await_count == 2